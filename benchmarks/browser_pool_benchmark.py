@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared Playwright browser pool.
+
+Compares the per-call pattern the DOM runner and schema extractor used before
+the pool (start Playwright, launch Chromium, open a page, close everything)
+with borrowing a page from ``BrowserPool``. Every action loads one of the
+local ``file://`` fixtures from tests/fixtures/web and counts interactive
+elements, so the numbers reflect browser overhead rather than the network.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/browser_pool_benchmark.py [--rounds 5] [--workers 2]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.execution.browser_pool import BrowserPool
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "web"
+
+
+def fixture_urls() -> List[str]:
+    return [p.resolve().as_uri() for p in sorted(FIXTURES.glob("*.html"))]
+
+
+def inspect_page(page: Any, url: str) -> int:
+    page.goto(url, wait_until="domcontentloaded")
+    return len(page.query_selector_all("input, textarea, select, button, a"))
+
+
+def launch_per_call(url: str) -> int:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        try:
+            return inspect_page(page, url)
+        finally:
+            browser.close()
+
+
+def summarize(name: str, samples: List[float], wall_s: float) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "name": name,
+        "actions": len(samples),
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "mean_ms": statistics.fmean(ordered),
+        "actions_per_s": len(samples) / wall_s if wall_s else 0.0,
+    }
+
+
+def run_sequential(name: str, action: Callable[[str], int], urls: List[str]) -> Dict[str, Any]:
+    samples = []
+    started = time.perf_counter()
+    for url in urls:
+        t0 = time.perf_counter()
+        action(url)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(name, samples, time.perf_counter() - started)
+
+
+def run_concurrent(name: str, action: Callable[[str], int], urls: List[str], workers: int) -> Dict[str, Any]:
+    def timed(url: str) -> float:
+        t0 = time.perf_counter()
+        action(url)
+        return (time.perf_counter() - t0) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        samples = list(executor.map(timed, urls))
+    return summarize(name, samples, time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over the fixtures")
+    parser.add_argument("--workers", type=int, default=2, help="Pool size and client threads")
+    args = parser.parse_args()
+
+    try:
+        import playwright.sync_api  # noqa: F401
+    except ImportError:
+        print("Playwright is not installed: pip install playwright && playwright install chromium")
+        return 1
+
+    urls = fixture_urls() * args.rounds
+    pool = BrowserPool(headless=True, max_browsers=args.workers)
+    pooled = lambda url: pool.run(lambda page: inspect_page(page, url), url=url)  # noqa: E731
+
+    try:
+        pool.run(lambda page: None)  # launch outside the measurement
+        results = [
+            run_sequential("launch per call", launch_per_call, urls),
+            run_sequential("pool, sequential", pooled, urls),
+            run_concurrent(f"pool, {args.workers} threads", pooled, urls, args.workers),
+        ]
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    print(f"{'mode':<22}{'actions':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'act/s':>9}")
+    for r in results:
+        print(
+            f"{r['name']:<22}{r['actions']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['mean_ms']:>10.1f}{r['actions_per_s']:>9.1f}"
+        )
+    speedup = results[0]["p50_ms"] / results[1]["p50_ms"] if results[1]["p50_ms"] else float("inf")
+    print(f"\np50 speedup (pool vs launch per call): {speedup:.1f}x")
+    print(f"browser launches in pool: {stats['launches']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
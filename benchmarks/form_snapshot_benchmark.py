@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark for FormHandler.detect_form_fields: one-shot DOM snapshot vs
+per-element attribute reads.
+
+Loads tests/fixtures/web/large_form.html (170 fields) from a file:// URL and
+counts the Playwright calls each strategy makes (each one is a round trip to
+the browser), along with wall time.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/form_snapshot_benchmark.py [--repeat 10]
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console
+
+from nlp2cmd.web_schema.form_handler import FormHandler
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "web" / "large_form.html"
+
+
+class CountingProxy:
+    """Counts method calls on a Playwright page and the element handles it returns."""
+
+    def __init__(self, target: Any, counter: Dict[str, int]):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if not callable(value):
+            return value
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            self._counter["calls"] += 1
+            return _wrap(value(*args, **kwargs), self._counter)
+
+        return call
+
+
+def _wrap(value: Any, counter: Dict[str, int]) -> Any:
+    if isinstance(value, list):
+        return [_wrap(v, counter) for v in value]
+    if type(value).__name__ == "ElementHandle":
+        return CountingProxy(value, counter)
+    return value
+
+
+def measure(name: str, detect: Callable[[Any], list], page: Any, repeat: int) -> Dict[str, Any]:
+    counter = {"calls": 0}
+    proxy = CountingProxy(page, counter)
+    fields: list = []
+    samples: List[float] = []
+    for _ in range(repeat):
+        counter["calls"] = 0
+        t0 = time.perf_counter()
+        fields = detect(proxy)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        "name": name,
+        "fields": len(fields),
+        "round_trips": counter["calls"],
+        "p50_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "selectors": [f.selector for f in fields],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Detections per strategy")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("Playwright is not installed: pip install playwright && playwright install chromium")
+        return 1
+
+    # Debug YAML output is part of both paths; send it nowhere.
+    handler = FormHandler(console=Console(file=io.StringIO()))
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(FIXTURE.resolve().as_uri())
+        try:
+            snapshot = measure("snapshot", handler.detect_form_fields, page, args.repeat)
+            per_element = measure("per element", handler._detect_form_fields_per_element, page, args.repeat)
+        finally:
+            browser.close()
+
+    print(f"{'strategy':<14}{'fields':>8}{'round trips':>13}{'p50 ms':>10}{'min ms':>10}")
+    for r in (per_element, snapshot):
+        print(f"{r['name']:<14}{r['fields']:>8}{r['round_trips']:>13}{r['p50_ms']:>10.1f}{r['min_ms']:>10.1f}")
+    print(f"\nsame fields: {snapshot['selectors'] == per_element['selectors']}")
+    if snapshot["p50_ms"]:
+        print(f"p50 speedup: {per_element['p50_ms'] / snapshot['p50_ms']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark for HybridGenerator: serial rules-then-LLM vs speculative mode.
+
+Runs a workload of rule hits and fall-through queries against the real
+RuleBasedPipeline and a local fake LLM that answers after ``--llm-delay-ms``.
+``--rule-delay-ms`` adds latency to every rule run (e.g. a slow cascade
+stage). For each mode it reports p50/p99 latency of the fall-through queries,
+of all queries, the number of LLM calls and the share of speculative calls
+whose result was thrown away. The first pass over the workload teaches the
+fall-through predictor and is not timed.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/hybrid_speculation_benchmark.py [--llm-delay-ms 200] [--passes 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.generation.hybrid import HybridGenerator
+from nlp2cmd.generation.llm_multi import MultiDomainGenerator
+from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+QUERIES = [
+    "pokaż pliki w katalogu /tmp",
+    "znajdź pliki .py większe niż 10MB",
+    "pokaż kontenery docker",
+    "list all running processes",
+    "show disk usage",
+    "pokaż pody w namespace prod",
+    "zrób coś mądrego z tym projektem",
+    "what would a wise sysadmin do now",
+    "ile mam wolnego miejsca i czy to dużo",
+    "zaplanuj migrację bazy na przyszły tydzień",
+]
+
+
+class FakeLLM:
+    """Answers every prompt after a fixed delay."""
+
+    def __init__(self, delay_ms: float):
+        self.delay = delay_ms / 1000
+        self.calls = 0
+
+    async def complete(self, user: str, system=None, max_tokens=500, temperature=0.1, **kwargs) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return "shell" if "Sklasyfikuj" in user else "echo done"
+
+
+class DelayedRules:
+    """Adds a fixed delay to every rule pipeline run."""
+
+    def __init__(self, pipeline: RuleBasedPipeline, delay_ms: float):
+        self.pipeline = pipeline
+        self.delay = delay_ms / 1000
+
+    def process(self, text: str):
+        time.sleep(self.delay)
+        return self.pipeline.process(text)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def fall_through_queries(pipeline: RuleBasedPipeline) -> Set[str]:
+    """Queries whose rule result HybridGenerator would not accept."""
+    judge = HybridGenerator(rule_pipeline=pipeline)
+    return {text for text in QUERIES if not judge._should_use_rule_result(pipeline.process(text))}
+
+
+async def run(mode: str, rules: Any, fall_through: Set[str], args: argparse.Namespace) -> Dict[str, Any]:
+    llm = FakeLLM(args.llm_delay_ms)
+    generator = HybridGenerator(
+        rule_pipeline=rules,
+        llm_generator=MultiDomainGenerator(llm),
+        speculative=mode == "speculative",
+        speculation_budget=args.budget,
+    )
+    workload = QUERIES
+
+    for text in workload:
+        await generator.generate(text)
+    generator.reset_stats()
+    llm.calls = 0
+
+    all_ms: List[float] = []
+    fallthrough_ms: List[float] = []
+    for _ in range(args.passes):
+        for text in workload:
+            t0 = time.perf_counter()
+            await generator.generate(text)
+            elapsed = (time.perf_counter() - t0) * 1000
+            all_ms.append(elapsed)
+            if text in fall_through:
+                fallthrough_ms.append(elapsed)
+
+    stats = generator.get_stats()
+    return {
+        "mode": mode,
+        "ft_p50": statistics.median(fallthrough_ms),
+        "ft_p99": percentile(fallthrough_ms, 0.99),
+        "all_p50": statistics.median(all_ms),
+        "all_p99": percentile(all_ms, 0.99),
+        "llm_calls": llm.calls,
+        "speculative": stats.speculative_calls,
+        "wasted": stats.wasted_call_ratio,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-delay-ms", type=float, default=200.0, help="Fake LLM latency per call")
+    parser.add_argument("--rule-delay-ms", type=float, default=0.0, help="Extra latency per rule run")
+    parser.add_argument("--budget", type=float, default=0.5, help="Speculative calls per request")
+    parser.add_argument("--passes", type=int, default=5, help="Timed passes over the workload")
+    args = parser.parse_args()
+
+    pipeline = RuleBasedPipeline()
+    rules = DelayedRules(pipeline, args.rule_delay_ms) if args.rule_delay_ms else pipeline
+    fall_through = fall_through_queries(pipeline)
+
+    results = [asyncio.run(run(mode, rules, fall_through, args)) for mode in ("serial", "speculative")]
+
+    print(f"{len(fall_through)} of {len(QUERIES)} queries fall through the rules")
+    print(f"llm delay {args.llm_delay_ms:.0f} ms, extra rule delay {args.rule_delay_ms:.0f} ms, budget {args.budget}")
+    print(
+        f"{'mode':<13}{'ft p50':>9}{'ft p99':>9}{'all p50':>9}{'all p99':>9}"
+        f"{'llm calls':>11}{'spec.':>7}{'wasted':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<13}{r['ft_p50']:>9.1f}{r['ft_p99']:>9.1f}{r['all_p50']:>9.1f}{r['all_p99']:>9.1f}"
+            f"{r['llm_calls']:>11}{r['speculative']:>7}{r['wasted']:>8.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
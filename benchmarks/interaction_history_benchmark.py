@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for InteractionHistory with a large synthetic history.
+
+Generates N interactions (default 100k) spread over domains, actions, fields
+and selectors, then compares:
+
+* lookups: the former linear scans in ``get_successful_selectors`` and
+  ``get_domain_stats``, against the incremental ``SelectorStatsIndex``
+* recording: rewriting the whole JSON file on every ``record()``, against
+  appending to the event log with periodic compaction
+* loading: the saved snapshot, with and without a persisted index
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/interaction_history_benchmark.py [--interactions 100000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.web_schema.history import InteractionHistory, InteractionRecord
+from nlp2cmd.web_schema.selector_index import SelectorStatsIndex
+
+ACTIONS = ["type", "click", "press", "goto"]
+FIELDS = ["search", "email", "name", "message", None]
+
+
+def synthetic_records(n: int, domains: int, selectors: int, seed: int = 42) -> List[InteractionRecord]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    records = []
+    for i in range(n):
+        domain = f"site{int(rng.paretovariate(1.2)) % domains}.example"
+        field = rng.choice(FIELDS)
+        records.append(
+            InteractionRecord(
+                timestamp=(start + timedelta(seconds=i * 7)).isoformat(),
+                url=f"https://{domain}/",
+                domain=domain,
+                action_type=rng.choice(ACTIONS),
+                selector=f"#{field or 'el'}-{int(rng.expovariate(0.3)) % selectors}",
+                success=rng.random() < 0.8,
+                metadata={"field": field} if field else {},
+            )
+        )
+    return records
+
+
+def linear_successful_selectors(records: List[InteractionRecord], domain: str, action_type: str, limit: int = 10) -> List[str]:
+    counts: Dict[str, int] = {}
+    for r in records:
+        if r.domain == domain and r.action_type == action_type and r.success and r.selector:
+            counts[r.selector] = counts.get(r.selector, 0) + 1
+    return [s for s, _ in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]]
+
+
+def linear_domain_stats(records: List[InteractionRecord], domain: str) -> Dict[str, Any]:
+    domain_records = [r for r in records if r.domain == domain]
+    successful = sum(1 for r in domain_records if r.success)
+    return {"total_interactions": len(domain_records), "successful_interactions": successful}
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def row(name: str, samples: List[float], unit: str = "us") -> None:
+    print(f"{name:<36}{statistics.median(samples):>12.1f}{max(samples):>12.1f}  {unit}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interactions", type=int, default=100_000, help="Synthetic history size")
+    parser.add_argument("--domains", type=int, default=50, help="Distinct domains")
+    parser.add_argument("--selectors", type=int, default=30, help="Selectors per field")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per method")
+    parser.add_argument("--records", type=int, default=20, help="Extra record() calls to time")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.interactions, args.domains, args.selectors)
+    probes = [(r.domain, r.action_type) for r in random.Random(1).sample(records, args.lookups)]
+
+    t0 = time.perf_counter()
+    index = SelectorStatsIndex.build(records)
+    build_s = time.perf_counter() - t0
+
+    mismatches = sum(
+        index.best_selectors(d, a) != linear_successful_selectors(records, d, a) for d, a in probes[:50]
+    )
+
+    print(f"{args.interactions} interactions, index built in {build_s * 1000:.0f} ms "
+          f"({build_s / args.interactions * 1e6:.2f} us/event), mismatches vs scan: {mismatches}\n")
+    print(f"{'operation':<36}{'p50':>12}{'max':>12}")
+
+    it = iter(probes * 2)
+    row("selectors, linear scan", timed(lambda: linear_successful_selectors(records, *next(it)), min(args.lookups, 50)))
+    it = iter(probes * 2)
+    row("selectors, index", timed(lambda: index.best_selectors(*next(it)), args.lookups))
+    it = iter(probes * 2)
+    row("domain stats, linear scan", timed(lambda: linear_domain_stats(records, next(it)[0]), min(args.lookups, 50)))
+    it = iter(probes * 2)
+    row("domain stats, index", timed(lambda: index.domain_stats(next(it)[0]), args.lookups))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "browser_history.json"
+        history = InteractionHistory(path)
+        history.records = list(records)
+        history.index = SelectorStatsIndex.build(records)
+        history.compact()
+
+        def record_once() -> None:
+            history.record(url="https://bench.example/", domain="bench.example",
+                           action_type="click", selector="#go", metadata={"field": "search"})
+
+        row("record(), append to log", timed(record_once, args.records))
+        row("record(), full rewrite", timed(lambda: (record_once(), history.compact()), max(3, args.records // 5)))
+        history.compact()
+
+        row("load snapshot + saved index", timed(lambda: InteractionHistory(path), 3))
+        data = json.loads(path.read_text())
+        data.pop("selector_index")
+        path.write_text(json.dumps(data))
+        row("load legacy snapshot (rebuild)", timed(lambda: InteractionHistory(path), 3))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the lemmatized detection path of KeywordIntentDetector.
+
+Runs a few thousand generated Polish and English queries through
+``KeywordIntentDetector`` with spaCy lemmatization enabled, in four
+configurations:
+
+* legacy: full pipeline (parser, NER, ...) and one ``nlp(text)`` call per
+  query that reaches the lemmatization fallback, no caching
+* cached: parser/NER/textcat disabled, exact text-level lemma cache
+* batch: as cached, through ``detect_batch`` (misses lemmatized with
+  ``nlp.pipe``)
+* tokens: as cached, plus the opt-in token-level cache
+
+Reports wall time per query, spaCy calls and how many detections differ from
+the legacy configuration.
+
+Usage:
+    NLP2CMD_ENABLE_SPACY_LEMMATIZATION=1 PYTHONPATH=src python3 benchmarks/lemmatization_benchmark.py [--queries 3000]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault("NLP2CMD_ENABLE_SPACY_LEMMATIZATION", "1")
+
+from nlp2cmd.generation import keywords
+from nlp2cmd.generation.keywords import KeywordIntentDetector
+from nlp2cmd.generation.lemmatizer import SPACY_DISABLED_COMPONENTS, SpacyLemmatizer, token_form
+
+VERBS = [
+    "pokaż", "pokazuje", "wyświetl", "wyświetlcie", "znajdź", "znajdźcie", "usuń", "usunąłem",
+    "sprawdziłem", "uruchomione", "zatrzymane", "show", "showing", "list", "listing", "find",
+    "found", "remove", "removed", "stopped", "running",
+]
+OBJECTS = [
+    "plików", "pliki", "katalogów", "kontenerów", "kontenerach", "obrazów", "procesów",
+    "logów", "usług", "użytkowników", "tabelach", "files", "folders", "containers", "images",
+    "processes", "logs", "services", "users", "tables", "pods",
+]
+MODIFIERS = [
+    "", "z wczoraj", "w katalogu domowym", "większych niż 10MB", "na serwerze", "dockera",
+    "from yesterday", "in the home directory", "larger than 10MB", "on the server", "quickly",
+]
+
+
+class LegacyLemmatizer:
+    """The former per-query lemmatization: full pipeline, no caching."""
+
+    def __init__(self, nlp: Any):
+        self.nlp = nlp
+        self.calls = 0
+
+    def lemmatize(self, text: str) -> str:
+        self.calls += 1
+        return " ".join(token_form(t) for t in self.nlp(text))
+
+    def lemmatize_many(self, texts, batch_size=None) -> List[str]:
+        return [self.lemmatize(t) for t in texts]
+
+
+def make_queries(count: int, seed: int) -> List[str]:
+    combos = [" ".join(p for p in c if p) for c in itertools.product(VERBS, OBJECTS, MODIFIERS)]
+    rng = random.Random(seed)
+    # Real traffic repeats itself: draw with replacement from a smaller pool.
+    pool = rng.sample(combos, min(len(combos), count // 2))
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def run(name: str, lemmatizer: Any, queries: List[str], batch: bool) -> Dict[str, Any]:
+    keywords._LEMMATIZER = lemmatizer
+    detector = KeywordIntentDetector()
+    t0 = time.perf_counter()
+    if batch:
+        results = detector.detect_batch(queries)
+    else:
+        results = [detector.detect(q) for q in queries]
+    elapsed = time.perf_counter() - t0
+    stats = getattr(lemmatizer, "stats", None)
+    spacy_calls = stats.model_runs if stats is not None else lemmatizer.calls
+    return {
+        "name": name,
+        "us_per_query": elapsed / len(queries) * 1e6,
+        "spacy_calls": spacy_calls,
+        "detections": [(r.domain, r.intent, round(r.confidence, 4)) for r in results],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=3000, help="Number of queries")
+    parser.add_argument("--model", default="pl_core_news_sm", help="spaCy model to load")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    try:
+        import spacy
+    except ImportError:
+        print("spaCy is not installed: pip install spacy && python -m spacy download pl_core_news_sm")
+        return 1
+    if not keywords._ENABLE_SPACY_LEMMATIZATION:
+        print("Set NLP2CMD_ENABLE_SPACY_LEMMATIZATION=1")
+        return 1
+
+    full = spacy.load(args.model)
+    slim = spacy.load(args.model, disable=list(SPACY_DISABLED_COMPONENTS))
+    print(f"pipeline: {full.pipe_names}")
+    print(f"enabled for lemmas: {slim.pipe_names}")
+
+    queries = make_queries(args.queries, args.seed)
+    results = [
+        run("legacy", LegacyLemmatizer(full), queries, batch=False),
+        run("cached", SpacyLemmatizer(slim), queries, batch=False),
+        run("batch", SpacyLemmatizer(slim), queries, batch=True),
+        run("tokens", SpacyLemmatizer(slim, token_cache_size=20000), queries, batch=False),
+    ]
+
+    baseline = results[0]["detections"]
+    print(f"\n{len(queries)} queries, {len(set(queries))} distinct")
+    print(f"{'config':<9}{'µs/query':>11}{'spaCy calls':>13}{'differ':>8}")
+    for r in results:
+        differ = sum(a != b for a, b in zip(r["detections"], baseline))
+        print(f"{r['name']:<9}{r['us_per_query']:>11.0f}{r['spacy_calls']:>13}{differ:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
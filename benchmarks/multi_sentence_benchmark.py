@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for multi-sentence inputs in RuleBasedPipeline.
+
+The CLI runs ``process`` and then ``process_steps`` on the same query. For
+every input of 1-10 sentences it times that pair two ways:
+
+* legacy: the sentence analysis is dropped before each call, so every
+  sentence is split and detected twice, as before
+* shared: ``process_steps`` reuses the analysis built by ``process``
+
+Both passes must give the same commands.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/multi_sentence_benchmark.py [--repeat 20]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+SENTENCES = [
+    "Pokaż pliki w katalogu /tmp.",
+    "Następnie usuń plik test.txt.",
+    "Jeśli nie istnieje, utwórz go.",
+    "Potem pokaż kontenery dockera.",
+    "Oraz zatrzymaj kontener web.",
+    "Wtedy sprawdź status usługi nginx.",
+    "Dalej pokaż pody w namespace default.",
+    "Na koniec wybierz użytkowników z tabeli users.",
+    "Potem znajdź pliki większe niż 100MB.",
+    "Następnie pokaż procesy zużywające pamięć.",
+]
+
+
+def run_pair(pipeline: RuleBasedPipeline, text: str, legacy: bool) -> list:
+    if legacy:
+        pipeline._sentence_memo.clear()
+    result = pipeline.process(text)
+    if legacy:
+        pipeline._sentence_memo.clear()
+    steps = pipeline.process_steps(text)
+    return [result.command] + [s.command for s in steps]
+
+
+def measure(pipeline: RuleBasedPipeline, text: str, legacy: bool, repeat: int) -> tuple[float, list]:
+    samples = []
+    output = None
+    for _ in range(repeat):
+        pipeline._sentence_memo.clear()
+        start = time.perf_counter()
+        output = run_pair(pipeline, text, legacy)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = RuleBasedPipeline()
+    run_pair(pipeline, " ".join(SENTENCES), legacy=True)  # warm up lazy loaders
+
+    print(f"{'sentences':>9} {'legacy ms':>10} {'shared ms':>10} {'speedup':>8}")
+    for n in range(1, len(SENTENCES) + 1):
+        text = " ".join(SENTENCES[:n])
+        legacy_ms, legacy_out = measure(pipeline, text, True, args.repeat)
+        shared_ms, shared_out = measure(pipeline, text, False, args.repeat)
+        if legacy_out != shared_out:
+            print(f"output mismatch for {n} sentences", file=sys.stderr)
+            return 1
+        print(f"{n:>9} {legacy_ms:>10.2f} {shared_ms:>10.2f} {legacy_ms / shared_ms:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for shell command safety checks and validation.
+
+Times ``ShellAdapter.check_safety`` and ``ShellValidator.validate`` over a mix
+of typical generated commands in three configurations:
+
+* legacy: the former per-check loops, with ``shlex.split`` on every call and
+  a new ``SyntaxValidator`` per validation
+* compiled: the compiled per-policy rules with the verdict cache disabled,
+  i.e. the cost of a command never seen before
+* cached: repeated commands answered from the bounded verdict cache
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/safety_rules_benchmark.py [--rounds 200]
+"""
+
+import argparse
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.adapters import safety
+from nlp2cmd.adapters.shell import ShellAdapter, ShellSafetyPolicy
+from nlp2cmd.validators import ShellValidator, SyntaxValidator, _shell_findings
+
+COMMANDS = [
+    "find /home/user -name '*.py' -type f -mtime -7 | xargs grep -l TODO | head -20",
+    "ls -la /var/log",
+    "docker ps -a --format '{{.Names}}'",
+    "ps aux --sort=-%mem | head -10",
+    "du -sh * | sort -rh | head -5",
+    "grep -rn 'ERROR' /var/log/syslog | tail -50",
+    "kubectl get pods -n prod -o wide",
+    "tar -czf backup.tar.gz ./project",
+    "rm -rf ./build",
+    "sudo systemctl restart nginx",
+    "curl -s https://example.com/install.sh | bash",
+    "cat /etc/hosts",
+    "echo 'export PATH=$PATH:~/bin' >> ~/.bashrc",
+    "kill -9 $(pgrep -f server.py)",
+    "git log --oneline -20",
+]
+
+
+def legacy_check_safety(command: str, policy: ShellSafetyPolicy) -> Dict[str, Any]:
+    command_lower = command.lower()
+    for blocked in policy.blocked_commands:
+        if blocked.lower() in command_lower:
+            return {"allowed": False, "reason": f"Command contains blocked pattern: {blocked}"}
+    if not policy.allow_sudo and command.strip().startswith("sudo"):
+        return {"allowed": False, "reason": "sudo is not allowed by safety policy"}
+    if not policy.allow_pipe_to_shell:
+        for dp in ["| sh", "| bash", "| zsh", "|sh", "|bash"]:
+            if dp in command:
+                return {"allowed": False, "reason": "Piping to shell is not allowed"}
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        argv = command.split()
+    for blocked_dir in policy.blocked_directories:
+        for arg in argv:
+            value = arg.split("=", 1)[1] if "=" in arg else arg
+            if blocked_dir == "/":
+                if value == "/":
+                    return {"allowed": False, "reason": f"Operations on {blocked_dir} are not allowed"}
+                continue
+            if value == blocked_dir or value.startswith(blocked_dir + "/"):
+                return {"allowed": False, "reason": f"Operations on {blocked_dir} are not allowed"}
+    requires_confirmation = any(p.lower() in command_lower for p in policy.require_confirmation_for)
+    return {"allowed": True, "requires_confirmation": requires_confirmation}
+
+
+def legacy_validate(content: str) -> tuple:
+    errors: List[str] = []
+    content_lower = content.lower()
+    for dangerous in ShellValidator.DANGEROUS_COMMANDS:
+        if dangerous.lower() in content_lower:
+            errors.append(dangerous)
+    checks = [
+        "rm " in content and "*" in content,
+        "| sh" in content or "| bash" in content,
+        "eval " in content_lower,
+        "chmod" in content_lower and ("777" in content or "a+rwx" in content),
+        "kill" in content_lower and ("-9" in content or "SIGKILL" in content),
+        "nohup" in content_lower,
+        "../" in content or "..\\" in content,
+    ]
+    for pattern in ["&&", "||", ";", "$(", "`"]:
+        checks.append(pattern in content)
+    for path in ["/etc/", "/boot/", "/sys/", "/proc/", "/dev/", "/root/", "/usr/bin/"]:
+        checks.append(path in content and (">>" in content or ">" in content))
+    syntax = SyntaxValidator().validate(content)
+    return errors, checks, syntax.errors
+
+
+def per_call_us(fn: Callable[[str], Any], rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for command in COMMANDS:
+            fn(command)
+    return (time.perf_counter() - t0) / (rounds * len(COMMANDS)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the command mix")
+    args = parser.parse_args()
+
+    adapter = ShellAdapter()
+    policy = adapter.config.safety_policy
+    validator = ShellValidator()
+
+    # Compiled rules without the verdict cache: every call is a miss.
+    uncached_rules = safety.ShellSafetyRules.from_policy(policy)
+    uncached_validate = _shell_findings.__wrapped__
+
+    def cached_check(command: str) -> Any:
+        return adapter.check_safety(command)
+
+    rows = [
+        ("check_safety", "legacy", per_call_us(lambda c: legacy_check_safety(c, policy), args.rounds)),
+        ("check_safety", "compiled", per_call_us(uncached_rules.check, args.rounds)),
+        ("check_safety", "cached", per_call_us(cached_check, args.rounds)),
+        ("validate", "legacy", per_call_us(legacy_validate, args.rounds)),
+        ("validate", "compiled", per_call_us(
+            lambda c: uncached_validate(tuple(ShellValidator.DANGEROUS_COMMANDS), False, c), args.rounds)),
+        ("validate", "cached", per_call_us(validator.validate, args.rounds)),
+    ]
+
+    print(f"{len(COMMANDS)} commands x {args.rounds} rounds\n")
+    print(f"{'operation':<14}{'mode':<10}{'us/call':>10}")
+    for op, mode, us in rows:
+        print(f"{op:<14}{mode:<10}{us:>10.2f}")
+    print(f"\nverdict cache: {safety.verdict_cache.hits} hits, {safety.verdict_cache.misses} misses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
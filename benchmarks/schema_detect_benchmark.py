@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SchemaRegistry.detect_format over a synthetic repository tree.
+
+Writes N files (default 50k) with a mix of source files, configuration files
+(YAML, JSON, .env, Dockerfiles, compose files, workflows) and extensionless
+files, some of them large logs. It then classifies every file twice:
+
+* legacy: ``fnmatch`` against every pattern of every schema, plus a content
+  check that reads the whole file
+* indexed: the precomputed filename/extension index and compiled globs, with
+  content sniffing limited to the file header
+
+Both passes must give the same schema for every file.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/schema_detect_benchmark.py [--files 50000]
+"""
+
+import argparse
+import fnmatch
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.schemas import FileFormatSchema, SchemaRegistry
+
+KINDS = [
+    ("src/pkg{d}/module{i}.py", "import os\n\nprint('hello')\n", 30),
+    ("docs/page{i}.md", "# Title\n\nSome text.\n", 10),
+    ("config/app{i}.yaml", "apiVersion: v1\nkind: ConfigMap\n", 8),
+    ("data/fixture{i}.json", '{"a": 1}\n', 8),
+    ("services/svc{i}/Dockerfile", "FROM python:3.11\nRUN pip install flask\n", 4),
+    ("services/svc{i}/docker-compose.yml", "version: '3'\nservices:\n  web: {}\n", 2),
+    ("env/.env.{i}", "DEBUG=1\n", 2),
+    ("bin/tool{i}", "#!/bin/sh\necho hi\n", 6),
+    ("logs/run{i}", "INFO line of a long log\n" * 3000, 2),
+    ("images/Containerfile{i}", "FROM alpine\nRUN true\n", 2),
+]
+
+
+def build_tree(root: Path, count: int, seed: int = 3) -> List[Path]:
+    rng = random.Random(seed)
+    templates = [k for k in KINDS for _ in range(k[2])]
+    paths = []
+    for i in range(count):
+        pattern, content, _ = rng.choice(templates)
+        path = root / pattern.format(d=i % 97, i=i)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+def legacy_detect(registry: SchemaRegistry, file_path: Path) -> Optional[FileFormatSchema]:
+    def match(text: str, pattern: str) -> bool:
+        return fnmatch.fnmatch(text.lower(), pattern.lower()) or text.lower() == pattern.lower()
+
+    matching = []
+    for schema in registry.schemas.values():
+        for pattern in schema.extensions:
+            if match(file_path.name, pattern) or match(str(file_path), pattern):
+                matching.append(schema)
+                break
+    if matching:
+        return max(matching, key=lambda s: s.priority)
+    try:
+        content = file_path.read_text()[:1000]
+        if content.strip().startswith("FROM "):
+            return registry.schemas.get("dockerfile")
+        if "apiVersion:" in content and "kind:" in content:
+            if "Deployment" in content:
+                return registry.schemas.get("kubernetes-deployment")
+        if "version:" in content and "services:" in content:
+            return registry.schemas.get("docker-compose")
+        if content.strip().startswith("on:") or "jobs:" in content:
+            return registry.schemas.get("github-workflow")
+    except Exception:
+        pass
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50_000, help="Files in the synthetic tree")
+    args = parser.parse_args()
+
+    registry = SchemaRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        paths = build_tree(Path(tmp), args.files)
+        print(f"built {len(paths)} files in {time.perf_counter() - t0:.1f}s\n")
+
+        # Warm the page cache so both passes read from memory.
+        for path in paths:
+            path.stat()
+
+        t0 = time.perf_counter()
+        legacy = [legacy_detect(registry, p) for p in paths]
+        legacy_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        indexed = [registry.detect_format(p) for p in paths]
+        indexed_s = time.perf_counter() - t0
+
+    mismatches = sum(a is not b for a, b in zip(legacy, indexed))
+    counts = Counter(s.name if s else "-" for s in indexed)
+
+    print(f"{'mode':<10}{'total s':>10}{'us/file':>10}")
+    for name, seconds in (("legacy", legacy_s), ("indexed", indexed_s)):
+        print(f"{name:<10}{seconds:>10.2f}{seconds / len(paths) * 1e6:>10.1f}")
+    print(f"\nspeedup: {legacy_s / indexed_s:.1f}x, mismatches: {mismatches}")
+    print("detected: " + ", ".join(f"{k}={v}" for k, v in counts.most_common()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the OptimizedSemanticMatcher search indexes on synthetic
+embeddings (CPU only, no model needed).
+
+Generates a clustered phrase bank of ``--size`` unit vectors and perturbed
+queries, then compares:
+
+* legacy: ``np.vstack`` of all embeddings plus the per-query normalisation of
+  the whole matrix that ``_cosine_similarity`` does
+* exact: pre-normalised contiguous float32 store, one ``matrix @ query``
+* int8: int8 scan, top ``k * 8`` rescored in float32
+* ivf: k-means inverted file for several ``nprobe`` values
+
+It reports query latency, recall@k against the exact search, index build
+time and memory. It also times adding phrases one at a time: legacy
+re-stacks the matrix before the next query, while the store appends in
+place.
+
+Usage:
+    PYTHONPATH=src python3 benchmarks/semantic_index_benchmark.py [--size 200000] [--dim 384]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nlp2cmd.generation.semantic_matcher_optimized import OptimizedSemanticMatcher
+from nlp2cmd.generation.vector_index import EmbeddingStore, ExactIndex, IVFIndex, Int8Index, normalize_rows
+
+
+def synthetic(size: int, dim: int, queries: int, seed: int) -> tuple:
+    rng = np.random.default_rng(seed)
+    clusters = max(16, size // 200)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    bank = centers[rng.integers(clusters, size=size)] + 0.9 * rng.normal(size=(size, dim)).astype(np.float32)
+    picks = rng.integers(size, size=queries)
+    query_vectors = bank[picks] + 0.7 * rng.normal(size=(queries, dim)).astype(np.float32)
+    return bank, query_vectors
+
+
+def time_queries(search: Callable[[np.ndarray], np.ndarray], queries: np.ndarray) -> tuple:
+    samples: List[float] = []
+    results = []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(search(q))
+        samples.append((time.perf_counter() - t0) * 1000)
+    return results, samples
+
+
+def recall(results: List[np.ndarray], reference: List[np.ndarray]) -> float:
+    hits = sum(len(set(r.tolist()) & set(e.tolist())) for r, e in zip(results, reference))
+    return hits / sum(len(e) for e in reference)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200000, help="Phrases in the bank")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query (recall@k)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bank, queries = synthetic(args.size, args.dim, args.queries, args.seed)
+    rows: List[Dict[str, Any]] = []
+
+    # Legacy: list of embeddings, vstack on first use, normalise per query.
+    embeddings = list(bank)
+    t0 = time.perf_counter()
+    legacy_matrix = np.vstack(embeddings)
+    legacy_build = (time.perf_counter() - t0) * 1000
+
+    def legacy_search(q: np.ndarray) -> np.ndarray:
+        sims = OptimizedSemanticMatcher._cosine_similarity(q, legacy_matrix)
+        return np.argsort(sims)[::-1][: args.k]
+
+    legacy_results, samples = time_queries(legacy_search, queries)
+    rows.append({"name": "legacy", "samples": samples, "results": legacy_results,
+                 "build_ms": legacy_build, "mb": legacy_matrix.nbytes / 1e6})
+
+    store = EmbeddingStore()
+    t0 = time.perf_counter()
+    store.extend(bank)
+    store_build = (time.perf_counter() - t0) * 1000
+    unit_queries = normalize_rows(queries)
+
+    exact = ExactIndex(store)
+    exact_results, samples = time_queries(lambda q: exact.search(q, args.k)[0], unit_queries)
+    rows.append({"name": "exact", "samples": samples, "results": exact_results,
+                 "build_ms": store_build, "mb": store.matrix.nbytes / 1e6})
+
+    int8 = Int8Index(store)
+    t0 = time.perf_counter()
+    int8.search(unit_queries[0], 1)
+    build = (time.perf_counter() - t0) * 1000
+    results, samples = time_queries(lambda q: int8.search(q, args.k)[0], unit_queries)
+    rows.append({"name": "int8", "samples": samples, "results": results, "build_ms": build,
+                 "mb": int8.nbytes / 1e6})
+
+    ivf = IVFIndex(store)
+    t0 = time.perf_counter()
+    ivf.build()
+    build = (time.perf_counter() - t0) * 1000
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        results, samples = time_queries(lambda q: ivf.search(q, args.k)[0], unit_queries)
+        rows.append({"name": f"ivf/{nprobe}", "samples": samples, "results": results, "build_ms": build,
+                     "mb": store.matrix.nbytes / 1e6})
+
+    print(f"{args.size} x {args.dim} embeddings, {args.queries} queries, k={args.k}, "
+          f"ivf nlist={len(ivf.centroids)}")
+    print(f"{'index':<10}{'p50 ms':>9}{'p99 ms':>9}{'recall@k':>10}{'build ms':>10}{'MB':>8}")
+    for r in rows:
+        p99 = sorted(r["samples"])[int(0.99 * (len(r["samples"]) - 1))]
+        print(f"{r['name']:<10}{statistics.median(r['samples']):>9.2f}{p99:>9.2f}"
+              f"{recall(r['results'], exact_results):>10.3f}{r['build_ms']:>10.0f}{r['mb']:>8.1f}")
+
+    # Incremental adds, each followed by a query.
+    extra = bank[:500]
+    t0 = time.perf_counter()
+    for row in extra:
+        embeddings.append(row)
+        legacy_matrix = np.vstack(embeddings)
+    legacy_add = (time.perf_counter() - t0) / len(extra) * 1000
+    t0 = time.perf_counter()
+    for row in extra:
+        store.append(row)
+        _ = store.matrix
+    store_add = (time.perf_counter() - t0) / len(extra) * 1000
+    print(f"\nadd one phrase: legacy re-stack {legacy_add:.2f} ms, store append {store_add:.4f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
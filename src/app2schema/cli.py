@@ -45,6 +45,19 @@ from app2schema.extract import extract_appspec_to_file, extract_schema_to_file
 )
 @click.option("--no-validate", is_flag=True)
 @click.option("--no-discover", is_flag=True)
+@click.option("--workers", type=int, default=0, help="Process pool size for Python packages")
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Per-file content-hash cache for Python package extraction",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-extract files changed since the last export (uses --cache or <out>.cache.json)",
+)
 def main(
     target: str,
     source_type: str,
@@ -54,7 +67,11 @@ def main(
     merge: bool,
     no_validate: bool,
     no_discover: bool,
+    workers: int,
+    cache_path: Path | None,
+    incremental: bool,
 ) -> None:
+    cache_kwargs = {"workers": workers, "cache_path": cache_path, "incremental": incremental}
     if out_format.lower() == "dynamic":
         written = extract_schema_to_file(
             target,
@@ -64,6 +81,7 @@ def main(
             raw=raw,
             validate=not no_validate,
             merge=merge,
+            **cache_kwargs,
         )
     else:
         if raw:
@@ -75,6 +93,7 @@ def main(
             discover_openapi=not no_discover,
             validate=not no_validate,
             merge=merge,
+            **cache_kwargs,
         )
     click.echo(str(written))
 
@@ -28,6 +28,12 @@ from nlp2cmd.schema_extraction import (
     CommandSchema,
 )
 
+from app2schema.package import (
+    PackageExtractionStats,
+    PythonExtractionCache,
+    iter_python_package_schemas,
+)
+
 
 SourceType = Literal[
     "auto",
@@ -625,7 +631,13 @@ def extract_schema(
     source_type: SourceType = "auto",
     discover_openapi: bool = True,
     http_client: Optional[httpx.Client] = None,
+    workers: int = 0,
+    cache_path: Optional[Union[str, Path]] = None,
+    incremental: bool = False,
+    max_files: Optional[int] = None,
 ) -> App2SchemaResult:
+    if incremental and cache_path is None:
+        raise ValueError("incremental extraction requires cache_path")
     target_str = str(target)
 
     openapi_extractor: Optional[OpenAPISchemaExtractor] = None
@@ -640,27 +652,28 @@ def extract_schema(
             openapi_extractor = OpenAPISchemaExtractor(http_client=http_client)
         return openapi_extractor
 
-    def extract_python_package(dir_path: Path, max_files: int = 100) -> App2SchemaResult:
-        py_files = [p for p in sorted(dir_path.rglob("*.py")) if "__pycache__" not in p.parts]
-        truncated = False
-        if len(py_files) > max_files:
-            py_files = py_files[:max_files]
-            truncated = True
-
-        schemas: list[ExtractedSchema] = []
-        for p in py_files:
-            try:
-                schemas.append(python_extractor.extract_from_file(p))
-            except Exception:
-                continue
+    def extract_python_package(dir_path: Path) -> App2SchemaResult:
+        cache = PythonExtractionCache.load(cache_path) if cache_path is not None else None
+        stats = PackageExtractionStats()
+        schemas = list(
+            iter_python_package_schemas(
+                dir_path,
+                workers=workers,
+                cache=cache,
+                incremental=incremental,
+                max_files=max_files,
+                stats=stats,
+            )
+        )
+        if cache is not None:
+            cache.save()
 
         return App2SchemaResult(
             schemas=schemas,
             detected_type="python_package",
             metadata={
                 "target": str(dir_path),
-                "python_files": len(py_files),
-                "truncated": truncated,
+                **stats.to_dict(),
             },
         )
 
@@ -819,6 +832,11 @@ def extract_schema(
     raise ValueError(f"Unsupported source_type: {source_type}")
 
 
+def default_cache_path(out_path: Union[str, Path]) -> Path:
+    out_path = Path(out_path)
+    return out_path.with_name(out_path.name + ".cache.json")
+
+
 def extract_appspec_to_file(
     target: Union[str, Path],
     out_path: Union[str, Path],
@@ -827,11 +845,19 @@ def extract_appspec_to_file(
     discover_openapi: bool = True,
     validate: bool = True,
     merge: bool = False,
+    workers: int = 0,
+    cache_path: Optional[Union[str, Path]] = None,
+    incremental: bool = False,
 ) -> Path:
+    if incremental and cache_path is None:
+        cache_path = default_cache_path(out_path)
     result = extract_schema(
         target,
         source_type=source_type,
         discover_openapi=discover_openapi,
+        workers=workers,
+        cache_path=cache_path,
+        incremental=incremental,
     )
 
     out_path = Path(out_path)
@@ -897,11 +923,19 @@ def extract_schema_to_file(
     raw: bool = False,
     validate: bool = True,
     merge: bool = False,
+    workers: int = 0,
+    cache_path: Optional[Union[str, Path]] = None,
+    incremental: bool = False,
 ) -> Path:
+    if incremental and cache_path is None:
+        cache_path = default_cache_path(out_path)
     result = extract_schema(
         target,
         source_type=source_type,
         discover_openapi=discover_openapi,
+        workers=workers,
+        cache_path=cache_path,
+        incremental=incremental,
     )
 
     out_path = Path(out_path)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from nlp2cmd.schema_extraction import (
+    CommandParameter,
+    CommandSchema,
+    ExtractedSchema,
+    PythonCodeExtractor,
+)
+
+
+CACHE_FORMAT = "app2schema.python_cache"
+CACHE_VERSION = 1
+
+_SKIP_DIRS = {"__pycache__", ".git", ".hg", ".svn", ".tox", ".venv", "node_modules"}
+
+
+def iter_python_files(dir_path: Path) -> Iterator[Path]:
+    """Yield ``*.py`` files under ``dir_path`` in a stable order without listing the whole tree."""
+    for root, dirs, files in os.walk(dir_path):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS)
+        for name in sorted(files):
+            if name.endswith(".py"):
+                yield Path(root) / name
+
+
+def file_content_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def schema_to_dict(schema: ExtractedSchema) -> dict[str, Any]:
+    return asdict(schema)
+
+
+def schema_from_dict(data: dict[str, Any], *, source: Optional[str] = None) -> ExtractedSchema:
+    commands = []
+    for cmd in data.get("commands") or []:
+        params = [CommandParameter(**p) for p in cmd.get("parameters") or []]
+        commands.append(CommandSchema(**{**cmd, "parameters": params}))
+    return ExtractedSchema(
+        source=source if source is not None else str(data.get("source") or ""),
+        source_type=str(data.get("source_type") or "python_code"),
+        commands=commands,
+        metadata=dict(data.get("metadata") or {}),
+    )
+
+
+def _extract_python_file(path_str: str) -> Optional[ExtractedSchema]:
+    # Runs in worker processes; must stay a picklable module-level function.
+    try:
+        return PythonCodeExtractor().extract_from_file(path_str)
+    except Exception:
+        return None
+
+
+@dataclass
+class _CacheEntry:
+    sha256: str
+    mtime_ns: int
+    size: int
+    schema: Optional[dict[str, Any]]
+
+
+@dataclass
+class PythonExtractionCache:
+    """Per-file content-hash cache of ``PythonCodeExtractor`` results.
+
+    Entries are keyed by the path relative to the extracted package root, so the
+    cache stays valid when the package is moved or checked out elsewhere.
+    """
+
+    path: Optional[Path] = None
+    entries: dict[str, _CacheEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PythonExtractionCache":
+        path = Path(path)
+        cache = cls(path=path)
+        if not path.exists():
+            return cache
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return cache
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return cache
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for rel, raw in (data.get("files") or {}).items():
+            try:
+                cache.entries[rel] = _CacheEntry(
+                    sha256=str(raw["sha256"]),
+                    mtime_ns=int(raw["mtime_ns"]),
+                    size=int(raw["size"]),
+                    schema=raw.get("schema"),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cache
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("No cache path configured")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": CACHE_FORMAT,
+            "version": CACHE_VERSION,
+            "files": {rel: asdict(entry) for rel, entry in sorted(self.entries.items())},
+        }
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp, target)
+        return target
+
+
+@dataclass
+class PackageExtractionStats:
+    python_files: int = 0
+    extracted: int = 0
+    cached: int = 0
+    failed: int = 0
+    removed: int = 0
+    truncated: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def iter_python_package_schemas(
+    dir_path: Path,
+    *,
+    workers: int = 0,
+    cache: Optional[PythonExtractionCache] = None,
+    incremental: bool = False,
+    max_files: Optional[int] = None,
+    stats: Optional[PackageExtractionStats] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[ExtractedSchema]:
+    """Stream ``ExtractedSchema`` objects for every Python file under ``dir_path``.
+
+    Files are discovered lazily and results are yielded in discovery order.
+    With ``workers > 1`` parsing runs on a process pool, keeping at most a small
+    window of files in flight. When a ``cache`` is supplied, files whose content
+    hash is unchanged are served from it; with ``incremental=True`` the hash is
+    only computed for files whose mtime or size differ from the cached entry.
+    Entries for files that disappeared are dropped from the cache at the end.
+    """
+    stats = stats if stats is not None else PackageExtractionStats()
+    seen: set[str] = set()
+    own_executor = executor is None and workers > 1
+    pool: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if own_executor else executor
+    window = max(1, workers) * 4
+    # (relative path, content hash, stat result, schema or future, served from cache)
+    pending: deque[tuple[str, Optional[str], Any, Any, bool]] = deque()
+
+    def resolve(item: tuple[str, Optional[str], Any, Any, bool]) -> Optional[ExtractedSchema]:
+        rel, digest, st, result, from_cache = item
+        if from_cache:
+            return result
+        schema = result.result() if isinstance(result, Future) else result
+        if schema is None:
+            stats.failed += 1
+        else:
+            stats.extracted += 1
+        if cache is not None and digest is not None:
+            cache.entries[rel] = _CacheEntry(
+                sha256=digest,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                schema=schema_to_dict(schema) if schema is not None else None,
+            )
+        return schema
+
+    try:
+        for path in iter_python_files(dir_path):
+            if max_files is not None and stats.python_files >= max_files:
+                stats.truncated = True
+                break
+            stats.python_files += 1
+            rel = path.relative_to(dir_path).as_posix()
+            seen.add(rel)
+
+            digest: Optional[str] = None
+            st = None
+            entry: Optional[_CacheEntry] = None
+            unchanged = False
+            if cache is not None:
+                entry = cache.entries.get(rel)
+                try:
+                    st = path.stat()
+                    unchanged = (
+                        incremental
+                        and entry is not None
+                        and entry.mtime_ns == st.st_mtime_ns
+                        and entry.size == st.st_size
+                    )
+                    if not unchanged:
+                        digest = file_content_hash(path)
+                        unchanged = entry is not None and entry.sha256 == digest
+                except OSError:
+                    digest, unchanged = None, False
+
+            if unchanged and entry is not None:
+                stats.cached += 1
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                if entry.schema is not None:
+                    pending.append((rel, None, st, schema_from_dict(entry.schema, source=str(path)), True))
+            elif pool is not None:
+                pending.append((rel, digest, st, pool.submit(_extract_python_file, str(path)), False))
+            else:
+                pending.append((rel, digest, st, _extract_python_file(str(path)), False))
+
+            while pending and (
+                len(pending) >= window
+                or not isinstance(pending[0][3], Future)
+                or pending[0][3].done()
+            ):
+                schema = resolve(pending.popleft())
+                if schema is not None:
+                    yield schema
+
+        while pending:
+            schema = resolve(pending.popleft())
+            if schema is not None:
+                yield schema
+    finally:
+        for item in pending:
+            if isinstance(item[3], Future):
+                item[3].cancel()
+        if own_executor and pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    if cache is not None:
+        for rel in list(cache.entries):
+            if rel not in seen and not stats.truncated:
+                del cache.entries[rel]
+                stats.removed += 1
@@ -18,72 +18,8 @@ Key principle: LLM plans. Code executes. System controls.
 __version__ = "0.2.0"
 __author__ = "NLP2CMD Team"
 
-# Import core classes with fallback
-try:
-    from nlp2cmd.core import NLP2CMD, TransformResult
-except ImportError:
-    # Fallback if TOON integration causes import issues
-    NLP2CMD = None
-    TransformResult = None
-from nlp2cmd.adapters import (
-    BaseDSLAdapter,
-    AppSpecAdapter,
-    SQLAdapter,
-    ShellAdapter,
-    DockerAdapter,
-    DQLAdapter,
-    KubernetesAdapter,
-    BrowserAdapter,
-    SQLSafetyPolicy,
-    ShellSafetyPolicy,
-    DockerSafetyPolicy,
-    KubernetesSafetyPolicy,
-)
-from nlp2cmd.schemas import SchemaRegistry, FileFormatSchema
-from nlp2cmd.feedback import FeedbackAnalyzer, FeedbackResult, FeedbackType
-from nlp2cmd.environment import EnvironmentAnalyzer
-from nlp2cmd.validators import BaseValidator
-
-# New components (LLM as Planner architecture)
-from nlp2cmd.router import (
-    DecisionRouter,
-    RoutingDecision,
-    RoutingResult,
-    RouterConfig,
-)
-
-from nlp2cmd.registry import (
-    ActionRegistry,
-    ActionSchema,
-    ActionResult,
-    ActionHandler,
-    ParamSchema,
-    ParamType,
-    get_registry,
-)
-
-from nlp2cmd.executor import (
-    PlanExecutor,
-    PlanValidator,
-    ExecutionPlan,
-    ExecutionContext,
-    ExecutionResult,
-    PlanStep,
-    StepResult,
-    StepStatus,
-)
-
-from nlp2cmd.planner import (
-    LLMPlanner,
-    PlannerConfig,
-    PlanningResult,
-)
-
-from nlp2cmd.aggregator import (
-    ResultAggregator,
-    AggregatedResult,
-    OutputFormat,
-)
+import importlib
+from typing import Any
 
 __all__ = [
     # Core
@@ -144,3 +80,87 @@ __all__ = [
     "AggregatedResult",
     "OutputFormat",
 ]
+
+
+# Subsystems are imported on first attribute access (PEP 562), so
+# ``import nlp2cmd`` and ``from nlp2cmd.generation... import ...`` do not pay
+# for the whole package graph.
+_LAZY_EXPORTS: dict[str, str] = {
+    # Core
+    "NLP2CMD": "nlp2cmd.core",
+    "TransformResult": "nlp2cmd.core",
+    # Adapters
+    "BaseDSLAdapter": "nlp2cmd.adapters",
+    "AppSpecAdapter": "nlp2cmd.adapters",
+    "SQLAdapter": "nlp2cmd.adapters",
+    "ShellAdapter": "nlp2cmd.adapters",
+    "DockerAdapter": "nlp2cmd.adapters",
+    "DQLAdapter": "nlp2cmd.adapters",
+    "KubernetesAdapter": "nlp2cmd.adapters",
+    "BrowserAdapter": "nlp2cmd.adapters",
+    # Safety Policies
+    "SQLSafetyPolicy": "nlp2cmd.adapters",
+    "ShellSafetyPolicy": "nlp2cmd.adapters",
+    "DockerSafetyPolicy": "nlp2cmd.adapters",
+    "KubernetesSafetyPolicy": "nlp2cmd.adapters",
+    # Schemas
+    "SchemaRegistry": "nlp2cmd.schemas",
+    "FileFormatSchema": "nlp2cmd.schemas",
+    # Feedback
+    "FeedbackAnalyzer": "nlp2cmd.feedback",
+    "FeedbackResult": "nlp2cmd.feedback",
+    "FeedbackType": "nlp2cmd.feedback",
+    # Environment
+    "EnvironmentAnalyzer": "nlp2cmd.environment",
+    # Validators
+    "BaseValidator": "nlp2cmd.validators",
+    # Router (new)
+    "DecisionRouter": "nlp2cmd.router",
+    "RoutingDecision": "nlp2cmd.router",
+    "RoutingResult": "nlp2cmd.router",
+    "RouterConfig": "nlp2cmd.router",
+    # Registry (new)
+    "ActionRegistry": "nlp2cmd.registry",
+    "ActionSchema": "nlp2cmd.registry",
+    "ActionResult": "nlp2cmd.registry",
+    "ActionHandler": "nlp2cmd.registry",
+    "ParamSchema": "nlp2cmd.registry",
+    "ParamType": "nlp2cmd.registry",
+    "get_registry": "nlp2cmd.registry",
+    # Executor (new)
+    "PlanExecutor": "nlp2cmd.executor",
+    "PlanValidator": "nlp2cmd.executor",
+    "ExecutionPlan": "nlp2cmd.executor",
+    "ExecutionContext": "nlp2cmd.executor",
+    "ExecutionResult": "nlp2cmd.executor",
+    "PlanStep": "nlp2cmd.executor",
+    "StepResult": "nlp2cmd.executor",
+    "StepStatus": "nlp2cmd.executor",
+    # Planner (new)
+    "LLMPlanner": "nlp2cmd.planner",
+    "PlannerConfig": "nlp2cmd.planner",
+    "PlanningResult": "nlp2cmd.planner",
+    # Aggregator (new)
+    "ResultAggregator": "nlp2cmd.aggregator",
+    "AggregatedResult": "nlp2cmd.aggregator",
+    "OutputFormat": "nlp2cmd.aggregator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        if module_name != "nlp2cmd.core":
+            raise
+        # Fallback if TOON integration causes import issues
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals().keys()) + list(_LAZY_EXPORTS.keys()))
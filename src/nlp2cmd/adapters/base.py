@@ -10,6 +10,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Mapping, Optional
 
+from nlp2cmd.adapters.safety import compile_patterns, policy_fingerprint, verdict_cache
+
 
 @dataclass
 class SafetyPolicy:
@@ -141,22 +143,25 @@ class BaseDSLAdapter(ABC):
         if not policy.enabled:
             return {"allowed": True}
 
-        # Check blocked patterns
+        key = (type(self), policy_fingerprint(policy), command)
+        return verdict_cache.get_or_compute(key, lambda: self._check_safety_patterns(command, policy))
+
+    @staticmethod
+    def _check_safety_patterns(command: str, policy: SafetyPolicy) -> dict[str, Any]:
         command_lower = command.lower()
-        for pattern in policy.blocked_patterns:
-            if pattern.lower() in command_lower:
-                return {
-                    "allowed": False,
-                    "reason": f"Command contains blocked pattern: {pattern}",
-                    "alternatives": [],
-                }
+
+        # Check blocked patterns
+        blocked = compile_patterns(tuple(policy.blocked_patterns)).first_match(command_lower)
+        if blocked is not None:
+            return {
+                "allowed": False,
+                "reason": f"Command contains blocked pattern: {blocked}",
+                "alternatives": [],
+            }
 
         # Check confirmation requirements
-        requires_confirmation = False
-        for pattern in policy.require_confirmation_for:
-            if pattern.lower() in command_lower:
-                requires_confirmation = True
-                break
+        confirmation = compile_patterns(tuple(policy.require_confirmation_for))
+        requires_confirmation = confirmation.first_match(command_lower) is not None
 
         return {
             "allowed": True,
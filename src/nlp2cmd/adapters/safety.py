@@ -0,0 +1,266 @@
+"""
+Compiled safety rules for adapter ``check_safety`` calls.
+
+A safety policy is turned into a rule object once: lowered pattern tuples,
+the pipe-to-shell needles and a prefilter for blocked directories. The object
+is cached by the policy's fingerprint, so a policy edited in place compiles
+again. Checking a command is then a single pass over those rules. The
+expensive ``shlex.split`` runs only if some blocked directory could appear in
+the command at all.
+
+Verdicts are memoised in a bounded LRU keyed by
+``(adapter class, policy fingerprint, command)``. ``NLP2CMD.transform``
+checks every generated command, and the same commands come up repeatedly.
+
+Environment:
+    NLP2CMD_SAFETY_CACHE_SIZE: Cached verdicts (default 4096, ``0`` disables)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import re
+import shlex
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_VERDICT_CACHE_SIZE = 4096
+
+SHELL_PIPES = ("| sh", "| bash", "| zsh", "|sh", "|bash")
+
+# Characters that shlex drops while joining a token (quotes, escapes).
+_SHLEX_STRIP = str.maketrans("", "", "'\"\\")
+
+# A token equal to "/" (or ``name=/``) in the quote-stripped command.
+_ROOT_ARG_RE = re.compile(r"(?:^|[\s=])/(?=\s|$)")
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def _policy_field_names(policy_type: type) -> tuple[str, ...]:
+    return tuple(f.name for f in dataclasses.fields(policy_type))
+
+
+def policy_fingerprint(policy: Any) -> Hashable:
+    """Hashable snapshot of every field of a safety policy dataclass."""
+    names = _policy_field_names(type(policy))
+    # Fast path for the usual flat fields (scalars, lists of strings).
+    values: list[Any] = [type(policy)]
+    for name in names:
+        value = getattr(policy, name)
+        if type(value) is list:
+            value = tuple(value)
+        elif type(value) is dict:
+            value = tuple(value.items())
+        values.append(value)
+    fingerprint = tuple(values)
+    try:
+        hash(fingerprint)
+    except TypeError:
+        return (type(policy),) + tuple(_freeze(getattr(policy, name)) for name in names)
+    return fingerprint
+
+
+class PatternRules:
+    """Case-insensitive substring patterns with their lowered forms precomputed."""
+
+    __slots__ = ("patterns",)
+
+    def __init__(self, patterns: tuple[str, ...]):
+        self.patterns = tuple((p, p.lower()) for p in patterns)
+
+    def first_match(self, command_lower: str) -> Optional[str]:
+        """The first pattern (in policy order) contained in the command."""
+        for original, lowered in self.patterns:
+            if lowered in command_lower:
+                return original
+        return None
+
+
+@lru_cache(maxsize=256)
+def compile_patterns(patterns: tuple[str, ...]) -> PatternRules:
+    return PatternRules(patterns)
+
+
+class ShellSafetyRules:
+    """Compiled form of a ``ShellSafetyPolicy``."""
+
+    def __init__(
+        self,
+        blocked_commands: tuple[str, ...],
+        require_confirmation_for: tuple[str, ...],
+        allow_sudo: bool,
+        allow_pipe_to_shell: bool,
+        blocked_directories: tuple[str, ...],
+    ):
+        self.blocked = compile_patterns(blocked_commands)
+        self.confirmation = compile_patterns(require_confirmation_for)
+        self.allow_sudo = allow_sudo
+        self.pipes = () if allow_pipe_to_shell else SHELL_PIPES
+        self.blocked_directories = blocked_directories
+
+    @classmethod
+    def from_policy(cls, policy: Any) -> "ShellSafetyRules":
+        return _compile_shell_rules(
+            tuple(policy.blocked_commands),
+            tuple(policy.require_confirmation_for),
+            bool(policy.allow_sudo),
+            bool(policy.allow_pipe_to_shell),
+            tuple(policy.blocked_directories),
+        )
+
+    def _candidate_directories(self, command: str) -> list[str]:
+        """Blocked directories that some argument of ``command`` could name."""
+        if not self.blocked_directories:
+            return []
+        stripped = command.translate(_SHLEX_STRIP)
+        candidates = []
+        for blocked_dir in self.blocked_directories:
+            if blocked_dir != blocked_dir.translate(_SHLEX_STRIP):
+                candidates.append(blocked_dir)
+            elif blocked_dir == "/":
+                if _ROOT_ARG_RE.search(stripped):
+                    candidates.append(blocked_dir)
+            elif blocked_dir in stripped:
+                candidates.append(blocked_dir)
+        return candidates
+
+    def check(self, command: str) -> dict[str, Any]:
+        command_lower = command.lower()
+
+        blocked = self.blocked.first_match(command_lower)
+        if blocked is not None:
+            return {
+                "allowed": False,
+                "reason": f"Command contains blocked pattern: {blocked}",
+            }
+
+        if not self.allow_sudo and command.strip().startswith("sudo"):
+            return {
+                "allowed": False,
+                "reason": "sudo is not allowed by safety policy",
+            }
+
+        for dp in self.pipes:
+            if dp in command:
+                return {
+                    "allowed": False,
+                    "reason": "Piping to shell is not allowed",
+                }
+
+        candidates = self._candidate_directories(command)
+        if candidates:
+            try:
+                argv = shlex.split(command)
+            except ValueError:
+                argv = command.split()
+            values = [arg.split("=", 1)[1] if "=" in arg else arg for arg in argv]
+
+            for blocked_dir in candidates:
+                for value in values:
+                    if blocked_dir == "/":
+                        hit = value == "/"
+                    else:
+                        hit = value == blocked_dir or value.startswith(blocked_dir + "/")
+                    if hit:
+                        return {
+                            "allowed": False,
+                            "reason": f"Operations on {blocked_dir} are not allowed",
+                        }
+
+        return {
+            "allowed": True,
+            "requires_confirmation": self.confirmation.first_match(command_lower) is not None,
+        }
+
+
+@lru_cache(maxsize=64)
+def _compile_shell_rules(
+    blocked_commands: tuple[str, ...],
+    require_confirmation_for: tuple[str, ...],
+    allow_sudo: bool,
+    allow_pipe_to_shell: bool,
+    blocked_directories: tuple[str, ...],
+) -> ShellSafetyRules:
+    return ShellSafetyRules(
+        blocked_commands,
+        require_confirmation_for,
+        allow_sudo,
+        allow_pipe_to_shell,
+        blocked_directories,
+    )
+
+
+def _env_cache_size() -> int:
+    raw = str(os.environ.get("NLP2CMD_SAFETY_CACHE_SIZE") or "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_VERDICT_CACHE_SIZE
+    except ValueError:
+        return DEFAULT_VERDICT_CACHE_SIZE
+
+
+def _copy_verdict(verdict: dict[str, Any]) -> dict[str, Any]:
+    return {k: list(v) if isinstance(v, list) else v for k, v in verdict.items()}
+
+
+class VerdictCache:
+    """Bounded LRU of safety verdicts; callers always get their own copy."""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = _env_cache_size() if maxsize is None else maxsize
+        self._entries: OrderedDict[Hashable, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        if self.maxsize <= 0:
+            return compute()
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_verdict(verdict)
+        verdict = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _copy_verdict(verdict)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return verdict
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verdict_cache = VerdictCache()
+
+
+__all__ = [
+    "PatternRules",
+    "ShellSafetyRules",
+    "VerdictCache",
+    "compile_patterns",
+    "policy_fingerprint",
+    "verdict_cache",
+]
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from nlp2cmd.adapters.base import AdapterConfig, BaseDSLAdapter, SafetyPolicy
+from nlp2cmd.adapters.safety import ShellSafetyRules, policy_fingerprint, verdict_cache
 
 
 @dataclass
@@ -2157,69 +2158,8 @@ class ShellAdapter(BaseDSLAdapter):
         """Check shell command against safety policy."""
         policy: ShellSafetyPolicy = self.config.safety_policy  # type: ignore
 
-        # Check blocked commands
-        command_lower = command.lower()
-        for blocked in policy.blocked_commands:
-            if blocked.lower() in command_lower:
-                return {
-                    "allowed": False,
-                    "reason": f"Command contains blocked pattern: {blocked}",
-                }
-
-        # Check sudo
-        if not policy.allow_sudo and command.strip().startswith("sudo"):
-            return {
-                "allowed": False,
-                "reason": "sudo is not allowed by safety policy",
-            }
-
-        # Check pipe to shell
-        if not policy.allow_pipe_to_shell:
-            dangerous_pipes = ["| sh", "| bash", "| zsh", "|sh", "|bash"]
-            for dp in dangerous_pipes:
-                if dp in command:
-                    return {
-                        "allowed": False,
-                        "reason": "Piping to shell is not allowed",
-                    }
-
-        # Check blocked directories
-        try:
-            argv = shlex.split(command)
-        except ValueError:
-            argv = command.split()
-
-        for blocked_dir in policy.blocked_directories:
-            for arg in argv:
-                value = arg
-                if "=" in arg:
-                    value = arg.split("=", 1)[1]
-
-                if blocked_dir == "/":
-                    if value == "/":
-                        return {
-                            "allowed": False,
-                            "reason": f"Operations on {blocked_dir} are not allowed",
-                        }
-                    continue
-
-                if value == blocked_dir or value.startswith(blocked_dir + "/"):
-                    return {
-                        "allowed": False,
-                        "reason": f"Operations on {blocked_dir} are not allowed",
-                    }
-
-        # Check commands requiring confirmation
-        requires_confirmation = False
-        for pattern in policy.require_confirmation_for:
-            if pattern.lower() in command_lower:
-                requires_confirmation = True
-                break
-
-        return {
-            "allowed": True,
-            "requires_confirmation": requires_confirmation,
-        }
+        key = (type(self), policy_fingerprint(policy), command)
+        return verdict_cache.get_or_compute(key, lambda: ShellSafetyRules.from_policy(policy).check(command))
 
     def _generate_cat(self, entities: dict[str, Any]) -> str:
         """Generate cat command for viewing file contents."""
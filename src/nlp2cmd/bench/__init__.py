@@ -0,0 +1,35 @@
+"""Reproducible latency/throughput benchmarks for NLP2CMD."""
+
+from .gate import (
+    DEFAULT_TOLERANCES,
+    GateResult,
+    MetricDelta,
+    Tolerance,
+    compare_reports,
+    load_tolerances,
+)
+from .harness import (
+    TARGETS,
+    BenchCorpus,
+    BenchQuery,
+    load_corpus,
+    load_report,
+    run_benchmark,
+    save_report,
+)
+
+__all__ = [
+    "DEFAULT_TOLERANCES",
+    "GateResult",
+    "MetricDelta",
+    "Tolerance",
+    "compare_reports",
+    "load_tolerances",
+    "TARGETS",
+    "BenchCorpus",
+    "BenchQuery",
+    "load_corpus",
+    "load_report",
+    "run_benchmark",
+    "save_report",
+]
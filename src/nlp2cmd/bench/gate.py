@@ -0,0 +1,193 @@
+"""
+Regression gate for benchmark reports.
+
+``compare_reports(baseline, current)`` checks every target present in both
+reports against per-metric tolerances. Latency, cold start and RSS regress
+when they grow by more than the relative tolerance; throughput regresses when
+it drops by more than its tolerance; success rate is compared in absolute
+points.
+
+Tolerance keys are metric paths inside a target (``"warm.p95_ms"``) and may be
+qualified with a target name (``"hybrid.warm.p95_ms"``) to override one target.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """Allowed change for one metric."""
+
+    limit: float
+    higher_is_better: bool = False
+    absolute: bool = False
+
+
+DEFAULT_TOLERANCES: dict[str, Tolerance] = {
+    "warm.p50_ms": Tolerance(0.25),
+    "warm.p95_ms": Tolerance(0.30),
+    "warm.p99_ms": Tolerance(0.50),
+    "cold_start.total_ms": Tolerance(0.30),
+    "throughput.qps": Tolerance(0.20, higher_is_better=True),
+    "peak_rss_mb": Tolerance(0.15),
+    "success_rate": Tolerance(0.02, higher_is_better=True, absolute=True),
+}
+
+# Sub-threshold jitter on very fast targets is not a regression.
+MIN_LATENCY_DELTA_MS = 0.05
+
+
+@dataclass
+class MetricDelta:
+    """Comparison of one metric for one target."""
+
+    target: str
+    metric: str
+    baseline: float
+    current: float
+    tolerance: Tolerance
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change (absolute change for absolute tolerances)."""
+        if self.tolerance.absolute:
+            return self.current - self.baseline
+        if self.baseline == 0:
+            return 0.0
+        return (self.current - self.baseline) / self.baseline
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "metric": self.metric,
+            "baseline": self.baseline,
+            "current": self.current,
+            "change": round(self.change, 4),
+            "limit": self.tolerance.limit,
+            "regressed": self.regressed,
+        }
+
+
+@dataclass
+class GateResult:
+    """Outcome of comparing two benchmark reports."""
+
+    deltas: list[MetricDelta] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> list[MetricDelta]:
+        return [d for d in self.deltas if d.regressed]
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "passed": self.passed,
+            "warnings": list(self.warnings),
+            "deltas": [d.to_dict() for d in self.deltas],
+        }
+
+
+def _lookup(data: dict[str, Any], path: str) -> Optional[float]:
+    node: Any = data
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    if isinstance(node, bool) or not isinstance(node, (int, float)):
+        return None
+    return float(node)
+
+
+def _is_regression(metric: str, baseline: float, current: float, tol: Tolerance) -> bool:
+    if tol.absolute:
+        delta = baseline - current if tol.higher_is_better else current - baseline
+        return delta > tol.limit
+    if tol.higher_is_better:
+        return current < baseline * (1.0 - tol.limit)
+    if metric.endswith("_ms") and current - baseline <= MIN_LATENCY_DELTA_MS:
+        return False
+    return current > baseline * (1.0 + tol.limit)
+
+
+def load_tolerances(path: Union[str, Path]) -> dict[str, float]:
+    """Read a ``{"metric": limit}`` JSON file of tolerance overrides."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"Tolerances must be a JSON object: {path}")
+    return {str(k): float(v) for k, v in data.items()}
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerances: Optional[dict[str, float]] = None,
+) -> GateResult:
+    """
+    Compare two benchmark reports.
+
+    Args:
+        baseline: Report from the reference commit
+        current: Report from the commit under test
+        tolerances: Overrides for ``DEFAULT_TOLERANCES`` limits; keys may be
+            target-qualified (``"pipeline.warm.p95_ms"``)
+    """
+    overrides = dict(tolerances or {})
+    result = GateResult()
+
+    base_corpus = (baseline.get("corpus") or {}).get("sha256")
+    cur_corpus = (current.get("corpus") or {}).get("sha256")
+    if base_corpus != cur_corpus:
+        result.warnings.append("Reports use different corpora; latency numbers are not comparable")
+    for key in ("python", "platform"):
+        if baseline.get(key) != current.get(key):
+            result.warnings.append(f"{key} differs: {baseline.get(key)} -> {current.get(key)}")
+    base_workers = (baseline.get("config") or {}).get("workers")
+    cur_workers = (current.get("config") or {}).get("workers")
+    if base_workers != cur_workers:
+        result.warnings.append(f"workers differs: {base_workers} -> {cur_workers}; throughput is not comparable")
+
+    base_targets = baseline.get("targets") or {}
+    cur_targets = current.get("targets") or {}
+    for target in sorted(set(base_targets) - set(cur_targets)):
+        result.warnings.append(f"Target {target} missing from current report")
+
+    for target in sorted(set(base_targets) & set(cur_targets)):
+        for metric, default in DEFAULT_TOLERANCES.items():
+            limit = overrides.get(f"{target}.{metric}", overrides.get(metric))
+            tol = default if limit is None else replace(default, limit=limit)
+            base_value = _lookup(base_targets[target], metric)
+            cur_value = _lookup(cur_targets[target], metric)
+            if base_value is None or cur_value is None:
+                continue
+            result.deltas.append(
+                MetricDelta(
+                    target=target,
+                    metric=metric,
+                    baseline=base_value,
+                    current=cur_value,
+                    tolerance=tol,
+                    regressed=_is_regression(metric, base_value, cur_value, tol),
+                )
+            )
+
+    return result
+
+
+__all__ = [
+    "DEFAULT_TOLERANCES",
+    "GateResult",
+    "MetricDelta",
+    "Tolerance",
+    "compare_reports",
+    "load_tolerances",
+]
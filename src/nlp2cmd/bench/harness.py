@@ -0,0 +1,445 @@
+"""
+Latency and throughput harness for NLP2CMD.
+
+Runs a versioned query corpus through one or more targets and produces a JSON
+report that can be compared across commits (see ``nlp2cmd.bench.gate``).
+
+Targets:
+    pipeline:  ``RuleBasedPipeline.process``
+    transform: ``NLP2CMD.transform`` with the shell adapter and rule backend
+    hybrid:    ``HybridGenerator.generate`` with ``MockLLMClient`` as fallback,
+               so LLM network latency never enters the numbers
+
+Measurements per target:
+    cold_start:  import, init and first-query time in a fresh interpreter
+    warm:        p50/p95/p99 over ``iterations`` passes after one warm-up pass
+    throughput:  queries/s with N worker threads, one target instance each
+    peak_rss_mb: peak RSS of the cold-start interpreter after one corpus pass
+
+This module imports only the standard library at module level; targets are
+imported when they are built so cold-start timing covers them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+CORPUS_FORMAT = "nlp2cmd.bench_corpus"
+REPORT_FORMAT = "nlp2cmd.bench_report"
+REPORT_VERSION = 1
+
+TARGETS: tuple[str, ...] = ("pipeline", "transform", "hybrid")
+
+DEFAULT_ITERATIONS = 5
+DEFAULT_WORKERS = 4
+COLD_START_TIMEOUT = 300.0
+
+
+@dataclass(frozen=True)
+class BenchQuery:
+    """One corpus entry."""
+
+    id: str
+    text: str
+    lang: str
+    domain: Optional[str] = None
+    category: str = "single"
+
+
+@dataclass
+class BenchCorpus:
+    """A versioned list of benchmark queries."""
+
+    name: str
+    version: int
+    queries: list[BenchQuery] = field(default_factory=list)
+    sha256: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchCorpus":
+        if not isinstance(data, dict) or data.get("format") != CORPUS_FORMAT:
+            raise ValueError("Not a benchmark corpus")
+        queries = [
+            BenchQuery(
+                id=str(raw.get("id") or f"q{i + 1:03d}"),
+                text=str(raw["text"]),
+                lang=str(raw.get("lang") or "en"),
+                domain=raw.get("domain"),
+                category=str(raw.get("category") or "single"),
+            )
+            for i, raw in enumerate(data.get("queries") or [])
+            if isinstance(raw, dict) and raw.get("text")
+        ]
+        if not queries:
+            raise ValueError("Benchmark corpus has no queries")
+        canonical = json.dumps(
+            [[q.id, q.text, q.lang, q.domain, q.category] for q in queries],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return cls(
+            name=str(data.get("name") or "custom"),
+            version=int(data.get("version") or 1),
+            queries=queries,
+            sha256=hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        )
+
+    def summary(self) -> dict[str, Any]:
+        langs: dict[str, int] = {}
+        categories: dict[str, int] = {}
+        for q in self.queries:
+            langs[q.lang] = langs.get(q.lang, 0) + 1
+            categories[q.category] = categories.get(q.category, 0) + 1
+        return {
+            "name": self.name,
+            "version": self.version,
+            "sha256": self.sha256,
+            "queries": len(self.queries),
+            "langs": langs,
+            "categories": categories,
+        }
+
+
+def default_corpus_path() -> Path:
+    return Path(__file__).resolve().parent.parent / "data" / "bench_corpus.json"
+
+
+def load_corpus(path: Optional[Union[str, Path]] = None) -> BenchCorpus:
+    """Load a benchmark corpus (the bundled one by default)."""
+    path = Path(path) if path else default_corpus_path()
+    return BenchCorpus.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def build_target(name: str) -> Callable[[str], bool]:
+    """
+    Build a fresh target instance.
+
+    Returns a callable that processes one query and reports success.
+    """
+    if name == "pipeline":
+        from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+        pipeline = RuleBasedPipeline()
+        return lambda text: bool(pipeline.process(text).success)
+
+    if name == "transform":
+        from nlp2cmd.adapters import ShellAdapter
+        from nlp2cmd.core import NLP2CMD, RuleBasedBackend
+
+        adapter = ShellAdapter()
+        rules = {intent: list(cfg.get("patterns", [])) for intent, cfg in adapter.INTENTS.items()}
+        backend = RuleBasedBackend(rules=rules, config={"dsl": adapter.DSL_NAME})
+        nlp = NLP2CMD(adapter=adapter, nlp_backend=backend)
+        return lambda text: bool(nlp.transform(text).is_success)
+
+    if name == "hybrid":
+        import asyncio
+
+        from nlp2cmd.generation.hybrid import HybridGenerator
+        from nlp2cmd.generation.llm_simple import MockLLMClient
+        from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+        generator = HybridGenerator(RuleBasedPipeline(), llm_client=MockLLMClient())
+        # One loop per instance: instances are never shared between threads.
+        loop = asyncio.new_event_loop()
+        return lambda text: bool(loop.run_until_complete(generator.generate(text)).success)
+
+    raise ValueError(f"Unknown benchmark target: {name} (expected one of {', '.join(TARGETS)})")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(maxrss / divisor, 2)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    values = sorted(samples_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 4),
+        "p95_ms": round(percentile(values, 0.95), 4),
+        "p99_ms": round(percentile(values, 0.99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+    }
+
+
+def _safe_run(run: Callable[[str], bool], text: str) -> bool:
+    try:
+        return run(text)
+    except Exception:
+        return False
+
+
+def measure_warm(
+    run: Callable[[str], bool],
+    corpus: BenchCorpus,
+    iterations: int = DEFAULT_ITERATIONS,
+) -> dict[str, Any]:
+    """
+    Measure per-query latency after one untimed warm-up pass.
+
+    Returns the overall latency summary, per-category p50/p95, and the
+    success rate over unique queries.
+    """
+    successes = sum(_safe_run(run, q.text) for q in corpus.queries)
+
+    samples: list[float] = []
+    by_category: dict[str, list[float]] = {}
+    for _ in range(max(1, iterations)):
+        for q in corpus.queries:
+            start = time.perf_counter_ns()
+            _safe_run(run, q.text)
+            elapsed_ms = (time.perf_counter_ns() - start) / 1e6
+            samples.append(elapsed_ms)
+            by_category.setdefault(q.category, []).append(elapsed_ms)
+
+    warm = latency_summary(samples)
+    warm["by_category"] = {
+        cat: {k: v for k, v in latency_summary(vals).items() if k in ("p50_ms", "p95_ms")}
+        for cat, vals in sorted(by_category.items())
+    }
+    return {
+        "warm": warm,
+        "success_rate": round(successes / len(corpus.queries), 4),
+    }
+
+
+def measure_throughput(
+    target: str,
+    corpus: BenchCorpus,
+    workers: int = DEFAULT_WORKERS,
+    iterations: int = DEFAULT_ITERATIONS,
+) -> dict[str, Any]:
+    """
+    Measure queries/s with ``workers`` threads, each owning one target instance.
+
+    Instances are built and warmed before the clock starts. Threads share the
+    GIL, so this measures how the targets behave under concurrent load in one
+    process (lock contention, shared caches) rather than multi-core scaling.
+    """
+    workers = max(1, workers)
+    instances = [build_target(target) for _ in range(workers)]
+    for run in instances:
+        _safe_run(run, corpus.queries[0].text)
+
+    texts = [q.text for q in corpus.queries] * max(1, iterations)
+    cursor = iter(texts)
+    cursor_lock = threading.Lock()
+
+    def worker(run: Callable[[str], bool]) -> int:
+        done = 0
+        while True:
+            with cursor_lock:
+                text = next(cursor, None)
+            if text is None:
+                return done
+            _safe_run(run, text)
+            done += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        completed = sum(pool.map(worker, instances))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "workers": workers,
+        "requests": completed,
+        "elapsed_s": round(elapsed, 4),
+        "qps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+_COLD_START_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+from nlp2cmd.bench.harness import build_target, load_corpus, peak_rss_mb
+t1 = time.perf_counter()
+run = build_target(sys.argv[1])
+t2 = time.perf_counter()
+corpus = load_corpus(sys.argv[2])
+run(corpus.queries[0].text)
+t3 = time.perf_counter()
+for q in corpus.queries:
+    try:
+        run(q.text)
+    except Exception:
+        pass
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "init_ms": (t2 - t1) * 1000,
+    "first_query_ms": (t3 - t2) * 1000,
+    "peak_rss_mb": peak_rss_mb(),
+}))
+"""
+
+
+def measure_cold_start(
+    target: str,
+    corpus_path: Optional[Union[str, Path]] = None,
+    timeout: float = COLD_START_TIMEOUT,
+) -> dict[str, Any]:
+    """
+    Time import, construction and the first query in a fresh interpreter.
+
+    The child then runs the rest of the corpus once and reports its peak RSS.
+    """
+    corpus_path = str(Path(corpus_path) if corpus_path else default_corpus_path())
+    proc = subprocess.run(
+        [sys.executable, "-c", _COLD_START_SCRIPT, target, corpus_path],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        err = (proc.stderr or "").strip().splitlines()
+        raise RuntimeError(f"Cold-start run for {target} failed: {err[-1] if err else proc.returncode}")
+
+    data = json.loads(lines[-1])
+    cold = {k: round(float(data[k]), 3) for k in ("import_ms", "init_ms", "first_query_ms")}
+    cold["total_ms"] = round(sum(cold.values()), 3)
+    return {"cold_start": cold, "peak_rss_mb": data.get("peak_rss_mb")}
+
+
+def _git_info() -> dict[str, Any]:
+    root = Path(__file__).resolve().parents[3]
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, timeout=5
+        )
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return {"commit": None, "dirty": None}
+    if commit.returncode != 0:
+        return {"commit": None, "dirty": None}
+    return {"commit": commit.stdout.strip(), "dirty": bool(status.stdout.strip())}
+
+
+def run_benchmark(
+    targets: Optional[list[str]] = None,
+    corpus_path: Optional[Union[str, Path]] = None,
+    iterations: int = DEFAULT_ITERATIONS,
+    workers: int = DEFAULT_WORKERS,
+    cold_start: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> dict[str, Any]:
+    """
+    Benchmark the given targets and return a JSON-serializable report.
+
+    Args:
+        targets: Target names (default: all of ``TARGETS``)
+        corpus_path: Corpus file (default: the bundled corpus)
+        iterations: Timed passes over the corpus for warm latency/throughput
+        workers: Worker threads for the throughput measurement
+        cold_start: Also measure cold start and peak RSS in a subprocess
+        progress: Optional callback receiving short status messages
+    """
+    targets = list(targets or TARGETS)
+    for name in targets:
+        if name not in TARGETS:
+            raise ValueError(f"Unknown benchmark target: {name} (expected one of {', '.join(TARGETS)})")
+    corpus = load_corpus(corpus_path)
+    notify = progress or (lambda _msg: None)
+
+    results: dict[str, Any] = {}
+    for name in targets:
+        entry: dict[str, Any] = {}
+        if cold_start:
+            notify(f"{name}: cold start")
+            entry.update(measure_cold_start(name, corpus_path))
+        notify(f"{name}: warm latency")
+        entry.update(measure_warm(build_target(name), corpus, iterations))
+        notify(f"{name}: throughput x{workers}")
+        entry["throughput"] = measure_throughput(name, corpus, workers, iterations)
+        results[name] = entry
+
+    return {
+        "format": REPORT_FORMAT,
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_info(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus": corpus.summary(),
+        "config": {
+            "targets": targets,
+            "iterations": iterations,
+            "workers": workers,
+            "cold_start": cold_start,
+        },
+        "targets": results,
+    }
+
+
+def load_report(path: Union[str, Path]) -> dict[str, Any]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("format") != REPORT_FORMAT:
+        raise ValueError(f"Not a benchmark report: {path}")
+    return data
+
+
+def save_report(report: dict[str, Any], path: Union[str, Path]) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+__all__ = [
+    "BenchCorpus",
+    "BenchQuery",
+    "DEFAULT_ITERATIONS",
+    "DEFAULT_WORKERS",
+    "TARGETS",
+    "build_target",
+    "default_corpus_path",
+    "latency_summary",
+    "load_corpus",
+    "load_report",
+    "measure_cold_start",
+    "measure_throughput",
+    "measure_warm",
+    "peak_rss_mb",
+    "percentile",
+    "run_benchmark",
+    "save_report",
+]
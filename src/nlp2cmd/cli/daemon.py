@@ -0,0 +1,98 @@
+"""
+CLI commands for the warm NLP2CMD daemon.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import click
+from rich.console import Console
+
+from nlp2cmd.daemon.client import DaemonClient, DaemonUnavailable, build_fingerprint
+
+console = Console()
+
+
+@click.group(name="daemon")
+def daemon_group():
+    """Keep a warm pipeline in the background for fast queries."""
+    pass
+
+
+@daemon_group.command(name="start")
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path), help="Socket path")
+def start_daemon(socket_path: Optional[Path]):
+    """Start the daemon in the background."""
+    from nlp2cmd.daemon.server import start_background
+
+    client = DaemonClient(socket_path, timeout=1.0)
+    try:
+        info = client.ping()
+    except DaemonUnavailable:
+        pass
+    else:
+        console.print(f"[yellow]Daemon already running (pid {info.get('pid')}) on {client.socket_path}[/yellow]")
+        return
+
+    try:
+        info = start_background(client.socket_path)
+    except RuntimeError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise SystemExit(1)
+    console.print(f"[green]✓ Daemon started (pid {info.get('pid')}) on {client.socket_path}[/green]")
+
+
+@daemon_group.command(name="run")
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path), help="Socket path")
+@click.option("--no-warmup", is_flag=True, help="Skip warm-up queries")
+def run_daemon(socket_path: Optional[Path], no_warmup: bool):
+    """Run the daemon in the foreground."""
+    import logging
+
+    from nlp2cmd.daemon.server import DaemonServer
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = DaemonServer(socket_path, warmup=not no_warmup)
+    try:
+        server.serve_forever()
+    except RuntimeError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise SystemExit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@daemon_group.command(name="stop")
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path), help="Socket path")
+def stop_daemon(socket_path: Optional[Path]):
+    """Stop a running daemon."""
+    client = DaemonClient(socket_path)
+    try:
+        client.shutdown()
+    except DaemonUnavailable:
+        console.print(f"[yellow]No daemon running on {client.socket_path}[/yellow]")
+        return
+    console.print("[green]✓ Daemon stopped[/green]")
+
+
+@daemon_group.command(name="status")
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path), help="Socket path")
+def daemon_status(socket_path: Optional[Path]):
+    """Show whether the daemon is running."""
+    client = DaemonClient(socket_path, timeout=1.0)
+    try:
+        info = client.ping()
+    except DaemonUnavailable:
+        console.print(f"[yellow]Not running[/yellow] [dim]({client.socket_path})[/dim]")
+        return
+    console.print(
+        f"[green]Running[/green] pid {info.get('pid')}, version {info.get('version')}, "
+        f"uptime {info.get('uptime_s')}s, {info.get('requests')} queries served"
+    )
+    if info.get("build") != build_fingerprint():
+        console.print("[yellow]Stale: code or data changed since start; queries run in-process until restarted[/yellow]")
+    if info.get("cwd"):
+        console.print(f"[dim]Serves queries from {info.get('cwd')}[/dim]")
+    console.print(f"[dim]{client.socket_path}[/dim]")
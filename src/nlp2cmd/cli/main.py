@@ -193,6 +193,13 @@ def _register_subcommands_for_args(argv: list[str]) -> None:
     except Exception:
         pass
 
+    try:
+        if wants_help or subcmd in {"daemon"}:
+            from nlp2cmd.cli.daemon import daemon_group
+            main.add_command(daemon_group)
+    except Exception:
+        pass
+
     # Service commands are the heaviest (can pull FastAPI/uvicorn). Register only on demand.
     try:
         if wants_help or subcmd in {"service", "config-service"}:
@@ -263,6 +270,108 @@ def _shell_env_context(context: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def run_auto_query(
+    pipeline: Any,
+    query: str,
+    *,
+    explain: bool = False,
+    summary: bool = True,
+    measure: Optional[bool] = None,
+) -> tuple[Any, dict[str, Any], str]:
+    """Run one ``--dsl auto`` query and build the result payload shown by the CLI.
+
+    Shared by the in-process single-query path and the warm daemon.
+
+    Args:
+        pipeline: RuleBasedPipeline instance
+        query: Query text
+        explain: Include detection details in the payload
+        summary: Build the payload (``--stdout`` only needs the pipeline result)
+        measure: Measure resources; None follows NLP2CMD_MEASURE_RESOURCES
+
+    Returns:
+        (pipeline_result, payload, metrics_str)
+    """
+    from nlp2cmd.monitoring import measure_resources, format_last_metrics
+
+    if measure is None:
+        measure = str(os.environ.get("NLP2CMD_MEASURE_RESOURCES", "1") or "").strip().lower() not in {
+            "0",
+            "false",
+            "no",
+            "n",
+            "off",
+        }
+    with (measure_resources() if measure else nullcontext()):
+        pipeline_result = pipeline.process(query)
+
+    if not summary:
+        return pipeline_result, {}, ""
+
+    metrics_str = format_last_metrics() if measure else ""
+    out: dict[str, Any] = {
+        "dsl": "auto",
+        "query": query,
+        "status": "success" if pipeline_result.success else "error",
+        "confidence": float(pipeline_result.confidence),
+        "generated_command": (pipeline_result.command or "").strip() or None,
+        "errors": list(pipeline_result.errors or []),
+        "warnings": list(pipeline_result.warnings or []),
+        "suggestions": [],
+        "clarification_questions": [],
+    }
+    if metrics_str:
+        try:
+            from nlp2cmd.monitoring.token_costs import parse_metrics_string
+            from nlp2cmd.monitoring import estimate_token_cost
+
+            metrics = parse_metrics_string(metrics_str)
+            if metrics:
+                out["resource_metrics"] = {
+                    "time_ms": metrics.get("time_ms"),
+                    "cpu_percent": metrics.get("cpu_percent"),
+                    "memory_mb": metrics.get("memory_mb"),
+                    "energy_mj": metrics.get("energy_mj"),
+                }
+                out["resource_metrics_parsed"] = metrics
+
+                if (
+                    metrics.get("time_ms") is not None
+                    and metrics.get("cpu_percent") is not None
+                    and metrics.get("memory_mb") is not None
+                ):
+                    token_estimate = estimate_token_cost(
+                        metrics["time_ms"],
+                        metrics["cpu_percent"],
+                        metrics["memory_mb"],
+                        metrics.get("energy_mj"),
+                    )
+                    out["token_estimate"] = {
+                        "total": int(token_estimate.total_tokens_estimate),
+                        "input": int(token_estimate.input_tokens_estimate),
+                        "output": int(token_estimate.output_tokens_estimate),
+                        "cost_usd": float(token_estimate.estimated_cost_usd),
+                        "model_tier": token_estimate.equivalent_model_tier,
+                        "tokens_per_ms": float(token_estimate.tokens_per_millisecond),
+                        "tokens_per_mj": float(token_estimate.tokens_per_mj),
+                    }
+        except Exception:
+            pass
+
+    if explain:
+        out.update(
+            {
+                "domain": pipeline_result.domain,
+                "intent": pipeline_result.intent,
+                "detection_confidence": pipeline_result.detection_confidence,
+                "template_used": pipeline_result.template_used,
+                "source": pipeline_result.source,
+                "entities": pipeline_result.entities,
+            }
+        )
+    return pipeline_result, out, metrics_str
+
+
 def get_adapter(dsl: str, context: dict[str, Any]):
     """Get the appropriate adapter for the DSL type."""
     from nlp2cmd.adapters import (
@@ -304,6 +413,7 @@ class InteractiveSession:
         dsl: str = "auto",
         auto_repair: bool = False,
         appspec: Optional[str] = None,
+        background_env: bool = True,
     ):
         self.dsl = dsl
         self.auto_repair = auto_repair
@@ -323,23 +433,34 @@ class InteractiveSession:
         self.context: dict[str, Any] = {}
 
         # Analyze environment
-        self._analyze_environment()
+        self._env_refresh = None
+        self._analyze_environment(background=background_env)
 
-    def _analyze_environment(self):
-        """Analyze current environment."""
-        self.context["environment"] = self.env_analyzer.analyze()
+    def _analyze_environment(self, background: bool = True):
+        """
+        Analyze current environment.
 
-        # Detect tools
-        tools = self.env_analyzer.detect_tools()
-        self.context["available_tools"] = {
-            name: info for name, info in tools.items() if info.available
-        }
+        With ``background=True`` tools are first taken from the tool cache
+        (no subprocesses), and the full tool/service probe refreshes the
+        context on a background thread so the prompt appears immediately.
+        """
+        self.context["environment"] = self.env_analyzer.analyze()
 
         # Find config files
         self.context["config_files"] = self.env_analyzer.find_config_files(Path.cwd())
 
-        # Check services
-        self.context["services"] = self.env_analyzer.check_services()
+        if background:
+            self._apply_probe(self.env_analyzer.cached_tools(), {})
+            self._env_refresh = self.env_analyzer.refresh_in_background(callback=self._apply_probe)
+        else:
+            self._apply_probe(*self.env_analyzer.probe())
+
+    def _apply_probe(self, tools: dict[str, Any], services: dict[str, Any]) -> None:
+        """Store detected tools and checked services in the session context."""
+        self.context["available_tools"] = {
+            name: info for name, info in tools.items() if info.available
+        }
+        self.context["services"] = services
 
     def process(self, user_input: str) -> FeedbackResult:
         """Process user input and return feedback."""
@@ -1836,18 +1957,11 @@ def main(
                 # Fast path: for single-shot CLI queries we avoid spinning up the full
                 # InteractiveSession (env scan + thermo router), which saves seconds.
                 from nlp2cmd.generation.pipeline import RuleBasedPipeline
-                from nlp2cmd.monitoring import measure_resources, format_last_metrics
 
                 pipeline = RuleBasedPipeline()
-                _measure = str(os.environ.get("NLP2CMD_MEASURE_RESOURCES", "1") or "").strip().lower() not in {
-                    "0",
-                    "false",
-                    "no",
-                    "n",
-                    "off",
-                }
-                with (measure_resources() if _measure else nullcontext()):
-                    pipeline_result = pipeline.process(query)
+                pipeline_result, out, metrics_str = run_auto_query(
+                    pipeline, query, explain=explain, summary=not stdout_only
+                )
 
                 if stdout_only:
                     cmd = (pipeline_result.command or "").strip()
@@ -1858,68 +1972,6 @@ def main(
                             sys.stderr.write(str(err).rstrip() + "\n")
                     return
 
-                metrics_str = format_last_metrics() if _measure else ""
-                out: dict[str, Any] = {
-                    "dsl": "auto",
-                    "query": query,
-                    "status": "success" if pipeline_result.success else "error",
-                    "confidence": float(pipeline_result.confidence),
-                    "generated_command": (pipeline_result.command or "").strip() or None,
-                    "errors": list(pipeline_result.errors or []),
-                    "warnings": list(pipeline_result.warnings or []),
-                    "suggestions": [],
-                    "clarification_questions": [],
-                }
-                if metrics_str:
-                    try:
-                        from nlp2cmd.monitoring.token_costs import parse_metrics_string
-                        from nlp2cmd.monitoring import estimate_token_cost
-
-                        metrics = parse_metrics_string(metrics_str)
-                        if metrics:
-                            out["resource_metrics"] = {
-                                "time_ms": metrics.get("time_ms"),
-                                "cpu_percent": metrics.get("cpu_percent"),
-                                "memory_mb": metrics.get("memory_mb"),
-                                "energy_mj": metrics.get("energy_mj"),
-                            }
-                            out["resource_metrics_parsed"] = metrics
-
-                            if (
-                                metrics.get("time_ms") is not None
-                                and metrics.get("cpu_percent") is not None
-                                and metrics.get("memory_mb") is not None
-                            ):
-                                token_estimate = estimate_token_cost(
-                                    metrics["time_ms"],
-                                    metrics["cpu_percent"],
-                                    metrics["memory_mb"],
-                                    metrics.get("energy_mj"),
-                                )
-                                out["token_estimate"] = {
-                                    "total": int(token_estimate.total_tokens_estimate),
-                                    "input": int(token_estimate.input_tokens_estimate),
-                                    "output": int(token_estimate.output_tokens_estimate),
-                                    "cost_usd": float(token_estimate.estimated_cost_usd),
-                                    "model_tier": token_estimate.equivalent_model_tier,
-                                    "tokens_per_ms": float(token_estimate.tokens_per_millisecond),
-                                    "tokens_per_mj": float(token_estimate.tokens_per_mj),
-                                }
-                    except Exception:
-                        pass
-
-                if explain:
-                    out.update(
-                        {
-                            "domain": pipeline_result.domain,
-                            "intent": pipeline_result.intent,
-                            "detection_confidence": pipeline_result.detection_confidence,
-                            "template_used": pipeline_result.template_used,
-                            "source": pipeline_result.source,
-                            "entities": pipeline_result.entities,
-                        }
-                    )
-
                 # Calculate total execution time
                 script_start_time = ctx.obj.get("script_start_time", time.time())
                 total_time_ms = (time.time() - script_start_time) * 1000
@@ -1981,6 +2033,8 @@ _command_decorator = main.command if hasattr(main, 'command') else lambda *args,
 @click.pass_context
 def repair(ctx, file: str, backup: bool):
     """Repair a configuration file."""
+    from nlp2cmd.schemas import SchemaRegistry
+
     file_path = Path(file)
     registry = SchemaRegistry()
 
@@ -2036,6 +2090,8 @@ def repair(ctx, file: str, backup: bool):
 @click.pass_context
 def validate(ctx, file: str):
     """Validate a configuration file."""
+    from nlp2cmd.schemas import SchemaRegistry
+
     file_path = Path(file)
     registry = SchemaRegistry()
 
@@ -2063,11 +2119,119 @@ def validate(ctx, file: str):
             console.print(f"  [yellow]• {warning}[/yellow]")
 
 
+@_command_decorator
+@click.option("-o", "--output", type=click.Path(), help="Bundle path (default: user config dir)")
+@click.pass_context
+def compile_data(ctx, output: Optional[str]):
+    """Compile all JSON data layers into one fast-loading knowledge bundle."""
+    from nlp2cmd.generation.knowledge_bundle import compile_bundle
+
+    try:
+        bundle, path = compile_bundle(Path(output) if output else None)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    summary = bundle.summary()
+    console.print(f"📦 Knowledge bundle: [cyan]{path}[/cyan]")
+    console.print(
+        f"  {summary['domains']} domains, {summary['intents']} intents, "
+        f"{summary['keywords']} keywords, {summary['templates']} templates"
+    )
+    console.print(f"  source hash: {summary['source_hash'][:16]}")
+    if output:
+        console.print(f"[dim]Set NLP2CMD_KNOWLEDGE_BUNDLE={path} to use it.[/dim]")
+
+
+@_command_decorator
+@click.option("--corpus", type=click.Path(exists=True), help="Query corpus (default: bundled corpus)")
+@click.option(
+    "-t", "--target", "targets", multiple=True,
+    type=click.Choice(["pipeline", "transform", "hybrid"]),
+    help="Target to benchmark (repeatable, default: all)",
+)
+@click.option("-n", "--iterations", type=int, default=5, show_default=True, help="Timed passes over the corpus")
+@click.option("-w", "--workers", type=int, default=4, show_default=True, help="Worker threads for throughput")
+@click.option("--no-cold-start", is_flag=True, help="Skip the subprocess cold-start/RSS measurement")
+@click.option("-o", "--output", type=click.Path(), help="Write the JSON report here")
+@click.option("--baseline", type=click.Path(exists=True), help="Fail on regressions against this report")
+@click.option("--tolerances", type=click.Path(exists=True), help="JSON file with per-metric tolerance overrides")
+@click.pass_context
+def bench(
+    ctx,
+    corpus: Optional[str],
+    targets: tuple[str, ...],
+    iterations: int,
+    workers: int,
+    no_cold_start: bool,
+    output: Optional[str],
+    baseline: Optional[str],
+    tolerances: Optional[str],
+):
+    """Benchmark latency, throughput and memory on a fixed query corpus."""
+    from rich.table import Table
+
+    from nlp2cmd.bench import compare_reports, load_report, load_tolerances, run_benchmark, save_report
+
+    try:
+        baseline_report = load_report(baseline) if baseline else None
+        overrides = load_tolerances(tolerances) if tolerances else None
+        report = run_benchmark(
+            targets=list(targets) or None,
+            corpus_path=corpus,
+            iterations=iterations,
+            workers=workers,
+            cold_start=not no_cold_start,
+            progress=lambda msg: console.print(f"[dim]… {msg}[/dim]"),
+        )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+
+    table = Table(title=f"Benchmark ({report['corpus']['queries']} queries × {iterations})")
+    for column in ("target", "cold ms", "p50 ms", "p95 ms", "p99 ms", "qps", "RSS MB", "success"):
+        table.add_column(column, justify="left" if column == "target" else "right")
+    for name, entry in report["targets"].items():
+        cold = entry.get("cold_start", {}).get("total_ms")
+        rss = entry.get("peak_rss_mb")
+        table.add_row(
+            name,
+            f"{cold:.0f}" if cold is not None else "-",
+            f"{entry['warm']['p50_ms']:.2f}",
+            f"{entry['warm']['p95_ms']:.2f}",
+            f"{entry['warm']['p99_ms']:.2f}",
+            f"{entry['throughput']['qps']:.0f}",
+            f"{rss:.0f}" if rss is not None else "-",
+            f"{entry['success_rate']:.0%}",
+        )
+    console.print(table)
+
+    if output:
+        console.print(f"📄 Report: [cyan]{save_report(report, output)}[/cyan]")
+
+    if baseline_report is None:
+        return
+
+    gate = compare_reports(baseline_report, report, overrides)
+    for warning in gate.warnings:
+        console.print(f"[yellow]⚠ {warning}[/yellow]")
+    for delta in gate.regressions:
+        console.print(
+            f"[red]✗ {delta.target} {delta.metric}: {delta.baseline:g} → {delta.current:g} "
+            f"({delta.change:+.1%}, limit {delta.tolerance.limit:g})[/red]"
+        )
+    if not gate.passed:
+        raise SystemExit(1)
+    console.print(f"[green]✓ No regressions against {baseline}[/green]")
+
+
 @_command_decorator
 @click.option("-o", "--output", type=click.Path(), help="Output file (JSON)")
 @click.pass_context
 def analyze_env(ctx, output: Optional[str]):
     """Analyze system environment."""
+    from nlp2cmd.environment import EnvironmentAnalyzer
+
     analyzer = EnvironmentAnalyzer()
     report = analyzer.full_report()
 
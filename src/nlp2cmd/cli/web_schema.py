@@ -74,18 +74,42 @@ def web_schema_group():
     default=True,
     help="Run browser in headless mode"
 )
-def extract_schema(url: str, output: Path, headless: bool):
+@click.option(
+    "--max-wait-ms",
+    type=int,
+    default=5000,
+    show_default=True,
+    help="Upper bound for waiting until the page settles"
+)
+@click.option(
+    "--quiet-ms",
+    type=int,
+    default=300,
+    show_default=True,
+    help="DOM quiet period that counts as settled"
+)
+def extract_schema(url: str, output: Path, headless: bool, max_wait_ms: int, quiet_ms: int):
     """Extract schema from a web page."""
     from nlp2cmd.web_schema.extractor import extract_web_schema
+    from nlp2cmd.web_schema.readiness import ReadinessConfig
     
     console.print(f"\n[cyan]Extracting schema from {url}...[/cyan]")
     
     try:
-        schema = extract_web_schema(url, output_dir=output, headless=headless)
+        schema = extract_web_schema(
+            url,
+            output_dir=output,
+            headless=headless,
+            readiness=ReadinessConfig(quiet_ms=quiet_ms, max_wait_ms=max_wait_ms),
+        )
         
         console.print(f"\n[green]✓ Schema extracted successfully[/green]")
         console.print(f"[dim]Domain: {schema.domain}[/dim]")
         console.print(f"[dim]Title: {schema.title}[/dim]")
+        readiness = schema.metadata.get("readiness") or {}
+        if readiness:
+            state = "settled" if not readiness.get("timed_out") else "wait limit reached"
+            console.print(f"[dim]Page wait: {readiness.get('waited_ms')}ms ({state})[/dim]")
         
         # Display summary
         table = Table(title="Extracted Elements")
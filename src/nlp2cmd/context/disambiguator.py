@@ -9,11 +9,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Any, Optional
-from difflib import SequenceMatcher
 
 from rich.console import Console
 from rich.table import Table
 
+from nlp2cmd.history.query_index import similarity
+
 try:
     from nlp2cmd.cli.markdown_output import print_yaml_block
 except Exception:  # pragma: no cover
@@ -72,42 +73,12 @@ class CommandDisambiguator:
         if not self._history:
             return []
         
-        recent = self._history.get_recent(50)
-        
-        # Calculate similarity
-        results = []
-        seen_queries = set()
-        
-        for record in reversed(recent):
-            if record.query in seen_queries:
-                continue
-            
-            similarity = self._calculate_similarity(query, record.query)
-            
-            if similarity >= threshold:
-                results.append((record.query, record.command, similarity))
-                seen_queries.add(record.query)
-        
-        # Sort by similarity
-        results.sort(key=lambda x: x[2], reverse=True)
-        
-        return results[:limit]
+        # Indexed over the whole history; built once per process.
+        return self._history.query_index().search(query, limit=limit, threshold=threshold)
     
     def _calculate_similarity(self, s1: str, s2: str) -> float:
         """Calculate similarity between two strings."""
-        s1_lower = s1.lower().strip()
-        s2_lower = s2.lower().strip()
-        
-        # Exact match
-        if s1_lower == s2_lower:
-            return 1.0
-        
-        # Check if one contains the other
-        if s1_lower in s2_lower or s2_lower in s1_lower:
-            return 0.8
-        
-        # Use SequenceMatcher for fuzzy matching
-        return SequenceMatcher(None, s1_lower, s2_lower).ratio()
+        return similarity(s1, s2)
     
     def disambiguate(
         self,
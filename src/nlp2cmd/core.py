@@ -94,6 +94,7 @@ except ImportError:  # pragma: no cover
             return self.__class__(**data)
 
 from nlp2cmd.ir import ActionIR
+from nlp2cmd.monitoring.tracing import span, trace_request
 
 if TYPE_CHECKING:
     from nlp2cmd.adapters.base import BaseDSLAdapter
@@ -817,6 +818,18 @@ class NLP2CMD:
         Returns:
             TransformResult with generated command and metadata
         """
+        with trace_request("transform") as trace:
+            result = self._transform(text, context, dry_run)
+        if trace is not None:
+            result.metadata["trace"] = trace.to_dict()
+        return result
+
+    def _transform(
+        self,
+        text: str,
+        context: Optional[dict[str, Any]],
+        dry_run: bool,
+    ) -> TransformResult:
         # Merge context
         full_context = {**self._context, **(context or {})}
         # Add text to context for operator detection
@@ -825,12 +838,14 @@ class NLP2CMD:
         # Step 1: NLP Processing - Generate execution plan
         try:
             try:
-                plan = self.nlp_backend.generate_plan(text, full_context)
+                with span("nlp"):
+                    plan = self.nlp_backend.generate_plan(text, full_context)
                 # Always preserve original user input text in the plan.
                 plan = plan.model_copy(update={"text": text})
             except NotImplementedError:
-                intent, confidence = self.nlp_backend.extract_intent(text)
-                entities = self.nlp_backend.extract_entities(text)
+                with span("nlp"):
+                    intent, confidence = self.nlp_backend.extract_intent(text)
+                    entities = self.nlp_backend.extract_entities(text)
                 entity_dict = {e.name: e.value for e in entities}
                 entity_dict = self._normalize_entities(intent, entity_dict, full_context)
                 plan = ExecutionPlan(
@@ -852,7 +867,8 @@ class NLP2CMD:
 
         # Step 2: Generate command using adapter
         try:
-            command = self.adapter.generate(plan.model_dump())
+            with span("generate"):
+                command = self.adapter.generate(plan.model_dump())
         except Exception as e:
             logger.error(f"Command generation failed: {e}")
             return TransformResult(
@@ -873,14 +889,16 @@ class NLP2CMD:
         suggestions = []
 
         if self.validator:
-            validation_result = self.validator.validate(command)
+            with span("validate"):
+                validation_result = self.validator.validate(command)
             if not validation_result.is_valid:
                 errors.extend(validation_result.errors)
             warnings.extend(validation_result.warnings)
             suggestions.extend(validation_result.suggestions)
 
         # Step 4: Check safety policy
-        safety_result = self.adapter.check_safety(command)
+        with span("safety"):
+            safety_result = self.adapter.check_safety(command)
         if not safety_result["allowed"]:
             # Record blocked command in history
             try:
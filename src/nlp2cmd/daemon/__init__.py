@@ -0,0 +1,49 @@
+"""
+Warm daemon mode for NLP2CMD.
+
+``nlp2cmd daemon start`` keeps a loaded pipeline in a background process on a
+Unix socket; the ``nlp2cmd`` console script answers simple queries through it
+and falls back to in-process execution when it is not running.
+"""
+
+import importlib
+from typing import Any
+
+from nlp2cmd.daemon.client import (
+    DaemonClient,
+    DaemonUnavailable,
+    cli_entry_point,
+    daemon_enabled,
+    default_socket_path,
+    run_via_daemon,
+)
+
+__all__ = [
+    "DaemonClient",
+    "DaemonUnavailable",
+    "cli_entry_point",
+    "daemon_enabled",
+    "default_socket_path",
+    "run_via_daemon",
+    "DaemonServer",
+    "start_background",
+]
+
+# The server pulls in the pipeline; keep it out of the client's import path.
+_LAZY_EXPORTS: dict[str, tuple[str, str]] = {
+    "DaemonServer": ("nlp2cmd.daemon.server", "DaemonServer"),
+    "start_background": ("nlp2cmd.daemon.server", "start_background"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    target = _LAZY_EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(name)
+    module_name, attr_name = target
+    module = importlib.import_module(module_name)
+    return getattr(module, attr_name)
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals().keys()) + list(_LAZY_EXPORTS.keys()))
@@ -0,0 +1,354 @@
+"""
+Thin client for the NLP2CMD warm daemon.
+
+Imports only the standard library so that a CLI query answered by the daemon
+never loads click, rich or the generation pipeline. ``cli_entry_point`` is the
+``nlp2cmd`` console script: it answers simple single-query invocations through
+the daemon when one is listening and otherwise hands over to the full CLI
+(``nlp2cmd.cli.main``) with argv untouched.
+
+Protocol: one JSON object per line in each direction, one request per
+connection.
+
+The daemon answers only when it would give the same output as the in-process
+CLI. Each query carries the client's working directory, its ``NLP2CMD_*``
+settings, ``HOME``/``XDG_CONFIG_HOME`` and a build fingerprint
+(``build_fingerprint``: stat of every package file and data layer). The
+daemon refuses a query when any of them differs from what its pipeline was
+built with, and the client then falls back to in-process execution. That
+covers a different environment, an edited ``.env``, a code change in a
+development install and an edited data override such as
+``~/.config/nlp2cmd/patterns.json``.
+
+Environment:
+    NLP2CMD_DAEMON: Set to 0/false/off to never use the daemon
+    NLP2CMD_DAEMON_SOCKET: Socket path (default: $XDG_RUNTIME_DIR/nlp2cmd/daemon.sock,
+        else ~/.nlp2cmd/daemon.sock)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+_STARTED = time.time()
+
+_DISABLED_VALUES = {"0", "false", "no", "n", "off"}
+
+DEFAULT_TIMEOUT = 5.0
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Settings that only affect how the client reaches or talks to the daemon.
+CLIENT_ONLY_SETTINGS = frozenset({
+    "NLP2CMD_DAEMON",
+    "NLP2CMD_DAEMON_SOCKET",
+    "NLP2CMD_MEASURE_RESOURCES",
+})
+
+# Variables that locate the user data layers (see nlp2cmd.utils.data_files).
+USER_DIR_VARIABLES = ("HOME", "XDG_CONFIG_HOME")
+
+# Data files the pipeline merges from every layer, with their explicit
+# override variables. Mirrors the find_data_files()/find_data_file() calls
+# of the loaders and knowledge_bundle.SOURCE_LAYERS; kept here because
+# importing nlp2cmd.utils would slow down the thin client.
+DATA_LAYER_FILES: tuple[tuple[str, Optional[str]], ...] = (
+    ("patterns.json", "NLP2CMD_PATTERNS_FILE"),
+    ("keyword_intent_detector_config.json", "NLP2CMD_KEYWORD_DETECTOR_CONFIG"),
+    ("regex_patterns.json", "NLP2CMD_REGEX_PATTERNS_FILE"),
+    ("templates.json", "NLP2CMD_TEMPLATES_FILE"),
+    ("defaults.json", "NLP2CMD_DEFAULTS_FILE"),
+    ("command_detector.json", "NLP2CMD_COMMAND_DETECTOR_FILE"),
+    ("shell_execution_policy.json", None),
+)
+
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+class DaemonUnavailable(Exception):
+    """The daemon is not running or did not answer."""
+
+
+def default_socket_path() -> Path:
+    explicit = str(os.environ.get("NLP2CMD_DAEMON_SOCKET") or "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    runtime_dir = str(os.environ.get("XDG_RUNTIME_DIR") or "").strip()
+    if runtime_dir:
+        return Path(runtime_dir) / "nlp2cmd" / "daemon.sock"
+    return Path.home() / ".nlp2cmd" / "daemon.sock"
+
+
+def daemon_enabled() -> bool:
+    return str(os.environ.get("NLP2CMD_DAEMON") or "").strip().lower() not in _DISABLED_VALUES
+
+
+def client_settings(environ: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """``NLP2CMD_*`` variables that can change the generated output."""
+    environ = os.environ if environ is None else environ
+    return {
+        k: v for k, v in environ.items()
+        if k.startswith("NLP2CMD_") and k not in CLIENT_ONLY_SETTINGS
+    }
+
+
+def user_dirs(environ: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """Variables locating the user data layers (``USER_DIR_VARIABLES``)."""
+    environ = os.environ if environ is None else environ
+    return {k: environ.get(k) or "" for k in USER_DIR_VARIABLES}
+
+
+def _user_config_dir() -> Path:
+    # Same precedence as nlp2cmd.utils.data_files.get_user_config_dir().
+    explicit = os.environ.get("NLP2CMD_CONFIG_DIR")
+    if explicit:
+        return Path(explicit).expanduser()
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    if xdg:
+        return Path(xdg).expanduser() / "nlp2cmd"
+    return Path.home() / ".config" / "nlp2cmd"
+
+
+def data_layer_candidates() -> list[Path]:
+    """Every override path ``find_data_files`` checks for ``DATA_LAYER_FILES``, existing or not."""
+    layer_dirs = (Path("data"), Path.home() / ".nlp2cmd", _user_config_dir())
+    out: list[Path] = []
+    for filename, env_var in DATA_LAYER_FILES:
+        out.extend(d / filename for d in layer_dirs)
+        explicit = os.environ.get(env_var) if env_var else None
+        if explicit:
+            out.append(Path(explicit).expanduser())
+    return out
+
+
+def build_fingerprint() -> str:
+    """
+    Stat-only identity of the installed code and the data it loads.
+
+    Covers the package version, the mtime and size of every file in the
+    package (and the repository ``data`` directory of a source checkout), and
+    every user data layer candidate (``data_layer_candidates``), including
+    whether it exists. Together that is everything the knowledge bundle is
+    built from, so an edited install or data override is detected.
+    """
+    from nlp2cmd import __version__
+
+    h = hashlib.sha256(__version__.encode("utf-8"))
+
+    def add(path: str) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            h.update(f"{path}\0-\n".encode("utf-8", "surrogateescape"))
+            return
+        h.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8", "surrogateescape"))
+
+    for root in (_PACKAGE_DIR, _PACKAGE_DIR.parent.parent / "data"):
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for name in sorted(filenames):
+                add(os.path.join(dirpath, name))
+    for path in data_layer_candidates():
+        add(os.path.abspath(path))
+    return h.hexdigest()
+
+
+class DaemonClient:
+    """Sends requests to a running daemon over its Unix socket."""
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+
+    def request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send one request and return the decoded response.
+
+        Raises:
+            DaemonUnavailable: No daemon is listening, or the exchange failed
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix sockets are not supported on this platform")
+        data = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(str(self.socket_path))
+                sock.sendall(data)
+                chunks = []
+                received = 0
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if chunk.endswith(b"\n") or received > MAX_MESSAGE_BYTES:
+                        break
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from e
+
+        try:
+            response = json.loads(b"".join(chunks).decode("utf-8"))
+        except ValueError as e:
+            raise DaemonUnavailable(f"Invalid daemon response: {e}") from e
+        if not isinstance(response, dict):
+            raise DaemonUnavailable("Invalid daemon response")
+        return response
+
+    def ping(self) -> dict[str, Any]:
+        return self.request({"op": "ping"})
+
+    def query(
+        self,
+        text: str,
+        explain: bool = False,
+        summary: bool = True,
+        build: Optional[str] = None,
+    ) -> dict[str, Any]:
+        return self.request({
+            "op": "query",
+            "text": text,
+            "explain": explain,
+            "summary": summary,
+            # Resource metrics only appear in the formatted summary.
+            "measure": summary and _measure_resources(),
+            "cwd": os.getcwd(),
+            "settings": client_settings(),
+            "user_dirs": user_dirs(),
+            "build": build,
+        })
+
+    def shutdown(self) -> dict[str, Any]:
+        return self.request({"op": "shutdown"})
+
+
+def _measure_resources() -> bool:
+    value = str(os.environ.get("NLP2CMD_MEASURE_RESOURCES", "1") or "").strip().lower()
+    return value not in _DISABLED_VALUES
+
+
+def parse_simple_query(argv: list[str]) -> Optional[dict[str, Any]]:
+    """
+    Recognize the invocations the daemon can answer.
+
+    Accepts ``--stdout``, ``--explain``, ``-d/--dsl auto``, ``-q/--query TEXT``
+    and free text arguments containing whitespace. Anything else (subcommands,
+    ``--run``, other DSLs, stdin input) returns None and goes to the full CLI.
+    """
+    options = {"stdout": False, "explain": False}
+    query: Optional[str] = None
+    texts: list[str] = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--stdout":
+            options["stdout"] = True
+        elif arg == "--explain":
+            options["explain"] = True
+        elif arg in ("-d", "--dsl") and i + 1 < len(argv):
+            if argv[i + 1] != "auto":
+                return None
+            i += 1
+        elif arg == "--dsl=auto":
+            pass
+        elif arg in ("-q", "--query") and i + 1 < len(argv):
+            query = argv[i + 1]
+            i += 1
+        elif arg.startswith("--query="):
+            query = arg[len("--query="):]
+        elif arg.startswith("-"):
+            return None
+        elif any(ch.isspace() for ch in arg):
+            texts.append(arg)
+        else:
+            # Could be a subcommand name; let click decide.
+            return None
+        i += 1
+
+    if query is not None and texts:
+        return None
+    text = (query if query is not None else " ".join(texts)).strip()
+    if not text:
+        return None
+    return {"text": text, **options}
+
+
+def run_via_daemon(argv: list[str], client: Optional[DaemonClient] = None) -> bool:
+    """
+    Answer a CLI invocation through the daemon.
+
+    Returns True when the output was produced, False when the caller should
+    fall back to in-process execution.
+    """
+    if not daemon_enabled():
+        return False
+    parsed = parse_simple_query(argv)
+    if parsed is None:
+        return False
+    client = client or DaemonClient()
+    if not client.socket_path.exists():
+        return False
+
+    build = build_fingerprint()
+    try:
+        response = client.query(
+            parsed["text"], explain=parsed["explain"], summary=not parsed["stdout"], build=build
+        )
+    except DaemonUnavailable:
+        return False
+    if not response.get("ok") or response.get("build") != build:
+        return False
+
+    if parsed["stdout"]:
+        cmd = str(response.get("command") or "").strip()
+        if cmd:
+            sys.stdout.write(cmd + "\n")
+        if not response.get("success"):
+            for err in response.get("errors") or []:
+                sys.stderr.write(str(err).rstrip() + "\n")
+        sys.stdout.flush()
+        return True
+
+    from nlp2cmd.cli.display import display_command_result
+
+    out = dict(response.get("output") or {})
+    out["total_execution_time_ms"] = round((time.time() - _STARTED) * 1000, 1)
+    display_command_result(
+        command=out.get("generated_command", "") or "",
+        metadata=out,
+        metrics_str=response.get("metrics") or "",
+        show_yaml=True,
+        title="NLP2CMD Result",
+    )
+    return True
+
+
+def cli_entry_point() -> None:
+    """``nlp2cmd`` console script: daemon fast path, full CLI otherwise."""
+    if run_via_daemon(sys.argv[1:]):
+        return
+    from nlp2cmd.cli.main import cli_entry_point as full_cli_entry_point
+
+    full_cli_entry_point()
+
+
+__all__ = [
+    "DaemonClient",
+    "DaemonUnavailable",
+    "build_fingerprint",
+    "cli_entry_point",
+    "client_settings",
+    "data_layer_candidates",
+    "user_dirs",
+    "daemon_enabled",
+    "default_socket_path",
+    "parse_simple_query",
+    "run_via_daemon",
+]
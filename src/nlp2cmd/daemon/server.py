@@ -0,0 +1,306 @@
+"""
+Warm NLP2CMD daemon.
+
+Holds a loaded ``RuleBasedPipeline`` (detector, extractor, templates and any
+models they load lazily) in a long-lived process and answers queries over a
+Unix domain socket. The socket is created with mode 0600 so only the owning
+user can connect.
+
+A query is refused (and the client falls back to in-process execution) when
+it comes from another working directory, with other ``NLP2CMD_*`` settings,
+``HOME`` or ``XDG_CONFIG_HOME``, or from a different build (code and data
+layers) than the pipeline was loaded with. The client's
+settings are compared after adding what the in-process CLI would read from
+``.env`` (``load_dotenv()`` does not override set variables).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from nlp2cmd.daemon.client import (
+    DaemonClient,
+    DaemonUnavailable,
+    MAX_MESSAGE_BYTES,
+    build_fingerprint,
+    client_settings,
+    default_socket_path,
+    user_dirs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Exercise detection, extraction, templates and lazily loaded models before
+# the first real query arrives.
+WARMUP_QUERIES: tuple[str, ...] = (
+    "list files in current directory",
+    "Pokaż procesy",
+    "Pokaż wszystkich użytkowników z tabeli users",
+)
+
+START_TIMEOUT = 60.0
+
+# The CLI calls load_dotenv() from cli/main.py, which searches for .env
+# upwards from that module's directory.
+_DOTENV_SEARCH_DIR = Path(__file__).resolve().parent.parent / "cli"
+
+
+def _find_dotenv() -> Optional[Path]:
+    for directory in (_DOTENV_SEARCH_DIR, *_DOTENV_SEARCH_DIR.parents):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _read_dotenv_settings(path: Path) -> dict[str, str]:
+    try:
+        from dotenv import dotenv_values
+    except Exception:
+        # Without python-dotenv the CLI does not read .env either.
+        return {}
+    try:
+        values = dotenv_values(path)
+    except Exception as e:
+        logger.debug(f"Could not read {path}: {e}")
+        return {}
+    return client_settings({k: v for k, v in values.items() if v is not None})
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_MESSAGE_BYTES)
+        try:
+            request = json.loads(line.decode("utf-8"))
+        except ValueError:
+            response: dict[str, Any] = {"ok": False, "error": "invalid request"}
+        else:
+            response = self.server.daemon.handle(request)  # type: ignore[attr-defined]
+        self.wfile.write((json.dumps(response, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DaemonServer:
+    """Serves CLI queries from a warm pipeline."""
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None, warmup: bool = True):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.warmup = warmup
+        self.pipeline: Any = None
+        self.build = build_fingerprint()
+        self.cwd: Optional[str] = None
+        self.settings: dict[str, str] = {}
+        self.user_dirs: dict[str, str] = {}
+        self.started_at = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        self._dotenv_cache: Optional[tuple[Any, dict[str, str]]] = None
+
+    def load(self) -> None:
+        """Build the pipeline and run the warm-up queries."""
+        from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+        self.cwd = os.getcwd()
+        self.settings = client_settings()
+        self.user_dirs = user_dirs()
+        self.build = build_fingerprint()
+        self.pipeline = RuleBasedPipeline()
+        if self.warmup:
+            for text in WARMUP_QUERIES:
+                try:
+                    self.pipeline.process(text)
+                except Exception as e:
+                    logger.debug(f"Warm-up query failed: {e}")
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Dispatch one decoded request."""
+        from nlp2cmd import __version__
+
+        op = request.get("op") if isinstance(request, dict) else None
+        if op == "ping":
+            return {
+                "ok": True,
+                "version": __version__,
+                "build": self.build,
+                "cwd": self.cwd,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "requests": self.requests,
+            }
+        if op == "query":
+            return self._query(request)
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "version": __version__}
+        return {"ok": False, "version": __version__, "error": f"unknown op: {op}"}
+
+    def _query(self, request: dict[str, Any]) -> dict[str, Any]:
+        from nlp2cmd import __version__
+        from nlp2cmd.cli.main import run_auto_query
+
+        text = str(request.get("text") or "").strip()
+        if not text:
+            return {"ok": False, "version": __version__, "error": "empty query"}
+        if self.pipeline is None:
+            self.load()
+        mismatch = self._mismatch(request)
+        if mismatch:
+            return {"ok": False, "version": __version__, "build": self.build, "error": mismatch}
+        try:
+            # Pipeline components keep per-call state; serialize queries.
+            with self._lock:
+                self.requests += 1
+                result, out, metrics_str = run_auto_query(
+                    self.pipeline,
+                    text,
+                    explain=bool(request.get("explain")),
+                    summary=bool(request.get("summary", True)),
+                    measure=bool(request.get("measure", True)),
+                )
+        except Exception as e:
+            logger.exception("Daemon query failed")
+            return {"ok": False, "version": __version__, "error": str(e)}
+        return {
+            "ok": True,
+            "version": __version__,
+            "build": self.build,
+            "command": (result.command or "").strip(),
+            "success": bool(result.success),
+            "errors": list(result.errors or []),
+            "output": out,
+            "metrics": metrics_str,
+        }
+
+    def _mismatch(self, request: dict[str, Any]) -> Optional[str]:
+        """Why this pipeline would answer differently than the client's CLI, or None."""
+        build = request.get("build")
+        if build is not None and build != self.build:
+            return "build mismatch: code or data changed since the daemon started"
+        cwd = request.get("cwd")
+        if cwd is not None and cwd != self.cwd:
+            return f"working directory mismatch: daemon runs in {self.cwd}"
+        dirs = request.get("user_dirs")
+        if isinstance(dirs, dict) and user_dirs(dirs) != self.user_dirs:
+            changed = sorted(k for k, v in user_dirs(dirs).items() if v != self.user_dirs.get(k))
+            return f"user directory mismatch: {', '.join(changed)}"
+        settings = request.get("settings")
+        if isinstance(settings, dict):
+            effective = {**self._dotenv_settings(), **client_settings(settings)}
+            if effective != self.settings:
+                changed = sorted(
+                    k for k in effective.keys() | self.settings.keys()
+                    if effective.get(k) != self.settings.get(k)
+                )
+                return f"settings mismatch: {', '.join(changed)}"
+        return None
+
+    def _dotenv_settings(self) -> dict[str, str]:
+        """``NLP2CMD_*`` values the CLI would currently load from ``.env``."""
+        path = _find_dotenv()
+        if path is None:
+            return {}
+        try:
+            st = path.stat()
+        except OSError:
+            return {}
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        cached = self._dotenv_cache
+        if cached is None or cached[0] != key:
+            cached = self._dotenv_cache = (key, _read_dotenv_settings(path))
+        return cached[1]
+
+    def _bind(self) -> _UnixServer:
+        path = self.socket_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            try:
+                DaemonClient(path, timeout=1.0).ping()
+            except DaemonUnavailable:
+                path.unlink()
+            else:
+                raise RuntimeError(f"A daemon is already listening on {path}")
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon = self  # type: ignore[attr-defined]
+        return server
+
+    def serve_forever(self) -> None:
+        """Load the pipeline, bind the socket and serve until shutdown."""
+        self.load()
+        self._server = self._bind()
+        logger.info(f"NLP2CMD daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def start_background(
+    socket_path: Optional[Union[str, Path]] = None,
+    log_path: Optional[Union[str, Path]] = None,
+    timeout: float = START_TIMEOUT,
+) -> dict[str, Any]:
+    """
+    Start a detached daemon process and wait until it answers a ping.
+
+    Returns the ping response.
+
+    Raises:
+        RuntimeError: The daemon did not come up within ``timeout``
+    """
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    log_path = Path(log_path) if log_path else socket_path.with_suffix(".log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    client = DaemonClient(socket_path, timeout=1.0)
+    with open(log_path, "ab") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "nlp2cmd.cli.main", "daemon", "run", "--socket", str(socket_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Daemon exited with code {proc.returncode}; see {log_path}")
+        try:
+            return client.ping()
+        except DaemonUnavailable:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"Daemon did not start within {timeout:.0f}s; see {log_path}")
+
+
+__all__ = [
+    "DaemonServer",
+    "WARMUP_QUERIES",
+    "start_background",
+]
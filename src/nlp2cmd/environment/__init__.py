@@ -3,18 +3,72 @@ Environment Analysis module for NLP2CMD.
 
 Provides system environment detection, tool availability checking,
 and context-aware command validation.
+
+Tool versions and service ports are probed concurrently (asyncio subprocesses
+and sockets) under one global deadline, and tool versions are cached on disk
+so unchanged binaries are never executed twice.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
 import platform
 import re
 import shutil
-import subprocess
+import signal
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from nlp2cmd.environment.tool_cache import (
+    BinaryStamp,
+    ToolInventoryCache,
+    default_tool_cache_path,
+)
+
+T = TypeVar("T")
+
+# Upper bound for a whole probe (all tools and services together)
+DEFAULT_PROBE_DEADLINE = 5.0
+# Simultaneous ``--version`` subprocesses
+DEFAULT_PROBE_CONCURRENCY = 8
+
+
+def _kill_process_tree(proc: asyncio.subprocess.Process) -> None:
+    """Kill a probe and anything it spawned (wrapper scripts keep pipes open)."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine from sync code, even when called inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: dict[str, Any] = {}
+
+    def runner() -> None:
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner, name="nlp2cmd-env-probe")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
 
 
 @dataclass
@@ -128,8 +182,30 @@ class EnvironmentAnalyzer:
         "nginx": {"port": 80},
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        tool_cache: Optional[ToolInventoryCache] = None,
+        deadline: float = DEFAULT_PROBE_DEADLINE,
+        max_concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            tool_cache: Tool version cache (default: ~/.nlp2cmd/tool_cache.json)
+            deadline: Seconds allowed for a whole tool/service probe
+            max_concurrency: Maximum simultaneous version subprocesses
+        """
         self._cache: dict[str, Any] = {}
+        self._tool_cache = tool_cache
+        self.deadline = deadline
+        self.max_concurrency = max(1, max_concurrency)
+
+    @property
+    def tool_cache(self) -> ToolInventoryCache:
+        if self._tool_cache is None:
+            self._tool_cache = ToolInventoryCache.load(default_tool_cache_path())
+        return self._tool_cache
 
     def analyze(self) -> dict[str, Any]:
         """
@@ -194,6 +270,134 @@ class EnvironmentAnalyzer:
         ]
         return {k: os.environ.get(k, "") for k in relevant if os.environ.get(k)}
 
+    def _tool_check(self, name: str) -> dict[str, Any]:
+        return self.TOOL_CHECKS.get(name, {"command": [name, "--version"]})
+
+    def _locate_tool(self, name: str, check: dict[str, Any]) -> ToolInfo:
+        """Resolve a tool on PATH and collect its config files (no subprocess)."""
+        info = ToolInfo(name=name, available=False)
+
+        path = shutil.which(name)
+        if not path:
+            cmd = check.get("command")
+            if isinstance(cmd, list) and cmd:
+                candidate = cmd[0]
+                if isinstance(candidate, str) and candidate and candidate != name:
+                    path = shutil.which(candidate)
+        if path:
+            info.available = True
+            info.path = path
+
+            for config_path in check.get("config_files", []):
+                expanded = Path(config_path).expanduser()
+                if expanded.exists():
+                    info.config_files.append(str(expanded))
+
+        return info
+
+    async def _read_version(
+        self,
+        command: list[str],
+        pattern: str,
+        deadline_at: float,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Run a version command and parse its output.
+
+        Returns:
+            ``(completed, version)``; ``completed`` is False when the
+            command could not finish before the deadline
+        """
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                return False, None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True,
+                )
+            except OSError:
+                return True, None
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), remaining)
+            except asyncio.TimeoutError:
+                _kill_process_tree(proc)
+                await proc.wait()
+                return False, None
+
+        if proc.returncode != 0:
+            return True, None
+        combined = stdout.decode(errors="replace") + stderr.decode(errors="replace")
+        match = re.search(pattern, combined)
+        return True, match.group(1) if match else None
+
+    async def detect_tools_async(
+        self,
+        tool_names: Optional[list[str]] = None,
+        deadline_at: Optional[float] = None,
+    ) -> dict[str, ToolInfo]:
+        """
+        Detect available tools, probing versions concurrently.
+
+        Args:
+            tool_names: List of tool names to check (default: all known tools)
+            deadline_at: Loop time by which probing must finish
+
+        Returns:
+            Dictionary mapping tool names to ToolInfo
+        """
+        if tool_names is None:
+            tool_names = list(self.TOOL_CHECKS.keys())
+        loop = asyncio.get_running_loop()
+        if deadline_at is None:
+            deadline_at = loop.time() + self.deadline
+
+        cache = self.tool_cache
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: dict[str, ToolInfo] = {}
+        probes: list[Awaitable[None]] = []
+
+        async def probe(info: ToolInfo, check: dict[str, Any], stamp: BinaryStamp) -> None:
+            command = check.get("command", [info.name, "--version"])
+            completed, version = await self._read_version(
+                command,
+                check.get("version_pattern", r"([\d.]+)"),
+                deadline_at,
+                semaphore,
+            )
+            info.version = version
+            if completed:
+                cache.put(info.name, info.path or "", stamp, command, version)
+
+        for name in tool_names:
+            check = self._tool_check(name)
+            info = self._locate_tool(name, check)
+            results[name] = info
+            if not info.available or not info.path:
+                continue
+
+            stamp = BinaryStamp.of(info.path)
+            if stamp is None:
+                continue
+            command = check.get("command", [name, "--version"])
+            hit, version = cache.get(name, info.path, stamp, command)
+            if hit:
+                info.version = version
+            else:
+                probes.append(probe(info, check, stamp))
+
+        if probes:
+            await asyncio.gather(*probes)
+            cache.save()
+
+        return results
+
     def detect_tools(
         self,
         tool_names: Optional[list[str]] = None,
@@ -207,55 +411,74 @@ class EnvironmentAnalyzer:
         Returns:
             Dictionary mapping tool names to ToolInfo
         """
+        return _run_sync(self.detect_tools_async(tool_names))
+
+    def cached_tools(
+        self,
+        tool_names: Optional[list[str]] = None,
+    ) -> dict[str, ToolInfo]:
+        """
+        Detect available tools without running any subprocess.
+
+        Versions come from the tool cache only; tools that were never probed
+        (or whose binary changed) are reported with ``version=None``.
+        """
         if tool_names is None:
             tool_names = list(self.TOOL_CHECKS.keys())
 
+        cache = self.tool_cache
         results = {}
-
         for name in tool_names:
-            check = self.TOOL_CHECKS.get(name, {"command": [name, "--version"]})
-            info = ToolInfo(name=name, available=False)
-
-            # Check if tool exists
-            path = shutil.which(name)
-            if not path:
-                cmd = check.get("command")
-                if isinstance(cmd, list) and cmd:
-                    candidate = cmd[0]
-                    if isinstance(candidate, str) and candidate and candidate != name:
-                        path = shutil.which(candidate)
-            if path:
-                info.available = True
-                info.path = path
-
-                # Get version
-                try:
-                    cmd = check.get("command", [name, "--version"])
-                    output = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                    )
+            check = self._tool_check(name)
+            info = self._locate_tool(name, check)
+            stamp = BinaryStamp.of(info.path) if info.path else None
+            if stamp is not None:
+                command = check.get("command", [name, "--version"])
+                _, info.version = cache.get(name, info.path or "", stamp, command)
+            results[name] = info
+        return results
+
+    async def check_services_async(
+        self,
+        deadline_at: Optional[float] = None,
+    ) -> dict[str, ServiceInfo]:
+        """
+        Check status of common services concurrently.
 
-                    if output.returncode == 0:
-                        combined_output = output.stdout + output.stderr
-                        pattern = check.get("version_pattern", r"([\d.]+)")
-                        match = re.search(pattern, combined_output)
-                        if match:
-                            info.version = match.group(1)
+        Args:
+            deadline_at: Loop time by which probing must finish
+
+        Returns:
+            Dictionary mapping service names to ServiceInfo
+        """
+        loop = asyncio.get_running_loop()
+        if deadline_at is None:
+            deadline_at = loop.time() + self.deadline
+
+        results: dict[str, ServiceInfo] = {}
+        probes: list[Awaitable[None]] = []
 
-                except (subprocess.TimeoutExpired, Exception):
-                    pass
+        async def probe_port(info: ServiceInfo, port: int) -> None:
+            info.reachable = await self._check_port_async("localhost", port, deadline_at)
+            info.running = info.reachable
 
-                # Check config files
-                for config_path in check.get("config_files", []):
-                    expanded = Path(config_path).expanduser()
-                    if expanded.exists():
-                        info.config_files.append(str(expanded))
+        async def probe_docker(info: ServiceInfo) -> None:
+            info.running = await self._check_docker_daemon_async(deadline_at)
 
+        for name, config in self.SERVICE_CHECKS.items():
+            port = config.get("port")
+            info = ServiceInfo(name=name, running=False, port=port)
             results[name] = info
 
+            # Check by port
+            if port:
+                probes.append(probe_port(info, port))
+
+            # Special check for Docker
+            if name == "docker_daemon":
+                probes.append(probe_docker(info))
+
+        await asyncio.gather(*probes)
         return results
 
     def check_services(self) -> dict[str, ServiceInfo]:
@@ -265,51 +488,103 @@ class EnvironmentAnalyzer:
         Returns:
             Dictionary mapping service names to ServiceInfo
         """
-        results = {}
+        return _run_sync(self.check_services_async())
 
-        for name, config in self.SERVICE_CHECKS.items():
-            info = ServiceInfo(
-                name=name,
-                running=False,
-                port=config.get("port"),
-            )
+    async def probe_async(
+        self,
+        tool_names: Optional[list[str]] = None,
+    ) -> tuple[dict[str, ToolInfo], dict[str, ServiceInfo]]:
+        """Detect tools and check services together under one deadline."""
+        deadline_at = asyncio.get_running_loop().time() + self.deadline
+        tools, services = await asyncio.gather(
+            self.detect_tools_async(tool_names, deadline_at),
+            self.check_services_async(deadline_at),
+        )
+        return tools, services
 
-            port = config.get("port")
+    def probe(
+        self,
+        tool_names: Optional[list[str]] = None,
+    ) -> tuple[dict[str, ToolInfo], dict[str, ServiceInfo]]:
+        """
+        Detect tools and check services.
 
-            # Check by port
-            if port:
-                info.reachable = self._check_port("localhost", port)
-                info.running = info.reachable
+        Returns:
+            Tuple of (tools, services)
+        """
+        return _run_sync(self.probe_async(tool_names))
 
-            # Special check for Docker
-            if name == "docker_daemon":
-                info.running = self._check_docker_daemon()
+    def refresh_in_background(
+        self,
+        tool_names: Optional[list[str]] = None,
+        callback: Optional[Callable[[dict[str, ToolInfo], dict[str, ServiceInfo]], None]] = None,
+    ) -> Future:
+        """
+        Run ``probe`` on a daemon thread.
 
-            results[name] = info
+        Args:
+            tool_names: List of tool names to check (default: all known tools)
+            callback: Called with ``(tools, services)`` when probing completes
 
-        return results
+        Returns:
+            Future resolving to ``(tools, services)``
+        """
+        future: Future = Future()
 
-    def _check_port(self, host: str, port: int) -> bool:
-        """Check if a port is open."""
-        import socket
+        def worker() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                tools, services = self.probe(tool_names)
+                if callback is not None:
+                    callback(tools, services)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result((tools, services))
 
+        threading.Thread(target=worker, name="nlp2cmd-env-refresh", daemon=True).start()
+        return future
+
+    async def _check_port_async(self, host: str, port: int, deadline_at: float) -> bool:
+        """Check if a port is open."""
+        timeout = min(1.0, deadline_at - asyncio.get_running_loop().time())
+        if timeout <= 0:
+            return False
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(1)
-                return s.connect_ex((host, port)) == 0
-        except Exception:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except (asyncio.TimeoutError, OSError):
             return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
 
-    def _check_docker_daemon(self) -> bool:
+    async def _check_docker_daemon_async(self, deadline_at: float) -> bool:
         """Check if Docker daemon is running."""
+        if not shutil.which("docker"):
+            return False
+        timeout = deadline_at - asyncio.get_running_loop().time()
+        if timeout <= 0:
+            return False
         try:
-            result = subprocess.run(
-                ["docker", "info"],
-                capture_output=True,
-                timeout=5,
+            proc = await asyncio.create_subprocess_exec(
+                "docker",
+                "info",
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=True,
             )
-            return result.returncode == 0
-        except Exception:
+        except OSError:
+            return False
+        try:
+            return await asyncio.wait_for(proc.wait(), timeout) == 0
+        except asyncio.TimeoutError:
+            _kill_process_tree(proc)
+            await proc.wait()
             return False
 
     def find_config_files(
@@ -429,8 +704,7 @@ class EnvironmentAnalyzer:
         Returns:
             EnvironmentReport with all gathered information
         """
-        tools = self.detect_tools()
-        services = self.check_services()
+        tools, services = self.probe()
         config_files = self.find_config_files(Path.cwd())
 
         recommendations = self._generate_recommendations(tools, services)
@@ -517,8 +791,10 @@ class EnvironmentAnalyzer:
 
 
 __all__ = [
+    "DEFAULT_PROBE_DEADLINE",
     "EnvironmentAnalyzer",
     "EnvironmentReport",
     "ToolInfo",
     "ServiceInfo",
+    "ToolInventoryCache",
 ]
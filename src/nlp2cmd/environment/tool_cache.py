@@ -0,0 +1,177 @@
+"""
+Persistent tool-inventory cache for NLP2CMD.
+
+Running ``<tool> --version`` for every known tool is the slowest part of
+environment analysis. The result only changes when the binary itself changes,
+so versions are stored in ``~/.nlp2cmd/tool_cache.json`` keyed by the binary
+path and validated against its mtime, inode and size. Unchanged tools are
+never executed again.
+
+Environment:
+    NLP2CMD_TOOL_CACHE: Cache file path, or ``0``/``off`` to keep it in memory only
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = "nlp2cmd.tool_cache"
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILENAME = "tool_cache.json"
+
+_DISABLED_VALUES = {"0", "false", "no", "n", "off"}
+
+
+def default_tool_cache_path() -> Optional[Path]:
+    """Resolve the cache path; None when disabled via NLP2CMD_TOOL_CACHE."""
+    explicit = str(os.environ.get("NLP2CMD_TOOL_CACHE") or "").strip()
+    if explicit.lower() in _DISABLED_VALUES:
+        return None
+    if explicit:
+        return Path(explicit).expanduser()
+    return Path.home() / ".nlp2cmd" / DEFAULT_CACHE_FILENAME
+
+
+@dataclass(frozen=True)
+class BinaryStamp:
+    """Identity of an executable on disk (symlinks are followed)."""
+
+    mtime_ns: int
+    inode: int
+    size: int
+
+    @classmethod
+    def of(cls, path: Union[str, Path]) -> Optional["BinaryStamp"]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return cls(mtime_ns=st.st_mtime_ns, inode=st.st_ino, size=st.st_size)
+
+
+@dataclass
+class _CacheEntry:
+    stamp: BinaryStamp
+    command: list[str]
+    version: Optional[str]
+
+
+class ToolInventoryCache:
+    """Tool versions keyed by ``(tool name, binary path)``."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._entries: dict[str, _CacheEntry] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, binary: str) -> str:
+        return f"{name}\0{binary}"
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> "ToolInventoryCache":
+        """Load the cache from disk (the default path when ``path`` is None)."""
+        target = Path(path) if path is not None else default_tool_cache_path()
+        cache = cls(path=target)
+        if target is None or not target.exists():
+            return cache
+        try:
+            data = json.loads(target.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.debug(f"Could not read tool cache {target}: {e}")
+            return cache
+        if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+            return cache
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for raw in data.get("tools") or []:
+            try:
+                entry = _CacheEntry(
+                    stamp=BinaryStamp(**raw["stamp"]),
+                    command=[str(part) for part in raw["command"]],
+                    version=raw.get("version"),
+                )
+                cache._entries[cls._key(str(raw["name"]), str(raw["binary"]))] = entry
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cache
+
+    def get(
+        self,
+        name: str,
+        binary: str,
+        stamp: BinaryStamp,
+        command: list[str],
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Look up a cached version.
+
+        Returns:
+            ``(hit, version)``; ``hit`` is False when the binary or the
+            probe command changed since the version was recorded
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(name, binary))
+        if entry is None or entry.stamp != stamp or entry.command != list(command):
+            return False, None
+        return True, entry.version
+
+    def put(
+        self,
+        name: str,
+        binary: str,
+        stamp: BinaryStamp,
+        command: list[str],
+        version: Optional[str],
+    ) -> None:
+        with self._lock:
+            self._entries[self._key(name, binary)] = _CacheEntry(
+                stamp=stamp, command=list(command), version=version
+            )
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self) -> Optional[Path]:
+        """Write the cache if it changed; a no-op for in-memory caches."""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return None
+            tools = []
+            for key, entry in sorted(self._entries.items()):
+                name, binary = key.split("\0", 1)
+                tools.append({
+                    "name": name,
+                    "binary": binary,
+                    "stamp": asdict(entry.stamp),
+                    "command": entry.command,
+                    "version": entry.version,
+                })
+            payload = {"format": CACHE_FORMAT, "version": CACHE_VERSION, "tools": tools}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.debug(f"Could not write tool cache {self.path}: {e}")
+                return None
+            self._dirty = False
+            return self.path
+
+
+__all__ = [
+    "BinaryStamp",
+    "ToolInventoryCache",
+    "default_tool_cache_path",
+]
@@ -6,16 +6,27 @@ Contains executors for different DSL types:
 - Browser automation (Playwright)
 - Keyboard shortcuts
 - Interactive runner with error recovery
+- Concurrent command batches (asyncio)
 """
 
+from nlp2cmd.execution.async_runner import AsyncExecutionRunner, BatchResult, CommandSpec
 from nlp2cmd.execution.browser import BrowserExecutor, open_url, search_web
+from nlp2cmd.execution.browser_pool import BrowserPool, get_browser_pool
+from nlp2cmd.execution.capture import OutputBuffer, stream_process
 from nlp2cmd.execution.runner import ExecutionRunner, ExecutionResult, RecoveryContext
 
 __all__ = [
     "BrowserExecutor",
     "open_url",
     "search_web",
+    "BrowserPool",
+    "get_browser_pool",
+    "OutputBuffer",
+    "stream_process",
     "ExecutionRunner",
     "ExecutionResult",
     "RecoveryContext",
+    "AsyncExecutionRunner",
+    "BatchResult",
+    "CommandSpec",
 ]
@@ -0,0 +1,393 @@
+"""
+Asyncio execution engine for batches of shell commands.
+
+``AsyncExecutionRunner`` runs commands with ``asyncio.create_subprocess_shell``
+under a concurrency limit, with per-command timeouts and cancellation, and
+returns one ``ExecutionResult`` per command in input order. Output goes
+through the same bounded capture as ``ExecutionRunner`` and nothing is
+printed, so concurrent commands never interleave on the terminal.
+
+Ordering comes from ``CommandSpec.depends_on_previous``: a dependent command
+starts only after the one before it finished successfully. Commands without
+the flag run as soon as a slot is free. ``RuleBasedPipeline.process_steps()``
+sets ``metadata["depends_on_previous"]`` on steps that continue the previous
+sentence ("then", "następnie", "if ..."); ``specs_from_steps()`` turns those
+steps into specs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Iterable, Optional, TypeVar, Union
+
+from nlp2cmd.execution.capture import DEFAULT_MAX_OUTPUT_BYTES, READ_CHUNK_BYTES, ErrorScanner, OutputBuffer
+from nlp2cmd.execution.runner import ExecutionResult
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def _kill_process_tree(proc: asyncio.subprocess.Process) -> None:
+    """Kill a shell and anything it spawned (children keep the pipes open)."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@dataclass
+class CommandSpec:
+    """One command of a batch."""
+
+    command: str
+    timeout: Optional[float] = None
+    depends_on_previous: bool = False
+    label: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Results of a batch, in input order."""
+
+    results: list[ExecutionResult] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(r.success for r in self.results)
+
+    @property
+    def failed(self) -> list[ExecutionResult]:
+        return [r for r in self.results if not r.success]
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+def specs_from_steps(steps: Iterable[Any], timeout: Optional[float] = None) -> list[CommandSpec]:
+    """
+    Build specs from ``process_steps()`` results.
+
+    Steps without an executable shell command (empty, comment-only, SQL) are
+    left out; a dependent step following a left-out step still waits for the
+    last included one.
+    """
+    specs: list[CommandSpec] = []
+    for i, step in enumerate(steps, 1):
+        cmd = str(getattr(step, "command", "") or "").strip()
+        if not cmd or cmd.startswith("#") or getattr(step, "domain", None) == "sql":
+            continue
+        metadata = getattr(step, "metadata", None) or {}
+        specs.append(
+            CommandSpec(
+                command=cmd,
+                timeout=timeout,
+                depends_on_previous=bool(metadata.get("depends_on_previous")),
+                label=f"step {i}",
+            )
+        )
+    return specs
+
+
+class AsyncExecutionRunner:
+    """
+    Run shell commands concurrently.
+
+    Example:
+        runner = AsyncExecutionRunner(max_concurrency=4, timeout=30)
+        batch = runner.run_batch(["systemctl is-active nginx", "systemctl is-active redis"])
+        for result in batch:
+            print(result.command, result.exit_code)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
+        env: Optional[dict[str, str]] = None,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        record_history: bool = True,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_concurrency: Maximum number of commands running at once
+            timeout: Default per-command timeout in seconds
+            cwd: Working directory for all commands
+            env: Environment for all commands
+            max_output_bytes: Per-stream capture cap (head and tail are kept)
+            record_history: Record commands in the global command history
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self.cwd = cwd
+        self.env = env
+        self.max_output_bytes = max_output_bytes
+        self._cmd_history = None
+        self._history_lock = threading.Lock()
+        if record_history:
+            try:
+                from nlp2cmd.history.tracker import get_global_history
+                self._cmd_history = get_global_history()
+            except Exception:
+                pass
+
+    async def run(self, command: str, timeout: Optional[float] = None) -> ExecutionResult:
+        """
+        Run one command.
+
+        Cancelling the awaiting task kills the command (and its children)
+        before the cancellation propagates.
+        """
+        result = await self._execute(command, timeout)
+        await self._record_history([result])
+        return result
+
+    async def _execute(self, command: str, timeout: Optional[float]) -> ExecutionResult:
+        timeout = self.timeout if timeout is None else timeout
+        started = time.time()
+        spawn = asyncio.ensure_future(asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=self.env,
+            start_new_session=True,
+        ))
+        try:
+            proc = await asyncio.shield(spawn)
+        except asyncio.CancelledError:
+            # Cancelled while spawning: the process may still start; kill it.
+            try:
+                proc = await spawn
+            except Exception:
+                raise asyncio.CancelledError from None
+            _kill_process_tree(proc)
+            await proc.wait()
+            raise
+        except Exception as e:
+            return ExecutionResult(
+                success=False,
+                command=command,
+                exit_code=-1,
+                stderr=str(e),
+                duration_ms=(time.time() - started) * 1000,
+                error_context=str(e),
+            )
+
+        stdout = OutputBuffer(self.max_output_bytes, name="stdout")
+        stderr = OutputBuffer(self.max_output_bytes, name="stderr")
+        scanners = {"stdout": ErrorScanner(), "stderr": ErrorScanner()}
+
+        async def pump(stream: asyncio.StreamReader, buf: OutputBuffer) -> None:
+            while True:
+                data = await stream.read(READ_CHUNK_BYTES)
+                if not data:
+                    return
+                buf.write(data)
+                scanners[buf.name].feed(data)
+
+        async def communicate() -> int:
+            await asyncio.gather(pump(proc.stdout, stdout), pump(proc.stderr, stderr))
+            return await proc.wait()
+
+        timed_out = False
+        try:
+            exit_code = await asyncio.wait_for(communicate(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill_process_tree(proc)
+            exit_code = await proc.wait()
+        except asyncio.CancelledError:
+            _kill_process_tree(proc)
+            await proc.wait()
+            raise
+
+        duration_ms = (time.time() - started) * 1000
+        err_text = stderr.getvalue()
+        error_patterns = scanners["stderr"].matches if stderr.total_bytes else scanners["stdout"].matches
+        if timed_out:
+            return ExecutionResult(
+                success=False,
+                command=command,
+                exit_code=-1,
+                stdout=stdout.getvalue(),
+                stderr=err_text or "Command timed out",
+                duration_ms=duration_ms,
+                error_context="Timeout",
+                error_patterns=error_patterns,
+                output_truncated=stdout.truncated or stderr.truncated,
+            )
+
+        success = exit_code == 0
+        return ExecutionResult(
+            success=success,
+            command=command,
+            exit_code=exit_code,
+            stdout=stdout.getvalue(),
+            stderr=err_text,
+            duration_ms=duration_ms,
+            error_context=err_text if not success else None,
+            error_patterns=error_patterns,
+            output_truncated=stdout.truncated or stderr.truncated,
+        )
+
+    async def run_many(
+        self,
+        commands: Iterable[Union[str, CommandSpec]],
+        fail_fast: bool = False,
+    ) -> BatchResult:
+        """
+        Run a batch concurrently.
+
+        Args:
+            commands: Command strings (independent) or CommandSpecs
+            fail_fast: Cancel everything still pending or running after the
+                first failure
+
+        Returns:
+            BatchResult with one ExecutionResult per command, in input order.
+            Skipped and cancelled commands have ``exit_code=-1`` and
+            ``error_context`` "Skipped" / "Cancelled".
+        """
+        specs = [c if isinstance(c, CommandSpec) else CommandSpec(command=c) for c in commands]
+        started = time.time()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: list[asyncio.Task] = []
+        executed: list[ExecutionResult] = []
+
+        async def run_spec(index: int, spec: CommandSpec) -> ExecutionResult:
+            if spec.depends_on_previous and index > 0:
+                try:
+                    previous = await asyncio.shield(tasks[index - 1])
+                except asyncio.CancelledError:
+                    if not tasks[index - 1].cancelled():
+                        raise
+                    previous = None
+                if previous is None or not previous.success:
+                    return _not_run(spec.command, "Skipped", "previous command did not succeed")
+            async with semaphore:
+                result = await self._execute(spec.command, spec.timeout)
+            executed.append(result)
+            return result
+
+        for index, spec in enumerate(specs):
+            tasks.append(asyncio.create_task(run_spec(index, spec)))
+
+        if fail_fast:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(
+                    not t.cancelled() and (t.exception() is not None or not t.result().success)
+                    for t in done
+                ):
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    break
+        else:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for spec, task in zip(specs, tasks):
+            if task.cancelled():
+                results.append(_not_run(spec.command, "Cancelled", "cancelled after an earlier failure"))
+            elif task.exception() is not None:
+                e = task.exception()
+                results.append(_not_run(spec.command, str(e), str(e)))
+            else:
+                results.append(task.result())
+        # Recorded once for the whole batch, in completion order.
+        await self._record_history(executed)
+        return BatchResult(results=results, duration_ms=(time.time() - started) * 1000)
+
+    async def run_steps(self, steps: Iterable[Any], fail_fast: bool = False) -> BatchResult:
+        """Run the executable ``process_steps()`` results, honouring their dependencies."""
+        return await self.run_many(specs_from_steps(steps, timeout=self.timeout), fail_fast=fail_fast)
+
+    def run_batch(
+        self,
+        commands: Iterable[Union[str, CommandSpec]],
+        fail_fast: bool = False,
+    ) -> BatchResult:
+        """Synchronous ``run_many()``; safe to call inside a running event loop."""
+        return _run_sync(self.run_many(list(commands), fail_fast=fail_fast))
+
+    async def _record_history(self, results: list[ExecutionResult]) -> None:
+        """Record results in the command history; each record rewrites the file, so off the loop."""
+        if self._cmd_history and results:
+            await asyncio.to_thread(self._record_sync, list(results))
+
+    def _record_sync(self, results: list[ExecutionResult]) -> None:
+        with self._history_lock:
+            for result in results:
+                try:
+                    self._cmd_history.record(
+                        query=result.command,
+                        dsl="shell",
+                        command=result.command,
+                        success=result.success,
+                        exit_code=result.exit_code,
+                        duration_ms=result.duration_ms,
+                        error=result.stderr if not result.success else None,
+                    )
+                except Exception:
+                    pass
+
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine from sync code, even when called inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: dict[str, Any] = {}
+
+    def runner() -> None:
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner, name="nlp2cmd-batch")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def _not_run(command: str, context: str, reason: str) -> ExecutionResult:
+    return ExecutionResult(
+        success=False,
+        command=command,
+        exit_code=-1,
+        stderr=f"Not run: {reason}",
+        error_context=context,
+    )
+
+
+__all__ = [
+    "AsyncExecutionRunner",
+    "BatchResult",
+    "CommandSpec",
+    "DEFAULT_MAX_CONCURRENCY",
+    "specs_from_steps",
+]
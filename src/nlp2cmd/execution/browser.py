@@ -3,16 +3,18 @@ Browser automation executor for NLP2CMD.
 
 Provides functionality to execute browser automation commands using:
 1. System commands (xdg-open, open, start) for simple URL opening
-2. Playwright for advanced browser automation (type, click, navigate)
+2. Playwright for advanced browser automation (type, click, navigate),
+   on a page borrowed from the shared browser pool
 """
 
 from __future__ import annotations
 
+import asyncio
 import platform
 import subprocess
 import webbrowser
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from urllib.parse import quote_plus
 
 
@@ -138,37 +140,34 @@ class BrowserExecutor:
         """
         self.use_playwright = use_playwright
         self.headless = headless
-        self._browser = None
-        self._page = None
-        self._playwright = None
+        self._lease = None
     
     async def _ensure_playwright(self):
-        """Initialize Playwright browser if not already done."""
-        if self._browser is not None:
+        """Pin a page from the shared browser pool if not already done."""
+        if self._lease is not None:
             return
         
         try:
-            from playwright.async_api import async_playwright
-            
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(
-                headless=self.headless
-            )
-            self._page = await self._browser.new_page()
+            import playwright.sync_api  # noqa: F401
         except ImportError:
             raise RuntimeError(
                 "Playwright is not installed. Install with: pip install playwright && playwright install"
             )
+        
+        from nlp2cmd.execution.browser_pool import get_browser_pool
+        
+        self._lease = get_browser_pool(headless=self.headless).lease()
+    
+    async def _on_page(self, fn: Callable[[Any], Any]) -> Any:
+        """Run ``fn(page)`` on the pinned page (on the pool's browser thread)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._lease.run, fn)
     
     async def close(self):
-        """Close the browser and cleanup."""
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
-            self._page = None
-        if self._playwright:
-            await self._playwright.stop()
-            self._playwright = None
+        """Release the pinned page back to the shared browser pool."""
+        if self._lease is not None:
+            self._lease.release()
+            self._lease = None
     
     def execute_simple(self, action: str, params: dict[str, Any]) -> BrowserResult:
         """
@@ -240,7 +239,7 @@ class BrowserExecutor:
         try:
             if action == "navigate":
                 url = normalize_url(params.get("url", ""))
-                await self._page.goto(url)
+                await self._on_page(lambda page: page.goto(url))
                 return BrowserResult(
                     success=True,
                     action=action,
@@ -253,9 +252,9 @@ class BrowserExecutor:
                 selector = params.get("selector", "")
                 
                 if selector:
-                    await self._page.fill(selector, text)
+                    await self._on_page(lambda page: page.fill(selector, text))
                 else:
-                    await self._page.keyboard.type(text)
+                    await self._on_page(lambda page: page.keyboard.type(text))
                 
                 return BrowserResult(
                     success=True,
@@ -272,7 +271,7 @@ class BrowserExecutor:
                         error="No selector provided for click",
                     )
                 
-                await self._page.click(selector)
+                await self._on_page(lambda page: page.click(selector))
                 return BrowserResult(
                     success=True,
                     action=action,
@@ -288,7 +287,7 @@ class BrowserExecutor:
                         error="No key provided for press",
                     )
                 
-                await self._page.keyboard.press(key)
+                await self._on_page(lambda page: page.keyboard.press(key))
                 return BrowserResult(
                     success=True,
                     action=action,
@@ -297,7 +296,7 @@ class BrowserExecutor:
             
             elif action == "screenshot":
                 path = params.get("path", "screenshot.png")
-                await self._page.screenshot(path=path)
+                await self._on_page(lambda page: page.screenshot(path=path))
                 return BrowserResult(
                     success=True,
                     action=action,
@@ -0,0 +1,444 @@
+"""
+Shared Playwright browser pool.
+
+Launching Chromium dominates the latency of a single web action, so the
+pipeline runner, the web schema extractor and ``BrowserExecutor`` borrow pages
+from a process-wide pool instead of launching a browser per call:
+
+- Each worker thread owns one persistent browser. Playwright's sync API
+  objects are bound to the thread that created them, so jobs are callables
+  run on the owning worker (``pool.run(fn, url=...)``). The number of workers
+  is the concurrency limit.
+- Contexts are kept per (domain, context options). Jobs for the same domain
+  are routed to the worker holding that context, so cookies and storage
+  survive between calls.
+- Pages are recycled: an idle page of the context is reused (up to
+  ``max_page_uses`` times), and a page is discarded when a job raised.
+- Workers reap contexts idle for ``idle_timeout`` seconds and shut their
+  browser down once nothing is left; the next job relaunches it.
+
+``lease()`` pins one page for a sequence of jobs (for callers that navigate
+and then act on the same page).
+
+Environment:
+    NLP2CMD_BROWSER_POOL_SIZE: Number of browsers (default: 2)
+    NLP2CMD_BROWSER_IDLE_TIMEOUT: Seconds before idle contexts/browsers are closed (default: 120)
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_IDLE_TIMEOUT = 120.0
+DEFAULT_MAX_PAGE_USES = 50
+# Idle pages kept per context
+MAX_IDLE_PAGES = 2
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def context_key(url: Optional[str], context_options: Optional[dict[str, Any]] = None) -> tuple[str, str]:
+    """Pool key: (domain, canonical context options)."""
+    parsed = urlparse(str(url or ""))
+    domain = parsed.netloc.lower() or parsed.scheme.lower()
+    options = json.dumps(context_options or {}, sort_keys=True, default=str)
+    return domain, options
+
+
+@dataclass
+class _PooledPage:
+    page: Any
+    uses: int = 0
+
+
+@dataclass
+class _ContextSlot:
+    context: Any
+    idle: list[_PooledPage] = field(default_factory=list)
+    leased: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Job:
+    fn: Optional[Callable[[Any], Any]]
+    key: tuple[str, str]
+    options: dict[str, Any]
+    future: Future
+    lease_id: Optional[int] = None
+    release: bool = False
+
+
+class _Worker:
+    """One browser and the thread that drives it."""
+
+    def __init__(self, pool: "BrowserPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self.pending = 0
+        self.keys: set[tuple[str, str]] = set()
+        self.launches = 0
+        self._playwright = None
+        self._browser = None
+        self._contexts: dict[tuple[str, str], _ContextSlot] = {}
+        self._leases: dict[int, tuple[tuple[str, str], _PooledPage]] = {}
+        self._last_activity = time.monotonic()
+        self.thread = threading.Thread(target=self._loop, name=f"nlp2cmd-browser-{index}", daemon=True)
+        self.thread.start()
+
+    def _loop(self) -> None:
+        try:
+            while True:
+                try:
+                    job = self.jobs.get(timeout=self.pool.reap_interval)
+                except queue.Empty:
+                    self._reap()
+                    continue
+                if job is None:
+                    return
+                try:
+                    if job.release:
+                        self._release(job.lease_id)
+                        job.future.set_result(None)
+                    else:
+                        self._execute(job)
+                finally:
+                    self._last_activity = time.monotonic()
+                    with self.pool._lock:
+                        self.pending -= 1
+        finally:
+            self._shutdown_browser()
+
+    def _ensure_browser(self) -> Any:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        self._shutdown_browser()
+        from playwright.sync_api import sync_playwright  # type: ignore
+
+        self._playwright = sync_playwright().start()
+        launcher = getattr(self._playwright, self.pool.browser_type)
+        self._browser = launcher.launch(headless=self.pool.headless)
+        self.launches += 1
+        logger.debug(f"Browser pool worker {self.index} launched {self.pool.browser_type}")
+        return self._browser
+
+    def _slot(self, key: tuple[str, str], options: dict[str, Any]) -> _ContextSlot:
+        slot = self._contexts.get(key)
+        if slot is None:
+            slot = _ContextSlot(context=self._ensure_browser().new_context(**options))
+            self._contexts[key] = slot
+            with self.pool._lock:
+                self.keys.add(key)
+        slot.last_used = time.monotonic()
+        return slot
+
+    def _acquire(self, slot: _ContextSlot) -> _PooledPage:
+        while slot.idle:
+            pooled = slot.idle.pop()
+            if not pooled.page.is_closed():
+                return pooled
+        return _PooledPage(page=slot.context.new_page())
+
+    def _recycle(self, slot: _ContextSlot, pooled: _PooledPage, ok: bool) -> None:
+        pooled.uses += 1
+        if ok and pooled.uses < self.pool.max_page_uses and len(slot.idle) < MAX_IDLE_PAGES and not pooled.page.is_closed():
+            slot.idle.append(pooled)
+            return
+        try:
+            pooled.page.close()
+        except Exception:
+            pass
+
+    def _execute(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            if self._browser is not None and not self._browser.is_connected():
+                # Browser crashed or was closed: everything it held is gone.
+                self._forget_contexts()
+            if job.lease_id is not None and job.lease_id in self._leases:
+                key, pooled = self._leases[job.lease_id]
+                slot = self._slot(key, job.options)
+                if pooled.page.is_closed():
+                    pooled = _PooledPage(page=slot.context.new_page())
+                    self._leases[job.lease_id] = (key, pooled)
+                job.future.set_result(job.fn(pooled.page))
+                return
+
+            slot = self._slot(job.key, job.options)
+            pooled = self._acquire(slot)
+            if job.lease_id is not None:
+                slot.leased += 1
+                self._leases[job.lease_id] = (job.key, pooled)
+                job.future.set_result(job.fn(pooled.page))
+                return
+
+            ok = False
+            try:
+                result = job.fn(pooled.page)
+                ok = True
+            finally:
+                self._recycle(slot, pooled, ok)
+                slot.last_used = time.monotonic()
+            job.future.set_result(result)
+        except BaseException as e:
+            job.future.set_exception(e)
+
+    def _release(self, lease_id: Optional[int]) -> None:
+        entry = self._leases.pop(lease_id, None)
+        if entry is None:
+            return
+        key, pooled = entry
+        slot = self._contexts.get(key)
+        if slot is None:
+            return
+        slot.leased -= 1
+        slot.last_used = time.monotonic()
+        self._recycle(slot, pooled, True)
+
+    def _reap(self) -> None:
+        now = time.monotonic()
+        timeout = self.pool.idle_timeout
+        for key, slot in list(self._contexts.items()):
+            if slot.leased == 0 and now - slot.last_used >= timeout:
+                self._close_context(key, slot)
+        if self._browser is not None and not self._contexts and now - self._last_activity >= timeout:
+            logger.debug(f"Browser pool worker {self.index} idle, closing browser")
+            self._shutdown_browser()
+
+    def _close_context(self, key: tuple[str, str], slot: _ContextSlot) -> None:
+        self._contexts.pop(key, None)
+        with self.pool._lock:
+            self.keys.discard(key)
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+
+    def _forget_contexts(self) -> None:
+        self._contexts.clear()
+        self._leases.clear()
+        with self.pool._lock:
+            self.keys.clear()
+
+    def _shutdown_browser(self) -> None:
+        for key, slot in list(self._contexts.items()):
+            self._close_context(key, slot)
+        self._leases.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    @property
+    def browser_running(self) -> bool:
+        return self._browser is not None
+
+
+class PageLease:
+    """A page pinned for a sequence of jobs; release it (or use ``with``) when done."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, pool: "BrowserPool", worker: _Worker, key: tuple[str, str], options: dict[str, Any]):
+        self.pool = pool
+        self.worker = worker
+        self.key = key
+        self.options = options
+        self.lease_id = next(self._ids)
+        self.released = False
+
+    def run(self, fn: Callable[[Any], T], timeout: Optional[float] = None) -> T:
+        if self.released:
+            raise RuntimeError("Page lease already released")
+        return self.pool._submit(self.worker, fn, self.key, self.options, self.lease_id).result(timeout)
+
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self.pool._submit(self.worker, None, self.key, self.options, self.lease_id, release=True)
+
+    def __enter__(self) -> "PageLease":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class BrowserPool:
+    """Persistent browsers with per-domain contexts and recycled pages."""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        max_browsers: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_page_uses: int = DEFAULT_MAX_PAGE_USES,
+        browser_type: str = "chromium",
+    ):
+        """
+        Initialize the pool (browsers are launched on first use).
+
+        Args:
+            headless: Launch browsers headless
+            max_browsers: Browsers (and concurrent jobs) at most
+                (default: NLP2CMD_BROWSER_POOL_SIZE or 2)
+            idle_timeout: Seconds before an unused context, and then the
+                browser, is closed (default: NLP2CMD_BROWSER_IDLE_TIMEOUT or 120)
+            max_page_uses: Jobs served by one page before it is replaced
+            browser_type: Playwright browser type name
+        """
+        if max_browsers is None:
+            max_browsers = int(_env_number("NLP2CMD_BROWSER_POOL_SIZE", DEFAULT_POOL_SIZE))
+        if idle_timeout is None:
+            idle_timeout = _env_number("NLP2CMD_BROWSER_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)
+        self.headless = headless
+        self.max_browsers = max(1, int(max_browsers))
+        self.idle_timeout = max(0.1, float(idle_timeout))
+        self.reap_interval = min(5.0, self.idle_timeout / 2)
+        self.max_page_uses = max(1, int(max_page_uses))
+        self.browser_type = browser_type
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _pick_worker(self, key: tuple[str, str]) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            for worker in self._workers:
+                if key in worker.keys:
+                    return worker
+            idle = [w for w in self._workers if w.pending == 0]
+            if idle:
+                return idle[0]
+            if len(self._workers) < self.max_browsers:
+                worker = _Worker(self, len(self._workers))
+                self._workers.append(worker)
+                return worker
+            return min(self._workers, key=lambda w: w.pending)
+
+    def _submit(
+        self,
+        worker: _Worker,
+        fn: Optional[Callable[[Any], Any]],
+        key: tuple[str, str],
+        options: dict[str, Any],
+        lease_id: Optional[int] = None,
+        release: bool = False,
+    ) -> Future:
+        future: Future = Future()
+        with self._lock:
+            worker.pending += 1
+        worker.jobs.put(_Job(fn=fn, key=key, options=options, future=future, lease_id=lease_id, release=release))
+        return future
+
+    def run(
+        self,
+        fn: Callable[[Any], T],
+        url: Optional[str] = None,
+        context_options: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Run ``fn(page)`` on a pooled page of the context for ``url``'s domain.
+
+        ``fn`` runs on the pool's browser thread; it must not keep references
+        to the page after returning. Exceptions raised by ``fn`` propagate to
+        the caller.
+        """
+        options = dict(context_options or {})
+        key = context_key(url, options)
+        return self._submit(self._pick_worker(key), fn, key, options).result(timeout)
+
+    def lease(self, url: Optional[str] = None, context_options: Optional[dict[str, Any]] = None) -> PageLease:
+        """Pin a page of the context for ``url``'s domain until released."""
+        options = dict(context_options or {})
+        key = context_key(url, options)
+        return PageLease(self, self._pick_worker(key), key, options)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            workers = list(self._workers)
+        return {
+            "browsers": sum(1 for w in workers if w.browser_running),
+            "workers": len(workers),
+            "launches": sum(w.launches for w in workers),
+            "contexts": sum(len(w.keys) for w in workers),
+            "pending": sum(w.pending for w in workers),
+        }
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Close all browsers; the pool cannot be used afterwards."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.jobs.put(None)
+        for worker in workers:
+            worker.thread.join(timeout)
+
+
+_pools: dict[bool, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """Process-wide pool for headless or headed browsers."""
+    with _pools_lock:
+        pool = _pools.get(bool(headless))
+        if pool is None or pool._closed:
+            pool = BrowserPool(headless=headless)
+            _pools[bool(headless)] = pool
+        return pool
+
+
+@atexit.register
+def close_browser_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+__all__ = [
+    "BrowserPool",
+    "PageLease",
+    "close_browser_pools",
+    "context_key",
+    "get_browser_pool",
+]
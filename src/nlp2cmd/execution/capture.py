@@ -0,0 +1,279 @@
+"""
+Bounded streaming capture of subprocess output.
+
+``stream_process`` reads a child's stdout/stderr with large non-blocking reads
+(``os.read`` on whatever a selector reports as ready, no line buffering), so a
+partial line never stalls the loop. Each stream goes into an ``OutputBuffer``
+that keeps the first and last bytes up to a cap; with ``spill=True`` the full
+output is also written to a temp file once the cap is exceeded. Error patterns
+are scanned incrementally as bytes arrive, so recovery heuristics do not need
+the whole output.
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+import selectors
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+DEFAULT_MAX_OUTPUT_BYTES = 4 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+# Name -> lowercase byte substrings, in heuristic priority order.
+ERROR_PATTERNS: dict[str, tuple[bytes, ...]] = {
+    "command_not_found": (b"command not found", b"not found"),
+    "permission_denied": (b"permission denied",),
+    "no_such_file": (b"no such file or directory",),
+    "connection_refused": (b"connection refused", b"could not connect"),
+    "playwright": (b"playwright",),
+}
+
+
+class OutputBuffer:
+    """
+    Keeps the head and tail of a byte stream within ``max_bytes``.
+
+    A quarter of the cap holds the head, the rest a rolling tail. With
+    ``spill`` enabled, the complete stream is written to a temp file from the
+    moment the cap is first exceeded (nothing has been dropped yet at that
+    point, so the file is complete).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES, spill: bool = False, name: str = "output"):
+        self.max_bytes = max(1024, int(max_bytes))
+        self.head_cap = self.max_bytes // 4
+        self.tail_cap = self.max_bytes - self.head_cap
+        self.spill = spill
+        self.name = name
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+        self._head = bytearray()
+        self._tail: deque[bytes] = deque()
+        self._tail_size = 0
+        self._spill_file = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.max_bytes
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.total_bytes += len(data)
+        if self._spill_file is not None:
+            self._spill_file.write(data)
+
+        room = self.head_cap - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+            if not data:
+                return
+
+        self._tail.append(data)
+        self._tail_size += len(data)
+        if self._tail_size <= self.tail_cap:
+            return
+
+        if self.spill and self._spill_file is None:
+            self._start_spill()
+        excess = self._tail_size - self.tail_cap
+        while excess > 0:
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(first)
+                excess -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_size -= excess
+                excess = 0
+
+    def _start_spill(self) -> None:
+        handle = tempfile.NamedTemporaryFile(prefix=f"nlp2cmd-{self.name}-", suffix=".log", delete=False)
+        handle.write(bytes(self._head))
+        for chunk in self._tail:
+            handle.write(chunk)
+        self._spill_file = handle
+        self.spill_path = handle.name
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def getvalue(self) -> str:
+        """Captured text; an omission marker separates head and tail when truncated."""
+        head = bytes(self._head).decode("utf-8", errors="replace")
+        tail = b"".join(self._tail).decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total_bytes - len(self._head) - self._tail_size
+        where = f"; full output: {self.spill_path}" if self.spill_path else ""
+        return f"{head}\n... [{omitted} bytes omitted{where}] ...\n{tail}"
+
+
+class ErrorScanner:
+    """Incremental, case-insensitive substring scan over a byte stream."""
+
+    def __init__(self, patterns: Optional[dict[str, tuple[bytes, ...]]] = None):
+        self.patterns = patterns if patterns is not None else ERROR_PATTERNS
+        self.matched: set[str] = set()
+        self._overlap = max((len(n) for needles in self.patterns.values() for n in needles), default=1) - 1
+        self._carry = b""
+
+    def feed(self, data: bytes) -> None:
+        if len(self.matched) == len(self.patterns) or not data:
+            return
+        window = self._carry + data.lower()
+        for name, needles in self.patterns.items():
+            if name not in self.matched and any(n in window for n in needles):
+                self.matched.add(name)
+        self._carry = window[-self._overlap:] if self._overlap else b""
+
+    @property
+    def matches(self) -> list[str]:
+        """Matched pattern names in priority order."""
+        return [name for name in self.patterns if name in self.matched]
+
+
+def scan_error_patterns(text: str) -> list[str]:
+    """Error pattern names found in ``text``."""
+    scanner = ErrorScanner()
+    scanner.feed(text.encode("utf-8", errors="replace"))
+    return scanner.matches
+
+
+@dataclass
+class CapturedOutput:
+    """Bounded stdout/stderr of a finished process."""
+
+    stdout: OutputBuffer
+    stderr: OutputBuffer
+    stdout_errors: list[str] = field(default_factory=list)
+    stderr_errors: list[str] = field(default_factory=list)
+
+    @property
+    def error_patterns(self) -> list[str]:
+        """Patterns in stderr, or in stdout when stderr was empty."""
+        return self.stderr_errors if self.stderr.total_bytes else self.stdout_errors
+
+    @property
+    def truncated(self) -> bool:
+        return self.stdout.truncated or self.stderr.truncated
+
+    @property
+    def spill_paths(self) -> dict[str, str]:
+        return {b.name: b.spill_path for b in (self.stdout, self.stderr) if b.spill_path}
+
+
+def stream_process(
+    process: subprocess.Popen,
+    on_output: Optional[Callable[[str, str], None]] = None,
+    max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    spill: bool = False,
+    timeout: Optional[float] = None,
+) -> CapturedOutput:
+    """
+    Drain a process started with binary ``stdout``/``stderr`` pipes.
+
+    Args:
+        process: Running process
+        on_output: Called with ("stdout"|"stderr", decoded text) as data arrives
+        max_bytes: Cap per stream
+        spill: Write complete output to a temp file once a cap is exceeded
+        timeout: Seconds before the process is killed
+
+    Raises:
+        subprocess.TimeoutExpired: The process outlived ``timeout``
+    """
+    buffers = {
+        "stdout": OutputBuffer(max_bytes, spill, "stdout"),
+        "stderr": OutputBuffer(max_bytes, spill, "stderr"),
+    }
+    scanners = {"stdout": ErrorScanner(), "stderr": ErrorScanner()}
+    decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in buffers}
+
+    def consume(name: str, data: bytes, final: bool = False) -> None:
+        buffers[name].write(data)
+        scanners[name].feed(data)
+        if on_output is not None:
+            text = decoders[name].decode(data, final=final)
+            if text:
+                on_output(name, text)
+
+    try:
+        if sys.platform == "win32":
+            # Pipes cannot be selected on Windows.
+            out, err = process.communicate(timeout=timeout)
+            consume("stdout", out or b"", final=True)
+            consume("stderr", err or b"", final=True)
+        else:
+            _select_loop(process, consume, timeout)
+    finally:
+        for buf in buffers.values():
+            buf.close()
+
+    return CapturedOutput(
+        stdout=buffers["stdout"],
+        stderr=buffers["stderr"],
+        stdout_errors=scanners["stdout"].matches,
+        stderr_errors=scanners["stderr"].matches,
+    )
+
+
+def _select_loop(
+    process: subprocess.Popen,
+    consume: Callable[..., None],
+    timeout: Optional[float],
+) -> None:
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    with selectors.DefaultSelector() as selector:
+        for name in ("stdout", "stderr"):
+            pipe = getattr(process, name)
+            if pipe is not None:
+                selector.register(pipe.fileno(), selectors.EVENT_READ, name)
+
+        while selector.get_map():
+            wait = 0.1
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    process.kill()
+                    process.wait()
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+                wait = min(wait, remaining)
+            for key, _events in selector.select(wait):
+                data = os.read(key.fd, READ_CHUNK_BYTES)
+                if data:
+                    consume(key.data, data)
+                else:
+                    selector.unregister(key.fd)
+                    consume(key.data, b"", final=True)
+
+    remaining = deadline - time.monotonic() if deadline is not None else None
+    try:
+        process.wait(timeout=max(0.0, remaining) if remaining is not None else None)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+
+
+__all__ = [
+    "CapturedOutput",
+    "DEFAULT_MAX_OUTPUT_BYTES",
+    "ERROR_PATTERNS",
+    "ErrorScanner",
+    "OutputBuffer",
+    "scan_error_patterns",
+    "stream_process",
+]
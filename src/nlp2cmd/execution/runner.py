@@ -10,6 +10,7 @@ Provides:
 
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 import time
@@ -17,6 +18,8 @@ from dataclasses import dataclass, field
 from typing import Any, Optional, Callable
 from pathlib import Path
 
+from nlp2cmd.execution.capture import DEFAULT_MAX_OUTPUT_BYTES, scan_error_patterns, stream_process
+
 try:
     from rich.console import Console
     from rich.panel import Panel
@@ -70,6 +73,9 @@ class ExecutionResult:
     stderr: str = ""
     duration_ms: float = 0.0
     error_context: Optional[str] = None
+    error_patterns: list[str] = field(default_factory=list)
+    output_truncated: bool = False
+    spill_paths: dict[str, str] = field(default_factory=dict)
 
 
 @dataclass
@@ -81,6 +87,51 @@ class RecoveryContext:
     exit_code: int
     previous_attempts: list[str] = field(default_factory=list)
     environment_info: dict[str, Any] = field(default_factory=dict)
+    error_patterns: Optional[list[str]] = None
+
+
+_ENABLED_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+def _env_max_output_bytes() -> int:
+    try:
+        return int(os.environ.get("NLP2CMD_MAX_OUTPUT_BYTES") or DEFAULT_MAX_OUTPUT_BYTES)
+    except ValueError:
+        return DEFAULT_MAX_OUTPUT_BYTES
+
+
+def _env_spill_output() -> bool:
+    return str(os.environ.get("NLP2CMD_SPILL_OUTPUT") or "").strip().lower() in _ENABLED_VALUES
+
+
+def _write_plain(name: str, text: str) -> None:
+    target = sys.stdout if name == "stdout" else sys.stderr
+    target.write(text)
+    target.flush()
+
+
+class _LinePrinter:
+    """Turns streamed text chunks into whole lines for a MarkdownBlockStream."""
+
+    def __init__(self, stream: Any):
+        self.stream = stream
+        self._pending = {"stdout": "", "stderr": ""}
+
+    def feed(self, name: str, text: str) -> None:
+        lines = (self._pending[name] + text).split("\n")
+        self._pending[name] = lines.pop()
+        for line in lines:
+            self._print(name, line)
+
+    def flush(self) -> None:
+        for name, rest in self._pending.items():
+            if rest:
+                self._print(name, rest)
+            self._pending[name] = ""
+
+    def _print(self, name: str, line: str) -> None:
+        line = line.rstrip()
+        self.stream.print(f"[stderr] {line}" if name == "stderr" else line)
 
 
 class ExecutionRunner:
@@ -109,6 +160,8 @@ class ExecutionRunner:
         max_retries: int = 3,
         plain_output: bool = False,
         llm_client: Optional[Any] = None,
+        max_output_bytes: Optional[int] = None,
+        spill_output: Optional[bool] = None,
     ):
         """
         Initialize execution runner.
@@ -118,12 +171,18 @@ class ExecutionRunner:
             auto_confirm: Skip confirmation prompts
             max_retries: Maximum number of retry attempts
             llm_client: Optional LLM client for error recovery suggestions
+            max_output_bytes: Per-stream capture cap; head and tail are kept
+                (default: NLP2CMD_MAX_OUTPUT_BYTES or 4 MiB)
+            spill_output: Write complete output of capped streams to a temp
+                file (default: NLP2CMD_SPILL_OUTPUT)
         """
         self._console = console or Console()
         self.auto_confirm = auto_confirm
         self.max_retries = max_retries
         self.plain_output = plain_output
         self.llm_client = llm_client
+        self.max_output_bytes = max_output_bytes if max_output_bytes is not None else _env_max_output_bytes()
+        self.spill_output = spill_output if spill_output is not None else _env_spill_output()
         self.execution_history: list[ExecutionResult] = []
         
         # Initialize global command history
@@ -175,130 +234,36 @@ class ExecutionRunner:
                     shell=True,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    text=True,
                     cwd=cwd,
                     env=env,
                 )
-                
-                stdout_lines = []
-                stderr_lines = []
-                
-                import select
 
                 if self.plain_output:
-                    if hasattr(select, 'poll'):
-                        poller = select.poll()
-                        poller.register(process.stdout, select.POLLIN)
-                        poller.register(process.stderr, select.POLLIN)
-
-                        while process.poll() is None:
-                            events = poller.poll(100)
-                            for fd, _event in events:
-                                if fd == process.stdout.fileno():
-                                    line = process.stdout.readline()
-                                    if line:
-                                        stdout_lines.append(line)
-                                        sys.stdout.write(line)
-                                        sys.stdout.flush()
-                                elif fd == process.stderr.fileno():
-                                    line = process.stderr.readline()
-                                    if line:
-                                        stderr_lines.append(line)
-                                        sys.stderr.write(line)
-                                        sys.stderr.flush()
-
-                        while True:
-                            line = process.stdout.readline()
-                            if not line:
-                                break
-                            stdout_lines.append(line)
-                            sys.stdout.write(line)
-                            sys.stdout.flush()
-
-                        while True:
-                            line = process.stderr.readline()
-                            if not line:
-                                break
-                            stderr_lines.append(line)
-                            sys.stderr.write(line)
-                            sys.stderr.flush()
-                    else:
-                        stdout, stderr = process.communicate(timeout=timeout)
-                        stdout_lines = stdout.splitlines(keepends=True)
-                        stderr_lines = stderr.splitlines(keepends=True)
-                        if stdout:
-                            sys.stdout.write(stdout)
-                            sys.stdout.flush()
-                        if stderr:
-                            sys.stderr.write(stderr)
-                            sys.stderr.flush()
-
-                    remaining_stdout, remaining_stderr = process.communicate()
-                    if remaining_stdout:
-                        stdout_lines.append(remaining_stdout)
-                        sys.stdout.write(remaining_stdout)
-                        sys.stdout.flush()
-                    if remaining_stderr:
-                        stderr_lines.append(remaining_stderr)
-                        sys.stderr.write(remaining_stderr)
-                        sys.stderr.flush()
+                    captured = stream_process(
+                        process,
+                        on_output=_write_plain,
+                        max_bytes=self.max_output_bytes,
+                        spill=self.spill_output,
+                        timeout=timeout,
+                    )
                 else:
                     with self.MarkdownBlockStream(console=self.console, language="bash") as stream:
-                        if hasattr(select, 'poll'):
-                            poller = select.poll()
-                            poller.register(process.stdout, select.POLLIN)
-                            poller.register(process.stderr, select.POLLIN)
-                            
-                            while process.poll() is None:
-                                events = poller.poll(100)
-                                for fd, event in events:
-                                    if fd == process.stdout.fileno():
-                                        line = process.stdout.readline()
-                                        if line:
-                                            stdout_lines.append(line)
-                                            stream.print(line.rstrip())
-                                    elif fd == process.stderr.fileno():
-                                        line = process.stderr.readline()
-                                        if line:
-                                            stderr_lines.append(line)
-                                            stream.print(f"[stderr] {line.rstrip()}")
-                            
-                            # Read any remaining output after process exits
-                            while True:
-                                line = process.stdout.readline()
-                                if not line:
-                                    break
-                                stdout_lines.append(line)
-                                stream.print(line.rstrip())
-                            
-                            while True:
-                                line = process.stderr.readline()
-                                if not line:
-                                    break
-                                stderr_lines.append(line)
-                                stream.print(f"[stderr] {line.rstrip()}")
-                        else:
-                            stdout, stderr = process.communicate(timeout=timeout)
-                            stdout_lines = stdout.splitlines(keepends=True)
-                            stderr_lines = stderr.splitlines(keepends=True)
-                            for line in stdout_lines:
-                                stream.print(line.rstrip())
-                            for line in stderr_lines:
-                                stream.print(f"[stderr] {line.rstrip()}")
-                        
-                        remaining_stdout, remaining_stderr = process.communicate()
-                        if remaining_stdout:
-                            stdout_lines.append(remaining_stdout)
-                            for line in remaining_stdout.splitlines():
-                                stream.print(line)
-                        if remaining_stderr:
-                            stderr_lines.append(remaining_stderr)
-                            for line in remaining_stderr.splitlines():
-                                stream.print(f"[stderr] {line}")
-                
+                        printer = _LinePrinter(stream)
+                        captured = stream_process(
+                            process,
+                            on_output=printer.feed,
+                            max_bytes=self.max_output_bytes,
+                            spill=self.spill_output,
+                            timeout=timeout,
+                        )
+                        printer.flush()
+
                 exit_code = process.returncode
-                stdout = ''.join(stdout_lines)
-                stderr = ''.join(stderr_lines)
+                stdout = captured.stdout.getvalue()
+                stderr = captured.stderr.getvalue()
+                error_patterns = captured.error_patterns
+                output_truncated = captured.truncated
+                spill_paths = captured.spill_paths
             else:
                 result = subprocess.run(
                     command,
@@ -312,6 +277,9 @@ class ExecutionRunner:
                 exit_code = result.returncode
                 stdout = result.stdout
                 stderr = result.stderr
+                error_patterns = scan_error_patterns(stderr or stdout)
+                output_truncated = False
+                spill_paths = {}
 
                 if stdout:
                     if self.plain_output:
@@ -337,6 +305,9 @@ class ExecutionRunner:
                 stderr=stderr,
                 duration_ms=duration_ms,
                 error_context=stderr if not success else None,
+                error_patterns=error_patterns,
+                output_truncated=output_truncated,
+                spill_paths=spill_paths,
             )
             
             self.execution_history.append(result)
@@ -391,6 +362,7 @@ class ExecutionRunner:
                 stderr=str(e),
                 duration_ms=duration_ms,
                 error_context=str(e),
+                error_patterns=scan_error_patterns(str(e)),
             )
             self.execution_history.append(result)
             if self.plain_output:
@@ -494,24 +466,26 @@ If the command syntax was wrong, provide the corrected command.
     
     def _get_heuristic_suggestion(self, context: RecoveryContext) -> Optional[str]:
         """Get heuristic-based recovery suggestion."""
-        error = context.error_output.lower()
+        patterns = context.error_patterns
+        if patterns is None:
+            patterns = scan_error_patterns(context.error_output)
         
-        if "command not found" in error or "not found" in error:
+        if "command_not_found" in patterns:
             cmd_parts = context.executed_command.split()
             if cmd_parts:
                 tool = cmd_parts[0]
                 return f"# Install '{tool}' using your package manager (apt, brew, etc.)"
         
-        if "permission denied" in error:
+        if "permission_denied" in patterns:
             return f"sudo {context.executed_command}"
         
-        if "no such file or directory" in error:
+        if "no_such_file" in patterns:
             return "# Check if the file/directory exists"
         
-        if "connection refused" in error or "could not connect" in error:
+        if "connection_refused" in patterns:
             return "# Check if the service is running"
         
-        if "playwright" in error.lower():
+        if "playwright" in patterns:
             return "playwright install"
         
         return None
@@ -563,6 +537,7 @@ If the command syntax was wrong, provide the corrected command.
                     error_output=result.stderr or result.stdout,
                     exit_code=result.exit_code,
                     previous_attempts=attempts,
+                    error_patterns=result.error_patterns,
                 )
                 
                 suggestion = self.get_recovery_suggestion(context)
@@ -7,18 +7,27 @@ Executes multi-step execution plans with support for:
 - Variable references between steps
 - Conditional execution
 - Error handling and rollback
+- Parallel execution of independent steps (dependency graph inferred from
+  ``$variable`` references, conditions and foreach sources)
 """
 
 from __future__ import annotations
 
+import heapq
+import inspect
 import logging
 import re
+import threading
 import time
 import uuid
+from collections import ChainMap
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Callable, Optional
 
+from nlp2cmd.executor.conditions import CompiledCondition, ConditionError, compile_condition
 from nlp2cmd.registry import ActionRegistry, ActionResult, get_registry
 
 logger = logging.getLogger(__name__)
@@ -46,11 +55,35 @@ class PlanStep:
     on_error: str = "stop"  # "stop", "skip", "continue"
     timeout: Optional[float] = None  # Timeout in seconds
     retry: int = 0  # Number of retries on failure
+    max_parallel: int = 1  # Concurrent foreach iterations
+    _compiled_condition: Optional[tuple[str, Optional[CompiledCondition]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def __post_init__(self):
         # Generate store_as if not provided
         if self.store_as is None:
             self.store_as = f"{self.action}_result"
+    
+    def compiled_condition(self) -> Optional[CompiledCondition]:
+        """
+        Return the condition compiled once and cached on the step.
+        
+        Returns None when there is no condition or it failed to compile; the
+        cache is keyed by the condition text so later edits are picked up.
+        """
+        if not self.condition:
+            return None
+        cached = self._compiled_condition
+        if cached is None or cached[0] != self.condition:
+            try:
+                compiled: Optional[CompiledCondition] = compile_condition(self.condition)
+            except ConditionError as e:
+                logger.warning(f"Step '{self.action}': {e}")
+                compiled = None
+            cached = (self.condition, compiled)
+            self._compiled_condition = cached
+        return cached[1]
 
 
 @dataclass
@@ -88,6 +121,7 @@ class ExecutionPlan:
                 on_error=step_data.get("on_error", "stop"),
                 timeout=step_data.get("timeout"),
                 retry=step_data.get("retry", 0),
+                max_parallel=step_data.get("max_parallel", 1),
             ))
         
         return cls(
@@ -108,6 +142,7 @@ class ExecutionPlan:
                     "on_error": step.on_error,
                     "timeout": step.timeout,
                     "retry": step.retry,
+                    "max_parallel": step.max_parallel,
                 }
                 for step in self.steps
             ],
@@ -115,6 +150,34 @@ class ExecutionPlan:
         }
 
 
+class _LinkedEvent(threading.Event):
+    """
+    Event that also counts as set once ``parent`` is set.
+    
+    Setting it never touches ``parent``: a plan stopping on error must not
+    cancel other plans sharing the caller's event. Like
+    ``_call_with_deadline``, waits poll the parent every 50 ms.
+    """
+    
+    def __init__(self, parent: threading.Event):
+        super().__init__()
+        self.parent = parent
+    
+    def is_set(self) -> bool:
+        if not super().is_set() and self.parent.is_set():
+            self.set()
+        return super().is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            remaining = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            super().wait(remaining)
+        return True
+
+
 @dataclass
 class ExecutionContext:
     """Context for plan execution."""
@@ -124,6 +187,12 @@ class ExecutionContext:
     results: list[StepResult] = field(default_factory=list)
     current_step: int = 0
     dry_run: bool = False
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether execution of the plan has been cancelled."""
+        return self.cancel_event.is_set()
     
     def set(self, name: str, value: Any) -> None:
         """Set a variable."""
@@ -146,16 +215,18 @@ class ExecutionContext:
         if not ref.startswith("$"):
             return ref
         
-        path = ref[1:].split(".")
-        var_name = path[0]
-        
+        var_name, *path = ref[1:].split(".")
+        return self.resolve_path(var_name, tuple(path))
+    
+    def resolve_path(self, var_name: str, path: tuple[str, ...] = ()) -> Any:
+        """Resolve a pre-split reference (``$var_name.path...``)."""
         if var_name not in self.variables:
             raise ValueError(f"Unknown variable: {var_name}")
         
         value = self.variables[var_name]
         
         # Navigate nested path
-        for key in path[1:]:
+        for key in path:
             if isinstance(value, dict):
                 value = value.get(key)
             elif isinstance(value, list) and key.isdigit():
@@ -163,9 +234,199 @@ class ExecutionContext:
             elif hasattr(value, key):
                 value = getattr(value, key)
             else:
-                raise ValueError(f"Cannot resolve path: {ref}")
+                raise ValueError(f"Cannot resolve path: ${'.'.join((var_name, *path))}")
         
         return value
+    
+    def scoped(self, **local_vars: Any) -> "ExecutionContext":
+        """
+        Create a child context that sees all variables plus ``local_vars``.
+        
+        Writes to the child go to the parent, while the locals (e.g. ``item``
+        and ``index`` in a foreach loop) stay private to the child. This keeps
+        concurrently running steps from clobbering each other's loop state.
+        """
+        child = ExecutionContext(
+            trace_id=self.trace_id,
+            results=self.results,
+            current_step=self.current_step,
+            dry_run=self.dry_run,
+            cancel_event=self.cancel_event,
+        )
+        child.variables = _ScopedVariables(local_vars, self.variables)  # type: ignore[assignment]
+        return child
+
+
+class _ScopedVariables(ChainMap):
+    """ChainMap whose writes go to the shared (parent) mapping."""
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.maps[-1][key] = value
+
+
+class StepCancelledError(RuntimeError):
+    """Raised when an action is abandoned because the plan was cancelled."""
+
+
+def _accepts_keyword(fn: Callable[..., Any], name: str) -> bool:
+    """Whether ``fn`` declares ``name`` as an explicit keyword parameter."""
+    try:
+        return _accepts_keyword_cached(fn, name)
+    except TypeError:  # unhashable callable
+        return _inspect_accepts_keyword(fn, name)
+
+
+def _inspect_accepts_keyword(fn: Callable[..., Any], name: str) -> bool:
+    try:
+        param = inspect.signature(fn).parameters.get(name)
+    except (TypeError, ValueError):
+        return False
+    return param is not None and param.kind in (
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.KEYWORD_ONLY,
+    )
+
+
+# Handlers are called for every step and foreach item; inspect each once.
+_accepts_keyword_cached = lru_cache(maxsize=1024)(_inspect_accepts_keyword)
+
+
+def _call_with_deadline(
+    call: Callable[[threading.Event], Any],
+    action: str,
+    timeout: float,
+    parent_cancel: Optional[threading.Event] = None,
+) -> Any:
+    """
+    Run ``call`` on a daemon thread and give up after ``timeout`` seconds.
+    
+    Python threads cannot be killed, so the call receives its own cancel
+    event which is set on timeout or parent cancellation; cooperative
+    handlers (those accepting ``cancel_event``) stop early, others are
+    abandoned and their result discarded.
+    """
+    own_cancel = threading.Event()
+    outcome: dict[str, Any] = {}
+    
+    def target() -> None:
+        try:
+            outcome["result"] = call(own_cancel)
+        except BaseException as e:  # re-raised in the calling thread
+            outcome["error"] = e
+    
+    worker = threading.Thread(target=target, name=f"action-{action}", daemon=True)
+    worker.start()
+    
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        worker.join(max(0.0, min(remaining, 0.05)) if parent_cancel else max(0.0, remaining))
+        if not worker.is_alive():
+            break
+        if parent_cancel is not None and parent_cancel.is_set():
+            own_cancel.set()
+            raise StepCancelledError(f"Action '{action}' cancelled")
+        if time.monotonic() >= deadline:
+            own_cancel.set()
+            raise TimeoutError(f"Action '{action}' timed out after {timeout}s")
+    
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+_LOOP_VARIABLES = frozenset({"item", "index"})
+_CONDITION_REF_RE = re.compile(r"\$(\w+)")
+
+
+def _collect_param_refs(value: Any, refs: set[str]) -> None:
+    if isinstance(value, str):
+        if value.startswith("$"):
+            refs.add(value[1:].split(".")[0])
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collect_param_refs(v, refs)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _collect_param_refs(v, refs)
+
+
+def step_references(step: PlanStep) -> set[str]:
+    """Return the root variable names a step reads (excluding loop variables)."""
+    refs: set[str] = set()
+    _collect_param_refs(step.params, refs)
+    if step.condition:
+        refs.update(_CONDITION_REF_RE.findall(step.condition))
+    if step.foreach:
+        refs.add(step.foreach.lstrip("$").split(".")[0])
+    return refs - _LOOP_VARIABLES
+
+
+def build_dependency_graph(plan: ExecutionPlan) -> list[set[int]]:
+    """
+    Infer step dependencies from variable reads and ``store_as`` writes.
+    
+    Step ``j`` depends on step ``i < j`` when it reads a variable last written
+    by ``i`` (read-after-write), overwrites a variable ``i`` wrote
+    (write-after-write) or overwrites a variable ``i`` still needs to read
+    (write-after-read). Variables coming from the initial context create no
+    dependencies.
+    
+    Returns:
+        For every step index, the set of step indices it depends on.
+    """
+    deps: list[set[int]] = []
+    last_writer: dict[str, int] = {}
+    readers: dict[str, list[int]] = {}
+    
+    for j, step in enumerate(plan.steps):
+        step_deps: set[int] = set()
+        for ref in step_references(step):
+            if ref in last_writer:
+                step_deps.add(last_writer[ref])
+            readers.setdefault(ref, []).append(j)
+        
+        name = step.store_as
+        if name:
+            if name in last_writer:
+                step_deps.add(last_writer[name])
+            step_deps.update(r for r in readers.get(name, []) if r != j)
+            last_writer[name] = j
+            readers[name] = []
+        
+        deps.append(step_deps)
+    
+    return deps
+
+
+def critical_path(
+    deps: list[set[int]],
+    durations_ms: dict[int, float],
+) -> tuple[float, list[int]]:
+    """
+    Longest duration-weighted path through the executed part of the graph.
+    
+    Returns:
+        Tuple of (critical path time in ms, step indices along the path)
+    """
+    best: dict[int, tuple[float, Optional[int]]] = {}
+    for i in sorted(durations_ms):
+        prev = max(
+            ((best[d][0], d) for d in deps[i] if d in best),
+            default=(0.0, None),
+        )
+        best[i] = (prev[0] + durations_ms[i], prev[1])
+    
+    if not best:
+        return 0.0, []
+    
+    end = max(best, key=lambda i: best[i][0])
+    path: list[int] = []
+    node: Optional[int] = end
+    while node is not None:
+        path.append(node)
+        node = best[node][1]
+    return best[end][0], path[::-1]
 
 
 @dataclass
@@ -208,6 +469,7 @@ class PlanValidator:
                         },
                         "timeout": {"type": "number", "minimum": 0},
                         "retry": {"type": "integer", "minimum": 0},
+                        "max_parallel": {"type": "integer", "minimum": 1},
                     },
                 },
             },
@@ -310,12 +572,25 @@ class PlanExecutor:
     - Retry with backoff
     - Timeout handling
     - Dry-run mode
+    
+    With ``max_concurrency > 1`` independent steps (see
+    :func:`build_dependency_graph`) run concurrently on a thread pool. Step
+    results are still reported in plan order. A failing ``on_error="stop"``
+    step prevents any further steps from starting and cancels the plan;
+    steps already in flight stop at their next checkpoint (between retries
+    or foreach iterations) and are reported.
+    
+    Step ``timeout`` is enforced per action call. Handlers that declare a
+    ``cancel_event`` keyword receive a ``threading.Event`` that is set when
+    the call times out or the plan is cancelled.
     """
     
     def __init__(
         self,
         registry: Optional[ActionRegistry] = None,
         action_handlers: Optional[dict[str, Callable]] = None,
+        max_concurrency: int = 1,
+        retry_backoff: float = 0.1,
     ):
         """
         Initialize executor.
@@ -323,10 +598,14 @@ class PlanExecutor:
         Args:
             registry: Action registry for validation
             action_handlers: Custom action handlers
+            max_concurrency: Maximum number of steps running at once
+            retry_backoff: Base delay in seconds between retries (linear backoff)
         """
         self.registry = registry or get_registry()
         self.validator = PlanValidator(self.registry)
         self.action_handlers = action_handlers or {}
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.retry_backoff = retry_backoff
         
         # Register default handlers
         self._register_default_handlers()
@@ -359,6 +638,8 @@ class PlanExecutor:
         initial_context: Optional[dict[str, Any]] = None,
         dry_run: bool = False,
         on_step_complete: Optional[Callable[[StepResult], None]] = None,
+        max_concurrency: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> ExecutionResult:
         """
         Execute a plan.
@@ -367,7 +648,9 @@ class PlanExecutor:
             plan: Plan to execute
             initial_context: Initial variables
             dry_run: If True, validate but don't execute
-            on_step_complete: Callback after each step
+            on_step_complete: Callback after each step (in completion order)
+            max_concurrency: Override the executor's ``max_concurrency``
+            cancel_event: Event that cancels the plan when set (never set by the executor)
             
         Returns:
             ExecutionResult with all step results
@@ -386,42 +669,24 @@ class PlanExecutor:
         
         # Initialize context
         ctx = ExecutionContext(dry_run=dry_run)
+        if cancel_event is not None:
+            ctx.cancel_event = _LinkedEvent(cancel_event)
         if initial_context:
             ctx.variables.update(initial_context)
         
-        logger.info(f"[{ctx.trace_id}] Starting plan execution ({len(plan.steps)} steps)")
+        concurrency = max(1, int(max_concurrency or self.max_concurrency))
+        deps = build_dependency_graph(plan)
+        elapsed_ms: dict[int, float] = {}
         
-        # Execute steps
-        for i, step in enumerate(plan.steps):
-            ctx.current_step = i
-            
-            try:
-                result = self._execute_step(step, i, ctx)
-                ctx.results.append(result)
-                
-                if on_step_complete:
-                    on_step_complete(result)
-                
-                # Handle step failure
-                if result.status == StepStatus.FAILED:
-                    if step.on_error == "stop":
-                        logger.error(f"[{ctx.trace_id}] Step {i + 1} failed, stopping execution")
-                        break
-                    elif step.on_error == "skip":
-                        logger.warning(f"[{ctx.trace_id}] Step {i + 1} failed, skipping")
-                        continue
-                    # "continue" - just keep going
-                
-            except Exception as e:
-                logger.exception(f"[{ctx.trace_id}] Step {i + 1} raised exception")
-                ctx.results.append(StepResult(
-                    step_index=i,
-                    action=step.action,
-                    status=StepStatus.FAILED,
-                    error=str(e),
-                ))
-                if step.on_error == "stop":
-                    break
+        logger.info(
+            f"[{ctx.trace_id}] Starting plan execution "
+            f"({len(plan.steps)} steps, concurrency={concurrency})"
+        )
+        
+        if concurrency == 1:
+            self._execute_sequential(plan, ctx, elapsed_ms, on_step_complete)
+        else:
+            self._execute_parallel(plan, ctx, deps, concurrency, elapsed_ms, on_step_complete)
         
         # Determine overall success
         all_success = all(
@@ -437,6 +702,7 @@ class PlanExecutor:
                 break
         
         total_duration = (time.time() - start_time) * 1000
+        critical_ms, critical_steps = critical_path(deps, elapsed_ms)
         
         return ExecutionResult(
             trace_id=ctx.trace_id,
@@ -444,9 +710,120 @@ class PlanExecutor:
             steps=ctx.results,
             final_result=final_result,
             total_duration_ms=total_duration,
-            metadata={"dry_run": dry_run},
+            metadata={
+                "dry_run": dry_run,
+                "max_concurrency": concurrency,
+                "critical_path_ms": critical_ms,
+                "critical_path": critical_steps,
+            },
         )
     
+    def _run_step(self, step: PlanStep, index: int, ctx: ExecutionContext) -> StepResult:
+        """Execute a step, turning unexpected exceptions into a FAILED result."""
+        try:
+            return self._execute_step(step, index, ctx)
+        except Exception as e:
+            logger.exception(f"[{ctx.trace_id}] Step {index + 1} raised exception")
+            return StepResult(
+                step_index=index,
+                action=step.action,
+                status=StepStatus.FAILED,
+                error=str(e),
+            )
+    
+    def _should_stop(self, step: PlanStep, result: StepResult, ctx: ExecutionContext) -> bool:
+        """Apply ``on_error`` semantics; True when execution must stop."""
+        if result.status != StepStatus.FAILED:
+            return False
+        if step.on_error == "stop":
+            logger.error(
+                f"[{ctx.trace_id}] Step {result.step_index + 1} failed, stopping execution"
+            )
+            ctx.cancel_event.set()
+            return True
+        if step.on_error == "skip":
+            logger.warning(f"[{ctx.trace_id}] Step {result.step_index + 1} failed, skipping")
+        # "continue" - just keep going
+        return False
+    
+    def _execute_sequential(
+        self,
+        plan: ExecutionPlan,
+        ctx: ExecutionContext,
+        elapsed_ms: dict[int, float],
+        on_step_complete: Optional[Callable[[StepResult], None]],
+    ) -> None:
+        """Execute steps one after another in plan order."""
+        for i, step in enumerate(plan.steps):
+            if ctx.cancelled:
+                break
+            ctx.current_step = i
+            
+            started = time.perf_counter()
+            result = self._run_step(step, i, ctx)
+            elapsed_ms[i] = (time.perf_counter() - started) * 1000
+            ctx.results.append(result)
+            
+            if on_step_complete:
+                on_step_complete(result)
+            
+            if self._should_stop(step, result, ctx):
+                break
+    
+    def _execute_parallel(
+        self,
+        plan: ExecutionPlan,
+        ctx: ExecutionContext,
+        deps: list[set[int]],
+        concurrency: int,
+        elapsed_ms: dict[int, float],
+        on_step_complete: Optional[Callable[[StepResult], None]],
+    ) -> None:
+        """Execute steps as soon as their dependencies finished."""
+        remaining = [set(d) for d in deps]
+        dependents: list[list[int]] = [[] for _ in plan.steps]
+        for i, step_deps in enumerate(deps):
+            for d in step_deps:
+                dependents[d].append(i)
+        
+        # Ready steps are started lowest index first, so scheduling is deterministic
+        ready = [i for i, d in enumerate(remaining) if not d]
+        heapq.heapify(ready)
+        running: dict[Any, tuple[int, float]] = {}
+        results: dict[int, StepResult] = {}
+        stopped = False
+        
+        with ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix=f"plan-{ctx.trace_id}",
+        ) as pool:
+            while running or (ready and not stopped):
+                stopped = stopped or ctx.cancelled
+                while ready and not stopped and len(running) < concurrency:
+                    i = heapq.heappop(ready)
+                    future = pool.submit(self._run_step, plan.steps[i], i, ctx)
+                    running[future] = (i, time.perf_counter())
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: running[f][0]):
+                    i, started = running.pop(future)
+                    elapsed_ms[i] = (time.perf_counter() - started) * 1000
+                    result = future.result()
+                    results[i] = result
+                    
+                    if on_step_complete:
+                        on_step_complete(result)
+                    
+                    if self._should_stop(plan.steps[i], result, ctx):
+                        stopped = True
+                    
+                    for j in dependents[i]:
+                        remaining[j].discard(i)
+                        if not remaining[j]:
+                            heapq.heappush(ready, j)
+        
+        ctx.results.extend(results[i] for i in sorted(results))
+    
     def _execute_step(
         self,
         step: PlanStep,
@@ -459,7 +836,7 @@ class PlanExecutor:
         logger.debug(f"[{ctx.trace_id}] Executing step {index + 1}: {step.action}")
         
         # Check condition
-        if step.condition and not self._evaluate_condition(step.condition, ctx):
+        if step.condition and not self._evaluate_condition(step, ctx):
             logger.debug(f"[{ctx.trace_id}] Step {index + 1} skipped (condition not met)")
             return StepResult(
                 step_index=index,
@@ -486,9 +863,16 @@ class PlanExecutor:
         
         # Execute with retry
         last_error = None
+        attempts = 0
         for attempt in range(step.retry + 1):
+            if ctx.cancelled:
+                last_error = last_error or "cancelled"
+                break
+            attempts = attempt + 1
             try:
-                result = self._call_action(step.action, resolved_params, step.timeout)
+                result = self._call_action(
+                    step.action, resolved_params, step.timeout, ctx.cancel_event
+                )
                 
                 # Store result
                 if step.store_as:
@@ -505,13 +889,19 @@ class PlanExecutor:
                     metadata={"attempt": attempt + 1},
                 )
                 
+            except StepCancelledError as e:
+                last_error = str(e)
+                break
             except Exception as e:
                 last_error = str(e)
                 if attempt < step.retry:
                     logger.warning(
                         f"[{ctx.trace_id}] Step {index + 1} attempt {attempt + 1} failed, retrying"
                     )
-                    time.sleep(0.1 * (attempt + 1))  # Simple backoff
+                    # Backoff wakes up immediately when the plan is cancelled
+                    if ctx.cancel_event.wait(self.retry_backoff * (attempt + 1)):
+                        last_error = f"{last_error} (cancelled during retry backoff)"
+                        break
         
         duration = (time.time() - start_time) * 1000
         
@@ -521,7 +911,7 @@ class PlanExecutor:
             status=StepStatus.FAILED,
             error=last_error,
             duration_ms=duration,
-            metadata={"attempts": step.retry + 1},
+            metadata={"attempts": attempts},
         )
     
     def _execute_foreach(
@@ -552,28 +942,21 @@ class PlanExecutor:
                 error=f"foreach target is not iterable: {type(iterable)}",
             )
         
-        results = []
-        
-        for i, item in enumerate(iterable):
-            # Set loop context
-            ctx.set("item", item)
-            ctx.set("index", i)
-            
-            # Resolve params with loop context
-            resolved_params = self._resolve_params(step.params, ctx)
-            
-            try:
-                result = self._call_action(step.action, resolved_params, step.timeout)
-                results.append(result)
-            except Exception as e:
-                logger.warning(f"[{ctx.trace_id}] foreach iteration {i} failed: {e}")
+        if step.max_parallel > 1 and len(iterable) > 1:
+            results, failures = self._foreach_parallel(step, ctx, iterable)
+        else:
+            results, failures = [], 0
+            for i, item in enumerate(iterable):
+                if ctx.cancelled:
+                    break
+                ok, value = self._foreach_item(step, ctx, i, item)
+                if ok:
+                    results.append(value)
+                    continue
+                failures += 1
                 if step.on_error == "stop":
                     break
         
-        # Clean up loop context
-        ctx.variables.pop("item", None)
-        ctx.variables.pop("index", None)
-        
         # Store aggregated results
         if step.store_as:
             ctx.set(step.store_as, results)
@@ -587,8 +970,86 @@ class PlanExecutor:
             result=results,
             duration_ms=duration,
             iterations=len(iterable),
+            metadata={"max_parallel": step.max_parallel, "failed_iterations": failures},
         )
     
+    def _foreach_item(
+        self,
+        step: PlanStep,
+        ctx: ExecutionContext,
+        i: int,
+        item: Any,
+    ) -> tuple[bool, Any]:
+        """Run one foreach iteration; returns (succeeded, result)."""
+        # Resolve params with loop context
+        loop_ctx = ctx.scoped(item=item, index=i)
+        try:
+            resolved_params = self._resolve_params(step.params, loop_ctx)
+            return True, self._call_action(
+                step.action, resolved_params, step.timeout, ctx.cancel_event
+            )
+        except Exception as e:
+            logger.warning(f"[{ctx.trace_id}] foreach iteration {i} failed: {e}")
+            return False, None
+    
+    def _foreach_parallel(
+        self,
+        step: PlanStep,
+        ctx: ExecutionContext,
+        iterable: list[Any] | tuple[Any, ...],
+    ) -> tuple[list[Any], int]:
+        """
+        Run foreach iterations with at most ``step.max_parallel`` in flight.
+        
+        Results keep item order. With ``on_error="stop"`` no new iterations
+        start after a failure and only results of items before the first
+        failing one are kept, matching the sequential loop.
+        """
+        outcomes: dict[int, tuple[bool, Any]] = {}
+        stop_at: Optional[int] = None
+        pending_items = iter(enumerate(iterable))
+        limit = min(step.max_parallel, len(iterable))
+        
+        with ThreadPoolExecutor(
+            max_workers=limit,
+            thread_name_prefix=f"foreach-{ctx.trace_id}",
+        ) as pool:
+            running: dict[Any, int] = {}
+            
+            def submit_next() -> bool:
+                nxt = next(pending_items, None)
+                if nxt is None:
+                    return False
+                running[pool.submit(self._foreach_item, step, ctx, nxt[0], nxt[1])] = nxt[0]
+                return True
+            
+            while len(running) < limit and submit_next():
+                pass
+            
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    outcomes[i] = future.result()
+                    if not outcomes[i][0] and step.on_error == "stop":
+                        stop_at = i if stop_at is None else min(stop_at, i)
+                
+                while (
+                    stop_at is None
+                    and not ctx.cancelled
+                    and len(running) < limit
+                    and submit_next()
+                ):
+                    pass
+        
+        results = [
+            value
+            for i, (ok, value) in sorted(outcomes.items())
+            if ok and (stop_at is None or i < stop_at)
+        ]
+        failures = sum(1 for ok, _ in outcomes.values() if not ok)
+        return results, failures
+    
     def _resolve_params(
         self,
         params: dict[str, Any],
@@ -612,50 +1073,54 @@ class PlanExecutor:
         
         return resolved
     
-    def _evaluate_condition(self, condition: str, ctx: ExecutionContext) -> bool:
-        """Evaluate a condition expression."""
-        # Simple condition evaluation
-        # Real implementation would use a proper expression parser
-        
-        # Replace variable references
-        expr = condition
-        for match in re.finditer(r"\$(\w+(?:\.\w+)*)", condition):
-            ref = match.group(0)
-            try:
-                value = ctx.resolve_reference(ref)
-                if isinstance(value, str):
-                    expr = expr.replace(ref, f"'{value}'")
-                else:
-                    expr = expr.replace(ref, str(value))
-            except ValueError:
-                return False
-        
-        try:
-            # Safe eval for simple conditions
-            return eval(expr, {"__builtins__": {}}, {})
-        except Exception:
+    def _evaluate_condition(self, step: PlanStep, ctx: ExecutionContext) -> bool:
+        """Evaluate a step's condition (compiled once per step)."""
+        compiled = step.compiled_condition()
+        if compiled is None:
             return False
+        return compiled.evaluate(ctx)
     
     def _call_action(
         self,
         action: str,
         params: dict[str, Any],
         timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> Any:
-        """Call an action handler."""
+        """
+        Call an action handler.
+        
+        Enforces ``timeout`` (seconds) by running the call on a separate
+        thread; raises ``TimeoutError`` when it expires and
+        ``StepCancelledError`` when ``cancel_event`` is set meanwhile.
+        """
         if action in self.action_handlers:
             handler = self.action_handlers[action]
-            return handler(**params)
-        
-        # Check registry for handler
-        registry_handler = self.registry.get_handler(action)
-        if registry_handler:
-            result = registry_handler.execute(params)
-            if result.success:
-                return result.data
-            raise RuntimeError(result.error)
+            wants_cancel = _accepts_keyword(handler, "cancel_event")
+            
+            def call(event: Optional[threading.Event]) -> Any:
+                if wants_cancel:
+                    return handler(**params, cancel_event=event)
+                return handler(**params)
+        else:
+            # Check registry for handler
+            registry_handler = self.registry.get_handler(action)
+            if not registry_handler:
+                raise NotImplementedError(f"No handler for action: {action}")
+            wants_cancel = _accepts_keyword(registry_handler.execute, "cancel_event")
+            
+            def call(event: Optional[threading.Event]) -> Any:
+                if wants_cancel:
+                    result = registry_handler.execute(params, cancel_event=event)
+                else:
+                    result = registry_handler.execute(params)
+                if result.success:
+                    return result.data
+                raise RuntimeError(result.error)
         
-        raise NotImplementedError(f"No handler for action: {action}")
+        if timeout is None or timeout <= 0:
+            return call(cancel_event)
+        return _call_with_deadline(call, action, timeout, cancel_event)
     
     def register_handler(
         self,
@@ -675,4 +1140,11 @@ __all__ = [
     "PlanStep",
     "StepResult",
     "StepStatus",
+    "StepCancelledError",
+    "CompiledCondition",
+    "ConditionError",
+    "compile_condition",
+    "build_dependency_graph",
+    "critical_path",
+    "step_references",
 ]
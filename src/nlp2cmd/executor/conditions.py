@@ -0,0 +1,274 @@
+"""
+Condition expressions for plan steps.
+
+Conditions such as ``len($files) > 0 and $config.enabled`` are parsed once
+into a tree of closures. Variable references are looked up directly in the
+execution context at evaluation time, so values are never formatted back
+into Python source and nothing is re-parsed inside ``foreach`` loops.
+
+Supported syntax is a small, side-effect free subset of Python expressions:
+literals, ``$variable[.path]`` references, ``and``/``or``/``not``,
+comparisons (including ``in``/``is``), arithmetic, subscripts/slices,
+conditional expressions and calls to a few pure builtins (``len``, ``min``...).
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+
+
+_REF_RE = re.compile(r"\$(\w+(?:\.\w+)*)")
+_REF_PREFIX = "__ref_"
+
+
+class ConditionError(ValueError):
+    """Raised when a condition cannot be compiled."""
+
+
+class _Context(Protocol):
+    def resolve_path(self, name: str, path: tuple[str, ...]) -> Any: ...
+
+
+Evaluator = Callable[[_Context], Any]
+
+
+SAFE_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "len": len,
+    "any": any,
+    "all": all,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "abs": abs,
+    "bool": bool,
+    "int": int,
+    "float": float,
+    "str": str,
+    "sorted": sorted,
+}
+
+_CONSTANT_NAMES = {"True": True, "False": False, "None": None}
+
+_BIN_OPS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPS: dict[type, Callable[[Any], Any]] = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+_CMP_OPS: dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A condition parsed once and evaluated many times."""
+
+    source: str
+    references: tuple[str, ...]
+    _evaluate: Evaluator
+
+    def evaluate(self, ctx: _Context) -> bool:
+        """
+        Evaluate against an execution context.
+
+        Returns False when a referenced variable is missing or evaluation
+        raises, matching the executor's historical behaviour.
+        """
+        try:
+            return bool(self._evaluate(ctx))
+        except Exception:
+            return False
+
+
+def compile_condition(condition: str) -> CompiledCondition:
+    """
+    Compile a condition expression.
+
+    Raises:
+        ConditionError: If the expression is not valid or uses unsupported syntax
+    """
+    refs: dict[str, str] = {}
+
+    def placeholder(match: re.Match[str]) -> str:
+        ref = match.group(1)
+        if ref not in refs:
+            refs[ref] = f"{_REF_PREFIX}{len(refs)}"
+        return refs[ref]
+
+    expr = _REF_RE.sub(placeholder, condition.strip())
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition {condition!r}: {e.msg}") from None
+
+    lookups: dict[str, tuple[str, tuple[str, ...]]] = {}
+    for ref, name in refs.items():
+        root, *path = ref.split(".")
+        if any(key.startswith("_") for key in path):
+            raise ConditionError(f"Private attribute access in condition {condition!r}")
+        lookups[name] = (root, tuple(path))
+
+    evaluator = _Compiler(condition, lookups).compile(tree.body)
+    return CompiledCondition(
+        source=condition,
+        references=tuple(refs),
+        _evaluate=evaluator,
+    )
+
+
+class _Compiler:
+    def __init__(self, source: str, lookups: dict[str, tuple[str, tuple[str, ...]]]):
+        self.source = source
+        self.lookups = lookups
+
+    def unsupported(self, node: ast.AST) -> ConditionError:
+        return ConditionError(
+            f"Unsupported syntax in condition {self.source!r}: {type(node).__name__}"
+        )
+
+    def compile(self, node: ast.AST) -> Evaluator:
+        method = getattr(self, f"_compile_{type(node).__name__}", None)
+        if method is None:
+            raise self.unsupported(node)
+        return method(node)
+
+    def _compile_Constant(self, node: ast.Constant) -> Evaluator:
+        value = node.value
+        return lambda ctx: value
+
+    def _compile_Name(self, node: ast.Name) -> Evaluator:
+        if node.id in self.lookups:
+            root, path = self.lookups[node.id]
+            return lambda ctx: ctx.resolve_path(root, path)
+        if node.id in _CONSTANT_NAMES:
+            value = _CONSTANT_NAMES[node.id]
+            return lambda ctx: value
+        raise ConditionError(f"Unknown name {node.id!r} in condition {self.source!r}")
+
+    def _compile_BoolOp(self, node: ast.BoolOp) -> Evaluator:
+        operands = [self.compile(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            def evaluate_and(ctx: _Context) -> Any:
+                value: Any = True
+                for operand in operands:
+                    value = operand(ctx)
+                    if not value:
+                        return value
+                return value
+            return evaluate_and
+
+        def evaluate_or(ctx: _Context) -> Any:
+            value: Any = False
+            for operand in operands:
+                value = operand(ctx)
+                if value:
+                    return value
+            return value
+        return evaluate_or
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> Evaluator:
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise self.unsupported(node.op)
+        operand = self.compile(node.operand)
+        return lambda ctx: op(operand(ctx))
+
+    def _compile_BinOp(self, node: ast.BinOp) -> Evaluator:
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise self.unsupported(node.op)
+        left, right = self.compile(node.left), self.compile(node.right)
+        return lambda ctx: op(left(ctx), right(ctx))
+
+    def _compile_Compare(self, node: ast.Compare) -> Evaluator:
+        first = self.compile(node.left)
+        chain: list[tuple[Callable[[Any, Any], bool], Evaluator]] = []
+        for op_node, comparator in zip(node.ops, node.comparators):
+            op = _CMP_OPS.get(type(op_node))
+            if op is None:
+                raise self.unsupported(op_node)
+            chain.append((op, self.compile(comparator)))
+
+        if len(chain) == 1:
+            op, second = chain[0]
+            return lambda ctx: op(first(ctx), second(ctx))
+
+        def evaluate_chain(ctx: _Context) -> bool:
+            left = first(ctx)
+            for op, comparator in chain:
+                right = comparator(ctx)
+                if not op(left, right):
+                    return False
+                left = right
+            return True
+        return evaluate_chain
+
+    def _compile_IfExp(self, node: ast.IfExp) -> Evaluator:
+        test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+        return lambda ctx: body(ctx) if test(ctx) else orelse(ctx)
+
+    def _compile_Subscript(self, node: ast.Subscript) -> Evaluator:
+        value, index = self.compile(node.value), self.compile(node.slice)
+        return lambda ctx: value(ctx)[index(ctx)]
+
+    def _compile_Slice(self, node: ast.Slice) -> Evaluator:
+        parts = [
+            self.compile(part) if part is not None else None
+            for part in (node.lower, node.upper, node.step)
+        ]
+        return lambda ctx: slice(*(p(ctx) if p is not None else None for p in parts))
+
+    def _compile_Call(self, node: ast.Call) -> Evaluator:
+        if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS:
+            raise self.unsupported(node.func)
+        if node.keywords:
+            raise self.unsupported(node.keywords[0])
+        func = SAFE_FUNCTIONS[node.func.id]
+        args = [self.compile(a) for a in node.args]
+        if len(args) == 1:
+            arg = args[0]
+            return lambda ctx: func(arg(ctx))
+        return lambda ctx: func(*(a(ctx) for a in args))
+
+    def _compile_List(self, node: ast.List) -> Evaluator:
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: [item(ctx) for item in items]
+
+    def _compile_Tuple(self, node: ast.Tuple) -> Evaluator:
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: tuple(item(ctx) for item in items)
+
+    def _compile_Set(self, node: ast.Set) -> Evaluator:
+        items = [self.compile(e) for e in node.elts]
+        return lambda ctx: {item(ctx) for item in items}
+
+
+__all__ = [
+    "CompiledCondition",
+    "ConditionError",
+    "SAFE_FUNCTIONS",
+    "compile_condition",
+]
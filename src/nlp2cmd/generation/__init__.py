@@ -58,6 +58,9 @@ __all__ = [
     "SimpleLLMDockerGenerator",
     "SimpleLLMKubernetesGenerator",
     "MockLLMClient",
+    "LiteLLMClient",
+    "ResponseCache",
+    "LLMCacheStats",
     "LLMDomainRouter",
     "MultiDomainGenerator",
     "MultiDomainResult",
@@ -108,6 +111,9 @@ _LAZY_EXPORTS: dict[str, tuple[str, str]] = {
     "SimpleLLMDockerGenerator": ("nlp2cmd.generation.llm_simple", "SimpleLLMDockerGenerator"),
     "SimpleLLMKubernetesGenerator": ("nlp2cmd.generation.llm_simple", "SimpleLLMKubernetesGenerator"),
     "MockLLMClient": ("nlp2cmd.generation.llm_simple", "MockLLMClient"),
+    "LiteLLMClient": ("nlp2cmd.generation.llm_simple", "LiteLLMClient"),
+    "ResponseCache": ("nlp2cmd.generation.llm_cache", "ResponseCache"),
+    "LLMCacheStats": ("nlp2cmd.generation.llm_cache", "LLMCacheStats"),
     "LLMDomainRouter": ("nlp2cmd.generation.llm_multi", "LLMDomainRouter"),
     "MultiDomainGenerator": ("nlp2cmd.generation.llm_multi", "MultiDomainGenerator"),
     "MultiDomainResult": ("nlp2cmd.generation.llm_multi", "MultiDomainResult"),
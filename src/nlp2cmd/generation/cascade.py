@@ -0,0 +1,228 @@
+"""
+Detection cascade statistics for KeywordIntentDetector.
+
+``KeywordIntentDetector._detect_normalized`` tries a fixed cascade of stages
+and returns the first match. ``CascadeStats`` counts, per stage, how often it
+was reached, how often it resolved the query and how much time it spent.
+``CascadePlan`` turns recorded stats into an adaptive cascade that skips
+expensive stages which (almost) never resolve traffic for a given pattern set.
+
+Stage order is never changed: several stages can match the same input, and the
+first one wins, so reordering would change results. Skipping is the only
+adaptation, and the core rule stages are never skipped.
+
+Environment:
+    NLP2CMD_CASCADE_PLAN: Path of a saved plan to apply to new detectors
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+CASCADE_STAGES: tuple[str, ...] = (
+    "ml_classifier",
+    "fast_path",
+    "explicit_matches",
+    "pattern_scan",
+    "ml_medium",
+    "schema_matcher",
+    "fuzzy_fallback",
+    "schema_fallback",
+    "semantic_fallback",
+)
+
+# Deterministic rule stages; an adaptive plan never skips them.
+PROTECTED_STAGES: frozenset[str] = frozenset({"fast_path", "explicit_matches", "pattern_scan"})
+
+STATS_FORMAT = "nlp2cmd.cascade_stats"
+PLAN_FORMAT = "nlp2cmd.cascade_plan"
+
+
+@dataclass
+class StageCounter:
+    """Counters for one cascade stage."""
+
+    hits: int = 0
+    misses: int = 0
+    total_ns: int = 0
+
+    @property
+    def attempts(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ns / self.attempts / 1e6 if self.attempts else 0.0
+
+
+class CascadeStats:
+    """Hit/miss counts and cumulative time per detection stage."""
+
+    def __init__(self, fingerprint: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.stages: dict[str, StageCounter] = {name: StageCounter() for name in CASCADE_STAGES}
+        self.runs = 0
+        self.unresolved = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, hit: bool, elapsed_ns: int) -> None:
+        with self._lock:
+            counter = self.stages.get(stage)
+            if counter is None:
+                counter = self.stages[stage] = StageCounter()
+            if hit:
+                counter.hits += 1
+            else:
+                counter.misses += 1
+            counter.total_ns += elapsed_ns
+
+    def record_run(self, resolved: bool) -> None:
+        with self._lock:
+            self.runs += 1
+            if not resolved:
+                self.unresolved += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages = {name: StageCounter() for name in CASCADE_STAGES}
+            self.runs = 0
+            self.unresolved = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export counters (JSON-serializable)."""
+        with self._lock:
+            stages = {
+                name: {
+                    "hits": c.hits,
+                    "misses": c.misses,
+                    "attempts": c.attempts,
+                    "hit_rate": round(c.hit_rate, 6),
+                    "total_ms": round(c.total_ns / 1e6, 4),
+                    "avg_ms": round(c.avg_ms, 6),
+                }
+                for name, c in self.stages.items()
+            }
+            return {
+                "format": STATS_FORMAT,
+                "version": 1,
+                "fingerprint": self.fingerprint,
+                "runs": self.runs,
+                "unresolved": self.unresolved,
+                "stages": stages,
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CascadeStats":
+        if not isinstance(data, dict) or data.get("format") != STATS_FORMAT:
+            raise ValueError("Not a cascade stats export")
+        stats = cls(fingerprint=data.get("fingerprint"))
+        stats.runs = int(data.get("runs") or 0)
+        stats.unresolved = int(data.get("unresolved") or 0)
+        for name, raw in (data.get("stages") or {}).items():
+            total_ns = int(round(float(raw.get("total_ms") or 0.0) * 1e6))
+            stats.stages[name] = StageCounter(
+                hits=int(raw.get("hits") or 0),
+                misses=int(raw.get("misses") or 0),
+                total_ns=total_ns,
+            )
+        return stats
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
+
+    def plan(
+        self,
+        min_samples: int = 100,
+        max_hit_rate: float = 0.0,
+        min_avg_ms: float = 0.05,
+    ) -> "CascadePlan":
+        """
+        Build an adaptive plan from the recorded counters.
+
+        A stage is skipped when it was reached at least ``min_samples`` times,
+        its hit rate is at most ``max_hit_rate`` and it costs at least
+        ``min_avg_ms`` per attempt on average.
+
+        Args:
+            min_samples: Attempts required before a stage can be judged
+            max_hit_rate: Highest hit rate that still counts as "never resolves"
+            min_avg_ms: Cheaper stages are kept regardless of hit rate
+        """
+        skip = []
+        with self._lock:
+            for name in CASCADE_STAGES:
+                counter = self.stages.get(name)
+                if counter is None or name in PROTECTED_STAGES:
+                    continue
+                if (
+                    counter.attempts >= min_samples
+                    and counter.hit_rate <= max_hit_rate
+                    and counter.avg_ms >= min_avg_ms
+                ):
+                    skip.append(name)
+        return CascadePlan(skip=frozenset(skip), fingerprint=self.fingerprint)
+
+
+@dataclass(frozen=True)
+class CascadePlan:
+    """Stages to skip for a specific pattern set."""
+
+    skip: frozenset[str] = field(default_factory=frozenset)
+    fingerprint: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        protected = self.skip & PROTECTED_STAGES
+        if protected:
+            raise ValueError(f"Cascade stages cannot be skipped: {sorted(protected)}")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": PLAN_FORMAT,
+            "version": 1,
+            "fingerprint": self.fingerprint,
+            "skip": sorted(self.skip),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CascadePlan":
+        if not isinstance(data, dict) or data.get("format") != PLAN_FORMAT:
+            raise ValueError("Not a cascade plan")
+        return cls(skip=frozenset(data.get("skip") or ()), fingerprint=data.get("fingerprint"))
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CascadePlan":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def default_plan_path() -> Optional[Path]:
+    explicit = str(os.environ.get("NLP2CMD_CASCADE_PLAN") or "").strip()
+    return Path(explicit).expanduser() if explicit else None
+
+
+__all__ = [
+    "CASCADE_STAGES",
+    "CascadePlan",
+    "CascadeStats",
+    "PROTECTED_STAGES",
+    "StageCounter",
+    "default_plan_path",
+]
@@ -2,17 +2,24 @@
 Iteration 9: Hybrid Rule+LLM Generator.
 
 Optimizes costs by using rules first, LLM as fallback only when needed.
+
+In speculative mode the rules run in a worker thread while the LLM request
+starts at once, for queries that are likely to fall through the rules (see
+``nlp2cmd.generation.speculation``). The first acceptable result wins.
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Any, Optional
+import asyncio
 import time
 
 from nlp2cmd.generation.pipeline import RuleBasedPipeline, PipelineResult
 from nlp2cmd.generation.llm_multi import MultiDomainGenerator, MultiDomainResult
+from nlp2cmd.generation.llm_cache import LLMCacheStats
 from nlp2cmd.generation.llm_simple import LLMClient, LLMConfig
+from nlp2cmd.generation.speculation import FallthroughPredictor, SpeculationBudget
 
 
 @dataclass
@@ -34,6 +41,9 @@ class HybridResult:
     llm_calls: int = 0
     estimated_cost: float = 0.0
     
+    # LLM was started alongside the rules
+    speculative: bool = False
+    
     errors: list[str] = field(default_factory=list)
 
 
@@ -48,6 +58,23 @@ class HybridStats:
     total_latency_ms: float = 0.0
     estimated_total_cost: float = 0.0
     
+    # LLM client response cache (see LiteLLMClient.cache_stats)
+    llm_cache_hits: int = 0
+    llm_cache_misses: int = 0
+    llm_coalesced: int = 0
+    
+    # Speculative mode: LLM calls started alongside the rules, and how many
+    # of them were thrown away because the rules won
+    speculative_calls: int = 0
+    wasted_llm_calls: int = 0
+    
+    @property
+    def wasted_call_ratio(self) -> float:
+        """Share of speculative LLM calls whose result was not used."""
+        if self.speculative_calls == 0:
+            return 0.0
+        return self.wasted_llm_calls / self.speculative_calls
+    
     @property
     def rule_hit_rate(self) -> float:
         """Calculate rule hit rate."""
@@ -80,6 +107,12 @@ class HybridStats:
             "avg_latency_ms": f"{self.avg_latency_ms:.2f}",
             "estimated_cost": f"${self.estimated_total_cost:.4f}",
             "cost_savings": f"{self.cost_savings_percent:.1f}%",
+            "llm_cache_hits": self.llm_cache_hits,
+            "llm_cache_misses": self.llm_cache_misses,
+            "llm_coalesced": self.llm_coalesced,
+            "speculative_calls": self.speculative_calls,
+            "wasted_llm_calls": self.wasted_llm_calls,
+            "wasted_call_ratio": f"{self.wasted_call_ratio:.1%}",
         }
 
 
@@ -102,6 +135,11 @@ class HybridGenerator:
         result = await generator.generate("Pokaż użytkowników")
         # Uses rules (fast, free) if confident enough
         # Falls back to LLM if rules fail
+    
+    With ``speculative=True`` a query the predictor expects to fall through
+    starts its LLM request while the rules are still running, so it does not
+    pay rule latency plus LLM latency in series. ``speculation_budget`` caps
+    such calls at that fraction of all requests.
     """
     
     # Estimated cost per LLM call (GPT-4)
@@ -129,6 +167,9 @@ class HybridGenerator:
         llm_client: Optional[LLMClient] = None,
         confidence_threshold: float = 0.7,
         always_validate_with_llm: bool = False,
+        speculative: bool = False,
+        speculation_budget: float = 0.25,
+        predictor: Optional[FallthroughPredictor] = None,
     ):
         """
         Initialize hybrid generator.
@@ -139,6 +180,11 @@ class HybridGenerator:
             llm_client: LLM client (if llm_generator not provided)
             confidence_threshold: Minimum confidence to use rule result
             always_validate_with_llm: Also validate rule results with LLM
+            speculative: Start the LLM in parallel with the rules for
+                queries predicted to fall through
+            speculation_budget: Maximum speculative LLM calls per request
+                (0.25 = at most one in four requests)
+            predictor: Fall-through predictor (default: FallthroughPredictor())
         """
         self.rules = rule_pipeline
         self.confidence_threshold = confidence_threshold
@@ -151,7 +197,12 @@ class HybridGenerator:
         else:
             self.llm = None
         
+        self.speculative = speculative
+        self.predictor = predictor or FallthroughPredictor()
+        self.budget = SpeculationBudget(speculation_budget)
+        
         self.stats = HybridStats()
+        self._llm_cache_baseline = self._snapshot_llm_cache_stats()
     
     async def generate(
         self,
@@ -172,31 +223,26 @@ class HybridGenerator:
         """
         start_time = time.time()
         self.stats.total_requests += 1
+        self.budget.record_request()
         
         # Force LLM if requested
         if force_llm and self.llm:
             return await self._generate_with_llm(text, context, start_time)
         
+        if (
+            self.speculative
+            and self.llm is not None
+            and self.predictor.predict(text)
+            and self.budget.try_acquire()
+        ):
+            return await self._generate_speculative(text, context, start_time)
+        
         # Try rules first
-        rule_result = self.rules.process(text)
+        rule_result = self._process_rules(text)
         
         # Check if rules succeeded with high confidence
         if self._should_use_rule_result(rule_result):
-            self.stats.rule_hits += 1
-            latency = (time.time() - start_time) * 1000
-            self.stats.total_latency_ms += latency
-            
-            return HybridResult(
-                command=rule_result.command,
-                domain=rule_result.domain,
-                source="rules",
-                confidence=rule_result.detection_confidence,
-                latency_ms=latency,
-                success=rule_result.success,
-                rule_result=rule_result,
-                llm_calls=0,
-                estimated_cost=0.0,
-            )
+            return self._rule_hit(rule_result, start_time)
         
         # Fallback to LLM
         if self.llm is None:
@@ -237,6 +283,94 @@ class HybridGenerator:
         
         return True
     
+    def _process_rules(self, text: str) -> PipelineResult:
+        """Run the rule pipeline and teach the predictor the outcome."""
+        result = self.rules.process(text)
+        self.predictor.observe(text, not self._should_use_rule_result(result))
+        return result
+    
+    def _rule_hit(
+        self,
+        rule_result: PipelineResult,
+        start_time: float,
+        speculative: bool = False,
+    ) -> HybridResult:
+        """Result for an accepted rule result."""
+        self.stats.rule_hits += 1
+        latency = (time.time() - start_time) * 1000
+        self.stats.total_latency_ms += latency
+        
+        # A speculative LLM call was paid for even though it lost.
+        llm_calls = 1 if speculative else 0
+        return HybridResult(
+            command=rule_result.command,
+            domain=rule_result.domain,
+            source="rules",
+            confidence=rule_result.detection_confidence,
+            latency_ms=latency,
+            success=rule_result.success,
+            rule_result=rule_result,
+            llm_calls=llm_calls,
+            estimated_cost=llm_calls * self.COST_PER_LLM_CALL,
+            speculative=speculative,
+        )
+    
+    async def _generate_speculative(
+        self,
+        text: str,
+        context: Optional[dict[str, Any]],
+        start_time: float,
+    ) -> HybridResult:
+        """
+        Race the rules (in a worker thread) against the LLM.
+        
+        An accepted rule result wins and cancels the LLM request. A successful
+        LLM result wins as soon as it arrives; the rule thread cannot be
+        interrupted, so it finishes in the background and only updates the
+        predictor. Otherwise the result matches the non-speculative path.
+        """
+        self.stats.speculative_calls += 1
+        self.stats.total_llm_calls += 1
+        self.stats.estimated_total_cost += self.COST_PER_LLM_CALL
+        
+        rule_task = asyncio.ensure_future(asyncio.to_thread(self._process_rules, text))
+        llm_task = asyncio.ensure_future(self.llm.generate(text, context))
+        try:
+            done, _ = await asyncio.wait(
+                {rule_task, llm_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            
+            rule_result: Optional[PipelineResult] = None
+            if rule_task in done:
+                rule_result = rule_task.result()
+                if self._should_use_rule_result(rule_result):
+                    self.stats.wasted_llm_calls += 1
+                    return self._rule_hit(rule_result, start_time, speculative=True)
+                llm_result = await llm_task
+            else:
+                try:
+                    llm_result = llm_task.result()
+                    llm_error: Optional[BaseException] = None
+                except Exception as e:
+                    llm_result, llm_error = None, e
+                if llm_result is None or not llm_result.success:
+                    rule_result = await rule_task
+                    if self._should_use_rule_result(rule_result):
+                        self.stats.wasted_llm_calls += 1
+                        return self._rule_hit(rule_result, start_time, speculative=True)
+                    if llm_error is not None:
+                        raise llm_error
+            
+            return self._llm_hit(llm_result, start_time, rule_result, speculative=True)
+        finally:
+            if not llm_task.done():
+                llm_task.cancel()
+            if not rule_task.done():
+                # Nobody awaits the abandoned rule run; consume its outcome.
+                rule_task.add_done_callback(
+                    lambda t: t.cancelled() or t.exception()
+                )
+    
     async def _generate_with_llm(
         self,
         text: str,
@@ -245,14 +379,23 @@ class HybridGenerator:
         rule_result: Optional[PipelineResult] = None,
     ) -> HybridResult:
         """Generate using LLM."""
-        self.stats.llm_fallbacks += 1
         self.stats.total_llm_calls += 1
+        self.stats.estimated_total_cost += self.COST_PER_LLM_CALL
         
         llm_result = await self.llm.generate(text, context)
-        
+        return self._llm_hit(llm_result, start_time, rule_result)
+    
+    def _llm_hit(
+        self,
+        llm_result: MultiDomainResult,
+        start_time: float,
+        rule_result: Optional[PipelineResult] = None,
+        speculative: bool = False,
+    ) -> HybridResult:
+        """Result built from an LLM answer."""
+        self.stats.llm_fallbacks += 1
         latency = (time.time() - start_time) * 1000
         self.stats.total_latency_ms += latency
-        self.stats.estimated_total_cost += self.COST_PER_LLM_CALL
         
         return HybridResult(
             command=llm_result.command,
@@ -265,6 +408,7 @@ class HybridGenerator:
             llm_result=llm_result,
             llm_calls=1,
             estimated_cost=self.COST_PER_LLM_CALL,
+            speculative=speculative,
             errors=[llm_result.error] if llm_result.error else [],
         )
     
@@ -274,17 +418,32 @@ class HybridGenerator:
         context: Optional[dict[str, Any]] = None,
     ) -> list[HybridResult]:
         """Generate for multiple inputs."""
-        import asyncio
         tasks = [self.generate(text, context) for text in texts]
         return await asyncio.gather(*tasks)
     
+    def _snapshot_llm_cache_stats(self) -> Optional[LLMCacheStats]:
+        """Copy of the LLM client's cache counters, if it keeps any."""
+        client = getattr(self.llm, "llm", None)
+        stats = getattr(client, "cache_stats", None)
+        if not isinstance(stats, LLMCacheStats):
+            return None
+        return LLMCacheStats(**stats.to_dict())
+    
     def get_stats(self) -> HybridStats:
         """Get generation statistics."""
+        current = self._snapshot_llm_cache_stats()
+        base = self._llm_cache_baseline
+        if current is not None and base is not None:
+            self.stats.llm_cache_hits = current.hits - base.hits
+            self.stats.llm_cache_misses = current.misses - base.misses
+            self.stats.llm_coalesced = current.coalesced - base.coalesced
         return self.stats
     
     def reset_stats(self) -> None:
         """Reset statistics."""
         self.stats = HybridStats()
+        self.budget.reset()
+        self._llm_cache_baseline = self._snapshot_llm_cache_stats()
     
     def set_confidence_threshold(self, threshold: float) -> None:
         """Update confidence threshold."""
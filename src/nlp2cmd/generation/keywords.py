@@ -7,13 +7,19 @@ Keyword matching for intent and domain detection without LLM.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Optional
+import hashlib
 import logging
 import json
 import os
 from pathlib import Path
 import re
+import time
 
+from nlp2cmd.generation.cascade import CASCADE_STAGES, CascadePlan, CascadeStats, default_plan_path
+from nlp2cmd.generation.knowledge_bundle import copy_tables, get_knowledge_bundle
+from nlp2cmd.generation.lemmatizer import SPACY_DISABLED_COMPONENTS, SpacyLemmatizer
+from nlp2cmd.monitoring.tracing import span
 from nlp2cmd.utils.data_files import find_data_files
 
 logger = logging.getLogger(__name__)
@@ -147,6 +153,7 @@ except ImportError:
 _SPACY = None
 _NLP_MODEL = None
 _NLP_MODEL_LOAD_ATTEMPTED = False
+_LEMMATIZER: Optional[SpacyLemmatizer] = None
 
 _ENABLE_SPACY_LEMMATIZATION = str(
     os.environ.get("NLP2CMD_ENABLE_SPACY_LEMMATIZATION")
@@ -173,17 +180,30 @@ def _get_spacy_model():
         _NLP_MODEL = None
         return None
 
+    disabled = list(SPACY_DISABLED_COMPONENTS)
     try:
-        _NLP_MODEL = _SPACY.load("pl_core_news_sm")
+        _NLP_MODEL = _SPACY.load("pl_core_news_sm", disable=disabled)
     except Exception:
         try:
-            _NLP_MODEL = _SPACY.load("spacy_pl_model")
+            _NLP_MODEL = _SPACY.load("spacy_pl_model", disable=disabled)
         except Exception:
             _NLP_MODEL = None
 
     return _NLP_MODEL
 
 
+def _get_lemmatizer() -> Optional[SpacyLemmatizer]:
+    """Cached lemmatizer around the spaCy model, or None when unavailable."""
+    global _LEMMATIZER
+
+    if _LEMMATIZER is None:
+        model = _get_spacy_model()
+        if model is None:
+            return None
+        _LEMMATIZER = SpacyLemmatizer.from_env(model)
+    return _LEMMATIZER
+
+
 @dataclass
 class DetectionResult:
     """Result of intent detection."""
@@ -236,6 +256,14 @@ class KeywordIntentDetector:
         self.fast_path_search_keywords: list[str] = []
         self.fast_path_common_images: set[str] = set()
 
+        # Bumped whenever detection results may change (patterns, cascade plan);
+        # lets callers memoise detections.
+        self.revision = 0
+
+        # Detection cascade instrumentation (see nlp2cmd.generation.cascade)
+        self.cascade_stats: Optional[CascadeStats] = None
+        self._cascade_skip: frozenset[str] = frozenset()
+
         # Load configuration from JSON files.
         self._load_detector_config_from_json()
         self._load_patterns_from_json()
@@ -271,7 +299,96 @@ class KeywordIntentDetector:
                 "Set NLP2CMD_STRICT_CONFIG=1 to fail fast."
             )
 
+        plan_path = default_plan_path()
+        if plan_path is not None:
+            try:
+                self.use_cascade_plan(CascadePlan.load(plan_path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring cascade plan {plan_path}: {e}")
+
+    def pattern_fingerprint(self) -> str:
+        """Stable hash of the loaded pattern set (cascade plans are tied to it)."""
+        payload = json.dumps(
+            {"patterns": self.patterns, "priority_intents": self.priority_intents},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def enable_cascade_stats(self, stats: Optional[CascadeStats] = None) -> CascadeStats:
+        """Start counting hits, misses and time per detection stage."""
+        if stats is None:
+            stats = CascadeStats(fingerprint=self.pattern_fingerprint())
+        self.cascade_stats = stats
+        return stats
+
+    def disable_cascade_stats(self) -> Optional[CascadeStats]:
+        stats, self.cascade_stats = self.cascade_stats, None
+        return stats
+
+    def use_cascade_plan(self, plan: Optional[CascadePlan]) -> None:
+        """
+        Apply an adaptive cascade plan (None restores the full cascade).
+
+        Raises:
+            ValueError: If the plan was computed for a different pattern set
+        """
+        self.revision += 1
+        if plan is None:
+            self._cascade_skip = frozenset()
+            return
+        if plan.fingerprint is not None and plan.fingerprint != self.pattern_fingerprint():
+            raise ValueError("Cascade plan was computed for a different pattern set")
+        unknown = plan.skip - set(CASCADE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown cascade stages: {sorted(unknown)}")
+        self._cascade_skip = plan.skip
+
+    def calibrate_cascade(self, texts: Iterable[str], **plan_options) -> tuple[CascadePlan, CascadeStats]:
+        """
+        Run a benchmark corpus through the full cascade and derive a plan.
+
+        The plan is returned, not applied; pass it to ``use_cascade_plan``.
+        Keyword arguments are forwarded to ``CascadeStats.plan``.
+        """
+        previous_stats, previous_skip = self.cascade_stats, self._cascade_skip
+        stats = CascadeStats(fingerprint=self.pattern_fingerprint())
+        self.cascade_stats, self._cascade_skip = stats, frozenset()
+        try:
+            for text in texts:
+                self.detect(text)
+        finally:
+            self.cascade_stats, self._cascade_skip = previous_stats, previous_skip
+        return stats.plan(**plan_options), stats
+
+    def _compiled_data(self) -> Optional[dict]:
+        """Detector tables from the compiled knowledge bundle, if one is usable."""
+        if type(self) is not KeywordIntentDetector:
+            return None
+        bundle = get_knowledge_bundle()
+        return bundle.detector if bundle is not None and bundle.detector else None
+
+    def export_loaded_data(self) -> dict:
+        """Snapshot the merged JSON-derived tables (used to compile the knowledge bundle)."""
+        return {
+            "patterns": copy_tables(self.patterns),
+            "domain_boosters": {k: list(v) for k, v in self.domain_boosters.items()},
+            "priority_intents": {k: list(v) for k, v in self.priority_intents.items()},
+            "fast_path_browser_keywords": list(self.fast_path_browser_keywords),
+            "fast_path_search_keywords": list(self.fast_path_search_keywords),
+            "fast_path_common_images": set(self.fast_path_common_images),
+        }
+
     def _load_detector_config_from_json(self) -> None:
+        compiled = self._compiled_data()
+        if compiled is not None:
+            self.domain_boosters = {k: list(v) for k, v in compiled["domain_boosters"].items()}
+            self.priority_intents = {k: list(v) for k, v in compiled["priority_intents"].items()}
+            self.fast_path_browser_keywords = list(compiled["fast_path_browser_keywords"])
+            self.fast_path_search_keywords = list(compiled["fast_path_search_keywords"])
+            self.fast_path_common_images = set(compiled["fast_path_common_images"])
+            return
+
         for p in find_data_files(
             explicit_path=os.environ.get("NLP2CMD_KEYWORD_DETECTOR_CONFIG"),
             default_filename="keyword_intent_detector_config.json",
@@ -364,6 +481,11 @@ class KeywordIntentDetector:
         if self._custom_patterns_provided:
             return
 
+        compiled = self._compiled_data()
+        if compiled is not None:
+            self.patterns = copy_tables(compiled["patterns"])
+            return
+
         base: dict[str, dict[str, list[str]]] = {
             d: {i: [_normalize_polish_text(kw.strip()) for kw in kws if isinstance(kw, str) and kw.strip()] 
                 for i, kws in intents.items()}
@@ -472,35 +594,28 @@ class KeywordIntentDetector:
     def _maybe_lemmatize_text_lower(text_lower: str) -> str:
         if not _ENABLE_SPACY_LEMMATIZATION:
             return text_lower
-        model = _get_spacy_model()
-        if model is None:
+        lemmatizer = _get_lemmatizer()
+        if lemmatizer is None:
             return text_lower
 
         try:
-            doc = model(text_lower)
-            lemmatized_tokens = []
-            for token in doc:
-                if token.is_punct or token.like_num or token.is_space:
-                    lemmatized_tokens.append(token.text)
-                else:
-                    original_text = token.text.lower()
-                    lemma = (token.lemma_ or "").lower()
-                    important_keywords = {
-                        'restartuj', 'uruchom', 'zrestartuj', 'startuj', 'wystartuj',
-                        'zatrzymaj', 'stopuj', 'usuń', 'skopiuj', 'przenieś', 'znajdź',
-                        'pokaż', 'sprawdź', 'utwórz', 'zmień', 'restart', 'docker', 'ps',
-                        'systemctl', 'nginx', 'kontener', 'kontenery', 'plik', 'foldery',
-                        'katalog', 'katalogi', 'usługa', 'usługi', 'usługę', 'serwis',
-                        'komputer', 'system', 'proces', 'procesy'
-                    }
-                    if original_text in important_keywords or not lemma or len(lemma) <= 1:
-                        lemmatized_tokens.append(original_text)
-                    else:
-                        lemmatized_tokens.append(lemma)
-            return " ".join(lemmatized_tokens)
+            return lemmatizer.lemmatize(text_lower)
         except Exception:
             return text_lower
 
+    @staticmethod
+    def _prefetch_lemmas(texts_lower: list[str], batch_size: Optional[int] = None) -> None:
+        """Lemmatize in batches so later ``_maybe_lemmatize_text_lower`` calls hit the cache."""
+        if not texts_lower or not _ENABLE_SPACY_LEMMATIZATION:
+            return
+        lemmatizer = _get_lemmatizer()
+        if lemmatizer is None:
+            return
+        try:
+            lemmatizer.lemmatize_many(texts_lower, batch_size=batch_size)
+        except Exception as e:
+            logger.debug(f"Batch lemmatization failed: {e}")
+
     @staticmethod
     def _normalize_intent(domain: str, intent: str, text_lower: str) -> str:
         if domain == 'sql':
@@ -1244,7 +1359,46 @@ class KeywordIntentDetector:
         Returns:
             DetectionResult with domain, intent, confidence
         """
-        raw_lower, text_lower = self._prepare_text(text)
+        result, lemma_input = self._detect_without_lemmatization(text)
+        if lemma_input is None:
+            return result
+
+        with span("detect.lemmatization"):
+            return self._detect_with_lemmatization(lemma_input, result)
+
+    @property
+    def lemmatization_enabled(self) -> bool:
+        """Whether the spaCy lemmatization fallback is switched on."""
+        return _ENABLE_SPACY_LEMMATIZATION
+
+    def detect_batch(self, texts: list[str], batch_size: Optional[int] = None) -> list[DetectionResult]:
+        """
+        Detect several texts; same results as calling ``detect`` on each.
+        
+        Texts that need the lemmatization fallback are lemmatized together
+        with ``nlp.pipe`` instead of one spaCy call per text.
+        """
+        staged = [self._detect_without_lemmatization(text) for text in texts]
+        self._prefetch_lemmas([lemma_input for _, lemma_input in staged if lemma_input is not None], batch_size)
+
+        results = []
+        for result, lemma_input in staged:
+            if lemma_input is not None:
+                with span("detect.lemmatization"):
+                    result = self._detect_with_lemmatization(lemma_input, result)
+            results.append(result)
+        return results
+
+    def _detect_without_lemmatization(self, text: str) -> tuple[DetectionResult, Optional[str]]:
+        """
+        Detection up to the lemmatization fallback.
+        
+        Returns:
+            ``(result, lemma_input)``: ``lemma_input`` is the lowered text to
+            retry with lemmas, or None when ``result`` is final
+        """
+        with span("detect.prepare"):
+            raw_lower, text_lower = self._prepare_text(text)
 
         if text_lower.strip() == "cd":
             return DetectionResult(
@@ -1252,17 +1406,18 @@ class KeywordIntentDetector:
                 intent="unknown",
                 confidence=0.0,
                 matched_keyword=None,
-            )
+            ), None
 
-        override = self._detect_explicit_overrides(text_lower)
+        with span("detect.overrides"):
+            override = self._detect_explicit_overrides(text_lower)
         if override is not None:
-            return override
+            return override, None
 
         result = self._detect_normalized(text_lower)
         if result.domain != 'unknown' or result.confidence > 0.0:
-            return self._normalize_detection_result(result, text_lower)
+            return self._normalize_detection_result(result, text_lower), None
 
-        return self._detect_with_lemmatization(raw_lower, result)
+        return result, raw_lower
 
     def _prepare_text(self, text: str) -> tuple[str, str]:
         raw_lower = text.lower()
@@ -1497,58 +1652,80 @@ class KeywordIntentDetector:
 
         return None
 
-    def _detect_normalized(self, text_lower: str) -> DetectionResult:
-        result = self._detect_ml_classifier(text_lower)
-        if result is not None:
-            return result
-
-        fast_path = self._detect_fast_path(text_lower)
-        if fast_path is not None:
-            return fast_path
-
-        sql_context, sql_explicit = self._compute_sql_context(text_lower)
-
-        result = self._detect_explicit_matches(
-            text_lower,
-            sql_context=sql_context,
-            sql_explicit=sql_explicit,
-        )
-        if result is not None:
-            return result
-
-        result = self._detect_pattern_matches(
-            text_lower,
-            sql_context=sql_context,
-            sql_explicit=sql_explicit,
-        )
-        if result is not None:
-            return result
-
-        result = self._detect_ml_medium_confidence()
-        if result is not None:
-            return result
-
-        result = self._detect_schema_matcher(text_lower)
-        if result is not None and self._domain_scan_allowed(
-            text_lower,
-            result.domain,
-            sql_context=sql_context,
-            sql_explicit=sql_explicit,
-        ):
-            return result
-
-        result = self._detect_fuzzy_match(text_lower)
-        if result is not None:
-            return result
-
-        result = self._detect_schema_fallback(text_lower)
-        if result is not None:
-            return result
+    def _run_cascade_stage(
+        self,
+        stage: str,
+        text_lower: str,
+        sql_context: bool,
+        sql_explicit: bool,
+    ) -> Optional[DetectionResult]:
+        if stage == "ml_classifier":
+            return self._detect_ml_classifier(text_lower)
+        if stage == "fast_path":
+            return self._detect_fast_path(text_lower)
+        if stage == "explicit_matches":
+            return self._detect_explicit_matches(
+                text_lower,
+                sql_context=sql_context,
+                sql_explicit=sql_explicit,
+            )
+        if stage == "pattern_scan":
+            return self._detect_pattern_matches(
+                text_lower,
+                sql_context=sql_context,
+                sql_explicit=sql_explicit,
+            )
+        if stage == "ml_medium":
+            return self._detect_ml_medium_confidence()
+        if stage == "schema_matcher":
+            result = self._detect_schema_matcher(text_lower)
+            if result is not None and self._domain_scan_allowed(
+                text_lower,
+                result.domain,
+                sql_context=sql_context,
+                sql_explicit=sql_explicit,
+            ):
+                return result
+            return None
+        if stage == "fuzzy_fallback":
+            return self._detect_fuzzy_match(text_lower)
+        if stage == "schema_fallback":
+            return self._detect_schema_fallback(text_lower)
+        if stage == "semantic_fallback":
+            return self._detect_semantic_fallback(text_lower)
+        raise ValueError(f"Unknown cascade stage: {stage}")
 
-        result = self._detect_semantic_fallback(text_lower)
-        if result is not None:
-            return result
+    def _detect_normalized(self, text_lower: str) -> DetectionResult:
+        stats = self.cascade_stats
+        skip = self._cascade_skip
+        sql_state: Optional[tuple[bool, bool]] = None
+        self._last_ml_result = None
 
+        for stage in CASCADE_STAGES:
+            if stage in skip:
+                continue
+            # SQL context is only needed from the explicit-match stage on
+            if sql_state is None and stage not in ("ml_classifier", "fast_path"):
+                with span("detect.sql_context"):
+                    sql_state = self._compute_sql_context(text_lower)
+            sql_context, sql_explicit = sql_state or (False, False)
+
+            if stats is None:
+                with span(f"detect.{stage}"):
+                    result = self._run_cascade_stage(stage, text_lower, sql_context, sql_explicit)
+            else:
+                start_ns = time.perf_counter_ns()
+                with span(f"detect.{stage}"):
+                    result = self._run_cascade_stage(stage, text_lower, sql_context, sql_explicit)
+                stats.record(stage, result is not None, time.perf_counter_ns() - start_ns)
+
+            if result is not None:
+                if stats is not None:
+                    stats.record_run(resolved=True)
+                return result
+
+        if stats is not None:
+            stats.record_run(resolved=False)
         return DetectionResult(
             domain='unknown',
             intent='unknown',
@@ -1615,6 +1792,7 @@ class KeywordIntentDetector:
         if intent not in self.patterns[domain]:
             self.patterns[domain][intent] = []
         self.patterns[domain][intent].extend(keywords)
+        self.revision += 1
     
     def get_supported_domains(self) -> list[str]:
         """Get list of supported domains."""
@@ -0,0 +1,267 @@
+"""
+Compiled knowledge bundle for NLP2CMD.
+
+At startup ``KeywordIntentDetector``, ``RegexEntityExtractor`` and
+``TemplateGenerator`` each locate, parse and merge their JSON data layers
+(patterns.json, keyword_intent_detector_config.json, regex_patterns.json,
+templates.json, defaults.json) and normalize every keyword. The bundle
+snapshots the merged, normalized result of all of them into a single pickle
+produced by ``nlp2cmd compile-data``.
+
+Loading is one ``pickle.loads`` plus a stat of each source layer. If any layer
+(or a loader module) changed since the bundle was compiled, the bundle is
+rebuilt and rewritten transparently. When no bundle has been compiled the
+loaders keep reading JSON as before, so the bundle is strictly opt-in.
+
+Environment:
+    NLP2CMD_KNOWLEDGE_BUNDLE: Bundle path, or ``0``/``off`` to disable it
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from nlp2cmd.utils.data_files import find_data_file, find_data_files, get_user_config_dir
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "nlp2cmd.knowledge_bundle"
+BUNDLE_VERSION = 1
+DEFAULT_BUNDLE_FILENAME = "knowledge_bundle.pkl"
+
+# (default filename, env override, merged from all layers?)
+SOURCE_LAYERS: tuple[tuple[str, str, bool], ...] = (
+    ("patterns.json", "NLP2CMD_PATTERNS_FILE", True),
+    ("keyword_intent_detector_config.json", "NLP2CMD_KEYWORD_DETECTOR_CONFIG", True),
+    ("regex_patterns.json", "NLP2CMD_REGEX_PATTERNS_FILE", False),
+    ("templates.json", "NLP2CMD_TEMPLATES_FILE", True),
+    ("defaults.json", "NLP2CMD_DEFAULTS_FILE", True),
+)
+
+# Loader modules whose embedded defaults end up in the bundle
+_LOADER_MODULES = ("keywords.py", "regex.py", "templates.py", "knowledge_bundle.py")
+
+_DISABLED_VALUES = {"0", "false", "no", "n", "off"}
+
+
+@dataclass
+class KnowledgeBundle:
+    """Merged and normalized data layers, ready to be applied to the loaders."""
+
+    fingerprint: tuple[tuple[str, str, int, int], ...]
+    source_hash: str
+    detector: dict[str, Any] = field(default_factory=dict)
+    regex_patterns: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    templates: dict[str, dict[str, str]] = field(default_factory=dict)
+    templates_loaded: bool = False
+    defaults: dict[str, Any] = field(default_factory=dict)
+    defaults_loaded: bool = False
+    created_at: float = field(default_factory=time.time)
+    version: int = BUNDLE_VERSION
+
+    def summary(self) -> dict[str, Any]:
+        patterns = self.detector.get("patterns") or {}
+        return {
+            "version": self.version,
+            "source_hash": self.source_hash,
+            "sources": [path for _, path, _, _ in self.fingerprint],
+            "domains": len(patterns),
+            "intents": sum(len(v) for v in patterns.values()),
+            "keywords": sum(len(kws) for v in patterns.values() for kws in v.values()),
+            "templates": sum(len(v) for v in self.templates.values()),
+        }
+
+
+def copy_tables(tables: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Copy two-level tables so loaders can mutate them without touching the bundle."""
+    return {
+        outer: {k: list(v) if isinstance(v, list) else v for k, v in inner.items()}
+        for outer, inner in tables.items()
+    }
+
+
+def default_bundle_path() -> Optional[Path]:
+    """Resolve the bundle path; None when disabled via NLP2CMD_KNOWLEDGE_BUNDLE."""
+    explicit = str(os.environ.get("NLP2CMD_KNOWLEDGE_BUNDLE") or "").strip()
+    if explicit.lower() in _DISABLED_VALUES:
+        return None
+    if explicit:
+        return Path(explicit).expanduser()
+    return get_user_config_dir() / DEFAULT_BUNDLE_FILENAME
+
+
+def _source_files() -> list[tuple[str, Path]]:
+    out: list[tuple[str, Path]] = []
+    for filename, env_var, merged in SOURCE_LAYERS:
+        explicit = os.environ.get(env_var)
+        if merged:
+            paths = find_data_files(explicit_path=explicit, default_filename=filename)
+        else:
+            p = find_data_file(explicit_path=explicit, default_filename=filename)
+            paths = [p] if p else []
+        out.extend((filename, p) for p in paths)
+
+    module_dir = Path(__file__).resolve().parent
+    out.extend(("module", module_dir / name) for name in _LOADER_MODULES)
+    return out
+
+
+def source_fingerprint() -> tuple[tuple[str, str, int, int], ...]:
+    """Cheap (stat-only) identity of every layer that feeds the bundle."""
+    fingerprint: list[tuple[str, str, int, int]] = []
+    for kind, path in _source_files():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        fingerprint.append((kind, str(path.resolve()), st.st_mtime_ns, st.st_size))
+    return tuple(fingerprint)
+
+
+def _content_hash(fingerprint: tuple[tuple[str, str, int, int], ...]) -> str:
+    h = hashlib.sha256(f"{BUNDLE_FORMAT}:{BUNDLE_VERSION}".encode())
+    for kind, path, _, _ in fingerprint:
+        h.update(f"\0{kind}\0{path}\0".encode())
+        try:
+            h.update(Path(path).read_bytes())
+        except OSError:
+            continue
+    return h.hexdigest()
+
+
+_build_state = threading.local()
+
+
+def is_building() -> bool:
+    """True while the loaders run to produce a bundle (they must read JSON then)."""
+    return bool(getattr(_build_state, "active", False))
+
+
+def build_bundle() -> KnowledgeBundle:
+    """Run the JSON loaders once and snapshot their merged state."""
+    from nlp2cmd.generation.keywords import KeywordIntentDetector
+    from nlp2cmd.generation.regex import RegexEntityExtractor
+    from nlp2cmd.generation.templates import TemplateGenerator
+
+    fingerprint = source_fingerprint()
+    _build_state.active = True
+    try:
+        detector = KeywordIntentDetector()
+        extractor = RegexEntityExtractor()
+        templates = TemplateGenerator()
+    finally:
+        _build_state.active = False
+
+    return KnowledgeBundle(
+        fingerprint=fingerprint,
+        source_hash=_content_hash(fingerprint),
+        detector=detector.export_loaded_data(),
+        regex_patterns=extractor.patterns,
+        templates=templates.templates,
+        templates_loaded=templates._templates_loaded,
+        defaults=templates.defaults,
+        defaults_loaded=templates._defaults_loaded,
+    )
+
+
+def save_bundle(bundle: KnowledgeBundle, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"format": BUNDLE_FORMAT, "version": BUNDLE_VERSION, "bundle": bundle}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp, path)
+    return path
+
+
+def compile_bundle(path: Optional[Path] = None) -> tuple[KnowledgeBundle, Path]:
+    """Build and write the bundle (used by ``nlp2cmd compile-data``)."""
+    target = Path(path) if path is not None else default_bundle_path()
+    if target is None:
+        raise ValueError("Knowledge bundle is disabled (NLP2CMD_KNOWLEDGE_BUNDLE)")
+    bundle = build_bundle()
+    save_bundle(bundle, target)
+    _cache_bundle(target, bundle)
+    return bundle, target
+
+
+def read_bundle(path: Path) -> Optional[KnowledgeBundle]:
+    try:
+        payload = pickle.loads(path.read_bytes())
+    except Exception as e:
+        logger.debug(f"Could not read knowledge bundle {path}: {e}")
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != BUNDLE_FORMAT:
+        return None
+    if payload.get("version") != BUNDLE_VERSION:
+        return None
+    bundle = payload.get("bundle")
+    return bundle if isinstance(bundle, KnowledgeBundle) else None
+
+
+_lock = threading.RLock()
+_cached: Optional[tuple[str, KnowledgeBundle]] = None
+
+
+def _cache_bundle(path: Path, bundle: Optional[KnowledgeBundle]) -> None:
+    global _cached
+    _cached = (str(path), bundle) if bundle is not None else None
+
+
+def get_knowledge_bundle() -> Optional[KnowledgeBundle]:
+    """
+    Return the compiled bundle, or None when none was compiled.
+
+    The bundle is read once per process. A stale bundle (a source layer was
+    added, removed or modified) is rebuilt and rewritten in place.
+    """
+    if is_building():
+        return None
+    path = default_bundle_path()
+    if path is None:
+        return None
+
+    with _lock:
+        if _cached is not None and _cached[0] == str(path):
+            return _cached[1]
+        if not path.exists():
+            return None
+
+        bundle = read_bundle(path)
+        if bundle is None or bundle.fingerprint != source_fingerprint():
+            logger.info(f"Knowledge bundle {path} is stale, rebuilding")
+            try:
+                bundle, _ = compile_bundle(path)
+            except Exception as e:
+                logger.warning(f"Knowledge bundle rebuild failed, using JSON layers: {e}")
+                return None
+        _cache_bundle(path, bundle)
+        return bundle
+
+
+def clear_cache() -> None:
+    """Forget the in-process bundle (mainly for tests)."""
+    with _lock:
+        _cache_bundle(Path(), None)
+
+
+__all__ = [
+    "KnowledgeBundle",
+    "SOURCE_LAYERS",
+    "build_bundle",
+    "clear_cache",
+    "compile_bundle",
+    "copy_tables",
+    "default_bundle_path",
+    "get_knowledge_bundle",
+    "is_building",
+    "read_bundle",
+    "source_fingerprint",
+]
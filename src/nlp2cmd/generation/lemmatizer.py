@@ -0,0 +1,223 @@
+"""
+Cached spaCy lemmatization for keyword detection.
+
+``KeywordIntentDetector`` lemmatizes a query only as a fallback, when plain
+keyword matching found nothing. ``SpacyLemmatizer`` wraps the loaded model
+(see ``SPACY_DISABLED_COMPONENTS``) with two LRU caches:
+
+* text level: normalized query -> lemmatized query, exact;
+* token level (opt-in): surface form -> output form. An uncached query whose
+  tokens are all known is assembled after running only the tokenizer
+  (``nlp.make_doc``), skipping the tagger and lemmatizer. Lemmas can depend
+  on context, so a surface form seen with two different lemmas is marked
+  ambiguous and any query containing it goes through the full pipeline.
+  Still, a result assembled this way depends on which queries came before,
+  so the tier is off by default and its results never enter the text cache.
+
+``lemmatize_many`` lemmatizes the misses of a batch with
+``nlp.pipe(..., batch_size=...)``.
+
+Environment:
+    NLP2CMD_LEMMA_CACHE_SIZE: Lemmatized texts kept (default 4096)
+    NLP2CMD_LEMMA_TOKEN_CACHE_SIZE: Surface forms kept (default 0, disabled)
+    NLP2CMD_LEMMA_BATCH_SIZE: ``nlp.pipe`` batch size (default 64)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Optional
+
+DEFAULT_TEXT_CACHE_SIZE = 4096
+DEFAULT_TOKEN_CACHE_SIZE = 0
+DEFAULT_BATCH_SIZE = 64
+
+# Only lemmas (and the tagging they rely on) are needed.
+SPACY_DISABLED_COMPONENTS: tuple[str, ...] = ("parser", "ner", "textcat")
+
+# Command words kept verbatim: their lemmas would no longer match keywords.
+IMPORTANT_KEYWORDS = frozenset({
+    'restartuj', 'uruchom', 'zrestartuj', 'startuj', 'wystartuj',
+    'zatrzymaj', 'stopuj', 'usuń', 'skopiuj', 'przenieś', 'znajdź',
+    'pokaż', 'sprawdź', 'utwórz', 'zmień', 'restart', 'docker', 'ps',
+    'systemctl', 'nginx', 'kontener', 'kontenery', 'plik', 'foldery',
+    'katalog', 'katalogi', 'usługa', 'usługi', 'usługę', 'serwis',
+    'komputer', 'system', 'proces', 'procesy'
+})
+
+_AMBIGUOUS = object()
+
+
+def token_form(token: Any) -> str:
+    """Form of a spaCy token in the lemmatized query."""
+    if token.is_punct or token.like_num or token.is_space:
+        return token.text
+    original_text = token.text.lower()
+    lemma = (token.lemma_ or "").lower()
+    if original_text in IMPORTANT_KEYWORDS or not lemma or len(lemma) <= 1:
+        return original_text
+    return lemma
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.environ.get(name) or "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+class _LRU:
+    __slots__ = ("maxsize", "_data")
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class LemmaCacheStats:
+    """How lemmatization requests were answered."""
+
+    text_hits: int = 0
+    token_hits: int = 0
+    model_runs: int = 0
+    batches: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class SpacyLemmatizer:
+    """Lemmatizes queries with a spaCy model, caching texts and tokens."""
+
+    def __init__(
+        self,
+        nlp: Any,
+        text_cache_size: int = DEFAULT_TEXT_CACHE_SIZE,
+        token_cache_size: int = DEFAULT_TOKEN_CACHE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.nlp = nlp
+        self.batch_size = max(1, batch_size)
+        self.stats = LemmaCacheStats()
+        self._texts = _LRU(text_cache_size)
+        self._tokens = _LRU(token_cache_size)
+        self._make_doc = getattr(nlp, "make_doc", None) if token_cache_size > 0 else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, nlp: Any) -> "SpacyLemmatizer":
+        return cls(
+            nlp,
+            text_cache_size=_env_int("NLP2CMD_LEMMA_CACHE_SIZE", DEFAULT_TEXT_CACHE_SIZE),
+            token_cache_size=_env_int("NLP2CMD_LEMMA_TOKEN_CACHE_SIZE", DEFAULT_TOKEN_CACHE_SIZE),
+            batch_size=_env_int("NLP2CMD_LEMMA_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+        )
+
+    def lemmatize(self, text: str) -> str:
+        """Lemmatized form of ``text`` (tokens joined with single spaces)."""
+        with self._lock:
+            cached = self._cached(text)
+        if cached is not None:
+            return cached
+        doc = self.nlp(text)
+        with self._lock:
+            self.stats.model_runs += 1
+            return self._learn(text, doc)
+
+    def lemmatize_many(self, texts: Iterable[str], batch_size: Optional[int] = None) -> list[str]:
+        """Lemmatize several texts; cache misses go through ``nlp.pipe`` in batches."""
+        texts = list(texts)
+        results: dict[str, str] = {}
+        todo: list[str] = []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                cached = self._cached(text)
+                if cached is None:
+                    todo.append(text)
+                else:
+                    results[text] = cached
+
+        if todo:
+            size = batch_size or self.batch_size
+            docs = list(self.nlp.pipe(todo, batch_size=size))
+            with self._lock:
+                self.stats.model_runs += len(todo)
+                self.stats.batches += (len(todo) + size - 1) // size
+                for text, doc in zip(todo, docs):
+                    results[text] = self._learn(text, doc)
+        return [results[text] for text in texts]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._texts.clear()
+            self._tokens.clear()
+
+    def _cached(self, text: str) -> Optional[str]:
+        lemmatized = self._texts.get(text)
+        if lemmatized is not None:
+            self.stats.text_hits += 1
+            return lemmatized
+        lemmatized = self._from_tokens(text)
+        if lemmatized is not None:
+            self.stats.token_hits += 1
+        return lemmatized
+
+    def _from_tokens(self, text: str) -> Optional[str]:
+        if self._make_doc is None:
+            return None
+        forms = []
+        for token in self._make_doc(text):
+            form = self._tokens.get(token.text)
+            if form is None or form is _AMBIGUOUS:
+                return None
+            forms.append(form)
+        return " ".join(forms)
+
+    def _learn(self, text: str, doc: Any) -> str:
+        forms = []
+        for token in doc:
+            form = token_form(token)
+            forms.append(form)
+            if self._make_doc is not None:
+                known = self._tokens.get(token.text)
+                if known is None:
+                    self._tokens.put(token.text, form)
+                elif known is not _AMBIGUOUS and known != form:
+                    self._tokens.put(token.text, _AMBIGUOUS)
+        lemmatized = " ".join(forms)
+        self._texts.put(text, lemmatized)
+        return lemmatized
+
+
+__all__ = [
+    "IMPORTANT_KEYWORDS",
+    "LemmaCacheStats",
+    "SPACY_DISABLED_COMPONENTS",
+    "SpacyLemmatizer",
+    "token_form",
+]
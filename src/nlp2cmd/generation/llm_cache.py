@@ -0,0 +1,265 @@
+"""
+Response cache and in-flight request coalescing for LLM clients.
+
+Responses are stored under a SHA-256 of the request. The request covers the
+endpoint, model, messages, temperature, max_tokens and any extra completion
+arguments, so byte-identical prompts to the same endpoint are answered without
+calling the model again.
+Entries live in a bounded in-memory LRU. An optional SQLite file adds a tier
+that survives restarts. Both tiers respect a TTL.
+
+``SingleFlight`` coalesces concurrent identical requests: the first caller
+starts the request and later callers await the same task. Cancelling one
+caller does not cancel the shared request.
+
+Environment:
+    NLP2CMD_LLM_CACHE: ``0``/``off`` disables the response cache
+    NLP2CMD_LLM_CACHE_SIZE: In-memory entries (default 512)
+    NLP2CMD_LLM_CACHE_TTL: Entry lifetime in seconds (default 3600, ``0`` never expires)
+    NLP2CMD_LLM_CACHE_DB: SQLite file for the on-disk tier (disabled when unset)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_CACHE_TTL = 3600.0
+
+_DISABLED_VALUES = {"0", "false", "no", "n", "off"}
+
+T = TypeVar("T")
+
+
+@dataclass
+class LLMCacheStats:
+    """Counters for one client; hits + misses + coalesced = requests."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    disk_hits: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses + self.coalesced
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "disk_hits": self.disk_hits,
+        }
+
+
+def cache_key(
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    extra: Optional[dict[str, Any]] = None,
+    api_base: Optional[str] = None,
+) -> str:
+    """Content address of a completion request."""
+    payload = json.dumps(
+        {
+            "api_base": api_base,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "extra": extra or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU of responses with an optional SQLite tier and a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        db_path: Optional[Union[str, Path]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.db_path = Path(db_path).expanduser() if db_path else None
+        self._clock = clock
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if self.db_path is not None:
+            self._open_db()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Cache configured from NLP2CMD_LLM_CACHE_*; None when disabled."""
+        if str(os.environ.get("NLP2CMD_LLM_CACHE") or "").strip().lower() in _DISABLED_VALUES:
+            return None
+
+        def number(name: str, default: float) -> float:
+            raw = str(os.environ.get(name) or "").strip()
+            try:
+                return float(raw) if raw else default
+            except ValueError:
+                return default
+
+        return cls(
+            max_entries=int(number("NLP2CMD_LLM_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            ttl=number("NLP2CMD_LLM_CACHE_TTL", DEFAULT_CACHE_TTL),
+            db_path=os.environ.get("NLP2CMD_LLM_CACHE_DB") or None,
+        )
+
+    def _open_db(self) -> None:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            if self.ttl is not None:
+                db.execute("DELETE FROM responses WHERE created < ?", (self._clock() - self.ttl,))
+            db.commit()
+            self._db = db
+        except sqlite3.Error as e:
+            logger.debug(f"LLM response cache database unavailable ({self.db_path}): {e}")
+            self._db = None
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and self._clock() - created > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response, or None."""
+        return self.lookup(key)[0]
+
+    def lookup(self, key: str) -> tuple[Optional[str], bool]:
+        """``(response, from_disk)``; response is None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._memory.move_to_end(key)
+                    return entry[0], False
+                del self._memory[key]
+
+            if self._db is None:
+                return None, False
+            try:
+                row = self._db.execute(
+                    "SELECT response, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"LLM response cache read failed: {e}")
+                return None, False
+            if row is None or self._expired(row[1]):
+                return None, False
+            self._remember(key, row[0], row[1])
+            return row[0], True
+
+    def put(self, key: str, response: str) -> None:
+        created = self._clock()
+        with self._lock:
+            self._remember(key, response, created)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                    (key, response, created),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"LLM response cache write failed: {e}")
+
+    def _remember(self, key: str, response: str, created: float) -> None:
+        self._memory[key] = (response, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM responses")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.debug(f"LLM response cache clear failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+class SingleFlight:
+    """Share one in-flight task between concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[tuple[int, str], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run ``factory()`` once for all concurrent callers of ``key``.
+
+        Returns:
+            ``(result, shared)`` where ``shared`` is True for callers that
+            joined a request another caller had already started
+        """
+        loop = asyncio.get_running_loop()
+        # Tasks belong to one event loop; different loops never share.
+        slot = (id(loop), key)
+        task = self._inflight.get(slot)
+        shared = task is not None
+        if task is None:
+            task = loop.create_task(factory())
+            self._inflight[slot] = task
+
+            def _done(t: asyncio.Task, slot: tuple[int, str] = slot) -> None:
+                if self._inflight.get(slot) is t:
+                    del self._inflight[slot]
+                # Mark the exception retrieved if every caller went away.
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task), shared
+
+
+__all__ = [
+    "LLMCacheStats",
+    "ResponseCache",
+    "SingleFlight",
+    "cache_key",
+]
@@ -6,11 +6,14 @@ LLM-based SQL generation - start with one domain before expanding.
 
 from __future__ import annotations
 
+import asyncio
 import re
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol
+from typing import Any, Callable, Optional, Protocol, Union
+
+from nlp2cmd.generation.llm_cache import LLMCacheStats, ResponseCache, SingleFlight, cache_key
 
 
 class LLMClient(Protocol):
@@ -29,26 +32,45 @@ class LLMClient(Protocol):
 
 
 class LiteLLMClient:
+    """
+    LLM client backed by ``litellm.completion``.
+
+    Identical requests are answered from a ``ResponseCache`` (configured from
+    the environment unless ``cache`` is given; ``cache=False`` disables it),
+    and concurrent identical requests share one in-flight call. Counters are
+    kept in ``cache_stats``.
+
+    ``completion_fn`` replaces ``litellm.completion`` (e.g. a local fake in
+    tests); it may return the response text or a litellm-style response.
+    """
+
     def __init__(
         self,
         model: Optional[str] = None,
         api_base: Optional[str] = None,
         api_key: Optional[str] = None,
         timeout: Optional[float] = None,
+        cache: Union[ResponseCache, bool, None] = None,
+        completion_fn: Optional[Callable[..., Any]] = None,
     ):
         self.model = model or os.environ.get("NLP2CMD_LLM_MODEL") or "ollama/qwen2.5-coder:7b"
         self.api_base = api_base or os.environ.get("NLP2CMD_LLM_API_BASE") or "http://localhost:11434"
         self.api_key = api_key or os.environ.get("NLP2CMD_LLM_API_KEY") or ""
         self.timeout = timeout or float(os.environ.get("NLP2CMD_LLM_TIMEOUT") or 30)
-
-    async def complete(
-        self,
-        user: str,
-        system: Optional[str] = None,
-        max_tokens: int = 500,
-        temperature: float = 0.1,
-        **kwargs: Any,
-    ) -> str:
+        self.completion_fn = completion_fn
+
+        if cache is None or cache is True:
+            self.cache: Optional[ResponseCache] = ResponseCache.from_env()
+        elif cache is False:
+            self.cache = None
+        else:
+            self.cache = cache
+        self.cache_stats = LLMCacheStats()
+        self._single_flight = SingleFlight()
+
+    def _resolve_completion(self) -> Callable[..., Any]:
+        if self.completion_fn is not None:
+            return self.completion_fn
         try:
             import litellm
             from litellm import completion
@@ -59,13 +81,31 @@ class LiteLLMClient:
         if self.api_key:
             litellm.api_key = self.api_key
         litellm.timeout = self.timeout
+        return completion
+
+    async def complete(
+        self,
+        user: str,
+        system: Optional[str] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.1,
+        **kwargs: Any,
+    ) -> str:
+        completion = self._resolve_completion()
 
         messages: list[dict[str, str]] = []
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": user})
 
-        import asyncio
+        key = cache_key(self.model, messages, temperature, max_tokens, kwargs, api_base=self.api_base)
+        if self.cache is not None:
+            cached, from_disk = self.cache.lookup(key)
+            if cached is not None:
+                self.cache_stats.hits += 1
+                if from_disk:
+                    self.cache_stats.disk_hits += 1
+                return cached
 
         def _call() -> str:
             resp = completion(
@@ -75,9 +115,21 @@ class LiteLLMClient:
                 temperature=temperature,
                 **kwargs,
             )
+            if isinstance(resp, str):
+                return resp
             return str(resp.choices[0].message["content"])
 
-        return await asyncio.to_thread(_call)
+        async def _fetch() -> str:
+            self.cache_stats.misses += 1
+            text = await asyncio.to_thread(_call)
+            if self.cache is not None:
+                self.cache.put(key, text)
+            return text
+
+        text, shared = await self._single_flight.do(key, _fetch)
+        if shared:
+            self.cache_stats.coalesced += 1
+        return text
 
 
 @dataclass
@@ -7,14 +7,17 @@ into a complete NL → DSL pipeline without LLM.
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Optional
 import json
 import os
 from pathlib import Path
 import re
+import threading
 import time
 
+from nlp2cmd.monitoring.tracing import LatencyHistogram, span, trace_request
 from nlp2cmd.utils.data_files import data_file_write_path
 
 # Simple execution plan to avoid circular import
@@ -43,6 +46,52 @@ _DEFAULT_USE_ENHANCED_CONTEXT = str(os.environ.get("NLP2CMD_USE_ENHANCED_CONTEXT
 
 _SEMANTIC_ENTITY_MODES = {"semantic", "shadow", "ab"}
 
+# Sentence splitting and log-input heuristics (see _split_sentences)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_LOG_FILE_LINE_RE = re.compile(r"file \".+\", line \d+")
+_LOG_KEYWORD_RE = re.compile(r"\b(exception|error|fatal|stack trace)\b")
+_LOG_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[ t]\d{2}:\d{2}:\d{2}")
+_LOG_LEVEL_RE = re.compile(r"^\[(info|warn|warning|error|debug|trace)\]")
+
+# Sentence-initial connectors used by process_steps
+_STEP_CONNECTOR_RE = re.compile(
+    r"^(nast[eę]pnie|potem|dalej|oraz|a potem|je[sś]li|je[sś]eli|gdy|wtedy|na koniec)\b"
+)
+_CONDITIONAL_RE = re.compile(r"^(je[sś]li|je[sś]eli|gdy|wtedy)\b")
+
+# Polish connectors and semantic markers weighting _aggregate_detection,
+# checked in this order
+_POLISH_CONNECTORS: dict[str, list[str]] = {
+    'sequence': ['następnie', 'potem', 'dalej', 'wtedy', 'na koniec', 'potem', 'po czym', 'zanim'],
+    'conditional': ['jeśli', 'jeżeli', 'gdy', 'gdyby', 'w razie', 'przy'],
+    'causal': ['ponieważ', 'dlatego', 'zatem', 'w związku z tym', 'wskutek'],
+    'additive': ['oraz', 'i', 'także', 'również', 'ponadto', 'wszakże'],
+    'contrastive': ['ale', 'jednakże', 'lecz', 'aczkolwiek', 'natomiast', 'mimo wszystko']
+}
+_CONNECTOR_TYPE_RES: tuple[tuple[str, re.Pattern[str]], ...] = tuple(
+    (conn_type, re.compile(r"^(?:" + "|".join(re.escape(c) for c in connectors) + r")\b"))
+    for conn_type, connectors in _POLISH_CONNECTORS.items()
+)
+
+# Domain markers (see _infer_domain_from_markers)
+_K8S_POD_RE = re.compile(r"\bpod(y)?\b")
+_SQL_MARKER_RE = re.compile(r"\b(select|update|delete|insert|from|where|join|sql|tabela|table)\b")
+
+# Multi-sentence analyses kept per pipeline (process + process_steps share them)
+_SENTENCE_MEMO_SIZE = 32
+
+
+@dataclass
+class SentenceAnalysis:
+    """One sentence of a multi-sentence input, detected once."""
+
+    text: str
+    lower: str
+    detection: DetectionResult
+    connector_type: Optional[str]
+    begins_with_connector: bool
+    is_conditional: bool
+
 
 def _should_use_semantic_extractor() -> bool:
     mode = os.environ.get("NLP2CMD_ENTITY_EXTRACTOR_MODE")
@@ -85,6 +134,7 @@ class PipelineResult:
     latency_ms: float = 0.0
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    metadata: dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
         if self.confidence == 0.0 and self.detection_confidence != 0.0:
@@ -122,6 +172,7 @@ class RuleBasedPipeline:
         generator: Optional[TemplateGenerator] = None,
         confidence_threshold: float = 0.5,
         use_enhanced_context: bool = _DEFAULT_USE_ENHANCED_CONTEXT,
+        trace: Optional[bool] = None,
     ):
         """
         Initialize pipeline.
@@ -132,17 +183,24 @@ class RuleBasedPipeline:
             generator: Template generator (default: TemplateGenerator)
             confidence_threshold: Minimum confidence to proceed
             use_enhanced_context: Use enhanced NLP context detection
+            trace: Record per-stage timings in ``result.metadata["trace"]``
+                (default: follow ``NLP2CMD_TRACE`` / ``set_tracing_enabled``)
         """
         self.detector = detector or KeywordIntentDetector()
         self.extractor = extractor or _create_default_extractor()
         self.generator = generator or TemplateGenerator()
         self.confidence_threshold = confidence_threshold
         self.use_enhanced_context = use_enhanced_context
+        self.trace = trace
         
         # Initialize enhanced detector lazily (only when needed)
         self._enhanced_detector = None
         self._enhanced_detector_loaded = False
 
+        self._sentence_memo: OrderedDict[tuple[str, Any], list[SentenceAnalysis]] = OrderedDict()
+        self._sentence_memo_detector: Any = None
+        self._sentence_memo_lock = threading.Lock()
+
     @property
     def enhanced_detector(self):
         """Lazy load enhanced detector only when needed."""
@@ -178,12 +236,24 @@ class RuleBasedPipeline:
         Returns:
             PipelineResult with generated command
         """
+        return self._process_traced(text)
+
+    def _process_traced(self, text: str, detection: Optional[DetectionResult] = None) -> PipelineResult:
+        with trace_request("pipeline", enabled=self.trace) as trace:
+            result = self._process(text, detection)
+        if trace is not None:
+            result.metadata["trace"] = trace.to_dict()
+        return result
+
+    def _process(self, text: str, detection: Optional[DetectionResult] = None) -> PipelineResult:
         start_time = time.time()
         errors: list[str] = []
         warnings: list[str] = []
         
         # Step 1: Detect domain and intent
-        detection = self.detector.detect(text)
+        if detection is None:
+            with span("detect"):
+                detection = self.detector.detect(text)
         
         # Step 1.5: Try enhanced context detection if available and basic detection failed
         if (self.use_enhanced_context and 
@@ -192,7 +262,8 @@ class RuleBasedPipeline:
              detection.confidence < 0.7)):  # Only trigger for low confidence or unknown domain
             
             try:
-                enhanced_match = self.enhanced_detector.get_best_match(text)
+                with span("enhanced_context"):
+                    enhanced_match = self.enhanced_detector.get_best_match(text)
                 if enhanced_match and enhanced_match.combined_score > 0.25:  # Even lower threshold
                     # Convert enhanced match to DetectionResult
                     detection = DetectionResult(
@@ -206,9 +277,10 @@ class RuleBasedPipeline:
                 # Enhanced detection failed, continue with basic detection
                 pass
 
-        sentences = self._split_sentences(text)
-        if len(sentences) >= 2:
-            agg = self._aggregate_detection(sentences)
+        analyses = self._analyze_sentences(text)
+        if len(analyses) >= 2:
+            with span("multi_sentence"):
+                agg = self._aggregate_detection(analyses)
             if agg is not None:
                 dominant = agg.get("detection")
                 if isinstance(dominant, DetectionResult):
@@ -255,7 +327,8 @@ class RuleBasedPipeline:
             warnings.append(f"Low confidence detection: {detection.confidence:.2f}")
         
         # Step 2: Extract entities
-        extraction = self.extractor.extract(text, detection.domain)
+        with span("extract"):
+            extraction = self.extractor.extract(text, detection.domain)
         
         if not extraction.entities:
             warnings.append("No entities extracted from text")
@@ -271,26 +344,31 @@ class RuleBasedPipeline:
         entities_with_text = merged_entities.copy()
         entities_with_text['text'] = text
 
-        template_result = self.generator.generate(
-            domain=detection.domain,
-            intent=detection.intent,
-            entities=entities_with_text,
-        )
+        with span("template"):
+            template_result = self.generator.generate(
+                domain=detection.domain,
+                intent=detection.intent,
+                entities=entities_with_text,
+            )
 
         if not template_result.success:
             fallback_results: list[tuple[DetectionResult, ExtractionResult, TemplateResult]] = []
-            for cand in self.detector.detect_all(text)[:8]:
+            with span("detect_all"):
+                candidates = self.detector.detect_all(text)[:8]
+            for cand in candidates:
                 if cand.domain == detection.domain and cand.intent == detection.intent:
                     continue
 
-                cand_extraction = self.extractor.extract(text, cand.domain)
+                with span("extract"):
+                    cand_extraction = self.extractor.extract(text, cand.domain)
                 cand_entities = cand_extraction.entities.copy()
                 cand_entities["text"] = text
-                cand_template = self.generator.generate(
-                    domain=cand.domain,
-                    intent=cand.intent,
-                    entities=cand_entities,
-                )
+                with span("template"):
+                    cand_template = self.generator.generate(
+                        domain=cand.domain,
+                        intent=cand.intent,
+                        entities=cand_entities,
+                    )
                 if cand_template.success:
                     fallback_results.append((cand, cand_extraction, cand_template))
                     break
@@ -344,13 +422,13 @@ class RuleBasedPipeline:
         if not text_lower:
             return None
 
-        if any(x in text_lower for x in ("kubectl", "kubernetes", "k8s")) or re.search(r"\bpod(y)?\b", text_lower):
+        if any(x in text_lower for x in ("kubectl", "kubernetes", "k8s")) or _K8S_POD_RE.search(text_lower):
             return "kubernetes"
 
         if any(x in text_lower for x in ("docker", "kontener", "container", "docker-compose", "compose")):
             return "docker"
 
-        if re.search(r"\b(select|update|delete|insert|from|where|join|sql|tabela|table)\b", text_lower):
+        if _SQL_MARKER_RE.search(text_lower):
             return "sql"
 
         if any(x in text_lower for x in ("entity", "graph", "dql")):
@@ -358,9 +436,56 @@ class RuleBasedPipeline:
 
         return None
 
-    def process_steps(self, text: str) -> list[PipelineResult]:
+    def _analyze_sentences(self, text: str) -> list[SentenceAnalysis]:
+        """
+        Split ``text`` and detect every sentence once.
+        
+        Returns an empty list for inputs with fewer than two sentences. The
+        result is memoised per input text and detector revision, so
+        ``process`` and ``process_steps`` on the same text share it. Replacing
+        ``self.detector`` drops the memo. Treat it as read-only.
+        """
+        detector = self.detector
+        key = (text, getattr(detector, "revision", None))
+        with self._sentence_memo_lock:
+            if self._sentence_memo_detector is not detector:
+                self._sentence_memo.clear()
+                self._sentence_memo_detector = detector
+            cached = self._sentence_memo.get(key)
+            if cached is not None:
+                self._sentence_memo.move_to_end(key)
+                return cached
+
         sentences = self._split_sentences(text)
-        if len(sentences) <= 1:
+        analyses: list[SentenceAnalysis] = []
+        if len(sentences) >= 2:
+            for sent in sentences:
+                sent_lower = sent.strip().lower()
+                connector_type = None
+                for conn_type, pattern in _CONNECTOR_TYPE_RES:
+                    if pattern.match(sent_lower):
+                        connector_type = conn_type
+                        break
+                analyses.append(SentenceAnalysis(
+                    text=sent,
+                    lower=sent_lower,
+                    detection=detector.detect(sent),
+                    connector_type=connector_type,
+                    begins_with_connector=bool(_STEP_CONNECTOR_RE.match(sent_lower)),
+                    is_conditional=bool(_CONDITIONAL_RE.match(sent_lower)),
+                ))
+
+        with self._sentence_memo_lock:
+            if self._sentence_memo_detector is not detector:
+                return analyses
+            self._sentence_memo[key] = analyses
+            while len(self._sentence_memo) > _SENTENCE_MEMO_SIZE:
+                self._sentence_memo.popitem(last=False)
+        return analyses
+
+    def process_steps(self, text: str) -> list[PipelineResult]:
+        analyses = self._analyze_sentences(text)
+        if len(analyses) <= 1:
             return [self.process(text)]
 
         results: list[PipelineResult] = []
@@ -369,22 +494,20 @@ class RuleBasedPipeline:
         prev_conf: float = 0.0
         prev_entities: dict[str, Any] = {}
 
-        for sent in sentences:
-            sent_lower = sent.strip().lower()
+        for analysis in analyses:
+            sent = analysis.text
+            sent_lower = analysis.lower
             forced_domain = self._infer_domain_from_markers(sent_lower)
 
-            d = self.detector.detect(sent)
+            d = analysis.detection
             if forced_domain is not None and d.domain != forced_domain:
                 for c in self.detector.detect_all(sent)[:12]:
                     if c.domain == forced_domain:
                         d = c
                         break
 
-            begins_with_connector = bool(
-                re.match(r"^(nast[eę]pnie|potem|dalej|oraz|a potem|je[sś]li|je[sś]eli|gdy|wtedy|na koniec)\b", sent_lower)
-            )
-
-            is_conditional = bool(re.match(r"^(je[sś]li|je[sś]eli|gdy|wtedy)\b", sent_lower))
+            begins_with_connector = analysis.begins_with_connector
+            is_conditional = analysis.is_conditional
 
             if prev_domain and begins_with_connector and forced_domain is None and d.domain != prev_domain:
                 # Avoid domain drift on continuation/conditional sentences unless explicit markers appear.
@@ -425,6 +548,11 @@ class RuleBasedPipeline:
                 context_entities = dict(prev_entities)
 
             step = self._process_with_detection(sent, d, context_entities=context_entities)
+            # Continuations and conditionals must run after the previous step;
+            # other sentences are independent (see AsyncExecutionRunner).
+            step.metadata["depends_on_previous"] = bool(results) and (
+                begins_with_connector or is_conditional or bool(context_entities)
+            )
             results.append(step)
 
             if step.domain != "unknown":
@@ -558,13 +686,13 @@ class RuleBasedPipeline:
                     ll = ln.lower()
                     if "traceback (most recent call last)" in ll:
                         score += 4
-                    if re.search(r"file \".+\", line \d+", ln):
+                    if _LOG_FILE_LINE_RE.search(ln):
                         score += 3
-                    if re.search(r"\b(exception|error|fatal|stack trace)\b", ll):
+                    if _LOG_KEYWORD_RE.search(ll):
                         score += 1
-                    if re.search(r"^\d{4}-\d{2}-\d{2}[ t]\d{2}:\d{2}:\d{2}", ln):
+                    if _LOG_TIMESTAMP_RE.search(ln):
                         score += 1
-                    if re.search(r"^\[(info|warn|warning|error|debug|trace)\]", ll):
+                    if _LOG_LEVEL_RE.search(ll):
                         score += 1
                     if "command not found" in ll:
                         score += 2
@@ -574,40 +702,26 @@ class RuleBasedPipeline:
                     return [text]
 
         # Fast regex-based splitting (default). This keeps cold-start fast.
-        parts = [p.strip() for p in re.split(r"(?<=[.!?])\s+", text) if p.strip()]
+        parts = [p.strip() for p in _SENTENCE_SPLIT_RE.split(text) if p.strip()]
         return parts
 
-    def _aggregate_detection(self, sentences: list[str]) -> Optional[dict[str, Any]]:
+    def _aggregate_detection(self, analyses: list[SentenceAnalysis]) -> Optional[dict[str, Any]]:
         """Enhanced aggregation of multi-sentence detection using semantic analysis."""
-        if not sentences or len(sentences) < 2:
+        if not analyses or len(analyses) < 2:
             return None
 
+        sentences = [a.text for a in analyses]
         domain_scores: dict[str, float] = {}
         intent_scores: dict[str, float] = {}
         sentence_results: list[DetectionResult] = []
         
-        # Enhanced Polish connectors and semantic markers
-        polish_connectors = {
-            'sequence': ['następnie', 'potem', 'dalej', 'wtedy', 'na koniec', 'potem', 'po czym', 'zanim'],
-            'conditional': ['jeśli', 'jeżeli', 'gdy', 'gdyby', 'w razie', 'przy'],
-            'causal': ['ponieważ', 'dlatego', 'zatem', 'w związku z tym', 'wskutek'],
-            'additive': ['oraz', 'i', 'także', 'również', 'ponadto', 'wszakże'],
-            'contrastive': ['ale', 'jednakże', 'lecz', 'aczkolwiek', 'natomiast', 'mimo wszystko']
-        }
-        
         # Analyze each sentence
-        for i, sent in enumerate(sentences):
-            d = self.detector.detect(sent)
+        for i, analysis in enumerate(analyses):
+            d = analysis.detection
             sentence_results.append(d)
             
-            sent_lower = sent.strip().lower()
-            
-            # Detect sentence type and connectors
-            connector_type = None
-            for conn_type, connectors in polish_connectors.items():
-                if any(re.match(rf"^{re.escape(conn)}\b", sent_lower) for conn in connectors):
-                    connector_type = conn_type
-                    break
+            # Sentence type from its leading connector (see _POLISH_CONNECTORS)
+            connector_type = analysis.connector_type
             
             # Weight confidence based on position and connector type
             weight = 1.0
@@ -865,7 +979,11 @@ class RuleBasedPipeline:
         Returns:
             List of PipelineResult
         """
-        return [self.process(text) for text in texts]
+        if len(texts) < 2 or not getattr(self.detector, "lemmatization_enabled", False):
+            return [self.process(text) for text in texts]
+        # Batch detection lemmatizes the fallback cases in one spaCy pass.
+        detections = self.detector.detect_batch(texts)
+        return [self._process_traced(text, detection) for text, detection in zip(texts, detections)]
     
     def detect_only(self, text: str) -> DetectionResult:
         """
@@ -932,10 +1050,17 @@ class PipelineMetrics:
         self.total_latency_ms = 0.0
         self.confidence_sum = 0.0
         self.errors: list[str] = []
+        self.latency_histogram = LatencyHistogram()
+        self.stage_histograms: dict[str, LatencyHistogram] = {}
     
     def record(self, result: PipelineResult) -> None:
-        """Record a pipeline result."""
+        """Record a pipeline result (and its per-stage trace, if any)."""
         self.total_requests += 1
+        self.latency_histogram.observe(result.latency_ms)
+
+        trace = result.metadata.get("trace") if result.metadata else None
+        if isinstance(trace, dict):
+            self.record_stages(trace.get("stages") or {})
         
         if result.success:
             self.successful_requests += 1
@@ -951,6 +1076,43 @@ class PipelineMetrics:
         if result.errors:
             self.errors.extend(result.errors)
 
+    def record_stages(self, stages: dict[str, float]) -> None:
+        """Add per-stage durations (ms) of one request to the stage histograms."""
+        for stage, duration_ms in stages.items():
+            hist = self.stage_histograms.get(stage)
+            if hist is None:
+                hist = self.stage_histograms.setdefault(stage, LatencyHistogram())
+            hist.observe(float(duration_ms))
+
+    def stage_report(self) -> dict[str, dict[str, float]]:
+        """p50/p95/p99 per stage, slowest p95 first."""
+        summaries = {stage: hist.summary() for stage, hist in self.stage_histograms.items()}
+        return dict(sorted(summaries.items(), key=lambda kv: kv[1]["p95_ms"], reverse=True))
+
+    def to_prometheus(self, prefix: str = "nlp2cmd") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_requests_total Pipeline requests processed.",
+            f"# TYPE {prefix}_requests_total counter",
+            f"{prefix}_requests_total {self.total_requests}",
+            f"# HELP {prefix}_requests_successful_total Pipeline requests that produced a command.",
+            f"# TYPE {prefix}_requests_successful_total counter",
+            f"{prefix}_requests_successful_total {self.successful_requests}",
+            f"# HELP {prefix}_request_latency_seconds End-to-end pipeline latency.",
+            f"# TYPE {prefix}_request_latency_seconds histogram",
+        ]
+        lines.extend(self.latency_histogram.prometheus_lines(f"{prefix}_request_latency_seconds", {}))
+        if self.stage_histograms:
+            lines.append(f"# HELP {prefix}_stage_latency_seconds Latency of individual pipeline stages.")
+            lines.append(f"# TYPE {prefix}_stage_latency_seconds histogram")
+            for stage in sorted(self.stage_histograms):
+                lines.extend(
+                    self.stage_histograms[stage].prometheus_lines(
+                        f"{prefix}_stage_latency_seconds", {"stage": stage}
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
     def record_result(self, success: bool, latency: float) -> None:
         self.total_requests += 1
         if success:
@@ -994,6 +1156,7 @@ class PipelineMetrics:
             "domain_distribution": self.domain_counts,
             "intent_distribution": self.intent_counts,
             "error_count": len(self.errors),
+            "stage_latency": self.stage_report(),
         }
 
     def generate_report(self) -> dict[str, Any]:
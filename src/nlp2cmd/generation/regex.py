@@ -12,6 +12,7 @@ import re
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from nlp2cmd.generation.knowledge_bundle import copy_tables, get_knowledge_bundle
 from nlp2cmd.utils.data_files import find_data_file
 
 
@@ -376,6 +377,11 @@ class RegexEntityExtractor:
         if self._custom_patterns_provided:
             return
 
+        bundle = get_knowledge_bundle() if type(self) is RegexEntityExtractor else None
+        if bundle is not None and bundle.regex_patterns:
+            self.patterns = copy_tables(bundle.regex_patterns)
+            return
+
         p = find_data_file(
             explicit_path=os.environ.get("NLP2CMD_REGEX_PATTERNS_FILE"),
             default_filename="regex_patterns.json",
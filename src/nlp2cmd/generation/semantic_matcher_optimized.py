@@ -10,6 +10,12 @@ Optimizations:
 - LRU cache for query embeddings
 - Polish-specific embeddings (sdadas/polish-distilroberta-base)
 - CTranslate2/ONNX support for 2-4x speedup
+- Contiguous, growable embedding matrix; int8 or IVF index for large phrase
+  banks (see ``nlp2cmd.generation.vector_index``)
+
+Environment:
+    NLP2CMD_SEMANTIC_INDEX: ``exact`` (default), ``int8`` or ``ivf``
+    NLP2CMD_SEMANTIC_NPROBE: IVF lists scanned per query (default 8)
 """
 
 from __future__ import annotations
@@ -17,6 +23,7 @@ from __future__ import annotations
 import atexit
 import hashlib
 import json
+import logging
 import os
 import pickle
 import threading
@@ -26,6 +33,40 @@ from pathlib import Path
 from typing import Any, Optional, Dict, Tuple
 import numpy as np
 
+from nlp2cmd.generation.vector_index import INDEX_KINDS, EmbeddingStore, create_index, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX = "exact"
+DEFAULT_NPROBE = 8
+
+
+def _env_index_kind() -> str:
+    raw = str(os.environ.get("NLP2CMD_SEMANTIC_INDEX") or "").strip().lower()
+    if not raw:
+        return DEFAULT_INDEX
+    if raw not in INDEX_KINDS:
+        logger.warning(
+            f"Ignoring NLP2CMD_SEMANTIC_INDEX={raw!r} (expected one of {', '.join(INDEX_KINDS)}); "
+            f"using {DEFAULT_INDEX!r}"
+        )
+        return DEFAULT_INDEX
+    return raw
+
+
+def _env_nprobe() -> int:
+    raw = str(os.environ.get("NLP2CMD_SEMANTIC_NPROBE") or "").strip()
+    if not raw:
+        return DEFAULT_NPROBE
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.warning(f"Ignoring NLP2CMD_SEMANTIC_NPROBE={raw!r}; using {DEFAULT_NPROBE}")
+        return DEFAULT_NPROBE
+    return value
+
 # Lazy imports for optional dependencies
 _sentence_transformers_available = None
 _torch_available = None
@@ -166,6 +207,8 @@ class OptimizedSemanticMatcher:
     DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
     # Polish-specific model for better PL matching
     POLISH_MODEL = "sdadas/polish-distilroberta-base"
+    # Below this many phrases an approximate index is not worth it
+    ANN_MIN_SIZE = 20000
     
     def __init__(
         self, 
@@ -176,7 +219,18 @@ class OptimizedSemanticMatcher:
         use_polish_model: bool = False,  # Disabled by default - requires download
         use_ctranslate2: bool = False,
         preload: bool = False,
+        index: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ann_min_size: Optional[int] = None,
     ):
+        """
+        Args:
+            index: Search index for large phrase banks: "exact", "int8" or
+                "ivf" (default: NLP2CMD_SEMANTIC_INDEX or "exact")
+            nprobe: IVF lists scanned per query (default: NLP2CMD_SEMANTIC_NPROBE or 8)
+            ann_min_size: Phrase count from which ``index`` is used; smaller
+                banks are always scanned exactly
+        """
         self.model_name = model_name or self.DEFAULT_MODEL
         self.threshold = threshold
         self.cache_path = cache_path
@@ -186,11 +240,17 @@ class OptimizedSemanticMatcher:
         self.model = None
         self.polish_model = None
         self.intent_embeddings: list[IntentEmbedding] = []
-        self._embedding_matrix = None
+        self._store = EmbeddingStore()
         self._polish_embedding_matrix = None
         self._is_loaded = False
         self._device = "cpu"
         
+        self.index_kind = index.strip().lower() if index else _env_index_kind()
+        self.nprobe = nprobe or _env_nprobe()
+        self.ann_min_size = self.ANN_MIN_SIZE if ann_min_size is None else ann_min_size
+        self._index = create_index(self.index_kind, self._store, nprobe=self.nprobe)
+        self._exact_index = create_index("exact", self._store)
+        
         if preload:
             self._preload_models()
     
@@ -299,9 +359,9 @@ class OptimizedSemanticMatcher:
             embedding=embedding,
             language=language
         ))
+        self._store.append(embedding)
         
         # Invalidate cached matrices
-        self._embedding_matrix = None
         self._polish_embedding_matrix = None
     
     def add_intents_batch(self, intents: list[tuple[str, str, str, str]]):
@@ -326,8 +386,9 @@ class OptimizedSemanticMatcher:
                 embedding=embedding,
                 language=language
             ))
+        if len(intents):
+            self._store.extend(embeddings)
         
-        self._embedding_matrix = None
         self._polish_embedding_matrix = None
     
     def _encode_text(self, text: str, model: Any) -> np.ndarray:
@@ -367,16 +428,26 @@ class OptimizedSemanticMatcher:
         _embedding_cache[cache_key] = embedding
         return embedding
     
+    def _sync_store(self) -> None:
+        """Rebuild the store if ``intent_embeddings`` was replaced directly."""
+        if len(self._store) != len(self.intent_embeddings):
+            self._store.clear()
+            if self.intent_embeddings:
+                self._store.extend(np.vstack([ie.embedding for ie in self.intent_embeddings]))
+    
     def _get_embedding_matrix(self) -> Optional[np.ndarray]:
-        """Get or build the embedding matrix for fast similarity computation."""
-        if self._embedding_matrix is not None:
-            return self._embedding_matrix
-        
-        if not self.intent_embeddings:
+        """Unit-normalised float32 embedding matrix (a view, do not modify)."""
+        self._sync_store()
+        if not len(self._store):
             return None
-        
-        self._embedding_matrix = np.vstack([ie.embedding for ie in self.intent_embeddings])
-        return self._embedding_matrix
+        return self._store.matrix
+    
+    def _search(self, query_embedding: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-``k`` intent rows by cosine similarity, best first."""
+        self._sync_store()
+        query = normalize_rows(query_embedding)[0]
+        index = self._index if len(self._store) >= self.ann_min_size else self._exact_index
+        return index.search(query, k)
     
     def _detect_language(self, text: str) -> str:
         """Simple language detection for Polish vs other."""
@@ -423,17 +494,12 @@ class OptimizedSemanticMatcher:
         # Encode query with cache
         query_embedding = self._encode_with_cache(text, model, self.model_name)
         
-        # Get embedding matrix
-        matrix = self._get_embedding_matrix()
-        if matrix is None:
-            return None
-        
-        # Compute cosine similarities
-        similarities = self._cosine_similarity(query_embedding, matrix)
-        
         # Get top match
-        best_idx = np.argmax(similarities)
-        best_score = similarities[best_idx]
+        ids, scores = self._search(query_embedding, 1)
+        if len(ids) == 0:
+            return None
+        best_idx = ids[0]
+        best_score = scores[0]
         
         if best_score < self.threshold:
             return None
@@ -499,16 +565,10 @@ class OptimizedSemanticMatcher:
             return []
         
         query_embedding = self._encode_with_cache(text, model, self.model_name)
-        matrix = self._get_embedding_matrix()
-        if matrix is None:
-            return []
-        
-        similarities = self._cosine_similarity(query_embedding, matrix)
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        ids, scores = self._search(query_embedding, top_k)
         
         results = []
-        for idx in top_indices:
-            score = similarities[idx]
+        for idx, score in zip(ids, scores):
             if score < self.threshold * 0.5:  # Allow lower threshold for alternatives
                 continue
             
@@ -605,7 +665,8 @@ class OptimizedSemanticMatcher:
                 for ie in data.get('intents', [])
             ]
             
-            self._embedding_matrix = None
+            self._store.clear()
+            self._sync_store()
             self._polish_embedding_matrix = None
             self._is_loaded = True
             return True
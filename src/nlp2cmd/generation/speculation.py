@@ -0,0 +1,150 @@
+"""
+Speculative LLM calls for HybridGenerator.
+
+In speculative mode ``HybridGenerator`` starts the LLM right away, in parallel
+with the rule pipeline, but only for queries that are likely to fall through
+the rules. Two small pieces decide when that happens:
+
+``FallthroughPredictor`` learns from outcomes the generator has already seen.
+A text it has seen before gets its last outcome. A new text is scored by
+averaging the fall-through rates of its tokens, each smoothed toward the
+global rate. A lookup is a ``split()`` plus a few dict reads, which is far
+cheaper than running the rules.
+
+``SpeculationBudget`` caps the extra LLM calls: speculative calls may not
+exceed ``ratio`` times the number of requests seen so far.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+@dataclass
+class _Rate:
+    fallthrough: int = 0
+    total: int = 0
+
+
+class FallthroughPredictor:
+    """Predicts whether the rule pipeline will fail to produce an acceptable result."""
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        prior: float = 0.0,
+        smoothing: float = 2.0,
+        max_texts: int = 4096,
+        max_tokens: int = 20000,
+    ):
+        """
+        Args:
+            threshold: Minimum score for ``predict`` to return True
+            prior: Fall-through rate assumed before anything was observed
+            smoothing: Pseudo-observations pulling token rates toward the global rate
+            max_texts: Exact texts remembered (LRU)
+            max_tokens: Distinct tokens tracked; later tokens are ignored
+        """
+        self.threshold = threshold
+        self.prior = prior
+        self.smoothing = smoothing
+        self.max_texts = max_texts
+        self.max_tokens = max_tokens
+        self._texts: OrderedDict[str, bool] = OrderedDict()
+        self._tokens: dict[str, _Rate] = {}
+        self._global = _Rate()
+        self._lock = threading.Lock()
+
+    @property
+    def observations(self) -> int:
+        return self._global.total
+
+    def score(self, text: str) -> float:
+        """Estimated probability that ``text`` falls through the rules."""
+        key = _normalize(text)
+        with self._lock:
+            seen = self._texts.get(key)
+            if seen is not None:
+                return 1.0 if seen else 0.0
+
+            g = self._global
+            base = g.fallthrough / g.total if g.total else self.prior
+            rates = []
+            for token in key.split():
+                rate = self._tokens.get(token)
+                if rate is not None:
+                    rates.append(
+                        (rate.fallthrough + self.smoothing * base) / (rate.total + self.smoothing)
+                    )
+            return sum(rates) / len(rates) if rates else base
+
+    def predict(self, text: str) -> bool:
+        return self.score(text) >= self.threshold
+
+    def observe(self, text: str, fell_through: bool) -> None:
+        """Record the actual outcome of the rule pipeline for ``text``."""
+        key = _normalize(text)
+        with self._lock:
+            self._texts[key] = fell_through
+            self._texts.move_to_end(key)
+            while len(self._texts) > self.max_texts:
+                self._texts.popitem(last=False)
+
+            self._global.total += 1
+            self._global.fallthrough += int(fell_through)
+            for token in set(key.split()):
+                rate = self._tokens.get(token)
+                if rate is None:
+                    if len(self._tokens) >= self.max_tokens:
+                        continue
+                    rate = self._tokens[token] = _Rate()
+                rate.total += 1
+                rate.fallthrough += int(fell_through)
+
+
+class SpeculationBudget:
+    """Allows at most ``ratio`` speculative LLM calls per request seen."""
+
+    def __init__(self, ratio: float = 0.25):
+        self.ratio = max(0.0, ratio)
+        self.requests = 0
+        self.spent = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.spent + 1 > self.ratio * self.requests:
+                self.denied += 1
+                return False
+            self.spent += 1
+            return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = self.spent = self.denied = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "requests": self.requests,
+            "spent": self.spent,
+            "denied": self.denied,
+        }
+
+
+__all__ = [
+    "FallthroughPredictor",
+    "SpeculationBudget",
+]
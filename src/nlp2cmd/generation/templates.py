@@ -14,6 +14,7 @@ import os
 import re
 from pathlib import Path
 
+from nlp2cmd.generation.knowledge_bundle import copy_tables, get_knowledge_bundle
 from nlp2cmd.utils.data_files import find_data_files
 
 
@@ -547,8 +548,15 @@ class TemplateGenerator:
         self.defaults: dict[str, Any] = {}
         self._defaults_loaded = False
         self._templates_loaded = False
-        self._load_defaults_from_json()
-        self._load_templates_from_json()
+        bundle = get_knowledge_bundle() if type(self) is TemplateGenerator else None
+        if bundle is not None and bundle.templates:
+            self.templates = copy_tables(bundle.templates)
+            self.defaults = dict(bundle.defaults)
+            self._templates_loaded = bundle.templates_loaded
+            self._defaults_loaded = bundle.defaults_loaded
+        else:
+            self._load_defaults_from_json()
+            self._load_templates_from_json()
 
         strict = str(os.environ.get("NLP2CMD_STRICT_CONFIG") or "").strip().lower() in {
             "1",
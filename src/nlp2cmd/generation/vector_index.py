@@ -0,0 +1,356 @@
+"""
+Embedding storage and nearest-neighbour search for semantic matching.
+
+``EmbeddingStore`` keeps unit-normalised float32 rows in one contiguous,
+preallocated buffer. The buffer doubles when full, so adding phrases one at a
+time costs amortised O(dim) per phrase. The old approach re-stacked every
+embedding after each change. Cosine similarity against the store is a
+single ``matrix @ query``.
+
+Three indexes answer top-k queries over a store. Each one keeps up with
+store changes on its own:
+
+* ``ExactIndex``: a full float32 scan; the reference for recall.
+* ``Int8Index``: symmetric per-dimension int8 scalar quantization. The int8
+  codes are scanned in blocks, and the best ``k * rescore`` candidates are
+  rescored exactly in float32.
+* ``IVFIndex``: an inverted file. A spherical k-means coarse quantizer splits
+  the rows into ``nlist`` lists, stored contiguously by list. A query scans
+  only the ``nprobe`` lists whose centroids are closest. Rows added after
+  the last build are scanned exactly until the index is rebuilt.
+
+Everything is plain NumPy on the CPU.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+import numpy as np
+
+_EPS = 1e-8
+
+INDEX_KINDS = ("exact", "int8", "ivf")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length, as float32 (same epsilon as the matcher)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / (norms + _EPS)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` highest scores; ties go to the lower position."""
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        part = np.argpartition(-scores, k - 1)[:k]
+        # Every position scoring exactly the k-th best competes for the tie.
+        kth = scores[part].min()
+        part = np.union1d(part, np.flatnonzero(scores == kth))
+    else:
+        part = np.arange(n)
+    order = np.lexsort((part, -scores[part]))
+    return part[order[:k]]
+
+
+class _GrowableRows:
+    """2-D buffer with amortised-doubling capacity."""
+
+    def __init__(self, dtype: np.dtype, dim: int, capacity: int = 1024):
+        self._data = np.empty((max(1, capacity), dim), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def view(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def extend(self, rows: np.ndarray) -> None:
+        needed = self._size + rows.shape[0]
+        if needed > self._data.shape[0]:
+            capacity = self._data.shape[0]
+            while capacity < needed:
+                capacity *= 2
+            grown = np.empty((capacity, self._data.shape[1]), dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size:needed] = rows
+        self._size = needed
+
+    def replace(self, rows: np.ndarray) -> None:
+        self._size = 0
+        self.extend(rows)
+
+
+class EmbeddingStore:
+    """Unit-normalised float32 embeddings in a contiguous, growable matrix."""
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._rows: Optional[_GrowableRows] = None
+        # Bumped by clear(); indexes rebuild when it changes.
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._rows) if self._rows is not None else 0
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._rows.view.shape[1] if self._rows is not None else None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the stored rows (do not modify)."""
+        if self._rows is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._rows.view
+
+    def append(self, embedding: np.ndarray) -> int:
+        """Add one embedding; returns its row number."""
+        self.extend(embedding)
+        return len(self) - 1
+
+    def extend(self, embeddings: np.ndarray) -> None:
+        rows = normalize_rows(embeddings)
+        if rows.shape[0] == 0:
+            return
+        if self._rows is None:
+            self._rows = _GrowableRows(np.float32, rows.shape[1], max(self._capacity, rows.shape[0]))
+        elif rows.shape[1] != self._rows.view.shape[1]:
+            raise ValueError(f"Embedding dimension {rows.shape[1]} != store dimension {self.dim}")
+        self._rows.extend(rows)
+
+    def clear(self) -> None:
+        self._rows = None
+        self.generation += 1
+
+
+class ExactIndex:
+    """Brute-force cosine search over the whole store."""
+
+    def __init__(self, store: EmbeddingStore):
+        self.store = store
+
+    def search(self, query: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-``k`` rows for a unit-normalised query.
+
+        Returns:
+            ``(ids, scores)``, best first
+        """
+        matrix = self.store.matrix
+        if len(matrix) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = matrix @ query
+        ids = top_k(scores, k)
+        return ids, scores[ids]
+
+
+class Int8Index:
+    """Int8 scalar-quantized scan with float32 rescoring of the best candidates."""
+
+    BLOCK_ROWS = 256
+
+    def __init__(self, store: EmbeddingStore, rescore: int = 8):
+        self.store = store
+        self.rescore = max(1, rescore)
+        self._codes: Optional[_GrowableRows] = None
+        self._scale: Optional[np.ndarray] = None
+        self._generation = -1
+
+    def _sync(self) -> None:
+        matrix = self.store.matrix
+        n = len(matrix)
+        if self._generation != self.store.generation or self._codes is None:
+            self._fit(matrix)
+            return
+        done = len(self._codes)
+        if done == n:
+            return
+        fresh = matrix[done:]
+        if np.any(np.abs(fresh) > self._scale):
+            # New values fall outside the calibrated range.
+            self._fit(matrix)
+        else:
+            self._codes.extend(self._quantize(fresh))
+
+    def _fit(self, matrix: np.ndarray) -> None:
+        self._generation = self.store.generation
+        if len(matrix) == 0:
+            self._codes, self._scale = None, None
+            return
+        self._scale = np.maximum(np.abs(matrix).max(axis=0), _EPS).astype(np.float32)
+        self._codes = _GrowableRows(np.int8, matrix.shape[1], len(matrix))
+        self._codes.extend(self._quantize(matrix))
+
+    def _quantize(self, rows: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(rows / self._scale * 127.0), -127, 127).astype(np.int8)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the int8 codes."""
+        return self._codes.view.nbytes if self._codes is not None else 0
+
+    def search(self, query: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        self._sync()
+        if self._codes is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        codes = self._codes.view
+        scaled_query = (query * self._scale / 127.0).astype(np.float32)
+        approx = np.empty(len(codes), dtype=np.float32)
+        # Widen small, cache-resident blocks into one reused float32 buffer.
+        buffer = np.empty((min(self.BLOCK_ROWS, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), self.BLOCK_ROWS):
+            block = codes[start:start + self.BLOCK_ROWS]
+            widened = buffer[: len(block)]
+            np.copyto(widened, block, casting="unsafe")
+            np.dot(widened, scaled_query, out=approx[start:start + len(block)])
+
+        candidates = top_k(approx, k * self.rescore)
+        exact = self.store.matrix[candidates] @ query
+        best = top_k(exact, k)
+        return candidates[best], exact[best]
+
+
+class IVFIndex:
+    """Inverted-file index with a spherical k-means coarse quantizer."""
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        train_iterations: int = 10,
+        rebuild_fraction: float = 0.1,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            store: Embeddings to index
+            nlist: Number of lists (default: ``sqrt(n)``)
+            nprobe: Lists scanned per query; higher is slower but recalls more
+            train_iterations: k-means iterations
+            rebuild_fraction: Rebuild once rows added since the last build
+                exceed this fraction of the indexed rows
+            seed: Seed for sampling training rows and initial centroids
+        """
+        self.store = store
+        self.nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.train_iterations = train_iterations
+        self.rebuild_fraction = rebuild_fraction
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._built = 0
+        self._generation = -1
+
+    def _sync(self) -> None:
+        n = len(self.store)
+        stale = self._generation != self.store.generation or self.centroids is None
+        if stale or n - self._built > self.rebuild_fraction * self._built:
+            self.build()
+
+    def build(self) -> None:
+        """(Re)train the coarse quantizer and regroup all rows by list."""
+        matrix = self.store.matrix
+        n = len(matrix)
+        self._generation = self.store.generation
+        self._built = n
+        if n == 0:
+            self.centroids = None
+            return
+
+        nlist = min(n, self.nlist or max(1, int(math.sqrt(n))))
+        self.centroids = self._train(matrix, nlist)
+        assign = self._assign(matrix, self.centroids)
+        order = np.argsort(assign, kind="stable")
+        self._ids = order
+        self._vectors = np.ascontiguousarray(matrix[order])
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=nlist))))
+
+    def _train(self, matrix: np.ndarray, nlist: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(len(matrix), max(nlist * 32, 1024))
+        sample = matrix[rng.choice(len(matrix), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            assign = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty lists with random training rows.
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    @staticmethod
+    def _assign(rows: np.ndarray, centroids: np.ndarray, block: int = 16384) -> np.ndarray:
+        assign = np.empty(len(rows), dtype=np.int64)
+        for start in range(0, len(rows), block):
+            assign[start:start + block] = np.argmax(rows[start:start + block] @ centroids.T, axis=1)
+        return assign
+
+    def search(self, query: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        self._sync()
+        if self.centroids is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        probes = top_k(self.centroids @ query, self.nprobe)
+        id_parts, score_parts = [], []
+        for probe in probes:
+            start, end = self._offsets[probe], self._offsets[probe + 1]
+            if start == end:
+                continue
+            id_parts.append(self._ids[start:end])
+            score_parts.append(self._vectors[start:end] @ query)
+
+        tail = self.store.matrix[self._built:]
+        if len(tail):
+            id_parts.append(np.arange(self._built, self._built + len(tail)))
+            score_parts.append(tail @ query)
+
+        if not id_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ids = np.concatenate(id_parts)
+        scores = np.concatenate(score_parts)
+        # Order candidates by row id so ties resolve like the exact scan.
+        by_id = np.argsort(ids, kind="stable")
+        ids, scores = ids[by_id], scores[by_id]
+        best = top_k(scores, k)
+        return ids[best], scores[best]
+
+
+def create_index(kind: str, store: EmbeddingStore, nprobe: int = 8, nlist: Optional[int] = None):
+    """Index of the given kind ("exact", "int8" or "ivf") over ``store``."""
+    if kind == "exact":
+        return ExactIndex(store)
+    if kind == "int8":
+        return Int8Index(store)
+    if kind == "ivf":
+        return IVFIndex(store, nlist=nlist, nprobe=nprobe)
+    raise ValueError(f"Unknown index kind: {kind!r} (expected one of {', '.join(INDEX_KINDS)})")
+
+
+__all__ = [
+    "EmbeddingStore",
+    "ExactIndex",
+    "INDEX_KINDS",
+    "IVFIndex",
+    "Int8Index",
+    "create_index",
+    "normalize_rows",
+    "top_k",
+]
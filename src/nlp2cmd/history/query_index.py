@@ -0,0 +1,217 @@
+"""
+Similarity index over command history queries.
+
+Queries are deduplicated (case/whitespace-insensitive) into one entry per
+distinct query with its latest command and a use count. Character-trigram
+postings narrow a lookup to the entries sharing the most trigrams with the
+input, and only those candidates are scored with ``similarity()``, so a
+lookup covers the whole history without a pairwise scan. With rapidfuzz
+installed the fuzzy part of ``similarity()`` is its Indel ratio (the same
+2*matches/total measure as difflib, computed exactly and much faster), which
+lets a wider candidate pool be rescored.
+
+The index is maintained incrementally: ``CommandHistory.record()`` adds to
+it, so it is built once per process.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Callable, Iterable, Optional
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    # rapidfuzz not installed - difflib fallback
+    fuzz = None
+
+
+# Candidates (by trigram overlap) rescored with similarity().
+DEFAULT_MAX_CANDIDATES = 64 if fuzz is not None else 16
+
+# Trigrams present in more than this share of entries carry little signal and
+# are skipped when the query has rarer ones.
+COMMON_GRAM_RATIO = 0.25
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def similarity(s1: str, s2: str) -> float:
+    """Similarity between two queries (0-1)."""
+    s1_lower = s1.lower().strip()
+    s2_lower = s2.lower().strip()
+
+    # Exact match
+    if s1_lower == s2_lower:
+        return 1.0
+
+    # Check if one contains the other
+    if s1_lower in s2_lower or s2_lower in s1_lower:
+        return 0.8
+
+    if fuzz is not None:
+        return fuzz.ratio(s1_lower, s2_lower) / 100.0
+
+    # Use SequenceMatcher for fuzzy matching
+    return SequenceMatcher(None, s1_lower, s2_lower).ratio()
+
+
+def trigrams(normalized: str) -> set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class QueryEntry:
+    """One distinct query in the history."""
+
+    query: str
+    command: str
+    count: int
+    last_seq: int
+    grams: int = 0
+
+
+class QueryIndex:
+    """Deduplicated query table with trigram postings."""
+
+    def __init__(self, max_candidates: int = DEFAULT_MAX_CANDIDATES):
+        self.max_candidates = max_candidates
+        self.entries: list[QueryEntry] = []
+        self._by_key: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, query: str, command: str = "") -> None:
+        """Add one history record (newest last)."""
+        key = normalize_query(query)
+        if not key:
+            return
+        self._seq += 1
+        idx = self._by_key.get(key)
+        if idx is not None:
+            entry = self.entries[idx]
+            entry.query = query
+            entry.command = command
+            entry.count += 1
+            entry.last_seq = self._seq
+            return
+
+        idx = len(self.entries)
+        grams = trigrams(key)
+        self.entries.append(
+            QueryEntry(query=query, command=command, count=1, last_seq=self._seq, grams=len(grams))
+        )
+        self._by_key[key] = idx
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(idx)
+
+    def extend(self, records: Iterable[tuple[str, str]]) -> None:
+        for query, command in records:
+            self.add(query, command)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._by_key.clear()
+        self._postings.clear()
+        self._seq = 0
+
+    def candidates(self, query: str) -> list[QueryEntry]:
+        """Entries sharing the most trigrams with ``query`` (best first)."""
+        key = normalize_query(query)
+        if not key:
+            return []
+        grams = trigrams(key)
+        postings = [p for p in (self._postings.get(g) for g in grams) if p]
+        common = max(64, int(len(self.entries) * COMMON_GRAM_RATIO))
+        rare = [p for p in postings if len(p) <= common]
+        shared: Counter[int] = Counter()
+        for p in rare or postings:
+            shared.update(p)
+        exact = self._by_key.get(key)
+        if exact is not None:
+            shared[exact] += 2 * len(grams)
+        # Shared counts favour long entries; re-rank a wider pool by Dice.
+        pool = shared.most_common(self.max_candidates * 4)
+        size = len(grams)
+        pool.sort(key=lambda item: item[1] / (size + self.entries[item[0]].grams), reverse=True)
+        return [self.entries[idx] for idx, _ in pool[: self.max_candidates]]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        threshold: float = 0.4,
+        scorer: Optional[Callable[[str, str], float]] = None,
+    ) -> list[tuple[str, str, float]]:
+        """
+        Find similar history queries.
+
+        Args:
+            query: Current query
+            limit: Maximum results
+            threshold: Minimum similarity (0-1)
+            scorer: Similarity function (default: ``similarity``)
+
+        Returns:
+            List of (query, command, similarity) tuples, most similar first;
+            ties go to the most recently used query
+        """
+        candidates = self.candidates(query)
+        if scorer is not None or fuzz is not None:
+            score = scorer or similarity
+            scored = [(score(query, e.query), e.last_seq, e) for e in candidates]
+        else:
+            scored = _score_candidates(query, candidates, limit, threshold)
+        scored = [item for item in scored if item[0] >= threshold]
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [(entry.query, entry.command, value) for value, _, entry in scored[:limit]]
+
+
+def _score_candidates(
+    query: str,
+    candidates: list[QueryEntry],
+    limit: int,
+    threshold: float,
+) -> list[tuple[float, int, QueryEntry]]:
+    """difflib ``similarity()`` for each candidate, skipping ones that cannot make the top ``limit``."""
+    q = query.lower().strip()
+    matcher = SequenceMatcher(None)
+    matcher.set_seq1(q)
+    best: list[float] = []
+    scored = []
+    for entry in candidates:
+        h = entry.query.lower().strip()
+        if h == q:
+            value = 1.0
+        elif q in h or h in q:
+            value = 0.8
+        else:
+            floor = max(threshold, best[0]) if len(best) >= limit else threshold
+            matcher.set_seq2(h)
+            if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+                continue
+            value = matcher.ratio()
+        scored.append((value, entry.last_seq, entry))
+        if len(best) < limit:
+            heapq.heappush(best, value)
+        elif value > best[0]:
+            heapq.heapreplace(best, value)
+    return scored
+
+__all__ = [
+    "DEFAULT_MAX_CANDIDATES",
+    "QueryEntry",
+    "QueryIndex",
+    "normalize_query",
+    "similarity",
+    "trigrams",
+]
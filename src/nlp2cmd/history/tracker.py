@@ -16,6 +16,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from nlp2cmd.history.query_index import QueryIndex
+
 
 @dataclass
 class SchemaUsage:
@@ -109,6 +111,7 @@ class CommandHistory:
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
         
         self.records: list[CommandRecord] = []
+        self._query_index: Optional[QueryIndex] = None
         self._load()
     
     def _load(self):
@@ -168,8 +171,18 @@ class CommandHistory:
         )
         
         self.records.append(record)
+        if self._query_index is not None:
+            self._query_index.add(record.query, record.command)
         self._save()
     
+    def query_index(self) -> QueryIndex:
+        """Similarity index over all recorded queries (built on first use)."""
+        if self._query_index is None:
+            index = QueryIndex()
+            index.extend((r.query, r.command) for r in self.records)
+            self._query_index = index
+        return self._query_index
+    
     def get_recent(self, limit: int = 50) -> list[CommandRecord]:
         """Get recent command records."""
         return self.records[-limit:]
@@ -286,6 +299,7 @@ class CommandHistory:
     def clear(self):
         """Clear all history."""
         self.records = []
+        self._query_index = None
         self._save()
     
     def export_analytics(self, output_file: Path):
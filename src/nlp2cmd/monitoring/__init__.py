@@ -16,6 +16,14 @@ from .token_costs import (
     format_token_estimate,
     parse_metrics_string,
 )
+from .tracing import (
+    LatencyHistogram,
+    Trace,
+    set_tracing_enabled,
+    span,
+    trace_request,
+    tracing_enabled,
+)
 
 __all__ = [
     "ResourceMonitor",
@@ -30,4 +38,10 @@ __all__ = [
     "estimate_token_cost",
     "format_token_estimate",
     "parse_metrics_string",
+    "LatencyHistogram",
+    "Trace",
+    "set_tracing_enabled",
+    "span",
+    "trace_request",
+    "tracing_enabled",
 ]
@@ -0,0 +1,268 @@
+"""
+Per-stage latency tracing for NLP2CMD.
+
+A request opens a trace with ``trace_request()``; code inside it marks stages
+with ``span("detect.fast_path")``. Timings use ``perf_counter_ns``. When no
+trace is active ``span()`` returns a shared no-op context manager, so
+instrumented code costs one context-variable lookup per stage.
+
+Tracing is off by default. Enable it globally with ``set_tracing_enabled(True)``
+or ``NLP2CMD_TRACE=1``, or per call via ``trace_request(enabled=True)``.
+
+Aggregation lives in ``LatencyHistogram`` (fixed buckets, bounded memory),
+which can estimate p50/p95/p99 and render the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+
+_ENABLED_VALUES = {"1", "true", "yes", "y", "on"}
+
+_enabled = str(os.environ.get("NLP2CMD_TRACE") or "").strip().lower() in _ENABLED_VALUES
+_active: ContextVar[Optional["Trace"]] = ContextVar("nlp2cmd_trace", default=None)
+
+
+def set_tracing_enabled(enabled: bool) -> None:
+    """Enable or disable tracing for requests that do not choose explicitly."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+@dataclass
+class Span:
+    """A finished stage timing."""
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    depth: int
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+
+class _SpanTimer:
+    __slots__ = ("_trace", "_name", "_start", "_depth")
+
+    def __init__(self, trace: "Trace", name: str):
+        self._trace = trace
+        self._name = name
+
+    def __enter__(self) -> "_SpanTimer":
+        self._depth = self._trace._depth
+        self._trace._depth += 1
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        end = time.perf_counter_ns()
+        self._trace._depth -= 1
+        self._trace.spans.append(Span(self._name, self._start, end - self._start, self._depth))
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans recorded for a single request."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: list[Span] = []
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self._depth = 0
+
+    def span(self, name: str) -> _SpanTimer:
+        return _SpanTimer(self, name)
+
+    def finish(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+
+    @property
+    def total_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+    def stage_durations_ms(self) -> dict[str, float]:
+        """Total time per stage name (a stage may run several times per request)."""
+        stages: dict[str, float] = {}
+        for s in self.spans:
+            stages[s.name] = stages.get(s.name, 0.0) + s.duration_ms
+        return stages
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "total_ms": round(self.total_ms, 4),
+            "stages": {k: round(v, 4) for k, v in self.stage_durations_ms().items()},
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start_ns - self.start_ns) / 1e6, 4),
+                    "duration_ms": round(s.duration_ms, 4),
+                    "depth": s.depth,
+                }
+                for s in sorted(self.spans, key=lambda s: s.start_ns)
+            ],
+        }
+
+
+def span(name: str) -> Any:
+    """
+    Time a stage of the active trace.
+
+    Returns a no-op context manager when no trace is active.
+    """
+    trace = _active.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return trace.span(name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _active.get()
+
+
+@contextmanager
+def trace_request(name: str, enabled: Optional[bool] = None) -> Iterator[Optional[Trace]]:
+    """
+    Open a trace for one request.
+
+    Yields the new ``Trace`` when this call owns it, and None when tracing is
+    disabled or a trace is already active (nested calls record their spans
+    into the outer trace, and only the outermost owner reports it).
+
+    Args:
+        name: Trace name (e.g. ``"pipeline"``)
+        enabled: Force tracing on/off; None follows ``tracing_enabled()``
+    """
+    if _active.get() is not None:
+        with span(name):
+            yield None
+        return
+    if not (_enabled if enabled is None else enabled):
+        yield None
+        return
+
+    trace = Trace(name)
+    token = _active.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _active.reset(token)
+
+
+# Upper bounds in milliseconds; chosen to cover sub-ms detector stages up to slow LLM calls.
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        idx = bisect.bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.sum_ms += value_ms
+            if value_ms > self.max_ms:
+                self.max_ms = value_ms
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            if n == 0:
+                continue
+            if seen + n >= rank:
+                lower = self.buckets_ms[idx - 1] if idx > 0 else 0.0
+                upper = self.buckets_ms[idx] if idx < len(self.buckets_ms) else self.max_ms
+                upper = min(upper, self.max_ms)
+                if upper <= lower:
+                    return upper
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.max_ms
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": self.sum_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+    def prometheus_lines(self, metric: str, labels: dict[str, str]) -> list[str]:
+        """Render as a Prometheus histogram in seconds (cumulative buckets)."""
+        base = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+        prefix = f"{base}," if base else ""
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets_ms, self.counts):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{{prefix}le="{bound / 1000:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{base}}}" if base else ""
+        lines.append(f"{metric}_sum{suffix} {self.sum_ms / 1000:.9g}")
+        lines.append(f"{metric}_count{suffix} {self.count}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+__all__ = [
+    "DEFAULT_BUCKETS_MS",
+    "LatencyHistogram",
+    "Span",
+    "Trace",
+    "current_trace",
+    "set_tracing_enabled",
+    "span",
+    "trace_request",
+    "tracing_enabled",
+]
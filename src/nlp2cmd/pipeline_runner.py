@@ -345,39 +345,39 @@ class PipelineRunner:
             pass
 
         try:
-            from playwright.sync_api import sync_playwright  # type: ignore
+            import playwright.sync_api  # type: ignore  # noqa: F401
         except Exception as e:
             return RunnerResult(success=False, kind="dom", error=f"Playwright not available: {e}")
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            page = browser.new_page()
+        from nlp2cmd.execution.browser_pool import get_browser_pool
 
+        def act(page) -> Optional[RunnerResult]:
+            page.goto(str(url))
+            page.wait_for_timeout(250)
             if action in {"goto", "navigate"}:
-                page.goto(str(url))
-                page.wait_for_timeout(250)
+                return None
+
+            locator = page.locator(selector).first
+
+            if action == "click":
+                locator.click()
+            elif action == "type":
+                value = (params or {}).get("value")
+                if value is None:
+                    return RunnerResult(success=False, kind="dom", error="Missing params.value for type")
+                locator.fill(str(value))
+            elif action == "select":
+                value = (params or {}).get("value")
+                if value is None:
+                    return RunnerResult(success=False, kind="dom", error="Missing params.value for select")
+                locator.select_option(str(value))
             else:
-                page.goto(str(url))
-                page.wait_for_timeout(250)
-
-                locator = page.locator(selector).first
-
-                if action == "click":
-                    locator.click()
-                elif action == "type":
-                    value = (params or {}).get("value")
-                    if value is None:
-                        return RunnerResult(success=False, kind="dom", error="Missing params.value for type")
-                    locator.fill(str(value))
-                elif action == "select":
-                    value = (params or {}).get("value")
-                    if value is None:
-                        return RunnerResult(success=False, kind="dom", error="Missing params.value for select")
-                    locator.select_option(str(value))
-                else:
-                    return RunnerResult(success=False, kind="dom", error=f"Unsupported dom action: {action}")
-
-            browser.close()
+                return RunnerResult(success=False, kind="dom", error=f"Unsupported dom action: {action}")
+            return None
+
+        failed = get_browser_pool(headless=self.headless).run(act, url=str(url))
+        if failed is not None:
+            return failed
 
         return RunnerResult(success=True, kind="dom", data={"url": url, "action": action, "selector": selector})
     
@@ -433,20 +433,18 @@ class PipelineRunner:
         console_wrapper = _MarkdownConsoleWrapper(console, enable_markdown=True)
         
         try:
-            from playwright.sync_api import sync_playwright  # type: ignore
+            import playwright.sync_api  # type: ignore  # noqa: F401
         except Exception as e:
             return RunnerResult(success=False, kind="dom", error=f"Playwright not available: {e}")
+
+        from nlp2cmd.execution.browser_pool import get_browser_pool
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            from nlp2cmd.web_schema.form_data_loader import FormDataLoader
+        from nlp2cmd.web_schema.form_data_loader import FormDataLoader
 
-            schema_loader = FormDataLoader(site=str(url))
-            ctx_opts = schema_loader.get_browser_context_options()
+        schema_loader = FormDataLoader(site=str(url))
+        ctx_opts = schema_loader.get_browser_context_options()
 
-            context = browser.new_context(**ctx_opts)
-            page = context.new_page()
-            
+        def run_actions(page) -> RunnerResult:
             try:
                 for i, action_spec in enumerate(actions):
                     action = action_spec.get("action")
@@ -571,6 +569,7 @@ class PipelineRunner:
                                         domain=parsed.netloc,
                                         action_type="type",
                                         selector=sel,
+                                        field=selector_group,
                                     )
                                 
                                 typed = True
@@ -586,6 +585,7 @@ class PipelineRunner:
                                         action_type="type",
                                         selector=sel,
                                         error=str(e),
+                                        field="search" if sel in search_selector_set else "generic",
                                     )
                                 continue
                         
@@ -643,16 +643,19 @@ class PipelineRunner:
                     else:
                         return RunnerResult(success=False, kind="dom", error=f"Action {i}: Unsupported action: {action}")
                 
-                # Keep browser open for a moment to see the result
+                # Keep the page on screen for a moment to see the result
                 page.wait_for_timeout(2000)
-                browser.close()
                 
                 return RunnerResult(success=True, kind="dom", data={"url": url, "actions_executed": len(actions)})
             
             except Exception as e:
-                browser.close()
                 return RunnerResult(success=False, kind="dom", error=f"Multi-action execution failed: {e}")
 
+        try:
+            return get_browser_pool(headless=self.headless).run(run_actions, url=str(url), context_options=ctx_opts)
+        except Exception as e:
+            return RunnerResult(success=False, kind="dom", error=f"Multi-action execution failed: {e}")
+
     @staticmethod
     def _dismiss_popups(page, schema_loader=None) -> None:
         """Try to dismiss common popups and cookie consents."""
@@ -6,6 +6,10 @@ Supports Docker, Kubernetes, SQL, Terraform, and other configuration formats.
 
 from __future__ import annotations
 
+import codecs
+import fnmatch
+import locale
+import os
 import re
 import json
 from dataclasses import dataclass, field
@@ -14,6 +18,21 @@ from typing import Any, Callable, Optional, Union
 
 from nlp2cmd.utils.yaml_compat import yaml
 
+# Content sniffing looks at the first CONTENT_SNIFF_CHARS characters, read
+# from at most CONTENT_SNIFF_BYTES (enough for 1000 characters of UTF-8).
+CONTENT_SNIFF_BYTES = 4096
+CONTENT_SNIFF_CHARS = 1000
+
+_GLOB_CHARS = frozenset("*?[")
+
+# (schema key, predicate on the file header), tried in order.
+_CONTENT_DETECTORS: tuple[tuple[str, Callable[[str], bool]], ...] = (
+    ("dockerfile", lambda c: c.strip().startswith("FROM ")),
+    ("kubernetes-deployment", lambda c: "apiVersion:" in c and "kind:" in c and "Deployment" in c),
+    ("docker-compose", lambda c: "version:" in c and "services:" in c),
+    ("github-workflow", lambda c: c.strip().startswith("on:") or "jobs:" in c),
+)
+
 
 @dataclass
 class FileFormatSchema:
@@ -99,12 +118,82 @@ class FileFormatSchema:
         }
 
 
+class _FormatIndex:
+    """
+    Filename patterns of all registered schemas, compiled for lookup.
+
+    Patterns are lowercased and classified once:
+    - literals (``Dockerfile``, ``compose.yml``) go into an exact-match map
+    - ``*<literal>`` patterns (``*.yaml``) are grouped by their extension
+    - everything else is compiled to a regex with ``fnmatch.translate``
+
+    Matching is the same as ``fnmatch`` (or plain equality) against the
+    lowercased filename or full path. Schemas are referred to by their
+    position in the registry, so priority ties still go to the first one.
+    """
+
+    def __init__(self, schemas: list[FileFormatSchema]):
+        self.schemas = schemas
+        self.literals: dict[str, list[int]] = {}
+        self.suffixes: dict[str, list[tuple[str, int]]] = {}
+        self.bare_suffixes: list[tuple[str, int]] = []
+        self.globs: list[tuple[re.Pattern[str], int]] = []
+
+        for position, schema in enumerate(schemas):
+            for pattern in getattr(schema, "extensions", None) or ():
+                pattern = os.path.normcase(str(pattern).lower())
+                # A pattern also matches itself verbatim (e.g. "a[1].txt").
+                self.literals.setdefault(pattern, []).append(position)
+                if not _GLOB_CHARS.intersection(pattern):
+                    continue
+                tail = pattern[1:]
+                if pattern.startswith("*") and not _GLOB_CHARS.intersection(tail):
+                    if "." in tail:
+                        self.suffixes.setdefault(tail.rpartition(".")[2], []).append((tail, position))
+                    else:
+                        self.bare_suffixes.append((tail, position))
+                else:
+                    self.globs.append((re.compile(fnmatch.translate(pattern)), position))
+
+    def match(self, file_path: Path) -> list[int]:
+        """Positions of the schemas whose patterns match, in registry order."""
+        name = os.path.normcase(file_path.name.lower())
+        full = os.path.normcase(str(file_path).lower())
+
+        matched = set(self.literals.get(name, ()))
+        matched.update(self.literals.get(full, ()))
+
+        if "." in name:
+            for suffix, position in self.suffixes.get(name.rpartition(".")[2], ()):
+                if position not in matched and (name.endswith(suffix) or full.endswith(suffix)):
+                    matched.add(position)
+        for suffix, position in self.bare_suffixes:
+            if position not in matched and (name.endswith(suffix) or full.endswith(suffix)):
+                matched.add(position)
+        for regex, position in self.globs:
+            if position not in matched and (regex.match(name) or regex.match(full)):
+                matched.add(position)
+
+        return sorted(matched)
+
+
+def _read_header(file_path: Path) -> str:
+    """First CONTENT_SNIFF_CHARS characters, as ``read_text()`` would decode them."""
+    with open(file_path, "rb") as f:
+        data = f.read(CONTENT_SNIFF_BYTES)
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))()
+    text = decoder.decode(data, final=len(data) < CONTENT_SNIFF_BYTES)
+    return text.replace("\r\n", "\n").replace("\r", "\n")[:CONTENT_SNIFF_CHARS]
+
+
 class SchemaRegistry:
     """Registry for file format schemas with validation and repair capabilities."""
 
     def __init__(self):
         self._schemas: dict[str, FileFormatSchema] = {}
         self.schemas: dict[str, FileFormatSchema] = self._schemas
+        self._format_index: Optional[_FormatIndex] = None
+        self._format_index_key: tuple[int, ...] = ()
         self._register_builtin_schemas()
 
     def _register_builtin_schemas(self):
@@ -422,21 +511,25 @@ class SchemaRegistry:
         
         return loaded_count
 
+    def _get_format_index(self) -> _FormatIndex:
+        """Pattern index, rebuilt when schemas are added, removed or replaced."""
+        key = tuple(map(id, self._schemas.values()))
+        if self._format_index is None or key != self._format_index_key:
+            self._format_index = _FormatIndex(list(self._schemas.values()))
+            self._format_index_key = key
+        return self._format_index
+
+    def invalidate_format_index(self) -> None:
+        """Drop the pattern index (needed after editing a schema's extensions in place)."""
+        self._format_index = None
+
     def detect_format(self, file_path: Path) -> Optional[FileFormatSchema]:
         """Detect file format from path."""
-        filename = file_path.name
-        full_path = str(file_path)
+        file_path = Path(file_path)
+        index = self._get_format_index()
 
         # Find all matching schemas
-        matching_schemas = []
-        for schema in self._schemas.values():
-            for pattern in schema.extensions:
-                if self._match_pattern(filename, pattern):
-                    matching_schemas.append(schema)
-                    break
-                if self._match_pattern(full_path, pattern):
-                    matching_schemas.append(schema)
-                    break
+        matching_schemas = [index.schemas[position] for position in index.match(file_path)]
 
         # Return the highest priority schema
         if matching_schemas:
@@ -447,28 +540,18 @@ class SchemaRegistry:
 
     def _match_pattern(self, text: str, pattern: str) -> bool:
         """Match filename against pattern (case insensitive)."""
-        import fnmatch
-
         return fnmatch.fnmatch(text.lower(), pattern.lower()) or text.lower() == pattern.lower()
 
     def _detect_by_content(self, file_path: Path) -> Optional[FileFormatSchema]:
-        """Detect format by content analysis."""
+        """Detect format by content analysis of the file header."""
         try:
-            content = file_path.read_text()[:1000]
-
-            if content.strip().startswith("FROM "):
-                return self._schemas.get("dockerfile")
-            if "apiVersion:" in content and "kind:" in content:
-                if "Deployment" in content:
-                    return self._schemas.get("kubernetes-deployment")
-            if "version:" in content and "services:" in content:
-                return self._schemas.get("docker-compose")
-            if content.strip().startswith("on:") or "jobs:" in content:
-                return self._schemas.get("github-workflow")
-
+            content = _read_header(file_path)
         except Exception:
-            pass
+            return None
 
+        for name, detector in _CONTENT_DETECTORS:
+            if detector(content):
+                return self._schemas.get(name)
         return None
 
     def validate(self, content: str, schema_name: str) -> dict[str, Any]:
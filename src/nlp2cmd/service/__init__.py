@@ -21,24 +21,25 @@ FastAPI = None
 HTTPException = None
 BackgroundTasks = None
 JSONResponse = None
+PlainTextResponse = None
 CORSMiddleware = None
 uvicorn = None
 
 if TYPE_CHECKING:  # pragma: no cover
     from fastapi import FastAPI as _FastAPI, HTTPException as _HTTPException, BackgroundTasks as _BackgroundTasks
-    from fastapi.responses import JSONResponse as _JSONResponse
+    from fastapi.responses import JSONResponse as _JSONResponse, PlainTextResponse as _PlainTextResponse
     from fastapi.middleware.cors import CORSMiddleware as _CORSMiddleware
 
 
 def _ensure_service_deps() -> None:
     """Lazily import FastAPI/uvicorn dependencies for service mode."""
-    global FastAPI, HTTPException, BackgroundTasks, JSONResponse, CORSMiddleware, uvicorn
+    global FastAPI, HTTPException, BackgroundTasks, JSONResponse, PlainTextResponse, CORSMiddleware, uvicorn
 
     if FastAPI is not None and uvicorn is not None:
         return
 
     from fastapi import FastAPI as _FastAPI, HTTPException as _HTTPException, BackgroundTasks as _BackgroundTasks
-    from fastapi.responses import JSONResponse as _JSONResponse
+    from fastapi.responses import JSONResponse as _JSONResponse, PlainTextResponse as _PlainTextResponse
     from fastapi.middleware.cors import CORSMiddleware as _CORSMiddleware
     import uvicorn as _uvicorn
 
@@ -46,11 +47,12 @@ def _ensure_service_deps() -> None:
     HTTPException = _HTTPException
     BackgroundTasks = _BackgroundTasks
     JSONResponse = _JSONResponse
+    PlainTextResponse = _PlainTextResponse
     CORSMiddleware = _CORSMiddleware
     uvicorn = _uvicorn
 
 
-from ..generation.pipeline import RuleBasedPipeline
+from ..generation.pipeline import PipelineMetrics, RuleBasedPipeline
 from ..cli.display import display_command_result
 
 
@@ -164,6 +166,7 @@ class NLP2CMDService:
         self.config = config or ServiceConfig()
         self.app = None
         self.pipeline = None
+        self.metrics = PipelineMetrics()
         self._setup_logging()
         
     def _setup_logging(self):
@@ -195,8 +198,8 @@ class NLP2CMDService:
                 allow_headers=["*"],
             )
         
-        # Initialize pipeline
-        self.pipeline = RuleBasedPipeline()
+        # Initialize pipeline (traced, so /metrics has per-stage latencies)
+        self.pipeline = RuleBasedPipeline(trace=True)
         
         return app
     
@@ -218,6 +221,14 @@ class NLP2CMDService:
             """Health check endpoint."""
             return {"status": "healthy", "service": "nlp2cmd"}
         
+        @app.get("/metrics")
+        async def metrics():
+            """Pipeline metrics in Prometheus text format."""
+            return PlainTextResponse(
+                self.metrics.to_prometheus(),
+                media_type="text/plain; version=0.0.4",
+            )
+        
         @app.post("/query", response_model=QueryResponse)
         async def process_query(request: QueryRequest, background_tasks: BackgroundTasks):
             """Process natural language query."""
@@ -226,6 +237,7 @@ class NLP2CMDService:
 
                 # Process query using pipeline
                 result = self.pipeline.process(request.query)
+                self.metrics.record(result)
                 
                 response_data = {
                     "success": result.success,
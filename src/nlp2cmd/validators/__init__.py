@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Optional
 
 import re
@@ -168,6 +169,10 @@ class SyntaxValidator(BaseValidator):
         )
 
 
+# Validators are stateless; one instance serves every caller.
+_SYNTAX_VALIDATOR = SyntaxValidator()
+
+
 class SQLValidator(BaseValidator):
     """SQL-specific validator."""
 
@@ -258,7 +263,7 @@ class SQLValidator(BaseValidator):
                 break
 
         # Basic syntax check
-        syntax_result = SyntaxValidator().validate(content)
+        syntax_result = _SYNTAX_VALIDATOR.validate(content)
         errors.extend(syntax_result.errors)
         warnings.extend(syntax_result.warnings)
 
@@ -270,8 +275,97 @@ class SQLValidator(BaseValidator):
         )
 
 
+_SHELL_SYSTEM_PATHS = ("/etc/", "/boot/", "/sys/", "/proc/", "/dev/", "/root/", "/usr/bin/")
+
+
+@lru_cache(maxsize=64)
+def _lowered_patterns(patterns: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    return tuple((p, p.lower()) for p in patterns)
+
+
+@lru_cache(maxsize=4096)
+def _shell_findings(
+    dangerous_commands: tuple[str, ...],
+    allow_sudo: bool,
+    content: str,
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """All ShellValidator findings for one command, in reporting order."""
+    errors = []
+    warnings = []
+    suggestions = []
+
+    content_lower = content.lower()
+
+    # Check for dangerous commands - mark as errors
+    for dangerous, dangerous_lower in _lowered_patterns(dangerous_commands):
+        if dangerous_lower in content_lower:
+            errors.append(f"Dangerous command detected: {dangerous}")
+
+    # Check sudo usage
+    if content.strip().startswith("sudo") and not allow_sudo:
+        warnings.append("sudo usage detected - requires elevated privileges")
+        suggestions.append("Consider if root privileges are necessary")
+
+    # Check for rm with wildcards - mark as error for safety
+    if "rm " in content and "*" in content:
+        errors.append("rm with wildcard - verify target carefully")
+
+    # Check pipe to shell - warning only
+    if "| sh" in content or "| bash" in content:
+        warnings.append("Piping to shell is potentially dangerous")
+
+    # Check for eval command - error for security
+    if "eval " in content_lower:
+        errors.append("eval command detected - potential code injection risk")
+
+    # Check for command injection patterns ("&&" and "||" are allowed)
+    if ";" in content:
+        errors.append("Command separator detected - potential injection risk")
+    if "$(" in content:
+        warnings.append("Command substitution detected - review for safety")
+    if "`" in content:
+        warnings.append("Backtick command substitution detected - review for safety")
+
+    # Check for dangerous permission changes
+    if "chmod" in content_lower and ("777" in content or "a+rwx" in content):
+        warnings.append("777 permissions change detected - security risk")
+        suggestions.append("Consider more restrictive permissions")
+
+    # Check for process killing
+    if "kill" in content_lower and ("-9" in content or "SIGKILL" in content):
+        warnings.append("kill -9 or SIGKILL detected - consider graceful termination")
+        suggestions.append("Try SIGTERM (kill -15) first")
+
+    # Check for system file modification (">" also covers ">>")
+    if ">" in content:
+        for path in _SHELL_SYSTEM_PATHS:
+            if path in content:
+                errors.append(f"System file modification detected: {path}")
+
+    # Check for background job patterns
+    if "nohup" in content_lower or (content.endswith("&") and not content.endswith(" &")):
+        errors.append("Background job detected - verify job management")
+
+    # Check for path traversal
+    if "../" in content or "..\\" in content:
+        errors.append("Path traversal pattern detected")
+
+    # Syntax check
+    syntax_result = _SYNTAX_VALIDATOR.validate(content)
+    errors.extend(syntax_result.errors)
+    warnings.extend(syntax_result.warnings)
+
+    return tuple(errors), tuple(warnings), tuple(suggestions)
+
+
 class ShellValidator(BaseValidator):
-    """Shell command validator."""
+    """
+    Shell command validator.
+
+    Findings depend only on the command, ``allow_sudo`` and
+    ``DANGEROUS_COMMANDS``, so they are memoised (bounded LRU) and every
+    call returns a fresh ValidationResult built from the cached findings.
+    """
 
     DANGEROUS_COMMANDS = [
         "rm -rf /",
@@ -288,79 +382,15 @@ class ShellValidator(BaseValidator):
 
     def validate(self, content: str) -> ValidationResult:
         """Validate shell command."""
-        errors = []
-        warnings = []
-        suggestions = []
-
-        content_lower = content.lower()
-
-        # Check for dangerous commands - mark as errors
-        for dangerous in self.DANGEROUS_COMMANDS:
-            if dangerous.lower() in content_lower:
-                errors.append(f"Dangerous command detected: {dangerous}")
-
-        # Check sudo usage
-        if content.strip().startswith("sudo") and not self.allow_sudo:
-            warnings.append("sudo usage detected - requires elevated privileges")
-            suggestions.append("Consider if root privileges are necessary")
-
-        # Check for rm with wildcards - mark as error for safety
-        if "rm " in content and "*" in content:
-            errors.append("rm with wildcard - verify target carefully")
-
-        # Check pipe to shell - warning only
-        if "| sh" in content or "| bash" in content:
-            warnings.append("Piping to shell is potentially dangerous")
-
-        # Check for eval command - error for security
-        if "eval " in content_lower:
-            errors.append("eval command detected - potential code injection risk")
-
-        # Check for command injection patterns
-        injection_patterns = ["&&", "||", ";", "$(", "`"]
-        for pattern in injection_patterns:
-            if pattern in content and not pattern in ["&&", "||"]:  # Allow logical operators in safe contexts
-                if pattern == ";":
-                    errors.append("Command separator detected - potential injection risk")
-                elif pattern == "$(":
-                    warnings.append("Command substitution detected - review for safety")
-                elif pattern == "`":
-                    warnings.append("Backtick command substitution detected - review for safety")
-
-        # Check for dangerous permission changes
-        if "chmod" in content_lower and ("777" in content or "a+rwx" in content):
-            warnings.append("777 permissions change detected - security risk")
-            suggestions.append("Consider more restrictive permissions")
-
-        # Check for process killing
-        if "kill" in content_lower and ("-9" in content or "SIGKILL" in content):
-            warnings.append("kill -9 or SIGKILL detected - consider graceful termination")
-            suggestions.append("Try SIGTERM (kill -15) first")
-
-        # Check for system file modification
-        system_paths = ["/etc/", "/boot/", "/sys/", "/proc/", "/dev/", "/root/", "/usr/bin/"]
-        for path in system_paths:
-            if path in content and (">>" in content or ">" in content):
-                errors.append(f"System file modification detected: {path}")
-
-        # Check for background job patterns
-        if "nohup" in content_lower or (content.endswith("&") and not content.endswith(" &")):
-            errors.append("Background job detected - verify job management")
-
-        # Check for path traversal
-        if "../" in content or "..\\" in content:
-            errors.append("Path traversal pattern detected")
-
-        # Syntax check
-        syntax_result = SyntaxValidator().validate(content)
-        errors.extend(syntax_result.errors)
-        warnings.extend(syntax_result.warnings)
+        errors, warnings, suggestions = _shell_findings(
+            tuple(self.DANGEROUS_COMMANDS), bool(self.allow_sudo), content
+        )
 
         return ValidationResult(
             is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings,
-            suggestions=suggestions,
+            errors=list(errors),
+            warnings=list(warnings),
+            suggestions=list(suggestions),
         )
 
 
@@ -9,10 +9,13 @@ Provides:
 
 from nlp2cmd.web_schema.extractor import WebSchemaExtractor, extract_web_schema
 from nlp2cmd.web_schema.history import InteractionHistory, InteractionRecord
+from nlp2cmd.web_schema.selector_index import SelectorStats, SelectorStatsIndex
 
 __all__ = [
     "WebSchemaExtractor",
     "extract_web_schema",
     "InteractionHistory",
     "InteractionRecord",
+    "SelectorStats",
+    "SelectorStatsIndex",
 ]
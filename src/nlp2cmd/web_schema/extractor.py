@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import urlparse
 
+from nlp2cmd.web_schema.readiness import ReadinessConfig, wait_for_ready
+
 
 @dataclass
 class WebElement:
@@ -138,8 +140,14 @@ class WebSchemaExtractor:
     app2schema.appspec compatible schemas.
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, readiness: Optional[ReadinessConfig] = None):
+        """
+        Args:
+            headless: Run browser in headless mode
+            readiness: How long to wait for the page to settle after navigation
+        """
         self.headless = headless
+        self.readiness = readiness or ReadinessConfig()
     
     def extract(self, url: str) -> WebPageSchema:
         """
@@ -152,44 +160,38 @@ class WebSchemaExtractor:
             WebPageSchema with extracted elements
         """
         try:
-            from playwright.sync_api import sync_playwright
+            import playwright.sync_api  # noqa: F401
         except ImportError:
             raise RuntimeError("Playwright is required for web schema extraction")
         
+        from nlp2cmd.execution.browser_pool import get_browser_pool
+        
         # Normalize URL
-        if not url.startswith(('http://', 'https://')):
+        if not url.startswith(('http://', 'https://', 'file://')):
             url = 'https://' + url
         
         parsed = urlparse(url)
         domain = parsed.netloc
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-            )
-            page = context.new_page()
-            
-            # Navigate to page
+        def analyze(page) -> tuple[Any, ...]:
+            # Navigate to page, then wait for dynamic content to settle
             page.goto(url, wait_until="domcontentloaded")
-            page.wait_for_timeout(2000)  # Wait for dynamic content
-            
-            # Extract page info
-            title = page.title()
+            readiness = wait_for_ready(page, self.readiness)
             
-            # Extract inputs
-            inputs = self._extract_inputs(page)
-            
-            # Extract buttons
-            buttons = self._extract_buttons(page)
-            
-            # Extract links
-            links = self._extract_links(page)
-            
-            # Extract forms
-            forms = self._extract_forms(page)
-            
-            browser.close()
+            return (
+                readiness,
+                page.title(),
+                self._extract_inputs(page),
+                self._extract_buttons(page),
+                self._extract_links(page),
+                self._extract_forms(page),
+            )
+        
+        readiness, title, inputs, buttons, links, forms = get_browser_pool(headless=self.headless).run(
+            analyze,
+            url=url,
+            context_options={"viewport": {"width": 1280, "height": 720}},
+        )
         
         import datetime
         
@@ -203,6 +205,7 @@ class WebSchemaExtractor:
             forms=forms,
             metadata={
                 "extracted_at": datetime.datetime.now().isoformat(),
+                "readiness": readiness.to_dict(),
             },
         )
     
@@ -353,6 +356,7 @@ def extract_web_schema(
     output_dir: Optional[Path] = None,
     headless: bool = True,
     use_cache: bool = True,
+    readiness: Optional[ReadinessConfig] = None,
 ) -> WebPageSchema:
     """
     Extract schema from a web page and optionally save it.
@@ -362,6 +366,7 @@ def extract_web_schema(
         output_dir: Directory to save schema (if None, doesn't save)
         headless: Run browser in headless mode
         use_cache: Use cached browsers if available
+        readiness: Page readiness bounds (default: ReadinessConfig())
     
     Returns:
         WebPageSchema
@@ -379,7 +384,7 @@ def extract_web_schema(
         except ImportError:
             pass  # Cache not available, continue normally
     
-    extractor = WebSchemaExtractor(headless=headless)
+    extractor = WebSchemaExtractor(headless=headless, readiness=readiness)
     schema = extractor.extract(url)
     
     if output_dir:
@@ -28,6 +28,7 @@ class FormField:
     placeholder: Optional[str] = None
     required: bool = False
     options: list[str] = field(default_factory=list)  # For select/radio
+    visible: bool = True
     
     def get_display_name(self) -> str:
         """Get human-readable field name."""
@@ -39,6 +40,121 @@ class FormField:
         return "Unnamed field"
 
 
+# Field groups in detection order:
+# (kind, count status, per-field status, ((debug key, descriptor key), ...))
+_SNAPSHOT_GROUPS: tuple[tuple[str, Optional[str], Optional[str], tuple[tuple[str, str], ...]], ...] = (
+    ("input", "form_inputs_visible", "form_input_detected",
+     (("type", "type"), ("name", "name"), ("id", "id"), ("placeholder", "placeholder"))),
+    ("textarea", "form_textareas", "form_textarea_detected",
+     (("name", "name"), ("id", "id"), ("placeholder", "placeholder"))),
+    ("contenteditable", "form_contenteditable", "form_contenteditable_detected",
+     (("id", "id"), ("class", "class"))),
+    ("div-input", "form_div_inputs", "form_div_input_detected",
+     (("id", "id"), ("role", "role"), ("data_input", "data_input"), ("data_field", "data_field"))),
+    ("select", None, None, ()),
+)
+
+# Collects every field descriptor in one round trip. Selectors follow the
+# per-element rules (id, then name / class / data attribute); ids are
+# CSS-escaped so unusual ids still yield a valid selector.
+FORM_SNAPSHOT_SCRIPT = r"""
+() => {
+  const attr = (el, name) => el.getAttribute(name);
+  const quote = (v) => String(v).replace(/\\/g, "\\\\").replace(/"/g, '\\"');
+  const byId = (id) => "#" + CSS.escape(id);
+  const visible = (el) => {
+    const style = window.getComputedStyle(el);
+    if (style.visibility === "hidden" || style.display === "none") return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+  };
+  const labelFor = (id) => {
+    if (!id) return null;
+    const label = document.querySelector('label[for="' + quote(id) + '"]');
+    return label ? label.innerText.trim() : null;
+  };
+  const base = (el, kind) => ({
+    kind,
+    id: attr(el, "id"),
+    name: attr(el, "name"),
+    placeholder: attr(el, "placeholder"),
+    required: el.hasAttribute("required"),
+    visible: visible(el),
+  });
+
+  const fields = [];
+  const inputs = document.querySelectorAll('input:not([type="hidden"]):not([type="submit"]):not([type="button"])');
+  for (const el of inputs) {
+    const d = base(el, "input");
+    d.type = attr(el, "type") || "text";
+    d.label = labelFor(d.id);
+    d.selector = d.id ? byId(d.id) : d.name ? 'input[name="' + quote(d.name) + '"]' : null;
+    fields.push(d);
+  }
+  const textareas = document.querySelectorAll("textarea");
+  for (const el of textareas) {
+    const d = base(el, "textarea");
+    d.type = "textarea";
+    d.label = labelFor(d.id);
+    d.selector = d.id ? byId(d.id) : d.name ? 'textarea[name="' + quote(d.name) + '"]' : null;
+    fields.push(d);
+  }
+  const editables = document.querySelectorAll('[contenteditable="true"]');
+  for (const el of editables) {
+    const d = base(el, "contenteditable");
+    d.type = "contenteditable";
+    d.name = null;
+    d.placeholder = null;
+    d.required = false;
+    d.class = attr(el, "class");
+    d.label = labelFor(d.id);
+    d.selector = d.id ? byId(d.id) : d.class ? "." + d.class.split(" ").join(".") : null;
+    fields.push(d);
+  }
+  const divs = document.querySelectorAll('div[role="textbox"], div[data-input], div[data-field]');
+  for (const el of divs) {
+    const d = base(el, "div-input");
+    d.type = "div-input";
+    d.placeholder = null;
+    d.required = false;
+    d.label = null;
+    d.role = attr(el, "role");
+    d.data_input = attr(el, "data-input");
+    d.data_field = attr(el, "data-field");
+    d.selector = d.id ? byId(d.id)
+      : d.data_input ? '[data-input="' + quote(d.data_input) + '"]'
+      : d.data_field ? '[data-field="' + quote(d.data_field) + '"]'
+      : null;
+    fields.push(d);
+  }
+  const selects = document.querySelectorAll("select");
+  for (const el of selects) {
+    const d = base(el, "select");
+    d.type = "select";
+    d.placeholder = null;
+    d.label = labelFor(d.id);
+    d.options = Array.from(el.querySelectorAll("option"))
+      .map((o) => (o.innerText || "").trim())
+      .filter((t) => t);
+    d.selector = d.id ? byId(d.id) : d.name ? 'select[name="' + quote(d.name) + '"]' : null;
+    fields.push(d);
+  }
+
+  return {
+    counts: {
+      inputs_total: document.querySelectorAll("input").length,
+      input: inputs.length,
+      textarea: textareas.length,
+      contenteditable: editables.length,
+      "div-input": divs.length,
+      select: selects.length,
+    },
+    fields,
+  };
+}
+"""
+
+
 @dataclass
 class FormData:
     """Collected form data."""
@@ -75,12 +191,69 @@ class FormHandler:
         """
         Detect all form fields on a page.
         
+        All field descriptors are collected by one ``page.evaluate`` call;
+        if that fails, elements are inspected one by one.
+        
         Args:
             page: Playwright page object
         
         Returns:
             List of FormField objects
         """
+        try:
+            snapshot = page.evaluate(FORM_SNAPSHOT_SCRIPT)
+        except Exception:
+            snapshot = None
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get("fields"), list):
+            return self._detect_form_fields_per_element(page)
+        return self._fields_from_snapshot(snapshot)
+    
+    def _fields_from_snapshot(self, snapshot: dict[str, Any]) -> list[FormField]:
+        """Map a ``FORM_SNAPSHOT_SCRIPT`` payload to FormFields (same order and output as per-element detection)."""
+        counts = snapshot.get("counts") or {}
+        by_kind: dict[str, list[dict[str, Any]]] = {}
+        for desc in snapshot["fields"]:
+            if isinstance(desc, dict):
+                by_kind.setdefault(str(desc.get("kind")), []).append(desc)
+        
+        self._print_yaml({"status": "form_inputs_total", "count": counts.get("inputs_total", 0)})
+        
+        fields = []
+        for kind, count_status, item_status, debug_keys in _SNAPSHOT_GROUPS:
+            descs = by_kind.get(kind, [])
+            if count_status:
+                self._print_yaml({"status": count_status, "count": counts.get(kind, len(descs))})
+            
+            for desc in descs:
+                if item_status:
+                    debug = {"status": item_status}
+                    debug.update({key: desc.get(attr) for key, attr in debug_keys})
+                    self._print_yaml(debug)
+                
+                selector = desc.get("selector")
+                if not selector:
+                    continue
+                
+                name = desc.get("name")
+                if kind == "div-input":
+                    name = desc.get("data_input") or desc.get("data_field")
+                
+                fields.append(FormField(
+                    selector=selector,
+                    field_type=desc.get("type") or "text",
+                    name=name,
+                    id=desc.get("id"),
+                    label=desc.get("label"),
+                    placeholder=desc.get("placeholder"),
+                    required=bool(desc.get("required")),
+                    options=list(desc.get("options") or []),
+                    visible=bool(desc.get("visible", True)),
+                ))
+        
+        return fields
+    
+    def _detect_form_fields_per_element(self, page) -> list[FormField]:
+        """Per-element detection (one browser round trip per attribute)."""
         fields = []
         
         # Debug: Show all input fields found
@@ -2,16 +2,44 @@
 Interaction history tracking and learning.
 
 Opcja C: Uczenie się z interakcji - zapisywane w historii poprzednich akcji.
+
+Storage: ``browser_history.json`` is a snapshot with all records and the
+compacted ``SelectorStatsIndex``. ``record()`` only appends the new
+interaction as one line to ``browser_history.events.jsonl``. Once
+``compact_every`` events have accumulated there, they are folded into the
+snapshot and the log is truncated. Each log line carries its sequence number,
+so events already in the snapshot are skipped if a compaction was interrupted
+before the log was cleared.
+
+Environment:
+    NLP2CMD_HISTORY_COMPACT_EVERY: Logged events before compaction (default 500)
 """
 
 from __future__ import annotations
 
 import json
+import logging
+import os
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from nlp2cmd.web_schema.selector_index import SelectorStats, SelectorStatsIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPACT_EVERY = 500
+
+
+def _env_compact_every() -> int:
+    raw = str(os.environ.get("NLP2CMD_HISTORY_COMPACT_EVERY") or "").strip()
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_COMPACT_EVERY
+    except ValueError:
+        return DEFAULT_COMPACT_EVERY
+
 
 @dataclass
 class InteractionRecord:
@@ -65,41 +93,98 @@ class InteractionHistory:
     - Builds domain-specific knowledge
     """
     
-    def __init__(self, history_file: Optional[Path] = None):
+    def __init__(self, history_file: Optional[Path] = None, compact_every: Optional[int] = None):
         if history_file is None:
             history_file = Path.home() / ".nlp2cmd" / "browser_history.json"
         
         self.history_file = Path(history_file)
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        self.events_file = self.history_file.with_name(f"{self.history_file.stem}.events.jsonl")
+        self.compact_every = compact_every if compact_every is not None else _env_compact_every()
         
         self.records: list[InteractionRecord] = []
+        self.index = SelectorStatsIndex()
+        self._pending_events = 0
+        self._lock = threading.Lock()
         self._load()
     
     def _load(self):
-        """Load history from file."""
+        """Load the snapshot, then replay events logged since it was written."""
+        saved_index = None
         if self.history_file.exists():
             try:
                 with open(self.history_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.records = [InteractionRecord.from_dict(r) for r in data.get("records", [])]
+                    saved_index = data.get("selector_index")
             except Exception:
                 self.records = []
+                saved_index = None
+        
+        index = SelectorStatsIndex.from_dict(saved_index) if saved_index else None
+        if index is None or len(index) != len(self.records):
+            index = SelectorStatsIndex.build(self.records)
+        self.index = index
+        
+        self._pending_events = 0
+        if not self.events_file.exists():
+            return
+        try:
+            with open(self.events_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        data = json.loads(line)
+                        if int(data.get("seq", -1)) < len(self.records):
+                            continue
+                        record = InteractionRecord.from_dict(data)
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        # Torn write at the end of the log.
+                        continue
+                    self.records.append(record)
+                    self.index.add_record(record)
+                    self._pending_events += 1
+        except OSError as e:
+            logger.debug(f"Could not read interaction log {self.events_file}: {e}")
     
     def _save(self):
-        """Save history to file."""
+        """Write the snapshot (records and index) and clear the event log."""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
+            tmp_file = self.history_file.with_name(f"{self.history_file.name}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(
                     {
                         "records": [r.to_dict() for r in self.records],
+                        "selector_index": self.index.to_dict(),
                         "last_updated": datetime.now().isoformat(),
                     },
                     f,
                     indent=2,
                     ensure_ascii=False,
                 )
+            os.replace(tmp_file, self.history_file)
+            if self.events_file.exists():
+                self.events_file.unlink()
+            self._pending_events = 0
+        except Exception as e:
+            print(f"Warning: Could not save interaction history: {e}")
+    
+    def _append_event(self, record: InteractionRecord):
+        """Append one record to the event log, compacting when it grows long."""
+        try:
+            line = json.dumps({**record.to_dict(), "seq": len(self.records) - 1}, ensure_ascii=False)
+            with open(self.events_file, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+            self._pending_events += 1
         except Exception as e:
             print(f"Warning: Could not save interaction history: {e}")
+            return
+        if self._pending_events >= self.compact_every:
+            self._save()
+    
+    def compact(self):
+        """Fold logged events into the snapshot now."""
+        with self._lock:
+            self._save()
     
     def record(
         self,
@@ -125,14 +210,17 @@ class InteractionHistory:
             metadata=metadata or {},
         )
         
-        self.records.append(record)
-        self._save()
+        with self._lock:
+            self.records.append(record)
+            self.index.add_record(record)
+            self._append_event(record)
     
     def get_successful_selectors(
         self,
         domain: str,
         action_type: str,
         limit: int = 10,
+        field: Optional[str] = None,
     ) -> list[str]:
         """
         Get selectors that worked for a domain and action type.
@@ -141,60 +229,41 @@ class InteractionHistory:
             domain: Domain to filter by
             action_type: Action type (type, click, etc.)
             limit: Maximum number of selectors to return
+            field: Only count interactions recorded for this field
         
         Returns:
             List of successful selectors, ordered by frequency
         """
-        # Filter successful records for this domain and action
-        relevant = [
-            r for r in self.records
-            if r.domain == domain
-            and r.action_type == action_type
-            and r.success
-            and r.selector
-        ]
-        
-        # Count selector frequency
-        selector_counts: dict[str, int] = {}
-        for record in relevant:
-            if record.selector:
-                selector_counts[record.selector] = selector_counts.get(record.selector, 0) + 1
-        
-        # Sort by frequency
-        sorted_selectors = sorted(
-            selector_counts.items(),
-            key=lambda x: x[1],
-            reverse=True,
-        )
-        
-        return [sel for sel, _ in sorted_selectors[:limit]]
+        return list(self.index.best_selectors(domain, action_type, field=field, limit=limit))
+    
+    def get_selector_stats(
+        self,
+        domain: str,
+        action_type: str,
+        field: Optional[str] = None,
+    ) -> dict[str, SelectorStats]:
+        """Success/failure counts and last-seen times per selector."""
+        return self.index.selector_stats(domain, action_type, field=field)
     
     def get_domain_stats(self, domain: str) -> dict[str, Any]:
         """Get statistics for a domain."""
-        domain_records = [r for r in self.records if r.domain == domain]
+        stats = self.index.domain_stats(domain)
         
-        if not domain_records:
+        if stats is None or not stats.total:
             return {
                 "total_interactions": 0,
                 "success_rate": 0.0,
                 "action_types": {},
             }
         
-        successful = sum(1 for r in domain_records if r.success)
-        
-        # Count action types
-        action_counts: dict[str, int] = {}
-        for record in domain_records:
-            action_counts[record.action_type] = action_counts.get(record.action_type, 0) + 1
-        
         return {
-            "total_interactions": len(domain_records),
-            "success_rate": successful / len(domain_records),
-            "successful_interactions": successful,
-            "failed_interactions": len(domain_records) - successful,
-            "action_types": action_counts,
-            "first_interaction": domain_records[0].timestamp,
-            "last_interaction": domain_records[-1].timestamp,
+            "total_interactions": stats.total,
+            "success_rate": stats.successful / stats.total,
+            "successful_interactions": stats.successful,
+            "failed_interactions": stats.total - stats.successful,
+            "action_types": dict(stats.action_types),
+            "first_interaction": stats.first_interaction,
+            "last_interaction": stats.last_interaction,
         }
     
     def suggest_selector(
@@ -214,7 +283,10 @@ class InteractionHistory:
         Returns:
             Suggested selector or None
         """
-        selectors = self.get_successful_selectors(domain, action_type, limit=1)
+        field_name = (context or {}).get("field")
+        selectors = self.get_successful_selectors(domain, action_type, limit=1, field=field_name)
+        if not selectors and field_name:
+            selectors = self.get_successful_selectors(domain, action_type, limit=1)
         return selectors[0] if selectors else None
     
     def learn_from_success(
@@ -222,6 +294,7 @@ class InteractionHistory:
         domain: str,
         action_type: str,
         selector: str,
+        field: Optional[str] = None,
     ):
         """
         Learn from a successful interaction.
@@ -234,6 +307,7 @@ class InteractionHistory:
             action_type=action_type,
             selector=selector,
             success=True,
+            metadata={"field": field} if field else None,
         )
     
     def learn_from_failure(
@@ -242,6 +316,7 @@ class InteractionHistory:
         action_type: str,
         selector: str,
         error: str,
+        field: Optional[str] = None,
     ):
         """
         Learn from a failed interaction.
@@ -255,6 +330,7 @@ class InteractionHistory:
             selector=selector,
             success=False,
             error=error,
+            metadata={"field": field} if field else None,
         )
     
     def get_recent_interactions(self, limit: int = 20) -> list[InteractionRecord]:
@@ -263,13 +339,17 @@ class InteractionHistory:
     
     def clear_domain(self, domain: str):
         """Clear history for a specific domain."""
-        self.records = [r for r in self.records if r.domain != domain]
-        self._save()
+        with self._lock:
+            self.records = [r for r in self.records if r.domain != domain]
+            self.index = SelectorStatsIndex.build(self.records)
+            self._save()
     
     def clear_all(self):
         """Clear all history."""
-        self.records = []
-        self._save()
+        with self._lock:
+            self.records = []
+            self.index = SelectorStatsIndex()
+            self._save()
     
     def export_domain_schema(self, domain: str, output_dir: Path) -> Optional[Path]:
         """
@@ -0,0 +1,139 @@
+"""
+Page readiness detection for schema extraction.
+
+Instead of sleeping a fixed time after navigation, ``wait_for_ready`` waits
+until the page has settled, bounded by ``max_wait_ms``:
+
+1. DOM quiet period: a ``MutationObserver`` injected with ``page.evaluate``
+   resolves once no mutation happened for ``quiet_ms``.
+2. Network idle: Playwright's ``networkidle`` load state (no connections for
+   500 ms).
+3. If waiting for the network took a while, responses may have changed the
+   DOM, so the quiet check runs once more.
+
+Static pages are ready after roughly one quiet period; pages that keep
+mutating or fetching are given up to the upper bound.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReadinessConfig:
+    """Bounds for ``wait_for_ready``."""
+
+    quiet_ms: int = 300
+    max_wait_ms: int = 5000
+    network_idle: bool = True
+    poll_ms: int = 50
+
+
+@dataclass
+class ReadinessReport:
+    """What waiting for a page cost and why it stopped."""
+
+    waited_ms: float = 0.0
+    dom_quiet: bool = False
+    network_idle: bool = False
+    mutations: int = 0
+    timed_out: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["waited_ms"] = round(self.waited_ms, 1)
+        return data
+
+
+DOM_QUIET_SCRIPT = r"""
+async ({ quietMs, maxMs, pollMs }) => {
+  const start = performance.now();
+  let last = start;
+  let mutations = 0;
+  const observer = new MutationObserver((records) => {
+    mutations += records.length;
+    last = performance.now();
+  });
+  observer.observe(document.documentElement || document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  });
+  try {
+    return await new Promise((resolve) => {
+      const tick = () => {
+        const now = performance.now();
+        if (now - last >= quietMs) return resolve({ quiet: true, mutations });
+        if (now - start >= maxMs) return resolve({ quiet: false, mutations });
+        setTimeout(tick, Math.max(1, Math.min(pollMs, quietMs - (now - last), maxMs - (now - start))));
+      };
+      tick();
+    });
+  } finally {
+    observer.disconnect();
+  }
+}
+"""
+
+
+def _dom_quiet(page: Any, config: ReadinessConfig, budget_ms: float) -> tuple[bool, int]:
+    result = page.evaluate(
+        DOM_QUIET_SCRIPT,
+        {"quietMs": config.quiet_ms, "maxMs": max(0.0, budget_ms), "pollMs": config.poll_ms},
+    )
+    if not isinstance(result, dict):
+        return False, 0
+    return bool(result.get("quiet")), int(result.get("mutations") or 0)
+
+
+def wait_for_ready(page: Any, config: Optional[ReadinessConfig] = None) -> ReadinessReport:
+    """
+    Wait until ``page`` (already navigated) has settled.
+
+    Args:
+        page: Playwright page
+        config: Quiet period and upper bound (default: ReadinessConfig())
+
+    Returns:
+        ReadinessReport with the time actually spent waiting
+    """
+    config = config or ReadinessConfig()
+    report = ReadinessReport()
+    started = time.perf_counter()
+
+    def remaining_ms() -> float:
+        return config.max_wait_ms - (time.perf_counter() - started) * 1000
+
+    try:
+        report.dom_quiet, report.mutations = _dom_quiet(page, config, remaining_ms())
+
+        if config.network_idle and remaining_ms() > 0:
+            before = time.perf_counter()
+            try:
+                page.wait_for_load_state("networkidle", timeout=max(1.0, remaining_ms()))
+                report.network_idle = True
+            except Exception:
+                report.network_idle = False
+            network_ms = (time.perf_counter() - before) * 1000
+            if network_ms > config.quiet_ms and remaining_ms() > 0:
+                quiet, mutations = _dom_quiet(page, config, remaining_ms())
+                report.dom_quiet = quiet
+                report.mutations += mutations
+    except Exception as e:
+        logger.debug(f"Readiness check failed: {e}")
+
+    report.waited_ms = (time.perf_counter() - started) * 1000
+    report.timed_out = not report.dom_quiet or (config.network_idle and not report.network_idle)
+    return report
+
+
+__all__ = [
+    "DOM_QUIET_SCRIPT",
+    "ReadinessConfig",
+    "ReadinessReport",
+    "wait_for_ready",
+]
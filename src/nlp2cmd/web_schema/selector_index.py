@@ -0,0 +1,245 @@
+"""
+Aggregated selector statistics for the browser interaction history.
+
+``SelectorStatsIndex`` is updated once per recorded interaction, so lookups
+do not have to scan the raw history. For each ``(domain, action_type, field)``
+it keeps one ``SelectorStats`` entry per selector, with success and failure
+counts and last-seen timestamps. It also keeps a ranking: selectors with at
+least one success, ordered by success count and then by when they first
+succeeded. A new success moves its selector up past lower-ranked neighbours,
+so keeping the ranking current is cheap. Reading the top ``limit`` selectors
+is a slice and does not depend on the history size.
+
+Interactions that name a field are counted twice: under their field and
+under ``field=None``, which aggregates all fields of that domain and action.
+Per-domain totals (as returned by ``InteractionHistory.get_domain_stats``)
+are kept alongside.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Optional
+
+INDEX_VERSION = 1
+
+GroupKey = tuple[str, str, Optional[str]]
+
+
+@dataclass
+class SelectorStats:
+    """Outcome counts for one selector within a (domain, action, field) group."""
+
+    selector: str
+    successes: int = 0
+    failures: int = 0
+    first_seen: Optional[str] = None
+    last_seen: Optional[str] = None
+    last_success: Optional[str] = None
+    # Event number of the first success; breaks ties between equal counts.
+    first_success: Optional[int] = None
+
+    @property
+    def attempts(self) -> int:
+        return self.successes + self.failures
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 0.0
+
+    def rank_key(self) -> tuple[int, int]:
+        return (-self.successes, self.first_success if self.first_success is not None else 0)
+
+
+@dataclass
+class DomainStats:
+    """Running totals for one domain."""
+
+    total: int = 0
+    successful: int = 0
+    action_types: dict[str, int] = field(default_factory=dict)
+    first_interaction: Optional[str] = None
+    last_interaction: Optional[str] = None
+
+
+class _SelectorGroup:
+    """Selectors of one group plus their ranking by successes."""
+
+    __slots__ = ("stats", "ranked", "positions")
+
+    def __init__(self) -> None:
+        self.stats: dict[str, SelectorStats] = {}
+        self.ranked: list[str] = []
+        self.positions: dict[str, int] = {}
+
+    def update(self, selector: str, success: bool, timestamp: str, event: int) -> None:
+        entry = self.stats.get(selector)
+        if entry is None:
+            entry = self.stats[selector] = SelectorStats(selector=selector, first_seen=timestamp)
+        entry.last_seen = timestamp
+        if not success:
+            entry.failures += 1
+            return
+
+        entry.successes += 1
+        entry.last_success = timestamp
+        if entry.first_success is None:
+            # A first success has the latest tie-break and the lowest
+            # possible count, so it belongs at the end.
+            entry.first_success = event
+            self.positions[selector] = len(self.ranked)
+            self.ranked.append(selector)
+            return
+        self._promote(selector)
+
+    def _promote(self, selector: str) -> None:
+        ranked, positions, stats = self.ranked, self.positions, self.stats
+        i = positions[selector]
+        key = stats[selector].rank_key()
+        while i > 0 and stats[ranked[i - 1]].rank_key() > key:
+            ranked[i] = ranked[i - 1]
+            positions[ranked[i]] = i
+            i -= 1
+        ranked[i] = selector
+        positions[selector] = i
+
+    def rebuild_ranking(self) -> None:
+        winners = [s for s in self.stats.values() if s.successes > 0]
+        winners.sort(key=SelectorStats.rank_key)
+        self.ranked = [s.selector for s in winners]
+        self.positions = {sel: i for i, sel in enumerate(self.ranked)}
+
+
+class SelectorStatsIndex:
+    """Incrementally maintained selector and domain statistics."""
+
+    def __init__(self) -> None:
+        self._groups: dict[GroupKey, _SelectorGroup] = {}
+        self._domains: dict[str, DomainStats] = {}
+        self._events = 0
+
+    def __len__(self) -> int:
+        return self._events
+
+    def add(
+        self,
+        domain: str,
+        action_type: str,
+        selector: Optional[str],
+        success: bool,
+        timestamp: str,
+        field: Optional[str] = None,
+    ) -> None:
+        """Account for one interaction."""
+        self._events += 1
+
+        stats = self._domains.get(domain)
+        if stats is None:
+            stats = self._domains[domain] = DomainStats(first_interaction=timestamp)
+        stats.total += 1
+        stats.successful += 1 if success else 0
+        stats.action_types[action_type] = stats.action_types.get(action_type, 0) + 1
+        stats.last_interaction = timestamp
+
+        if not selector:
+            return
+        keys: list[GroupKey] = [(domain, action_type, None)]
+        if field:
+            keys.append((domain, action_type, field))
+        for key in keys:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _SelectorGroup()
+            group.update(selector, success, timestamp, self._events)
+
+    def best_selectors(
+        self,
+        domain: str,
+        action_type: str,
+        field: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[str]:
+        """Selectors that succeeded, most successful first."""
+        group = self._groups.get((domain, action_type, field))
+        if group is None or limit <= 0:
+            return []
+        return group.ranked[:limit]
+
+    def selector_stats(
+        self,
+        domain: str,
+        action_type: str,
+        field: Optional[str] = None,
+    ) -> dict[str, SelectorStats]:
+        """All selectors seen for a group, including ones that only failed."""
+        group = self._groups.get((domain, action_type, field))
+        return dict(group.stats) if group is not None else {}
+
+    def domain_stats(self, domain: str) -> Optional[DomainStats]:
+        return self._domains.get(domain)
+
+    def domains(self) -> list[str]:
+        return list(self._domains)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "events": self._events,
+            "domains": {name: asdict(stats) for name, stats in self._domains.items()},
+            "groups": [
+                {
+                    "domain": domain,
+                    "action_type": action_type,
+                    "field": field,
+                    "selectors": [asdict(s) for s in group.stats.values()],
+                }
+                for (domain, action_type, field), group in self._groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Optional["SelectorStatsIndex"]:
+        """Restore a saved index; None when the data is from another version or malformed."""
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        try:
+            index._events = int(data["events"])
+            for name, raw in data["domains"].items():
+                index._domains[name] = DomainStats(**raw)
+            for raw in data["groups"]:
+                group = _SelectorGroup()
+                for entry in raw["selectors"]:
+                    stats = SelectorStats(**entry)
+                    group.stats[stats.selector] = stats
+                group.rebuild_ranking()
+                index._groups[(raw["domain"], raw["action_type"], raw.get("field"))] = group
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        return index
+
+    @classmethod
+    def build(cls, records: Iterable[Any]) -> "SelectorStatsIndex":
+        """Index ``InteractionRecord``-like objects in order."""
+        index = cls()
+        for record in records:
+            index.add_record(record)
+        return index
+
+    def add_record(self, record: Any) -> None:
+        metadata = getattr(record, "metadata", None) or {}
+        self.add(
+            domain=record.domain,
+            action_type=record.action_type,
+            selector=record.selector,
+            success=record.success,
+            timestamp=record.timestamp,
+            field=metadata.get("field"),
+        )
+
+
+__all__ = [
+    "DomainStats",
+    "SelectorStats",
+    "SelectorStatsIndex",
+]
@@ -26,7 +26,13 @@ from nlp2cmd.adapters import (
 )
 from nlp2cmd.schemas import SchemaRegistry
 from nlp2cmd.feedback import FeedbackAnalyzer
-from nlp2cmd.environment import EnvironmentAnalyzer
+from nlp2cmd.environment import EnvironmentAnalyzer, ToolInventoryCache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tool_cache(tmp_path, monkeypatch):
+    """Keep EnvironmentAnalyzer's tool-version cache out of the real home directory."""
+    monkeypatch.setenv("NLP2CMD_TOOL_CACHE", str(tmp_path / "tool_cache.json"))
 
 
 @pytest.fixture
@@ -119,7 +125,7 @@ def feedback_analyzer():
 @pytest.fixture
 def environment_analyzer():
     """Provide an EnvironmentAnalyzer instance."""
-    return EnvironmentAnalyzer()
+    return EnvironmentAnalyzer(tool_cache=ToolInventoryCache())
 
 
 def pytest_configure(config):
@@ -0,0 +1,116 @@
+"""Shared browser pool against local file:// fixtures (requires Playwright with Chromium)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from nlp2cmd.execution.browser_pool import BrowserPool
+from nlp2cmd.web_schema.extractor import WebSchemaExtractor
+
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "web"
+
+
+def _url(name: str) -> str:
+    return (FIXTURES / name).as_uri()
+
+
+@pytest.fixture
+def pool():
+    pool = BrowserPool(headless=True, max_browsers=2, idle_timeout=30)
+    try:
+        pool.run(lambda page: None)
+    except Exception as e:  # pragma: no cover - browsers not installed
+        pool.close()
+        pytest.skip(f"Chromium not available: {e}")
+    yield pool
+    pool.close()
+
+
+def test_pages_and_contexts_are_reused(pool):
+    url = _url("contact_form.html")
+
+    def visit(page):
+        page.goto(url)
+        return id(page), int(page.evaluate("localStorage.getItem('visits')"))
+
+    first_page, first_visits = pool.run(visit, url=url)
+    second_page, second_visits = pool.run(visit, url=url)
+
+    assert second_page == first_page
+    # Same context, so storage survives between calls.
+    assert second_visits == first_visits + 1
+    assert pool.stats()["launches"] == 1
+
+
+def test_failed_job_discards_page(pool):
+    url = _url("article.html")
+    pool.run(lambda page: page.evaluate("window.__used = true"), url=url)
+
+    def boom(page):
+        assert page.evaluate("window.__used === true")
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        pool.run(boom, url=url)
+    assert pool.run(lambda page: page.evaluate("window.__used === true"), url=url) is False
+
+
+def test_lease_pins_page_across_calls(pool):
+    url = _url("search.html")
+    with pool.lease(url) as lease:
+        lease.run(lambda page: page.goto(url))
+        lease.run(lambda page: page.fill("#q", "nlp2cmd"))
+        lease.run(lambda page: page.click("#go"))
+        assert lease.run(lambda page: page.text_content("#out")) == "nlp2cmd"
+
+
+def test_concurrency_is_limited_to_pool_size(pool):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def job(page):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        page.wait_for_timeout(200)
+        with lock:
+            running.pop()
+
+    threads = [
+        threading.Thread(target=pool.run, args=(job,), kwargs={"context_options": {"locale": f"x-{i}"}})
+        for i in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) <= 2
+
+
+def test_idle_reaper_closes_browser():
+    pool = BrowserPool(headless=True, max_browsers=1, idle_timeout=0.5)
+    try:
+        pool.run(lambda page: None)
+        assert pool.stats()["browsers"] == 1
+        deadline = time.monotonic() + 10
+        while pool.stats()["browsers"] and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert pool.stats()["browsers"] == 0
+        # Relaunched on demand.
+        assert pool.run(lambda page: 42) == 42
+    finally:
+        pool.close()
+
+
+def test_extractor_uses_pool_with_file_url():
+    schema = WebSchemaExtractor(headless=True).extract(_url("contact_form.html"))
+    assert schema.title == "Contact form fixture"
+    assert {i.name for i in schema.inputs} >= {"name", "email", "message"}
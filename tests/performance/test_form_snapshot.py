@@ -0,0 +1,61 @@
+"""Form snapshot parity against a real browser (requires Playwright with Chromium)."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from rich.console import Console
+
+from nlp2cmd.execution.browser_pool import BrowserPool
+from nlp2cmd.web_schema.form_handler import FormHandler
+
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "web"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = BrowserPool(headless=True, max_browsers=1)
+    try:
+        pool.run(lambda page: None)
+    except Exception as e:  # pragma: no cover - browsers not installed
+        pool.close()
+        pytest.skip(f"Chromium not available: {e}")
+    yield pool
+    pool.close()
+
+
+@pytest.mark.parametrize("fixture", ["large_form.html", "contact_form.html", "search.html"])
+def test_snapshot_matches_per_element_detection(pool, fixture):
+    url = (FIXTURES / fixture).as_uri()
+    snapshot_out, legacy_out = io.StringIO(), io.StringIO()
+
+    def detect(page):
+        page.goto(url)
+        return (
+            FormHandler(console=Console(file=snapshot_out, width=200)).detect_form_fields(page),
+            FormHandler(console=Console(file=legacy_out, width=200))._detect_form_fields_per_element(page),
+        )
+
+    snapshot, legacy = pool.run(detect, url=url)
+
+    strip = lambda fields: [{**f.__dict__, "visible": True} for f in fields]  # noqa: E731
+    assert strip(snapshot) == strip(legacy)
+    assert snapshot_out.getvalue() == legacy_out.getvalue()
+
+
+def test_snapshot_reports_visibility(pool):
+    url = (FIXTURES / "large_form.html").as_uri()
+
+    def detect(page):
+        page.goto(url)
+        return FormHandler(console=Console(file=io.StringIO())).detect_form_fields(page)
+
+    fields = pool.run(detect, url=url)
+    hidden = {f.id for f in fields if not f.visible}
+    assert "f4" in hidden and "f0" not in hidden
@@ -0,0 +1,76 @@
+"""Import-time budget for the single-query CLI path."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Generous enough for slow CI machines; the path currently takes ~300ms and
+# ~360 modules locally (it was ~480ms / ~450 modules with eager imports).
+IMPORT_BUDGET_MS = 1500
+MODULE_BUDGET = 420
+
+# Subsystems the single-query path must not load.
+FORBIDDEN_MODULES = (
+    "nlp2cmd.core",
+    "nlp2cmd.adapters",
+    "nlp2cmd.schemas",
+    "nlp2cmd.feedback",
+    "nlp2cmd.environment",
+    "nlp2cmd.router",
+    "nlp2cmd.registry",
+    "nlp2cmd.executor",
+    "nlp2cmd.planner",
+    "nlp2cmd.aggregator",
+    "nlp2cmd.service",
+)
+
+
+def _importtime(*args: str) -> dict[str, int]:
+    """Run python -X importtime and return {module: self time in us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env={**os.environ, "NLP2CMD_MEASURE_RESOURCES": "0"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def test_package_import_is_lazy() -> None:
+    modules = _importtime("-c", "import nlp2cmd")
+    loaded = [m for m in modules if m.startswith("nlp2cmd.")]
+    assert loaded == [], f"import nlp2cmd loaded submodules eagerly: {loaded}"
+
+
+def test_lazy_exports_resolve() -> None:
+    import nlp2cmd
+
+    assert nlp2cmd.ShellAdapter.__name__ == "ShellAdapter"
+    assert "NLP2CMD" in dir(nlp2cmd)
+    with pytest.raises(AttributeError):
+        nlp2cmd.DoesNotExist  # noqa: B018
+
+
+@pytest.mark.slow
+def test_single_query_cli_import_budget() -> None:
+    modules = _importtime("-m", "nlp2cmd", "--stdout", "-q", "list files")
+
+    heavy = sorted(m for m in modules if m.startswith(FORBIDDEN_MODULES))
+    assert heavy == [], f"single-query path imported heavy subsystems: {heavy}"
+
+    total_ms = sum(modules.values()) / 1000
+    assert len(modules) <= MODULE_BUDGET, f"{len(modules)} modules imported (budget {MODULE_BUDGET})"
+    assert total_ms <= IMPORT_BUDGET_MS, f"imports took {total_ms:.0f}ms (budget {IMPORT_BUDGET_MS}ms)"
@@ -0,0 +1,55 @@
+"""Readiness waits against local file:// fixtures (requires Playwright with Chromium)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from nlp2cmd.execution.browser_pool import get_browser_pool
+from nlp2cmd.web_schema.extractor import WebSchemaExtractor
+from nlp2cmd.web_schema.readiness import ReadinessConfig
+
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "web"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def browser_available():
+    try:
+        get_browser_pool(headless=True).run(lambda page: None)
+    except Exception as e:  # pragma: no cover - browsers not installed
+        pytest.skip(f"Chromium not available: {e}")
+
+
+def _extract(name: str, **config):
+    extractor = WebSchemaExtractor(headless=True, readiness=ReadinessConfig(**config))
+    return extractor.extract((FIXTURES / name).as_uri())
+
+
+def test_static_page_does_not_wait_two_seconds():
+    schema = _extract("article.html")
+    readiness = schema.metadata["readiness"]
+    assert readiness["dom_quiet"] and not readiness["timed_out"]
+    assert readiness["waited_ms"] < 1500
+
+
+def test_delayed_dom_is_waited_for():
+    schema = _extract("delayed_form.html", quiet_ms=300, max_wait_ms=5000)
+    readiness = schema.metadata["readiness"]
+
+    assert {i.name for i in schema.inputs} == {f"late_{i}" for i in range(9)}
+    assert [b.text for b in schema.buttons] == ["Send"]
+    assert readiness["mutations"] >= 9
+    assert 900 <= readiness["waited_ms"] < 5000
+
+
+def test_wait_is_bounded_for_pages_that_never_settle():
+    schema = _extract("endless_mutations.html", quiet_ms=300, max_wait_ms=1000)
+    readiness = schema.metadata["readiness"]
+
+    assert readiness["timed_out"] and not readiness["dom_quiet"]
+    assert readiness["waited_ms"] < 2000
+    assert [i.name for i in schema.inputs] == ["q"]
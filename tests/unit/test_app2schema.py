@@ -153,3 +153,79 @@ getopts "v" opt
     nlp = NLP2CMD(adapter=AppSpecAdapter(appspec_path=written))
     ir = nlp.transform_ir("demo v=true")
     assert ir.to_dict()["format"] == "nlp2cmd.action_ir"
+
+
+def _make_python_package(root: Path, count: int) -> Path:
+    pkg = root / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    for i in range(count):
+        (pkg / f"mod_{i:03d}.py").write_text(
+            f'''import click
+
+
+@click.command()
+@click.option("--name", default="x")
+def cmd_{i}(name):
+    """Command {i}."""
+    print(name)
+''',
+            encoding="utf-8",
+        )
+    return pkg
+
+
+def test_app2schema_python_package_has_no_file_cap(tmp_path: Path):
+    pkg = _make_python_package(tmp_path, 120)
+
+    result = extract_schema(pkg, source_type="python_package")
+
+    assert result.metadata["python_files"] == 121
+    assert result.metadata["truncated"] is False
+    assert len(result.schemas) == 121
+    assert any(c.name == "cmd_119" for s in result.schemas for c in s.commands)
+
+
+def test_app2schema_python_package_parallel_matches_serial(tmp_path: Path):
+    pkg = _make_python_package(tmp_path, 12)
+
+    serial = extract_schema(pkg, source_type="python_package")
+    parallel = extract_schema(pkg, source_type="python_package", workers=2)
+
+    assert parallel.to_export_dict() == serial.to_export_dict()
+
+
+def test_app2schema_python_package_cache_skips_unchanged(tmp_path: Path, monkeypatch):
+    import app2schema.package as package
+
+    pkg = _make_python_package(tmp_path, 5)
+    cache_path = tmp_path / "cache.json"
+    first = extract_schema(pkg, source_type="python_package", cache_path=cache_path)
+    assert first.metadata["extracted"] == 6
+    assert cache_path.exists()
+
+    calls: list[str] = []
+    original = package._extract_python_file
+
+    def counting(path_str: str):
+        calls.append(path_str)
+        return original(path_str)
+
+    monkeypatch.setattr(package, "_extract_python_file", counting)
+
+    (pkg / "mod_002.py").write_text("def changed():\n    pass\n", encoding="utf-8")
+    (pkg / "mod_004.py").unlink()
+    second = extract_schema(pkg, source_type="python_package", cache_path=cache_path, incremental=True)
+
+    assert [Path(p).name for p in calls] == ["mod_002.py"]
+    assert second.metadata["cached"] == 4
+    assert second.metadata["removed"] == 1
+    assert second.to_export_dict()["sources"][str(pkg / "mod_000.py")] == first.to_export_dict()[
+        "sources"
+    ][str(pkg / "mod_000.py")]
+
+
+def test_app2schema_incremental_requires_cache_path(tmp_path: Path):
+    pkg = _make_python_package(tmp_path, 1)
+    with pytest.raises(ValueError):
+        extract_schema(pkg, source_type="python_package", incremental=True)
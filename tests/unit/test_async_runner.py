@@ -0,0 +1,149 @@
+"""Tests for concurrent command batches."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from nlp2cmd.execution import AsyncExecutionRunner, CommandSpec, ExecutionResult
+from nlp2cmd.execution.async_runner import specs_from_steps
+from nlp2cmd.generation.pipeline import PipelineResult
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+
+
+@pytest.fixture
+def runner():
+    return AsyncExecutionRunner(max_concurrency=4, record_history=False)
+
+
+def test_batch_runs_concurrently_and_keeps_order(runner):
+    started = time.monotonic()
+    batch = runner.run_batch([f"sleep 0.3; echo {i}" for i in range(4)] + ["echo oops >&2; exit 3"])
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert [r.stdout for r in batch.results[:4]] == ["0\n", "1\n", "2\n", "3\n"]
+    assert all(isinstance(r, ExecutionResult) for r in batch)
+    assert not batch.success
+    assert batch.failed[0].exit_code == 3
+    assert batch.failed[0].stderr == "oops\n"
+
+
+def test_concurrency_limit():
+    runner = AsyncExecutionRunner(max_concurrency=2, record_history=False)
+    started = time.monotonic()
+    runner.run_batch(["sleep 0.2"] * 4)
+    assert time.monotonic() - started >= 0.4
+
+
+def test_per_command_timeout_kills_children(runner):
+    batch = runner.run_batch([
+        CommandSpec("sleep 30 | cat", timeout=0.2),
+        CommandSpec("echo fine"),
+    ])
+
+    timed_out, fine = batch.results
+    assert timed_out.error_context == "Timeout"
+    assert timed_out.exit_code == -1
+    assert timed_out.duration_ms < 5000
+    assert fine.success
+
+
+def test_dependencies_and_fail_fast(runner, tmp_path):
+    marker = tmp_path / "marker"
+    batch = runner.run_batch([
+        CommandSpec(f"sleep 0.2; touch {marker}"),
+        CommandSpec(f"test -e {marker}", depends_on_previous=True),
+        CommandSpec("false"),
+        CommandSpec("echo never", depends_on_previous=True),
+    ])
+    assert [r.success for r in batch] == [True, True, False, False]
+    assert batch.results[3].error_context == "Skipped"
+
+    batch = runner.run_batch([CommandSpec("exit 1"), CommandSpec("sleep 30")], fail_fast=True)
+    assert batch.results[1].error_context == "Cancelled"
+    assert batch.duration_ms < 5000
+
+
+def test_cancellation_kills_running_command(runner):
+    async def scenario():
+        task = asyncio.create_task(runner.run("sleep 30"))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - started < 5
+
+
+def test_specs_from_steps_uses_planner_dependencies():
+    steps = [
+        PipelineResult(domain="docker", command="docker ps"),
+        PipelineResult(domain="sql", command="SELECT 1"),
+        PipelineResult(domain="shell", command="df -h", metadata={"depends_on_previous": False}),
+        PipelineResult(domain="shell", command="ps aux", metadata={"depends_on_previous": True}),
+        PipelineResult(domain="shell", command="# unknown"),
+    ]
+    specs = specs_from_steps(steps, timeout=5)
+    assert [(s.command, s.depends_on_previous, s.label) for s in specs] == [
+        ("docker ps", False, "step 1"),
+        ("df -h", False, "step 3"),
+        ("ps aux", True, "step 4"),
+    ]
+    assert all(s.timeout == 5 for s in specs)
+
+
+class RecordingHistory:
+    def __init__(self):
+        self.commands = []
+        self.threads = set()
+
+    def record(self, **kwargs):
+        import threading
+
+        self.commands.append(kwargs["command"])
+        self.threads.add(threading.get_ident())
+
+
+def test_history_recorded_off_the_loop_once_per_batch():
+    import threading
+
+    runner = AsyncExecutionRunner(max_concurrency=4, record_history=False)
+    history = runner._cmd_history = RecordingHistory()
+
+    batch = runner.run_batch([
+        "echo a",
+        "exit 1",
+        CommandSpec("echo skipped", depends_on_previous=True),
+    ])
+
+    assert [r.error_context for r in batch.results][2] == "Skipped"
+    assert sorted(history.commands) == ["echo a", "exit 1"]
+    assert threading.get_ident() not in history.threads
+
+    asyncio.run(runner.run("echo single"))
+    assert history.commands[-1] == "echo single"
+
+
+def test_fail_fast_treats_exceptions_as_failures(runner, monkeypatch):
+    original = runner._execute
+
+    async def execute(command, timeout):
+        if command == "boom":
+            raise RuntimeError("spawn failed")
+        return await original(command, timeout)
+
+    monkeypatch.setattr(runner, "_execute", execute)
+    started = time.monotonic()
+    batch = runner.run_batch(["boom", "sleep 5"], fail_fast=True)
+
+    assert time.monotonic() - started < 3
+    assert batch.results[0].error_context == "spawn failed"
+    assert batch.results[1].error_context == "Cancelled"
@@ -0,0 +1,100 @@
+"""Tests for the benchmark harness and regression gate."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from nlp2cmd.bench import compare_reports, load_corpus, run_benchmark
+from nlp2cmd.bench.harness import CORPUS_FORMAT, percentile
+
+
+def _report(p50=10.0, p95=20.0, qps=100.0, success=0.9, rss=50.0, sha="abc"):
+    return {
+        "format": "nlp2cmd.bench_report",
+        "corpus": {"sha256": sha},
+        "python": "3.11",
+        "platform": "linux",
+        "config": {"workers": 4},
+        "targets": {
+            "pipeline": {
+                "warm": {"p50_ms": p50, "p95_ms": p95, "p99_ms": p95},
+                "throughput": {"qps": qps},
+                "success_rate": success,
+                "peak_rss_mb": rss,
+            }
+        },
+    }
+
+
+def test_bundled_corpus_covers_languages_and_categories():
+    corpus = load_corpus()
+    summary = corpus.summary()
+
+    assert {"pl", "en"} <= set(summary["langs"])
+    assert {"single", "multi_sentence", "log"} <= set(summary["categories"])
+    assert len({q.id for q in corpus.queries}) == len(corpus.queries)
+    assert len(corpus.sha256) == 64
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0.0) == 1.0
+    assert percentile(values, 0.5) == 2.5
+    assert percentile(values, 1.0) == 4.0
+
+
+def test_run_benchmark_small_corpus(tmp_path):
+    corpus_path = tmp_path / "corpus.json"
+    corpus_path.write_text(
+        json.dumps(
+            {
+                "format": CORPUS_FORMAT,
+                "version": 1,
+                "queries": [
+                    {"id": "a", "text": "Pokaż procesy", "lang": "pl"},
+                    {"id": "b", "text": "list all files", "lang": "en"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    report = run_benchmark(
+        targets=["pipeline"], corpus_path=corpus_path, iterations=2, workers=2, cold_start=False
+    )
+
+    entry = report["targets"]["pipeline"]
+    assert report["corpus"]["queries"] == 2
+    assert entry["warm"]["count"] == 4
+    assert entry["warm"]["p50_ms"] <= entry["warm"]["p99_ms"]
+    assert entry["throughput"]["requests"] == 4
+    assert entry["throughput"]["qps"] > 0
+    assert 0.0 <= entry["success_rate"] <= 1.0
+    json.dumps(report)
+
+
+def test_run_benchmark_rejects_unknown_target():
+    with pytest.raises(ValueError):
+        run_benchmark(targets=["nope"], cold_start=False)
+
+
+def test_gate_passes_within_tolerance():
+    result = compare_reports(_report(), _report(p50=11.0, qps=95.0))
+    assert result.passed
+    assert result.warnings == []
+
+
+def test_gate_flags_latency_and_throughput_regressions():
+    result = compare_reports(_report(), _report(p50=20.0, qps=50.0, success=0.8))
+    regressed = {d.metric for d in result.regressions}
+    assert regressed == {"warm.p50_ms", "throughput.qps", "success_rate"}
+
+
+def test_gate_tolerance_overrides_and_corpus_warning():
+    result = compare_reports(
+        _report(), _report(p50=20.0, sha="other"), {"pipeline.warm.p50_ms": 1.5}
+    )
+    assert result.passed
+    assert any("corpora" in w for w in result.warnings)
@@ -0,0 +1,189 @@
+"""Browser pool logic against a fake Playwright (no browser needed)."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from nlp2cmd.execution.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, context: "FakeContext"):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser", options: dict):
+        self.browser = browser
+        self.options = options
+        self.pages: list[FakePage] = []
+        self.closed = False
+
+    def new_page(self) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts: list[FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def new_context(self, **options) -> FakeContext:
+        context = FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+    def close(self) -> None:
+        self.connected = False
+
+
+class FakePlaywright:
+    """Stands in for ``playwright.sync_api``; counts launched browsers."""
+
+    def __init__(self):
+        self.browsers: list[FakeBrowser] = []
+        self.chromium = self
+        self._lock = threading.Lock()
+
+    def launch(self, headless: bool = True) -> FakeBrowser:
+        browser = FakeBrowser()
+        with self._lock:
+            self.browsers.append(browser)
+        return browser
+
+    def sync_playwright(self):
+        return types.SimpleNamespace(start=lambda: types.SimpleNamespace(chromium=self, stop=lambda: None))
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakePlaywright()
+    package = types.ModuleType("playwright")
+    sync_api = types.ModuleType("playwright.sync_api")
+    sync_api.sync_playwright = fake.sync_playwright
+    package.sync_api = sync_api
+    monkeypatch.setitem(sys.modules, "playwright", package)
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", sync_api)
+    return fake
+
+
+@pytest.fixture
+def pool(fake):
+    pool = BrowserPool(max_browsers=2, idle_timeout=30)
+    yield pool
+    pool.close()
+
+
+def _thread(page):
+    return threading.current_thread().name
+
+
+def test_pages_and_contexts_are_reused(pool, fake):
+    first = pool.run(lambda page: page, url="https://a.example/x")
+    second = pool.run(lambda page: page, url="https://a.example/y")
+
+    assert second is first
+    assert len(fake.browsers) == 1 and len(fake.browsers[0].contexts) == 1
+    assert pool.stats()["launches"] == 1
+
+
+def test_jobs_are_routed_to_the_worker_holding_the_context(pool, fake):
+    gate = threading.Event()
+    busy = threading.Thread(
+        target=pool.run, args=(lambda page: gate.wait(5),), kwargs={"url": "https://a.example"}
+    )
+    busy.start()
+    while pool.stats()["pending"] == 0:
+        time.sleep(0.01)
+    # The first worker is busy, so a new domain gets the second one.
+    b_thread = pool.run(_thread, url="https://b.example")
+    gate.set()
+    busy.join()
+
+    assert pool.run(_thread, url="https://a.example") != b_thread
+    assert pool.run(_thread, url="https://b.example") == b_thread
+    assert len(fake.browsers) == 2
+
+
+def test_failed_job_discards_page(pool):
+    used = pool.run(lambda page: page, url="https://a.example")
+
+    def boom(page):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        pool.run(boom, url="https://a.example")
+
+    assert used.is_closed()
+    assert pool.run(lambda page: page, url="https://a.example") is not used
+
+
+def test_lease_pins_page_until_released(pool):
+    with pool.lease("https://a.example") as lease:
+        pinned = lease.run(lambda page: page)
+        assert lease.run(lambda page: page) is pinned
+        # Other jobs on the same domain get another page meanwhile.
+        assert pool.run(lambda page: page, url="https://a.example") is not pinned
+
+    with pytest.raises(RuntimeError):
+        lease.run(lambda page: page)
+    # Released pages go back to the context's idle pages.
+    assert pool.run(lambda page: page, url="https://a.example") is pinned
+
+
+def test_page_is_replaced_after_max_uses(fake):
+    pool = BrowserPool(max_browsers=1, idle_timeout=30, max_page_uses=2)
+    try:
+        pages = [pool.run(lambda page: page, url="https://a.example") for _ in range(3)]
+    finally:
+        pool.close()
+
+    assert pages[0] is pages[1] is not pages[2]
+    assert pages[0].is_closed()
+
+
+def test_idle_contexts_and_browser_are_reaped_then_relaunched(fake):
+    pool = BrowserPool(max_browsers=1, idle_timeout=0.2)
+    try:
+        page = pool.run(lambda page: page, url="https://a.example")
+        deadline = time.monotonic() + 5
+        while pool.stats()["browsers"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert pool.stats()["browsers"] == 0
+        assert page.context.closed and not fake.browsers[0].connected
+        assert pool.run(lambda page: 42, url="https://a.example") == 42
+        assert pool.stats()["launches"] == 2
+    finally:
+        pool.close()
+
+
+def test_disconnected_browser_is_relaunched(pool, fake):
+    old = pool.run(lambda page: page, url="https://a.example")
+    fake.browsers[0].connected = False
+
+    new = pool.run(lambda page: page, url="https://a.example")
+
+    assert new is not old
+    assert len(fake.browsers) == 2
+    assert new.context.browser is fake.browsers[1]
@@ -0,0 +1,187 @@
+"""Tests for the warm daemon and its thin client."""
+
+from __future__ import annotations
+
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from nlp2cmd import __version__
+from nlp2cmd.daemon.client import DaemonClient, DaemonUnavailable, parse_simple_query, run_via_daemon
+from nlp2cmd.daemon.server import DaemonServer
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    tmp = tempfile.mkdtemp(prefix="n2c-")
+    yield Path(tmp) / "d.sock"
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("NLP2CMD_CONFIG_DIR", str(tmp_path / "config"))
+    return tmp_path / "config"
+
+
+@pytest.fixture
+def running_daemon(socket_path, config_dir):
+    server = DaemonServer(socket_path, warmup=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(socket_path, timeout=10.0)
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            client.ping()
+            break
+        except DaemonUnavailable:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    yield server, client
+    server.shutdown()
+    thread.join(timeout=10)
+
+
+def test_parse_simple_query():
+    assert parse_simple_query(["--stdout", "-q", "list files"]) == {
+        "text": "list files", "stdout": True, "explain": False,
+    }
+    assert parse_simple_query(["pokaż", "procesy w tle"]) is None
+    assert parse_simple_query(["pokaż procesy", "--explain"])["explain"] is True
+    assert parse_simple_query(["--dsl", "auto", "--query=list files"])["text"] == "list files"
+    # Everything else goes to the full CLI.
+    assert parse_simple_query(["--dsl", "sql", "-q", "show users"]) is None
+    assert parse_simple_query(["--run", "list files"]) is None
+    assert parse_simple_query(["bench"]) is None
+    assert parse_simple_query(["--stdout"]) is None
+
+
+def test_server_handle_without_socket():
+    server = DaemonServer("/nonexistent/d.sock", warmup=False)
+
+    assert server.handle({"op": "ping"})["version"] == __version__
+    assert server.handle({"op": "bogus"})["ok"] is False
+
+    response = server.handle({"op": "query", "text": "docker ps", "summary": False, "measure": False})
+    assert response["ok"] is True
+    assert response["command"] == "docker ps"
+    assert server.requests == 1
+
+
+def test_cli_fast_path_through_socket(running_daemon, capsys):
+    server, client = running_daemon
+
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is True
+    assert capsys.readouterr().out == "docker ps\n"
+    assert server.requests == 1
+
+    assert oct(server.socket_path.stat().st_mode & 0o777) == oct(0o600)
+
+
+def test_cli_falls_back_without_daemon(socket_path, capsys, monkeypatch):
+    client = DaemonClient(socket_path)
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+
+    # A stale socket file with no listener is not an error either.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(socket_path))
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+
+    monkeypatch.setenv("NLP2CMD_DAEMON", "0")
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+    assert capsys.readouterr().out == ""
+
+
+def test_daemon_refuses_queries_it_would_answer_differently(tmp_path, monkeypatch):
+    from nlp2cmd.daemon import server as server_module
+    from nlp2cmd.daemon.client import client_settings, user_dirs
+
+    monkeypatch.setenv("NLP2CMD_DAEMON_TEST_FLAG", "1")
+    dotenv_file = tmp_path / ".env"
+    dotenv_file.write_text("NLP2CMD_DAEMON_TEST_FROM_DOTENV=a\n")
+    monkeypatch.setattr(server_module, "_find_dotenv", lambda: dotenv_file)
+    monkeypatch.setenv("NLP2CMD_DAEMON_TEST_FROM_DOTENV", "a")
+
+    server = DaemonServer("/nonexistent/d.sock", warmup=False)
+    server.load()
+    monkeypatch.delenv("NLP2CMD_DAEMON_TEST_FROM_DOTENV")
+
+    def query(**overrides):
+        request = {
+            "op": "query", "text": "docker ps", "summary": False, "measure": False,
+            "cwd": server.cwd, "settings": client_settings(), "user_dirs": user_dirs(), "build": server.build,
+        }
+        request.update(overrides)
+        return server.handle(request)
+
+    # The client has not loaded .env yet; the daemon adds it like load_dotenv().
+    assert query()["ok"] is True
+    assert "settings" in query(settings={**client_settings(), "NLP2CMD_DAEMON_TEST_FLAG": "2"})["error"]
+    assert "working directory" in query(cwd=str(tmp_path))["error"]
+    assert "build" in query(build="0" * 64)["error"]
+    assert "HOME" in query(user_dirs={**user_dirs(), "HOME": str(tmp_path)})["error"]
+
+    dotenv_file.write_text("NLP2CMD_DAEMON_TEST_FROM_DOTENV=b\n")
+    assert "NLP2CMD_DAEMON_TEST_FROM_DOTENV" in query()["error"]
+    assert server.requests == 1
+
+
+def test_cli_falls_back_on_mismatch(running_daemon, capsys, monkeypatch):
+    server, client = running_daemon
+
+    monkeypatch.setenv("NLP2CMD_DAEMON_TEST_FLAG", "changed")
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+
+    monkeypatch.delenv("NLP2CMD_DAEMON_TEST_FLAG")
+    monkeypatch.setattr("nlp2cmd.daemon.client.build_fingerprint", lambda: "edited")
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+    assert capsys.readouterr().out == ""
+    assert server.requests == 0
+
+
+def test_cli_falls_back_after_data_override_edit(running_daemon, config_dir, capsys):
+    server, client = running_daemon
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is True
+
+    config_dir.mkdir()
+    (config_dir / "patterns.json").write_text("{}")
+
+    assert run_via_daemon(["--stdout", "-q", "docker ps"], client=client) is False
+    assert capsys.readouterr().out == "docker ps\n"
+    assert server.requests == 1
+
+
+def test_data_layer_candidates_cover_the_loaders(config_dir, monkeypatch):
+    import os
+
+    from nlp2cmd.daemon.client import DATA_LAYER_FILES, data_layer_candidates
+    from nlp2cmd.utils.data_files import find_data_files
+
+    config_dir.mkdir()
+    explicit = config_dir / "explicit.json"
+    explicit.write_text("{}")
+    for filename, env_var in DATA_LAYER_FILES:
+        (config_dir / filename).write_text("{}")
+        if env_var:
+            monkeypatch.setenv(env_var, str(explicit))
+
+    candidates = {p.resolve() for p in data_layer_candidates()}
+    package_dir = Path(__import__("nlp2cmd").__file__).resolve().parent
+    repo_data = package_dir.parent.parent / "data"
+    for filename, env_var in DATA_LAYER_FILES:
+        found = find_data_files(explicit_path=os.environ.get(env_var or ""), default_filename=filename)
+        assert (config_dir / filename).resolve() in {p.resolve() for p in found}
+        for path in found:
+            path = path.resolve()
+            assert path in candidates or path.is_relative_to(package_dir) or path.is_relative_to(repo_data)
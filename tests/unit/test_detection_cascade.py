@@ -0,0 +1,107 @@
+"""
+Tests for detection cascade counters and adaptive cascade plans.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from nlp2cmd.generation.cascade import CASCADE_STAGES, CascadePlan, CascadeStats
+from nlp2cmd.generation.keywords import KeywordIntentDetector
+
+
+CORPUS = [
+    "pokaż pliki w katalogu /tmp",
+    "docker ps",
+    "select * from users",
+    "kubectl get pods",
+    "drop table users",
+    "completely unknown input",
+]
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return KeywordIntentDetector()
+
+
+def test_stats_disabled_by_default(detector):
+    assert detector.cascade_stats is None
+    detector.detect("docker ps")
+    assert detector.cascade_stats is None
+
+
+def test_stats_count_hits_misses_and_time(detector):
+    stats = detector.enable_cascade_stats()
+    try:
+        for text in CORPUS:
+            detector.detect(text)
+    finally:
+        detector.disable_cascade_stats()
+
+    data = stats.to_dict()
+    assert data["fingerprint"] == detector.pattern_fingerprint()
+    assert data["runs"] >= len(CORPUS)
+    assert set(data["stages"]) == set(CASCADE_STAGES)
+
+    resolved = sum(s["hits"] for s in data["stages"].values())
+    assert resolved == data["runs"] - data["unresolved"]
+    # Every run reaches the first stage.
+    assert data["stages"]["ml_classifier"]["attempts"] == data["runs"]
+    assert data["stages"]["fast_path"]["total_ms"] >= 0.0
+
+    restored = CascadeStats.from_dict(json.loads(json.dumps(data)))
+    assert restored.to_dict()["stages"]["pattern_scan"]["hits"] == data["stages"]["pattern_scan"]["hits"]
+
+
+def test_plan_skips_only_expensive_unproductive_stages():
+    stats = CascadeStats(fingerprint="abc")
+    for _ in range(200):
+        stats.record("fuzzy_fallback", False, 1_000_000)  # 1 ms, never hits
+        stats.record("semantic_fallback", False, 1_000)  # cheap, never hits
+        stats.record("schema_matcher", True, 1_000_000)  # expensive but useful
+        stats.record("pattern_scan", False, 5_000_000)  # protected
+
+    plan = stats.plan(min_samples=100)
+
+    assert plan.skip == frozenset({"fuzzy_fallback"})
+    assert plan.fingerprint == "abc"
+    assert CascadeStats().plan().skip == frozenset()
+
+
+def test_plan_rejects_protected_stages():
+    with pytest.raises(ValueError):
+        CascadePlan(skip=frozenset({"pattern_scan"}))
+
+
+def test_skipped_stage_is_not_called(detector):
+    plan = CascadePlan(skip=frozenset({"fuzzy_fallback"}), fingerprint=detector.pattern_fingerprint())
+    detector.use_cascade_plan(plan)
+    try:
+        with patch.object(detector, "_detect_fuzzy_match") as fuzzy:
+            result = detector.detect("completely unknown input")
+        fuzzy.assert_not_called()
+        assert result.domain == "unknown"
+    finally:
+        detector.use_cascade_plan(None)
+
+
+def test_plan_for_other_pattern_set_is_rejected(detector):
+    with pytest.raises(ValueError):
+        detector.use_cascade_plan(CascadePlan(fingerprint="not-this-pattern-set"))
+
+
+def test_calibrate_keeps_results_for_corpus(detector, tmp_path, monkeypatch):
+    plan, stats = detector.calibrate_cascade(CORPUS * 20, min_samples=20, min_avg_ms=0.0)
+    assert stats.runs >= len(CORPUS) * 20
+    assert detector.cascade_stats is None
+
+    baseline = [(r.domain, r.intent) for r in map(detector.detect, CORPUS)]
+
+    path = plan.save(tmp_path / "plan.json")
+    monkeypatch.setenv("NLP2CMD_CASCADE_PLAN", str(path))
+    adaptive = KeywordIntentDetector()
+    assert adaptive._cascade_skip == plan.skip
+
+    assert [(r.domain, r.intent) for r in map(adaptive.detect, CORPUS)] == baseline
@@ -13,6 +13,7 @@ from nlp2cmd.environment import (
     EnvironmentReport,
     ToolInfo,
     ServiceInfo,
+    ToolInventoryCache,
 )
 
 
@@ -86,7 +87,7 @@ class TestEnvironmentAnalyzer:
     @pytest.fixture
     def analyzer(self):
         """Create analyzer instance."""
-        return EnvironmentAnalyzer()
+        return EnvironmentAnalyzer(tool_cache=ToolInventoryCache())
 
     def test_analyze_returns_dict(self, analyzer):
         """Test analyze returns dictionary."""
@@ -216,7 +217,7 @@ class TestRecommendations:
 
     @pytest.fixture
     def analyzer(self):
-        return EnvironmentAnalyzer()
+        return EnvironmentAnalyzer(tool_cache=ToolInventoryCache())
 
     def test_recommendations_for_missing_docker(self, analyzer):
         """Test recommendations when Docker is missing."""
@@ -268,3 +269,93 @@ class TestRecommendations:
         
         # Should have minimal or no recommendations
         assert len(recommendations) <= 1
+
+
+class TestConcurrentProbing:
+    """Tests for concurrent probing and the persistent tool cache."""
+
+    @pytest.fixture
+    def fake_tool(self, tmp_path, monkeypatch):
+        """Create a fake tool on PATH that counts its invocations."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        counter = tmp_path / "calls"
+        tool = bin_dir / "faketool"
+        tool.write_text(
+            f'#!/bin/sh\necho x >> "{counter}"\necho "faketool version 1.2.3"\n'
+        )
+        tool.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        monkeypatch.setitem(
+            EnvironmentAnalyzer.TOOL_CHECKS,
+            "faketool",
+            {"command": ["faketool", "--version"], "version_pattern": r"version ([\d.]+)"},
+        )
+        return tool, counter
+
+    @staticmethod
+    def _calls(counter):
+        return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+    def test_unchanged_tool_is_not_executed_again(self, tmp_path, fake_tool):
+        tool, counter = fake_tool
+        cache_path = tmp_path / "tool_cache.json"
+
+        first = EnvironmentAnalyzer(tool_cache=ToolInventoryCache.load(cache_path))
+        assert first.detect_tools(["faketool"])["faketool"].version == "1.2.3"
+        assert self._calls(counter) == 1
+        assert cache_path.exists()
+
+        second = EnvironmentAnalyzer(tool_cache=ToolInventoryCache.load(cache_path))
+        assert second.detect_tools(["faketool"])["faketool"].version == "1.2.3"
+        assert second.cached_tools(["faketool"])["faketool"].version == "1.2.3"
+        assert self._calls(counter) == 1
+
+        tool.write_text(tool.read_text().replace("1.2.3", "2.0.0"))
+        third = EnvironmentAnalyzer(tool_cache=ToolInventoryCache.load(cache_path))
+        assert third.detect_tools(["faketool"])["faketool"].version == "2.0.0"
+        assert self._calls(counter) == 2
+
+    def test_global_deadline_bounds_slow_tools(self, tmp_path, monkeypatch):
+        import time
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        names = [f"slowtool{i}" for i in range(4)]
+        for name in names:
+            tool = bin_dir / name
+            tool.write_text("#!/bin/sh\nsleep 5\necho 1.0\n")
+            tool.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+        analyzer = EnvironmentAnalyzer(tool_cache=ToolInventoryCache(), deadline=0.5)
+        start = time.monotonic()
+        tools = analyzer.detect_tools(names)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 3
+        assert all(tools[n].available and tools[n].version is None for n in names)
+        assert len(analyzer.tool_cache) == 0
+
+    def test_refresh_in_background(self, tmp_path, fake_tool):
+        analyzer = EnvironmentAnalyzer(tool_cache=ToolInventoryCache.load(tmp_path / "c.json"))
+        seen = {}
+
+        future = analyzer.refresh_in_background(
+            ["faketool"], callback=lambda tools, services: seen.update(tools)
+        )
+        tools, services = future.result(timeout=10)
+
+        assert tools["faketool"].version == "1.2.3"
+        assert "docker_daemon" in services
+        assert seen["faketool"].version == "1.2.3"
+
+    def test_detect_tools_inside_running_loop(self):
+        import asyncio
+
+        analyzer = EnvironmentAnalyzer(tool_cache=ToolInventoryCache())
+
+        async def call():
+            return analyzer.detect_tools(["python"])
+
+        assert asyncio.run(call())["python"].available
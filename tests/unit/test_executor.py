@@ -12,6 +12,7 @@ from nlp2cmd.executor import (
     PlanStep,
     StepResult,
     StepStatus,
+    build_dependency_graph,
 )
 from nlp2cmd.registry import ActionRegistry
 
@@ -591,3 +592,378 @@ class TestPlanExecutorEdgeCases:
         
         assert result.success is True
         assert "localhost" in result.final_result
+
+
+class TestDependencyGraph:
+    """Tests for dependency inference between plan steps."""
+    
+    def test_independent_steps(self):
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="a", params={"x": 1}, store_as="a"),
+            PlanStep(action="b", params={"y": "literal"}, store_as="b"),
+        ])
+        
+        assert build_dependency_graph(plan) == [set(), set()]
+    
+    def test_param_condition_and_foreach_references(self):
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="a", store_as="files"),
+            PlanStep(action="b", store_as="limit"),
+            PlanStep(action="c", params={"data": {"nested": ["$files.0"]}}, store_as="c"),
+            PlanStep(action="d", foreach="files", params={"f": "$item"}, store_as="d"),
+            PlanStep(action="e", condition="$limit > 3", store_as="e"),
+        ])
+        
+        deps = build_dependency_graph(plan)
+        
+        assert deps[2] == {0}
+        assert deps[3] == {0}
+        assert deps[4] == {1}
+    
+    def test_write_after_write_and_write_after_read(self):
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="a", store_as="v"),
+            PlanStep(action="b", params={"data": "$v"}, store_as="b"),
+            PlanStep(action="c", store_as="v"),
+        ])
+        
+        deps = build_dependency_graph(plan)
+        
+        assert deps[2] == {0, 1}
+
+
+class TestPlanExecutorParallel:
+    """Tests for concurrent execution of independent steps."""
+    
+    @pytest.fixture
+    def executor(self):
+        from nlp2cmd.registry import ActionRegistry, ActionSchema, ParamSchema, ParamType
+        
+        registry = ActionRegistry()
+        for name in ("slow_a", "slow_b", "combine", "fail_fast"):
+            registry.register(ActionSchema(
+                name=name,
+                description=name,
+                domain="test",
+                params=[
+                    ParamSchema(name="left", type=ParamType.ANY, required=False),
+                    ParamSchema(name="right", type=ParamType.ANY, required=False),
+                ],
+            ))
+        
+        return PlanExecutor(registry=registry, max_concurrency=4)
+    
+    def test_independent_steps_run_concurrently(self, executor):
+        import threading
+        
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def waits_for_peer(**kw):
+            barrier.wait()
+            return threading.current_thread().name
+        
+        executor.register_handler("slow_a", waits_for_peer)
+        executor.register_handler("slow_b", waits_for_peer)
+        executor.register_handler("combine", lambda left, right: [left, right])
+        
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="slow_a", store_as="a"),
+            PlanStep(action="slow_b", store_as="b"),
+            PlanStep(action="combine", params={"left": "$a", "right": "$b"}),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.success is True
+        assert [s.step_index for s in result.steps] == [0, 1, 2]
+        assert result.final_result[0] != result.final_result[1]
+        assert result.metadata["max_concurrency"] == 4
+        assert result.metadata["critical_path"][-1] == 2
+        assert 0 < result.metadata["critical_path_ms"] <= result.total_duration_ms
+    
+    def test_sequential_override_does_not_deadlock_dependents(self, executor):
+        executor.register_handler("slow_a", lambda **kw: 1)
+        executor.register_handler("combine", lambda left, right=None: left + 1)
+        
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="slow_a", store_as="a"),
+            PlanStep(action="combine", params={"left": "$a"}, store_as="a2"),
+            PlanStep(action="combine", params={"left": "$a2"}, store_as="a3"),
+        ])
+        
+        result = executor.execute(plan, max_concurrency=1)
+        
+        assert result.final_result == 3
+        assert result.metadata["critical_path"] == [0, 1, 2]
+    
+    def test_stop_prevents_dependent_steps(self, executor):
+        def fail(**kw):
+            raise RuntimeError("boom")
+        
+        executor.register_handler("fail_fast", fail)
+        executor.register_handler("combine", lambda left, right=None: left)
+        
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="fail_fast", store_as="x", on_error="stop"),
+            PlanStep(action="combine", params={"left": "$x"}),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.success is False
+        assert len(result.steps) == 1
+        assert result.steps[0].status == StepStatus.FAILED
+    
+    def test_concurrent_foreach_steps_keep_item_scope(self, executor):
+        executor.register_handler("fail_fast", lambda **kw: [1, 2, 3])
+        executor.register_handler("combine", lambda **kw: [7, 8])
+        executor.register_handler("slow_a", lambda left, right=None: ("a", left))
+        executor.register_handler("slow_b", lambda left, right=None: ("b", left))
+        
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="fail_fast", store_as="xs"),
+            PlanStep(action="combine", store_as="ys"),
+            PlanStep(action="slow_a", foreach="xs", params={"left": "$item"}, store_as="ra"),
+            PlanStep(action="slow_b", foreach="ys", params={"left": "$item"}, store_as="rb"),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.steps[2].result == [("a", 1), ("a", 2), ("a", 3)]
+        assert result.steps[3].result == [("b", 7), ("b", 8)]
+
+
+class TestPlanExecutorForeachAndTimeouts:
+    """Tests for concurrent foreach, timeouts and cancellation."""
+    
+    @pytest.fixture
+    def executor(self):
+        from nlp2cmd.registry import ActionRegistry, ActionSchema, ParamSchema, ParamType
+        
+        registry = ActionRegistry()
+        for name in ("produce", "work"):
+            registry.register(ActionSchema(
+                name=name,
+                description=name,
+                domain="test",
+                params=[ParamSchema(name="value", type=ParamType.ANY, required=False)],
+            ))
+        
+        executor = PlanExecutor(registry=registry, retry_backoff=0.01)
+        executor.register_handler("produce", lambda **kw: list(range(8)))
+        return executor
+    
+    def test_plan_step_max_parallel_roundtrip(self):
+        plan = ExecutionPlan.from_dict({
+            "steps": [{"action": "work", "foreach": "xs", "max_parallel": 4}],
+        })
+        
+        assert plan.steps[0].max_parallel == 4
+        assert plan.to_dict()["steps"][0]["max_parallel"] == 4
+    
+    def test_parallel_foreach_keeps_order(self, executor):
+        import threading
+        import time as _time
+        
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+        
+        def work(value):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            _time.sleep(0.01 * (8 - value))
+            with lock:
+                active["now"] -= 1
+            return value * 10
+        
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="produce", store_as="xs"),
+            PlanStep(action="work", foreach="xs", params={"value": "$item"}, max_parallel=3),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.steps[1].result == [v * 10 for v in range(8)]
+        assert 1 < active["peak"] <= 3
+    
+    def test_parallel_foreach_stop_matches_sequential(self, executor):
+        def work(value):
+            if value == 3:
+                raise RuntimeError("bad item")
+            return value
+        
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="produce", store_as="xs"),
+            PlanStep(action="work", foreach="xs", params={"value": "$item"}, max_parallel=4),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.steps[1].result == [0, 1, 2]
+    
+    def test_timeout_is_enforced(self, executor):
+        import threading
+        
+        seen_cancel = threading.Event()
+        
+        def work(value=None, cancel_event=None):
+            if cancel_event.wait(5):
+                seen_cancel.set()
+            return "late"
+        
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[PlanStep(action="work", timeout=0.05)])
+        
+        result = executor.execute(plan)
+        
+        assert result.success is False
+        assert "timed out" in result.steps[0].error
+        assert result.steps[0].duration_ms < 2000
+        assert seen_cancel.wait(1)
+    
+    def test_retry_backoff_interrupted_by_cancel(self, executor):
+        import threading
+        
+        cancel = threading.Event()
+        calls = []
+        
+        def work(value=None):
+            calls.append(1)
+            cancel.set()
+            raise RuntimeError("flaky")
+        
+        executor.register_handler("work", work)
+        executor.retry_backoff = 30
+        plan = ExecutionPlan(steps=[PlanStep(action="work", retry=3)])
+        
+        result = executor.execute(plan, cancel_event=cancel)
+        
+        assert len(calls) == 1
+        assert result.steps[0].status == StepStatus.FAILED
+        assert result.total_duration_ms < 5000
+
+    
+    def test_stop_on_error_leaves_caller_event_alone(self, executor):
+        import threading
+        
+        cancel = threading.Event()
+        
+        def work(value=None):
+            raise RuntimeError("bad")
+        
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[PlanStep(action="work"), PlanStep(action="produce")])
+        
+        result = executor.execute(plan, cancel_event=cancel)
+        
+        assert result.success is False
+        assert len(result.steps) == 1
+        assert not cancel.is_set()
+    
+    def test_caller_event_cancels_running_step(self, executor):
+        import threading
+        
+        cancel = threading.Event()
+        
+        def work(value=None, cancel_event=None):
+            cancel.set()
+            return "cancelled" if cancel_event.wait(5) else "late"
+        
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[PlanStep(action="work")])
+        
+        result = executor.execute(plan, cancel_event=cancel)
+        
+        assert result.steps[0].result == "cancelled"
+        assert result.total_duration_ms < 2000
+
+    
+    def test_handler_signature_inspected_once(self, executor, monkeypatch):
+        import inspect
+        
+        import nlp2cmd.executor as executor_module
+        
+        calls = []
+        original = inspect.signature
+        
+        def counting(fn, *args, **kwargs):
+            calls.append(fn)
+            return original(fn, *args, **kwargs)
+        
+        def work(value=None):
+            return value
+        
+        monkeypatch.setattr(executor_module.inspect, "signature", counting)
+        executor.register_handler("work", work)
+        plan = ExecutionPlan(steps=[
+            PlanStep(action="produce", store_as="xs"),
+            PlanStep(action="work", foreach="xs", params={"value": "$item"}, timeout=5),
+        ])
+        
+        result = executor.execute(plan)
+        
+        assert result.steps[1].result == list(range(8))
+        assert calls.count(work) == 1
+
+
+class TestCompiledConditions:
+    """Tests for compiled step conditions."""
+    
+    def _ctx(self, **variables):
+        ctx = ExecutionContext()
+        ctx.variables.update(variables)
+        return ctx
+    
+    def test_basic_expressions(self):
+        from nlp2cmd.executor import compile_condition
+        
+        ctx = self._ctx(count=[1, 2], config={"db": {"port": 5432}}, name="web")
+        
+        assert compile_condition("len($count) > 0").evaluate(ctx) is True
+        assert compile_condition("$config.db.port == 5432 and $name in ['web', 'api']").evaluate(ctx)
+        assert compile_condition("0 < len($count) <= 1").evaluate(ctx) is False
+        assert compile_condition("not $count[1:]").evaluate(ctx) is False
+    
+    def test_string_values_are_not_formatted_into_source(self):
+        from nlp2cmd.executor import compile_condition
+        
+        ctx = self._ctx(name="x' or True or '")
+        
+        assert compile_condition("$name == 'web'").evaluate(ctx) is False
+        assert compile_condition("$name == $name").evaluate(ctx) is True
+    
+    def test_unknown_variable_is_false(self):
+        from nlp2cmd.executor import compile_condition
+        
+        assert compile_condition("$missing > 1").evaluate(self._ctx()) is False
+    
+    def test_unsafe_syntax_rejected(self):
+        from nlp2cmd.executor import ConditionError, compile_condition
+        
+        for expr in ("__import__('os').system('true')", "$x.__class__", "open('f')", "[x for x in $y]"):
+            with pytest.raises(ConditionError):
+                compile_condition(expr)
+    
+    def test_condition_compiled_once_per_step(self, monkeypatch):
+        import nlp2cmd.executor as executor_module
+        
+        calls = []
+        original = executor_module.compile_condition
+        
+        def counting(expr):
+            calls.append(expr)
+            return original(expr)
+        
+        monkeypatch.setattr(executor_module, "compile_condition", counting)
+        step = PlanStep(action="a", condition="$item > 1")
+        
+        for value in range(5):
+            step.compiled_condition().evaluate(self._ctx(item=value))
+        
+        assert calls == ["$item > 1"]
+        step.condition = "$item > 3"
+        assert step.compiled_condition().evaluate(self._ctx(item=4)) is True
+        assert len(calls) == 2
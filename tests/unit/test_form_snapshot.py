@@ -0,0 +1,78 @@
+"""Tests for the single-roundtrip form snapshot in FormHandler."""
+
+from __future__ import annotations
+
+import io
+
+from rich.console import Console
+
+from nlp2cmd.web_schema.form_handler import FORM_SNAPSHOT_SCRIPT, FormHandler
+
+
+SNAPSHOT = {
+    "counts": {"inputs_total": 4, "input": 2, "textarea": 1, "contenteditable": 0, "div-input": 1, "select": 1},
+    "fields": [
+        {"kind": "input", "type": "email", "id": "email", "name": "email", "label": "E-mail",
+         "placeholder": "you@example.com", "required": True, "visible": True, "selector": "#email"},
+        {"kind": "input", "type": "text", "id": None, "name": None, "label": None,
+         "placeholder": None, "required": False, "visible": True, "selector": None},
+        {"kind": "textarea", "type": "textarea", "id": None, "name": "msg", "label": None,
+         "placeholder": None, "required": False, "visible": False, "selector": 'textarea[name="msg"]'},
+        {"kind": "div-input", "type": "div-input", "id": None, "name": None, "role": "textbox",
+         "data_input": None, "data_field": "city", "selector": '[data-field="city"]'},
+        {"kind": "select", "type": "select", "id": "topic", "name": "topic", "label": "Topic",
+         "required": False, "options": ["Sales", "Support"], "selector": "#topic"},
+    ],
+}
+
+
+class SnapshotPage:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def evaluate(self, script):
+        self.calls.append("evaluate")
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+    def query_selector_all(self, selector):
+        self.calls.append(selector)
+        return []
+
+
+def _handler(buffer):
+    return FormHandler(console=Console(file=buffer, width=200))
+
+
+def test_snapshot_maps_to_form_fields_in_one_call():
+    page = SnapshotPage(SNAPSHOT)
+    out = io.StringIO()
+    fields = _handler(out).detect_form_fields(page)
+
+    assert page.calls == ["evaluate"]
+    assert [(f.selector, f.field_type, f.name) for f in fields] == [
+        ("#email", "email", "email"),
+        ('textarea[name="msg"]', "textarea", "msg"),
+        ('[data-field="city"]', "div-input", "city"),
+        ("#topic", "select", "topic"),
+    ]
+    assert fields[0].required and fields[0].get_display_name() == "E-mail"
+    assert fields[1].visible is False
+    assert fields[3].options == ["Sales", "Support"]
+    # Same progress output as per-element detection, in the same order.
+    text = out.getvalue()
+    assert text.index("form_inputs_total") < text.index("form_inputs_visible") < text.index("form_textareas")
+    assert text.count("form_input_detected") == 2
+
+
+def test_falls_back_to_per_element_detection():
+    page = SnapshotPage(RuntimeError("evaluate blocked"))
+    assert _handler(io.StringIO()).detect_form_fields(page) == []
+    assert page.calls[0] == "evaluate"
+    assert "textarea" in page.calls
+
+
+def test_snapshot_script_is_a_function_expression():
+    assert FORM_SNAPSHOT_SCRIPT.strip().startswith("() => {")
@@ -0,0 +1,80 @@
+"""Tests for the history similarity index used by CommandDisambiguator."""
+
+from __future__ import annotations
+
+import pytest
+
+from nlp2cmd.context.disambiguator import CommandDisambiguator
+from nlp2cmd.history import query_index
+from nlp2cmd.history.query_index import QueryIndex, similarity
+from nlp2cmd.history.tracker import CommandHistory
+
+
+QUERIES = [
+    "list files in current directory",
+    "show running docker containers",
+    "Pokaż procesy zużywające najwięcej pamięci",
+    "find log files larger than 100MB",
+    "kubectl get pods in namespace prod",
+    "znajdź pliki python w katalogu src",
+]
+
+
+def _brute_force(history: list[str], query: str, limit: int = 5, threshold: float = 0.4):
+    scores = sorted({(similarity(query, q), q) for q in history}, reverse=True)
+    return [s for s, _ in scores if s >= threshold][:limit]
+
+
+def test_deduplicates_queries_and_keeps_latest_command():
+    index = QueryIndex()
+    index.add("List files", "ls")
+    index.add("list  files", "ls -la")
+    index.add("show disk usage", "df -h")
+
+    assert len(index) == 2
+    results = index.search("list files")
+    assert results[0][:2] == ("list  files", "ls -la")
+    assert index.entries[0].count == 2
+
+
+def test_ties_prefer_most_recent():
+    index = QueryIndex()
+    index.add("show docker logs a", "docker logs a")
+    index.add("show docker logs b", "docker logs b")
+
+    results = index.search("show docker logs c")
+    assert results[0][2] == results[1][2]
+    assert results[0][0] == "show docker logs b"
+
+
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+def test_search_matches_brute_force(monkeypatch, use_rapidfuzz):
+    if not use_rapidfuzz:
+        monkeypatch.setattr(query_index, "fuzz", None)
+    history = [f"{q} {i}" for i in range(40) for q in QUERIES]
+    index = QueryIndex()
+    index.extend((q, "cmd") for q in history)
+
+    for probe in ("list files in home directory", "pokaż procesy", "kubectl get pods"):
+        got = [score for _, _, score in index.search(probe)]
+        assert got == pytest.approx(_brute_force(history, probe))
+
+
+def test_disambiguator_searches_whole_history(tmp_path):
+    history = CommandHistory(history_file=tmp_path / "history.json")
+    history.record(query="restart nginx service", dsl="shell", command="systemctl restart nginx")
+    for i in range(200):
+        history.record(query=f"echo {i}", dsl="shell", command=f"echo {i}")
+
+    disambiguator = CommandDisambiguator()
+    disambiguator._history = history
+
+    similar = disambiguator.find_similar_queries("restart the nginx service")
+    assert similar[0][:2] == ("restart nginx service", "systemctl restart nginx")
+
+    # New records reach the already-built index.
+    history.record(query="restart the nginx service", dsl="shell", command="sudo systemctl restart nginx")
+    assert disambiguator.find_similar_queries("restart the nginx service")[0][2] == 1.0
+
+    history.clear()
+    assert disambiguator.find_similar_queries("restart the nginx service") == []
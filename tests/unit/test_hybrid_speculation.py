@@ -0,0 +1,127 @@
+"""Tests for speculative rule/LLM racing in HybridGenerator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from nlp2cmd.generation.hybrid import HybridGenerator
+from nlp2cmd.generation.llm_multi import MultiDomainGenerator
+from nlp2cmd.generation.pipeline import PipelineResult
+from nlp2cmd.generation.speculation import FallthroughPredictor, SpeculationBudget
+
+
+class SlowRules:
+    """Rule pipeline stand-in: accepts texts containing "known"."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def process(self, text: str) -> PipelineResult:
+        self.calls += 1
+        time.sleep(self.delay)
+        if "known" in text:
+            return PipelineResult(
+                input_text=text, domain="shell", intent="list", command="ls",
+                detection_confidence=0.95, success=True,
+            )
+        return PipelineResult(input_text=text, success=False)
+
+
+class DelayedLLM:
+    """LLM client stand-in that answers every prompt after ``delay`` seconds."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(self, user: str, system=None, max_tokens=500, temperature=0.1, **kwargs) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return "shell" if "Sklasyfikuj" in user else "ls -la"
+
+
+def _generator(rules: SlowRules, llm: DelayedLLM, budget: float = 1.0) -> HybridGenerator:
+    return HybridGenerator(
+        rule_pipeline=rules,
+        llm_generator=MultiDomainGenerator(llm),
+        speculative=True,
+        speculation_budget=budget,
+        predictor=FallthroughPredictor(prior=1.0),
+    )
+
+
+def test_predictor_learns_from_outcomes():
+    predictor = FallthroughPredictor()
+    assert not predictor.predict("anything")
+
+    predictor.observe("deploy the frobnicator", True)
+    predictor.observe("restart the frobnicator", True)
+    predictor.observe("list files", False)
+
+    assert predictor.predict("Deploy  the frobnicator")
+    assert predictor.predict("scale frobnicator")
+    assert not predictor.predict("list files")
+    assert predictor.observations == 3
+
+
+def test_budget_caps_speculative_calls():
+    budget = SpeculationBudget(0.5)
+    granted = 0
+    for _ in range(10):
+        budget.record_request()
+        granted += budget.try_acquire()
+    assert granted == 5
+    assert budget.denied == 5
+
+
+@pytest.mark.asyncio
+async def test_llm_overlaps_with_slow_rules():
+    generator = _generator(SlowRules(delay=0.15), DelayedLLM(delay=0.05))
+
+    start = time.perf_counter()
+    result = await generator.generate("something unusual")
+    elapsed = time.perf_counter() - start
+
+    assert result.source == "llm" and result.speculative and result.success
+    # Serial execution would take rules (0.15) + two LLM calls (0.1).
+    assert elapsed < 0.22
+    assert generator.get_stats().speculative_calls == 1
+    assert generator.get_stats().wasted_llm_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_accepted_rules_cancel_llm():
+    llm = DelayedLLM(delay=5.0)
+    generator = _generator(SlowRules(), llm)
+
+    result = await asyncio.wait_for(generator.generate("known query"), timeout=1.0)
+    await asyncio.sleep(0)
+
+    assert result.source == "rules" and result.speculative
+    assert llm.cancelled == 1
+    stats = generator.get_stats()
+    assert stats.rule_hits == 1
+    assert stats.wasted_llm_calls == 1
+    assert stats.wasted_call_ratio == 1.0
+
+
+@pytest.mark.asyncio
+async def test_zero_budget_keeps_serial_path():
+    rules, llm = SlowRules(), DelayedLLM()
+    generator = _generator(rules, llm, budget=0.0)
+
+    results = await generator.generate_batch(["known query", "unusual query"])
+
+    assert [r.source for r in results] == ["rules", "llm"]
+    assert not any(r.speculative for r in results)
+    assert generator.get_stats().speculative_calls == 0
+    assert generator.budget.denied >= 1
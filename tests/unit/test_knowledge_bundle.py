@@ -0,0 +1,83 @@
+"""
+Tests for the compiled knowledge bundle.
+"""
+
+import json
+import os
+
+import pytest
+
+from nlp2cmd.generation import knowledge_bundle
+from nlp2cmd.generation.keywords import KeywordIntentDetector
+from nlp2cmd.generation.regex import RegexEntityExtractor
+from nlp2cmd.generation.templates import TemplateGenerator
+
+
+@pytest.fixture
+def bundle_path(tmp_path, monkeypatch):
+    path = tmp_path / "bundle.pkl"
+    monkeypatch.setenv("NLP2CMD_KNOWLEDGE_BUNDLE", str(path))
+    knowledge_bundle.clear_cache()
+    yield path
+    knowledge_bundle.clear_cache()
+
+
+def _loaded_without_bundle(monkeypatch):
+    monkeypatch.setenv("NLP2CMD_KNOWLEDGE_BUNDLE", "0")
+    try:
+        return KeywordIntentDetector(), RegexEntityExtractor(), TemplateGenerator()
+    finally:
+        monkeypatch.undo()
+
+
+def test_no_bundle_means_json_loading(bundle_path):
+    assert knowledge_bundle.get_knowledge_bundle() is None
+    assert not bundle_path.exists()
+
+
+def test_bundle_matches_json_loaders(bundle_path, monkeypatch):
+    bundle, written = knowledge_bundle.compile_bundle()
+    assert written == bundle_path
+    assert bundle.summary()["keywords"] > 0
+
+    knowledge_bundle.clear_cache()
+    detector, extractor, templates = KeywordIntentDetector(), RegexEntityExtractor(), TemplateGenerator()
+    assert knowledge_bundle.get_knowledge_bundle() is not None
+
+    json_detector, json_extractor, json_templates = _loaded_without_bundle(monkeypatch)
+    assert detector.patterns == json_detector.patterns
+    assert detector.domain_boosters == json_detector.domain_boosters
+    assert detector.priority_intents == json_detector.priority_intents
+    assert detector.fast_path_common_images == json_detector.fast_path_common_images
+    assert extractor.patterns == json_extractor.patterns
+    assert templates.templates == json_templates.templates
+    assert templates.defaults == json_templates.defaults
+
+
+def test_loaders_do_not_share_bundle_state(bundle_path):
+    knowledge_bundle.compile_bundle()
+
+    first = TemplateGenerator(custom_templates={"shell": {"custom_intent": "echo hi"}})
+    second = TemplateGenerator()
+
+    assert "custom_intent" in first.templates["shell"]
+    assert "custom_intent" not in second.templates["shell"]
+
+
+def test_stale_bundle_is_rebuilt(bundle_path, tmp_path, monkeypatch):
+    override = tmp_path / "patterns.json"
+    override.write_text(json.dumps({"shell": {"bundle_probe": ["first probe"]}}), encoding="utf-8")
+    monkeypatch.setenv("NLP2CMD_PATTERNS_FILE", str(override))
+
+    knowledge_bundle.compile_bundle()
+    knowledge_bundle.clear_cache()
+    assert "first probe" in KeywordIntentDetector().patterns["shell"]["bundle_probe"]
+
+    override.write_text(json.dumps({"shell": {"bundle_probe": ["second probe!"]}}), encoding="utf-8")
+    os.utime(override, ns=(1, 1))
+    knowledge_bundle.clear_cache()
+
+    patterns = KeywordIntentDetector().patterns["shell"]["bundle_probe"]
+    assert "second probe!" in patterns
+    assert "first probe" not in patterns
+    assert knowledge_bundle.read_bundle(bundle_path).fingerprint == knowledge_bundle.source_fingerprint()
@@ -0,0 +1,147 @@
+"""Tests for the cached spaCy lemmatizer used by KeywordIntentDetector."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+
+from nlp2cmd.generation import keywords
+from nlp2cmd.generation.keywords import KeywordIntentDetector
+from nlp2cmd.generation.lemmatizer import SpacyLemmatizer
+
+LEMMAS = {
+    "uruchomione": "uruchomić",
+    "kontenerów": "kontener",
+    "dockera": "docker",
+    "plików": "plik",
+    "pokazuje": "pokazywać",
+    "logów": "log",
+}
+
+
+@dataclass
+class FakeToken:
+    text: str
+    lemma_: str
+    is_punct: bool = False
+    like_num: bool = False
+    is_space: bool = False
+
+
+class FakeNLP:
+    """Whitespace tokenizer with a lemma table; counts model runs.
+
+    "zamek" lemmatizes differently depending on the next word, like a
+    tagger-driven lemma would.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.piped = 0
+        self.tokenized = 0
+
+    def make_doc(self, text: str) -> list[FakeToken]:
+        self.tokenized += 1
+        return [FakeToken(w, "", is_punct=w in ",.?!", like_num=w.isdigit()) for w in text.split()]
+
+    def _tag(self, text: str) -> list[FakeToken]:
+        tokens = self.make_doc(text)
+        for i, token in enumerate(tokens):
+            nxt = tokens[i + 1].text if i + 1 < len(tokens) else ""
+            if token.text == "zamek":
+                token.lemma_ = "zamknąć" if nxt == "drzwi" else "zamek"
+            else:
+                token.lemma_ = LEMMAS.get(token.text, token.text)
+        return tokens
+
+    def __call__(self, text: str) -> list[FakeToken]:
+        self.calls += 1
+        return self._tag(text)
+
+    def pipe(self, texts, batch_size: int = 1):
+        texts = list(texts)
+        self.piped += len(texts)
+        return [self._tag(t) for t in texts]
+
+
+def test_text_and_token_cache():
+    nlp = FakeNLP()
+    lemmatizer = SpacyLemmatizer(nlp, token_cache_size=100)
+
+    assert lemmatizer.lemmatize("pokazuje 3 uruchomione kontenerów dockera") == "pokazywać 3 uruchomić kontener docker"
+    assert lemmatizer.lemmatize("pokazuje 3 uruchomione kontenerów dockera") == "pokazywać 3 uruchomić kontener docker"
+    # Every token is known: assembled without running the model.
+    assert lemmatizer.lemmatize("dockera kontenerów") == "docker kontener"
+    # Assembled results are not pinned in the exact text cache.
+    assert lemmatizer.lemmatize("dockera kontenerów") == "docker kontener"
+
+    assert nlp.calls == 1
+    assert lemmatizer.stats.to_dict() == {"text_hits": 1, "token_hits": 2, "model_runs": 1, "batches": 0}
+
+
+def test_token_cache_is_off_by_default():
+    nlp = FakeNLP()
+    lemmatizer = SpacyLemmatizer(nlp)
+    lemmatizer.lemmatize("dockera kontenerów")
+    lemmatizer.lemmatize("kontenerów dockera")
+    assert nlp.calls == 2 and lemmatizer.stats.token_hits == 0
+
+
+def test_context_dependent_tokens_go_through_model():
+    nlp = FakeNLP()
+    lemmatizer = SpacyLemmatizer(nlp, token_cache_size=100)
+
+    assert lemmatizer.lemmatize("zamek drzwi") == "zamknąć drzwi"
+    assert lemmatizer.lemmatize("zamek logów") == "zamek log"
+    assert lemmatizer.lemmatize("logów zamek") == "log zamek"
+    assert nlp.calls == 3
+
+
+def test_token_cache_can_be_disabled():
+    nlp = FakeNLP()
+    lemmatizer = SpacyLemmatizer(nlp, token_cache_size=0)
+    lemmatizer.lemmatize("dockera kontenerów")
+    lemmatizer.lemmatize("kontenerów dockera")
+    assert nlp.calls == 2 and nlp.tokenized == 2
+
+
+def test_lemmatize_many_pipes_misses_once():
+    nlp = FakeNLP()
+    lemmatizer = SpacyLemmatizer(nlp, token_cache_size=0, batch_size=2)
+    texts = ["logów plików", "zamek drzwi", "logów plików", "uruchomione"]
+
+    assert lemmatizer.lemmatize_many(texts) == ["log plik", "zamknąć drzwi", "log plik", "uruchomić"]
+    assert nlp.piped == 3 and nlp.calls == 0
+    assert lemmatizer.stats.batches == 2
+    assert lemmatizer.lemmatize("zamek drzwi") == "zamknąć drzwi"
+    assert nlp.calls == 0
+
+
+@pytest.fixture
+def fake_spacy(monkeypatch):
+    nlp = FakeNLP()
+    monkeypatch.setattr(keywords, "_ENABLE_SPACY_LEMMATIZATION", True)
+    monkeypatch.setattr(keywords, "_LEMMATIZER", SpacyLemmatizer(nlp))
+    return nlp
+
+
+def test_detect_batch_matches_detect(fake_spacy):
+    detector = KeywordIntentDetector()
+    texts = [
+        "pokaż pliki",
+        "uruchomione kontenerów dockera",
+        "xyzzy plugh",
+        "cd",
+        "logów plików z wczoraj",
+    ]
+
+    batch = detector.detect_batch(texts)
+    piped = fake_spacy.piped
+    single = [detector.detect(t) for t in texts]
+
+    assert [(r.domain, r.intent, r.confidence) for r in batch] == [
+        (r.domain, r.intent, r.confidence) for r in single
+    ]
+    assert piped >= 1
+    assert fake_spacy.calls == 0
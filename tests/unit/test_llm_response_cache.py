@@ -0,0 +1,156 @@
+"""Tests for LiteLLMClient's response cache and request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from nlp2cmd.generation.hybrid import HybridGenerator
+from nlp2cmd.generation.llm_cache import ResponseCache
+from nlp2cmd.generation.llm_multi import MultiDomainGenerator
+from nlp2cmd.generation.llm_simple import LiteLLMClient
+from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+
+class FakeCompletion:
+    """Stands in for litellm.completion; counts calls per prompt."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, model, messages, max_tokens, temperature, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return f"echo {messages[-1]['content']} t={temperature}"
+
+
+def _client(fake, **cache_kwargs) -> LiteLLMClient:
+    return LiteLLMClient(model="fake/model", cache=ResponseCache(**cache_kwargs), completion_fn=fake)
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_hit_cache():
+    fake = FakeCompletion()
+    client = _client(fake)
+
+    first = await client.complete("list files", system="sys")
+    second = await client.complete("list files", system="sys")
+    other = await client.complete("list files", system="sys", temperature=0.7)
+
+    assert first == second != other
+    assert fake.calls == 2
+    assert client.cache_stats.to_dict() == {"hits": 1, "misses": 2, "coalesced": 0, "disk_hits": 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call():
+    fake = FakeCompletion(delay=0.05)
+    client = LiteLLMClient(model="fake/model", cache=False, completion_fn=fake)
+
+    results = await asyncio.gather(*(client.complete("same prompt") for _ in range(8)))
+
+    assert len(set(results)) == 1
+    assert fake.calls == 1
+    assert client.cache_stats.misses == 1
+    assert client.cache_stats.coalesced == 7
+    assert len(client._single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_and_are_not_cached():
+    fake = FakeCompletion(delay=0.02, fail=True)
+    client = _client(fake)
+
+    results = await asyncio.gather(*(client.complete("q") for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert fake.calls == 1
+
+    fake.fail = False
+    assert (await client.complete("q")).startswith("echo q")
+    assert fake.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request():
+    fake = FakeCompletion(delay=0.05)
+    client = _client(fake)
+
+    leader = asyncio.ensure_future(client.complete("q"))
+    follower = asyncio.ensure_future(client.complete("q"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert (await follower).startswith("echo q")
+    assert fake.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_sqlite_tier(tmp_path):
+    now = [1000.0]
+    db = tmp_path / "llm.sqlite"
+    fake = FakeCompletion()
+
+    client = _client(fake, ttl=60, db_path=db, clock=lambda: now[0])
+    await client.complete("q")
+
+    # A new process (fresh memory tier) is answered from disk.
+    restarted = _client(fake, ttl=60, db_path=db, clock=lambda: now[0])
+    await restarted.complete("q")
+    assert fake.calls == 1
+    assert restarted.cache_stats.disk_hits == 1
+
+    now[0] += 61
+    await restarted.complete("q")
+    assert fake.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_is_per_endpoint(tmp_path):
+    db = tmp_path / "llm.sqlite"
+    fake = FakeCompletion()
+
+    local = LiteLLMClient(
+        model="fake/model", api_base="http://localhost:11434",
+        cache=ResponseCache(db_path=db), completion_fn=fake,
+    )
+    remote = LiteLLMClient(
+        model="fake/model", api_base="https://llm.example.com",
+        cache=ResponseCache(db_path=db), completion_fn=fake,
+    )
+    await local.complete("q")
+    await remote.complete("q")
+
+    assert fake.calls == 2
+    assert remote.cache_stats.disk_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_hybrid_stats_expose_cache_counters():
+    fake = FakeCompletion(delay=0.02)
+    client = _client(fake)
+    generator = HybridGenerator(
+        rule_pipeline=RuleBasedPipeline(),
+        llm_generator=MultiDomainGenerator(client),
+        confidence_threshold=1.01,  # always fall back to the LLM
+    )
+
+    await generator.generate_batch(["pokaż pliki"] * 4)
+    await generator.generate("pokaż pliki")
+    stats = generator.get_stats()
+
+    assert stats.llm_cache_misses == fake.calls
+    assert stats.llm_coalesced > 0
+    assert stats.llm_cache_hits > 0
+    assert stats.to_dict()["llm_coalesced"] == stats.llm_coalesced
+
+    generator.reset_stats()
+    assert generator.get_stats().llm_cache_hits == 0
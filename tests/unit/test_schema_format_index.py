@@ -0,0 +1,95 @@
+"""Parity of SchemaRegistry.detect_format's pattern index with fnmatch over every pattern."""
+
+from __future__ import annotations
+
+import fnmatch
+import itertools
+from pathlib import Path
+
+from nlp2cmd.schemas import CONTENT_SNIFF_BYTES, FileFormatSchema, SchemaRegistry
+
+
+def _legacy_matches(registry: SchemaRegistry, file_path: Path) -> list[FileFormatSchema]:
+    def match(text: str, pattern: str) -> bool:
+        return fnmatch.fnmatch(text.lower(), pattern.lower()) or text.lower() == pattern.lower()
+
+    found = []
+    for schema in registry.schemas.values():
+        if any(match(file_path.name, p) or match(str(file_path), p) for p in schema.extensions):
+            found.append(schema)
+    return found
+
+
+def _registry() -> SchemaRegistry:
+    registry = SchemaRegistry()
+    registry.register("archive", FileFormatSchema(name="archive", extensions=["*.tar.gz", "*file", "a[1].txt"], priority=1))
+    registry.register("makefile", FileFormatSchema(name="makefile", extensions=["Makefile", "*.mk", "build/??.cfg"]))
+    return registry
+
+
+NAMES = [
+    "Dockerfile", "dockerfile", "Dockerfile.dev", "app.dockerfile", "docker-compose.yml", "Docker-Compose.YAML",
+    "compose.yml", "deploy.yaml", "x.yml", ".env", ".env.local", "prod.env", "config.json", "notes.txt",
+    "a[1].txt", "a1.txt", "backup.tar.gz", "tar.gz", "Makefile", "rules.mk", "Justfile", "README", "ab.cfg",
+    "abc.cfg", "script.py", "yaml", ".yml",
+]
+DIRS = ["", ".github/workflows", "/repo/.github/workflows", "build", "src/deep/dir", "/abs"]
+
+
+def test_index_matches_fnmatch_loop():
+    registry = _registry()
+    index = registry._get_format_index()
+    for directory, name in itertools.product(DIRS, NAMES):
+        path = Path(directory) / name
+        expected = _legacy_matches(registry, path)
+        got = [index.schemas[p] for p in index.match(path)]
+        assert got == expected, path
+
+
+def test_priority_tie_keeps_registry_order(tmp_path):
+    registry = _registry()
+    # Both kubernetes-deployment and github-workflow match; equal priority.
+    assert registry.detect_format(Path(".github/workflows/ci.yml")).name == "Kubernetes Deployment"
+    assert registry.detect_format(Path("dist/backup.tar.gz")).name == "archive"
+
+
+def test_index_follows_registry_changes():
+    registry = SchemaRegistry()
+    assert registry.detect_format(Path("/nonexistent/rules.mk")) is None
+    registry.register("make", FileFormatSchema(name="make", extensions=["*.mk"]))
+    assert registry.detect_format(Path("/nonexistent/rules.mk")).name == "make"
+    registry.unregister("make")
+    assert registry.detect_format(Path("/nonexistent/rules.mk")) is None
+
+
+def test_content_detection_reads_header_only(tmp_path):
+    registry = SchemaRegistry()
+    cases = {
+        "Containerfile": "FROM alpine\r\nRUN echo hi\r\n",
+        "deploy.txt": "apiVersion: apps/v1\nkind: Deployment\n",
+        "stack": "version: '3'\nservices:\n  web: {}\n",
+        "ci": "on:\n  push: {}\n",
+        "late": "x\n" * 600 + "FROM alpine\njobs:\n",
+        "wide": "ł" * (CONTENT_SNIFF_BYTES // 2 - 1) + "\njobs:\n" + "z" * CONTENT_SNIFF_BYTES,
+        "plain": "just text\n" * 5000,
+    }
+    for name, text in cases.items():
+        path = tmp_path / name
+        path.write_text(text, newline="")
+        content = path.read_text()[:1000]
+        expected = None
+        if content.strip().startswith("FROM "):
+            expected = "Dockerfile"
+        elif "apiVersion:" in content and "kind:" in content and "Deployment" in content:
+            expected = "Kubernetes Deployment"
+        elif "version:" in content and "services:" in content:
+            expected = "Docker Compose"
+        elif content.strip().startswith("on:") or "jobs:" in content:
+            expected = "GitHub Actions Workflow"
+        schema = registry.detect_format(path)
+        assert (schema.name if schema else None) == expected, name
+
+    binary = tmp_path / "blob"
+    binary.write_bytes(b"\xff\xfe\x00FROM")
+    assert registry.detect_format(binary) is None
+    assert registry.detect_format(tmp_path) is None
@@ -0,0 +1,115 @@
+"""Tests for the InteractionHistory selector index and its append-only storage."""
+
+from __future__ import annotations
+
+import json
+import random
+
+from nlp2cmd.web_schema.history import InteractionHistory, InteractionRecord
+from nlp2cmd.web_schema.selector_index import SelectorStatsIndex
+
+
+def _linear_selectors(records, domain, action_type, limit=10):
+    counts: dict[str, int] = {}
+    for r in records:
+        if r.domain == domain and r.action_type == action_type and r.success and r.selector:
+            counts[r.selector] = counts.get(r.selector, 0) + 1
+    return [s for s, _ in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:limit]]
+
+
+def _synthetic(history: InteractionHistory, n: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    for _ in range(n):
+        history.record(
+            url="https://example.test",
+            domain=rng.choice(["a.test", "b.test"]),
+            action_type=rng.choice(["type", "click"]),
+            selector=rng.choice([f"#s{i}" for i in range(12)] + [None]),
+            success=rng.random() < 0.7,
+            metadata={"field": rng.choice(["search", "email"])},
+        )
+
+
+def test_index_matches_linear_scan(tmp_path):
+    history = InteractionHistory(tmp_path / "h.json", compact_every=10_000)
+    _synthetic(history, 2000)
+
+    for domain in ("a.test", "b.test", "c.test"):
+        for action in ("type", "click"):
+            for limit in (1, 5, 20):
+                assert history.get_successful_selectors(domain, action, limit) == _linear_selectors(
+                    history.records, domain, action, limit
+                )
+        stats = history.get_domain_stats(domain)
+        domain_records = [r for r in history.records if r.domain == domain]
+        assert stats["total_interactions"] == len(domain_records)
+        if domain_records:
+            assert stats["successful_interactions"] == sum(r.success for r in domain_records)
+            assert stats["last_interaction"] == domain_records[-1].timestamp
+
+
+def test_field_groups_and_failure_counts(tmp_path):
+    history = InteractionHistory(tmp_path / "h.json")
+    history.learn_from_failure("x.test", "type", "#q", "timeout", field="search")
+    history.learn_from_success("x.test", "type", "#email", field="email")
+    history.learn_from_success("x.test", "type", "#q", field="search")
+    history.learn_from_success("x.test", "type", "#q", field="search")
+
+    assert history.get_successful_selectors("x.test", "type") == ["#q", "#email"]
+    assert history.get_successful_selectors("x.test", "type", field="email") == ["#email"]
+    assert history.suggest_selector("x.test", "type", {"field": "email"}) == "#email"
+    assert history.suggest_selector("x.test", "type", {"field": "phone"}) == "#q"
+
+    q = history.get_selector_stats("x.test", "type", field="search")["#q"]
+    assert (q.successes, q.failures) == (2, 1)
+    assert q.last_seen == q.last_success == history.records[-1].timestamp
+
+
+def test_ties_keep_first_success_order():
+    index = SelectorStatsIndex()
+    for selector, success in [("#b", False), ("#a", True), ("#b", True), ("#c", True), ("#c", True)]:
+        index.add("d", "click", selector, success, "t")
+    assert index.best_selectors("d", "click") == ["#c", "#a", "#b"]
+
+
+def test_appends_events_and_compacts(tmp_path):
+    path = tmp_path / "h.json"
+    history = InteractionHistory(path, compact_every=5)
+    _synthetic(history, 7)
+
+    assert len(history.events_file.read_text().splitlines()) == 2
+    snapshot = json.loads(path.read_text())
+    assert len(snapshot["records"]) == 5
+    assert snapshot["selector_index"]["events"] == 5
+
+    reloaded = InteractionHistory(path, compact_every=5)
+    assert [r.to_dict() for r in reloaded.records] == [r.to_dict() for r in history.records]
+    assert reloaded.index.to_dict() == history.index.to_dict()
+
+
+def test_interrupted_compaction_and_torn_line(tmp_path):
+    path = tmp_path / "h.json"
+    history = InteractionHistory(path, compact_every=1000)
+    _synthetic(history, 4)
+    log = history.events_file.read_text()
+    history.compact()
+
+    # Snapshot written but the log was not cleared, then a partial append.
+    history.events_file.write_text(log + '{"seq": 4, "timest')
+    reloaded = InteractionHistory(path)
+    assert len(reloaded.records) == 4
+    assert len(reloaded.index) == 4
+
+
+def test_loads_legacy_snapshot_without_index(tmp_path):
+    path = tmp_path / "h.json"
+    records = [
+        InteractionRecord(timestamp=f"2026-01-0{i}T10:00:00", url="https://l.test", domain="l.test",
+                          action_type="click", selector=sel, success=True)
+        for i, sel in enumerate(["#x", "#y", "#y"], start=1)
+    ]
+    path.write_text(json.dumps({"records": [r.to_dict() for r in records]}))
+
+    history = InteractionHistory(path)
+    assert history.get_successful_selectors("l.test", "click") == ["#y", "#x"]
+    assert history.get_domain_stats("l.test")["first_interaction"] == "2026-01-01T10:00:00"
@@ -0,0 +1,105 @@
+"""
+Tests for per-stage latency tracing.
+"""
+
+import pytest
+
+from nlp2cmd.generation.pipeline import PipelineMetrics, RuleBasedPipeline
+from nlp2cmd.monitoring.tracing import (
+    LatencyHistogram,
+    current_trace,
+    set_tracing_enabled,
+    span,
+    trace_request,
+)
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return RuleBasedPipeline(trace=True)
+
+
+def test_span_is_noop_without_trace():
+    assert current_trace() is None
+    first, second = span("a"), span("b")
+    assert first is second
+    with first:
+        pass
+
+
+def test_trace_request_disabled_yields_none():
+    set_tracing_enabled(False)
+    with trace_request("x") as trace:
+        with span("stage"):
+            pass
+    assert trace is None
+
+
+def test_nested_trace_joins_outer():
+    with trace_request("outer", enabled=True) as outer:
+        with span("stage"):
+            with trace_request("inner", enabled=True) as inner:
+                with span("inner.stage"):
+                    pass
+    assert inner is None
+    stages = outer.to_dict()["stages"]
+    assert set(stages) == {"stage", "inner", "inner.stage"}
+    depths = {s["name"]: s["depth"] for s in outer.to_dict()["spans"]}
+    assert depths == {"stage": 0, "inner": 1, "inner.stage": 2}
+
+
+def test_pipeline_attaches_stage_timings(pipeline):
+    result = pipeline.process("pokaż pliki w katalogu /tmp")
+
+    trace = result.metadata["trace"]
+    assert trace["name"] == "pipeline"
+    assert {"detect", "detect.prepare", "extract", "template"} <= set(trace["stages"])
+    assert trace["stages"]["detect"] <= trace["total_ms"]
+
+
+def test_pipeline_without_trace_has_no_metadata():
+    result = RuleBasedPipeline(trace=False).process("pokaż pliki w katalogu /tmp")
+    assert "trace" not in result.metadata
+
+
+def test_transform_records_validation_and_safety():
+    from nlp2cmd import NLP2CMD
+    from nlp2cmd.adapters import ShellAdapter
+
+    set_tracing_enabled(True)
+    try:
+        result = NLP2CMD(adapter=ShellAdapter()).transform("list files")
+    finally:
+        set_tracing_enabled(False)
+
+    stages = result.metadata["trace"]["stages"]
+    assert {"nlp", "generate", "safety"} <= set(stages)
+
+
+def test_histogram_quantiles():
+    hist = LatencyHistogram()
+    for value in range(1, 101):
+        hist.observe(float(value))
+
+    assert hist.count == 100
+    assert 40 <= hist.quantile(0.5) <= 60
+    assert 90 <= hist.quantile(0.95) <= 100
+    assert hist.quantile(0.99) <= hist.max_ms == 100.0
+
+
+def test_metrics_prometheus_export(pipeline):
+    metrics = PipelineMetrics()
+    for text in ["pokaż pliki w katalogu /tmp", "docker ps", "select * from users"]:
+        metrics.record(pipeline.process(text))
+
+    report = metrics.stage_report()
+    assert report["detect"]["count"] == 3
+    assert set(report["detect"]) >= {"p50_ms", "p95_ms", "p99_ms"}
+    assert "stage_latency" in metrics.report()
+
+    text = metrics.to_prometheus()
+    assert "nlp2cmd_requests_total 3" in text
+    assert "# TYPE nlp2cmd_stage_latency_seconds histogram" in text
+    assert 'nlp2cmd_stage_latency_seconds_bucket{stage="detect",le="+Inf"} 3' in text
+    assert 'nlp2cmd_stage_latency_seconds_count{stage="detect"} 3' in text
+    assert 'nlp2cmd_request_latency_seconds_count 3' in text
@@ -0,0 +1,151 @@
+"""Tests for the embedding store and ANN indexes behind OptimizedSemanticMatcher."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from nlp2cmd.generation.semantic_matcher_optimized import OptimizedSemanticMatcher
+from nlp2cmd.generation.vector_index import (
+    EmbeddingStore,
+    ExactIndex,
+    IVFIndex,
+    Int8Index,
+    normalize_rows,
+    top_k,
+)
+
+
+def clustered(n: int, dim: int = 64, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+
+
+def recall(index, exact: ExactIndex, queries: np.ndarray, k: int) -> float:
+    hits = 0
+    for q in queries:
+        hits += len(set(index.search(q, k)[0]) & set(exact.search(q, k)[0]))
+    return hits / (k * len(queries))
+
+
+def test_store_grows_in_place():
+    data = clustered(3000, dim=16)
+    store = EmbeddingStore(capacity=4)
+    for row in data[:10]:
+        store.append(row)
+    store.extend(data[10:])
+
+    assert len(store) == 3000
+    assert store.matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(store.matrix, normalize_rows(data), rtol=1e-6)
+    with pytest.raises(ValueError):
+        store.append(np.ones(8))
+
+
+def test_top_k_breaks_ties_by_position():
+    scores = np.array([0.5, 0.9, 0.1, 0.9, 0.9, 0.2], dtype=np.float32)
+    assert list(top_k(scores, 2)) == [1, 3]
+    assert list(top_k(scores, 10)) == [1, 3, 4, 0, 5, 2]
+
+
+def test_quantized_and_ivf_recall():
+    store = EmbeddingStore()
+    store.extend(clustered(20000))
+    queries = normalize_rows(clustered(50, seed=1))
+    exact = ExactIndex(store)
+
+    assert recall(Int8Index(store), exact, queries, 10) >= 0.98
+    assert recall(IVFIndex(store, nprobe=16), exact, queries, 10) >= 0.9
+
+    # Probing every list is an exact search.
+    ivf = IVFIndex(store, nlist=32, nprobe=32)
+    for q in queries[:10]:
+        ids, scores = ivf.search(q, 5)
+        exact_ids, exact_scores = exact.search(q, 5)
+        assert list(ids) == list(exact_ids)
+        np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+
+
+def test_indexes_follow_store_changes():
+    store = EmbeddingStore()
+    store.extend(clustered(2000))
+    ivf, int8 = IVFIndex(store, nprobe=1000), Int8Index(store)
+    ivf.search(store.matrix[0], 1)
+    int8.search(store.matrix[0], 1)
+
+    extra = 10 * clustered(5, seed=3)
+    store.extend(extra)  # below the IVF rebuild fraction: scanned as the tail
+    for index in (ivf, int8):
+        assert index.search(store.matrix[-1], 1)[0][0] == len(store) - 1
+
+    store.clear()
+    store.extend(clustered(100, seed=4))
+    for index in (ivf, int8):
+        assert index.search(store.matrix[7], 1)[0][0] == 7
+
+
+class FakeModel:
+    def __init__(self, dim: int = 32):
+        self.dim = dim
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        def one(text: str) -> np.ndarray:
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(text)) % (2**32)
+            return np.random.default_rng(seed).normal(size=self.dim)
+
+        if isinstance(texts, str):
+            return one(texts)
+        return np.vstack([one(t) for t in texts])
+
+
+@pytest.mark.parametrize("index", ["exact", "int8", "ivf"])
+def test_matcher_matches_reference_cosine(index):
+    matcher = OptimizedSemanticMatcher(threshold=-1.0, index=index, nprobe=64, ann_min_size=0)
+    matcher.model = FakeModel()
+    phrases = [f"phrase {i}" for i in range(300)]
+    matcher.add_intents_batch([(p, "shell", f"intent_{i}", "en") for i, p in enumerate(phrases)])
+    matcher.add_intent("one more phrase", "docker", "extra")
+
+    raw = np.vstack([ie.embedding for ie in matcher.intent_embeddings])
+    for query in ["phrase 17", "list files", "one more phrase"]:
+        sims = OptimizedSemanticMatcher._cosine_similarity(matcher.model.encode(query), raw)
+        best = matcher.match(query)
+        assert best.matched_phrase == matcher.intent_embeddings[int(np.argmax(sims))].phrase
+        assert best.confidence == pytest.approx(float(sims.max()), abs=1e-5)
+        top = [m.matched_phrase for m in matcher.match_all(query, top_k=3)]
+        assert top[0] == best.matched_phrase
+
+
+def test_matcher_resyncs_replaced_embeddings(tmp_path):
+    matcher = OptimizedSemanticMatcher(threshold=0.5)
+    matcher.model = FakeModel()
+    matcher.add_intents_batch([("list files", "shell", "list", "en"), ("show containers", "docker", "list", "en")])
+    path = tmp_path / "emb.json"
+    matcher.save(path)
+
+    loaded = OptimizedSemanticMatcher(threshold=0.5)
+    loaded.model = FakeModel()
+    assert loaded.load(path)
+    assert loaded.match("show containers").domain == "docker"
+
+    loaded.intent_embeddings = loaded.intent_embeddings[:1]
+    assert loaded.match("list files").domain == "shell"
+    assert len(loaded._get_embedding_matrix()) == 1
+
+
+def test_matcher_ignores_malformed_index_env(monkeypatch, caplog):
+    monkeypatch.setenv("NLP2CMD_SEMANTIC_INDEX", "ivff")
+    monkeypatch.setenv("NLP2CMD_SEMANTIC_NPROBE", "eight")
+
+    with caplog.at_level("WARNING"):
+        matcher = OptimizedSemanticMatcher()
+
+    assert matcher.index_kind == "exact"
+    assert matcher.nprobe == 8
+    assert "NLP2CMD_SEMANTIC_INDEX" in caplog.text and "NLP2CMD_SEMANTIC_NPROBE" in caplog.text
+
+    monkeypatch.setenv("NLP2CMD_SEMANTIC_INDEX", " IVF ")
+    monkeypatch.setenv("NLP2CMD_SEMANTIC_NPROBE", "4")
+    matcher = OptimizedSemanticMatcher()
+    assert (matcher.index_kind, matcher.nprobe) == ("ivf", 4)
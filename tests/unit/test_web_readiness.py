@@ -0,0 +1,60 @@
+"""Tests for page readiness detection (no browser needed)."""
+
+from __future__ import annotations
+
+import time
+
+from nlp2cmd.web_schema.readiness import DOM_QUIET_SCRIPT, ReadinessConfig, wait_for_ready
+
+
+class FakePage:
+    def __init__(self, quiet=(True,), network_delay=0.0, network_ok=True):
+        self.quiet = list(quiet)
+        self.network_delay = network_delay
+        self.network_ok = network_ok
+        self.calls = []
+
+    def evaluate(self, script, arg):
+        assert script is DOM_QUIET_SCRIPT
+        self.calls.append(("quiet", arg))
+        return {"quiet": self.quiet.pop(0) if self.quiet else True, "mutations": 3}
+
+    def wait_for_load_state(self, state, timeout):
+        self.calls.append((state, timeout))
+        time.sleep(self.network_delay)
+        if not self.network_ok:
+            raise TimeoutError("networkidle")
+
+
+def test_settled_page_reports_time_waited():
+    page = FakePage()
+    report = wait_for_ready(page, ReadinessConfig(quiet_ms=200, max_wait_ms=3000))
+
+    assert report.dom_quiet and report.network_idle and not report.timed_out
+    assert report.mutations == 3
+    assert [c[0] for c in page.calls] == ["quiet", "networkidle"]
+    assert page.calls[0][1]["quietMs"] == 200
+    assert 0 <= report.waited_ms < 1000
+    assert report.to_dict()["waited_ms"] == round(report.waited_ms, 1)
+
+
+def test_slow_network_rechecks_dom_within_the_bound():
+    page = FakePage(quiet=(True, False), network_delay=0.15)
+    report = wait_for_ready(page, ReadinessConfig(quiet_ms=100, max_wait_ms=3000))
+
+    assert [c[0] for c in page.calls] == ["quiet", "networkidle", "quiet"]
+    # Later checks only get what is left of the upper bound.
+    assert page.calls[2][1]["maxMs"] < 3000 - 100
+    assert page.calls[1][1] <= 3000
+    assert not report.dom_quiet and report.timed_out
+    assert report.mutations == 6
+
+
+def test_network_timeout_and_disabled_network_check():
+    report = wait_for_ready(FakePage(network_ok=False), ReadinessConfig(max_wait_ms=500))
+    assert report.dom_quiet and not report.network_idle and report.timed_out
+
+    page = FakePage()
+    report = wait_for_ready(page, ReadinessConfig(network_idle=False))
+    assert [c[0] for c in page.calls] == ["quiet"]
+    assert not report.timed_out